@@ -0,0 +1,241 @@
+"""add marketplace listings
+
+Revision ID: 0a7c4e2d9b13
+Revises: f2b6d9a4c815
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0a7c4e2d9b13"
+down_revision: Union[str, Sequence[str], None] = "f2b6d9a4c815"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+APPROVED = sa.text("status = 'approved'")
+
+# Browse indexes on the source tables; every browse query now reads
+# marketplace_listings, so they only add write cost.
+SOURCE_INDEXES = [
+    (
+        "ix_venues_approved_city_type_price",
+        "venues",
+        [sa.text("lower(location_city)"), "venue_type", "price_from"],
+        {},
+    ),
+    ("ix_venues_approved_price_capacity", "venues", ["price_from", "capacity"], {}),
+    ("ix_venues_approved_amenities", "venues", ["amenities"], {"postgresql_using": "gin"}),
+    ("ix_venues_approved_lat_lng", "venues", ["location_lat", "location_lng"], {}),
+    ("ix_service_providers_approved_price", "service_providers", ["price_min", "price_max"], {}),
+]
+
+
+def upgrade() -> None:
+    """Create the marketplace listing read model and backfill approved vendors."""
+    op.create_table(
+        "marketplace_listings",
+        sa.Column("listing_type", sa.String(length=50), nullable=False),
+        sa.Column("entity_id", sa.UUID(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("city", sa.String(length=100), nullable=False),
+        sa.Column("lat", sa.Numeric(precision=10, scale=8), nullable=True),
+        sa.Column("lng", sa.Numeric(precision=11, scale=8), nullable=True),
+        sa.Column("capacity", sa.Integer(), nullable=True),
+        sa.Column("venue_type", sa.String(length=100), nullable=True),
+        sa.Column("price_min", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("price_max", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column(
+            "amenities",
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default=sa.text("'[]'"),
+            nullable=False,
+        ),
+        sa.Column(
+            "categories",
+            postgresql.ARRAY(sa.Text()),
+            server_default=sa.text("'{}'"),
+            nullable=False,
+        ),
+        sa.Column("avg_rating", sa.Numeric(precision=3, scale=2), nullable=True),
+        sa.Column("review_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("search_document", postgresql.TSVECTOR(), nullable=False),
+        sa.Column("card", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("listing_type", "entity_id"),
+    )
+    op.create_index(
+        "ix_marketplace_listings_type_created", "marketplace_listings", ["listing_type", "created_at"]
+    )
+    op.create_index(
+        "ix_marketplace_listings_type_rating", "marketplace_listings", ["listing_type", "avg_rating"]
+    )
+    op.create_index(
+        "ix_marketplace_listings_type_lat_lng", "marketplace_listings", ["listing_type", "lat", "lng"]
+    )
+    op.create_index(
+        "ix_marketplace_listings_type_city_price",
+        "marketplace_listings",
+        ["listing_type", sa.text("lower(btrim(split_part(city, ',', 1)))"), "venue_type", "price_min"],
+    )
+    op.create_index(
+        "ix_marketplace_listings_amenities", "marketplace_listings", ["amenities"], postgresql_using="gin"
+    )
+    op.create_index(
+        "ix_marketplace_listings_categories", "marketplace_listings", ["categories"], postgresql_using="gin"
+    )
+    op.create_index(
+        "ix_marketplace_listings_search", "marketplace_listings", ["search_document"], postgresql_using="gin"
+    )
+
+    op.execute(
+        """
+        INSERT INTO marketplace_listings (
+            listing_type, entity_id, name, city, lat, lng, capacity, venue_type,
+            price_min, price_max, amenities, categories, avg_rating, review_count,
+            search_document, card, created_at, refreshed_at
+        )
+        SELECT 'venue',
+               v.id,
+               v.name,
+               v.location_city,
+               coalesce(v.location_lat, c.lat),
+               coalesce(v.location_lng, c.lng),
+               v.capacity,
+               v.venue_type,
+               v.price_from,
+               v.price_from,
+               a.amenities,
+               '{}'::text[],
+               rs.avg_rating,
+               coalesce(rs.review_count, 0),
+               setweight(to_tsvector('english', coalesce(v.name, '')), 'A')
+                 || setweight(to_tsvector('english', concat_ws(' ', v.venue_type, v.location_city)), 'B')
+                 || setweight(to_tsvector('english', a.amenities::text), 'C')
+                 || setweight(to_tsvector('english', coalesce(v.description, '')), 'D'),
+               jsonb_build_object(
+                   'id', v.id::text,
+                   'name', v.name,
+                   'description', v.description,
+                   'city', v.location_city,
+                   'address', v.location_address,
+                   'capacity', v.capacity,
+                   'amenities', a.amenities,
+                   'photos', to_jsonb(v.photos),
+                   'pricing_structure', v.pricing_structure,
+                   'venue_type', v.venue_type,
+                   'price_from', v.price_from
+               ),
+               v.created_at,
+               now()
+        FROM venues v
+        CROSS JOIN LATERAL (
+            SELECT coalesce(
+                jsonb_path_query_array(v.amenities, '$[*] ? (@.type() == "string")'), '[]'::jsonb
+            ) AS amenities
+        ) a
+        LEFT JOIN LATERAL (
+            SELECT cc.lat, cc.lng FROM city_centroids cc
+            WHERE lower(cc.name) = lower(trim(split_part(v.location_city, ',', 1)))
+              AND (upper(trim(split_part(v.location_city, ',', 2))) IN ('', cc.state))
+            ORDER BY cc.state, cc.id
+            LIMIT 1
+        ) c ON true
+        LEFT JOIN review_stats rs ON rs.reviewee_type = 'venue' AND rs.reviewee_id = v.id
+        WHERE v.status = 'approved'
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO marketplace_listings (
+            listing_type, entity_id, name, city, lat, lng, capacity, venue_type,
+            price_min, price_max, amenities, categories, avg_rating, review_count,
+            search_document, card, created_at, refreshed_at
+        )
+        SELECT 'service_provider',
+               sp.id,
+               sp.business_name,
+               sp.location_city,
+               c.lat,
+               c.lng,
+               NULL,
+               NULL,
+               sp.price_min,
+               sp.price_max,
+               '[]'::jsonb,
+               o.categories,
+               rs.avg_rating,
+               coalesce(rs.review_count, 0),
+               setweight(to_tsvector('english', coalesce(sp.business_name, '')), 'A')
+                 || setweight(to_tsvector('english', concat_ws(' ', array_to_string(o.categories, ' '), o.names)), 'B')
+                 || setweight(to_tsvector('english', coalesce(sp.location_city, '')), 'C')
+                 || setweight(to_tsvector('english', coalesce(sp.description, '')), 'D'),
+               jsonb_build_object(
+                   'id', sp.id::text,
+                   'business_name', sp.business_name,
+                   'description', sp.description,
+                   'city', sp.location_city,
+                   'service_area', to_jsonb(coalesce(sp.service_area, '{}'::text[])),
+                   'photos', to_jsonb(sp.photos),
+                   'services', o.services,
+                   'price_min', sp.price_min,
+                   'price_max', sp.price_max
+               ),
+               sp.created_at,
+               now()
+        FROM service_providers sp
+        CROSS JOIN LATERAL (
+            SELECT coalesce(
+                       array_agg(DISTINCT lower(s.category)) FILTER (WHERE s.category IS NOT NULL),
+                       '{}'::text[]
+                   ) AS categories,
+                   string_agg(s.name, ' ') AS names,
+                   coalesce(
+                       jsonb_agg(
+                           jsonb_build_object(
+                               'id', sps.service_id,
+                               'price_range', sps.price_range,
+                               'name', s.name,
+                               'category', s.category
+                           ) ORDER BY s.name
+                       ) FILTER (WHERE sps.id IS NOT NULL),
+                       '[]'::jsonb
+                   ) AS services
+            FROM service_provider_services sps
+            LEFT JOIN services s ON s.id = sps.service_id
+            WHERE sps.service_provider_id = sp.id
+        ) o
+        LEFT JOIN LATERAL (
+            SELECT cc.lat, cc.lng FROM city_centroids cc
+            WHERE lower(cc.name) = lower(trim(split_part(sp.location_city, ',', 1)))
+              AND (upper(trim(split_part(sp.location_city, ',', 2))) IN ('', cc.state))
+            ORDER BY cc.state, cc.id
+            LIMIT 1
+        ) c ON true
+        LEFT JOIN review_stats rs ON rs.reviewee_type = 'service_provider' AND rs.reviewee_id = sp.id
+        WHERE sp.status = 'approved'
+        """
+    )
+
+
+    for name, table, _, _ in SOURCE_INDEXES:
+        op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    """Drop the marketplace listing read model and restore the source browse indexes."""
+    for name, table, columns, options in SOURCE_INDEXES:
+        op.create_index(name, table, columns, unique=False, postgresql_where=APPROVED, **options)
+    op.drop_index("ix_marketplace_listings_search", table_name="marketplace_listings")
+    op.drop_index("ix_marketplace_listings_categories", table_name="marketplace_listings")
+    op.drop_index("ix_marketplace_listings_amenities", table_name="marketplace_listings")
+    op.drop_index("ix_marketplace_listings_type_city_price", table_name="marketplace_listings")
+    op.drop_index("ix_marketplace_listings_type_lat_lng", table_name="marketplace_listings")
+    op.drop_index("ix_marketplace_listings_type_rating", table_name="marketplace_listings")
+    op.drop_index("ix_marketplace_listings_type_created", table_name="marketplace_listings")
+    op.drop_table("marketplace_listings")
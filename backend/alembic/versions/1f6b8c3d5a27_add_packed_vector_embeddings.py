@@ -0,0 +1,32 @@
+"""add packed vector embeddings
+
+Revision ID: 1f6b8c3d5a27
+Revises: 9d4f2b7e1c38
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "1f6b8c3d5a27"
+down_revision: Union[str, Sequence[str], None] = "9d4f2b7e1c38"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """float32 embeddings readable without pgvector, for the in-process index."""
+    op.add_column("vector_embeddings", sa.Column("packed_embedding", sa.LargeBinary(), nullable=True))
+    op.create_index(
+        "ix_vector_embeddings_type_updated",
+        "vector_embeddings",
+        ["content_type", "updated_at", "content_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vector_embeddings_type_updated", table_name="vector_embeddings")
+    op.drop_column("vector_embeddings", "packed_embedding")
@@ -21,8 +21,13 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
-    # Enable pgvector extension before creating tables that use it
-    op.execute('CREATE EXTENSION IF NOT EXISTS vector')
+    # Enable pgvector extension before creating tables that use it; without
+    # it, embeddings are stored packed for the in-process vector index.
+    has_vector = bool(op.get_bind().scalar(
+        sa.text("SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'vector')")
+    ))
+    if has_vector:
+        op.execute('CREATE EXTENSION IF NOT EXISTS vector')
 
     # ### commands auto generated by Alembic - please adjust! ###
     op.create_table('availability',
@@ -100,7 +105,7 @@ def upgrade() -> None:
     op.create_table('vector_embeddings',
     sa.Column('content_type', sa.String(length=50), nullable=True),
     sa.Column('content_id', sa.UUID(), nullable=True),
-    sa.Column('embedding', Vector(dim=1536), nullable=True),
+    *([sa.Column('embedding', Vector(dim=1536), nullable=True)] if has_vector else []),
     sa.Column('metadata', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
     sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
     sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
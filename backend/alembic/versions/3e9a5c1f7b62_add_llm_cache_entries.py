@@ -0,0 +1,37 @@
+"""add llm cache entries
+
+Revision ID: 3e9a5c1f7b62
+Revises: 8b2e6f0d4a91
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3e9a5c1f7b62"
+down_revision: Union[str, Sequence[str], None] = "8b2e6f0d4a91"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Persistent tier of the LLM response cache."""
+    op.create_table(
+        "llm_cache_entries",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("model", sa.String(length=100), nullable=False),
+        sa.Column("response", sa.Text(), nullable=False),
+        sa.Column("hits", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index("ix_llm_cache_entries_expires_at", "llm_cache_entries", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_cache_entries_expires_at", table_name="llm_cache_entries")
+    op.drop_table("llm_cache_entries")
@@ -0,0 +1,39 @@
+"""add service category browse indexes
+
+Revision ID: 4e1a7b9d2c63
+Revises: 9c25c8a4f898
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4e1a7b9d2c63"
+down_revision: Union[str, Sequence[str], None] = "9c25c8a4f898"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index the provider -> service junction and case-insensitive categories."""
+    op.create_index(
+        "ix_service_provider_services_provider_service",
+        "service_provider_services",
+        ["service_provider_id", "service_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_services_lower_category",
+        "services",
+        [sa.text("lower(category)")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop category browse indexes."""
+    op.drop_index("ix_services_lower_category", table_name="services")
+    op.drop_index("ix_service_provider_services_provider_service", table_name="service_provider_services")
@@ -0,0 +1,97 @@
+"""add planner messages
+
+Revision ID: 5d3f8a1c7e24
+Revises: 0a7c4e2d9b13
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d3f8a1c7e24"
+down_revision: Union[str, Sequence[str], None] = "0a7c4e2d9b13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Move planner session messages out of conversations.data into their own table."""
+    op.create_table(
+        "planner_messages",
+        sa.Column("session_id", sa.UUID(), nullable=False),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("message_id", sa.String(length=100), nullable=True),
+        sa.Column("role", sa.String(length=20), nullable=False),
+        sa.Column("text", sa.Text(), server_default="", nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["session_id"], ["conversations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("session_id", "seq"),
+    )
+
+    op.execute(
+        r"""
+        INSERT INTO planner_messages (session_id, seq, message_id, role, text, status, created_at)
+        SELECT c.id,
+               m.ordinality - 1,
+               left(m.value->>'id', 100),
+               left(coalesce(m.value->>'role', 'user'), 20),
+               coalesce(m.value->>'text', ''),
+               left(m.value->>'status', 20),
+               CASE WHEN m.value->>'createdAt' ~ '^[0-9]+(\.[0-9]+)?$'
+                    THEN to_timestamp((m.value->>'createdAt')::double precision / 1000)
+                    ELSE c.updated_at END
+        FROM conversations c
+        CROSS JOIN LATERAL jsonb_array_elements(c.data #> '{session,messages}')
+             WITH ORDINALITY AS m(value, ordinality)
+        WHERE c.data->>'_type' = 'planner_session'
+          AND jsonb_typeof(c.data #> '{session,messages}') = 'array'
+        """
+    )
+    op.execute(
+        """
+        UPDATE conversations
+        SET data = jsonb_set(
+            data #- '{session,messages}',
+            '{session,messageCount}',
+            to_jsonb(jsonb_array_length(data #> '{session,messages}'))
+        )
+        WHERE data->>'_type' = 'planner_session'
+          AND jsonb_typeof(data #> '{session,messages}') = 'array'
+        """
+    )
+
+
+def downgrade() -> None:
+    """Fold planner messages back into conversations.data."""
+    op.execute(
+        """
+        UPDATE conversations c
+        SET data = jsonb_set(
+            c.data #- '{session,messageCount}',
+            '{session,messages}',
+            coalesce(
+                (
+                    SELECT jsonb_agg(
+                        jsonb_strip_nulls(jsonb_build_object(
+                            'id', pm.message_id,
+                            'role', pm.role,
+                            'text', pm.text,
+                            'createdAt', (extract(epoch FROM pm.created_at) * 1000)::bigint,
+                            'status', pm.status
+                        ))
+                        ORDER BY pm.seq
+                    )
+                    FROM planner_messages pm
+                    WHERE pm.session_id = c.id
+                ),
+                '[]'::jsonb
+            )
+        )
+        WHERE c.data->>'_type' = 'planner_session'
+        """
+    )
+    op.drop_table("planner_messages")
@@ -0,0 +1,29 @@
+"""drop llm cache entry hits
+
+Revision ID: 5d8a2f6c3e19
+Revises: 7b2e4c9f1a36
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d8a2f6c3e19"
+down_revision: Union[str, Sequence[str], None] = "7b2e4c9f1a36"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Cache reads no longer write; hit rates live in the in-process cache stats."""
+    op.drop_column("llm_cache_entries", "hits")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "llm_cache_entries",
+        sa.Column("hits", sa.Integer(), server_default="0", nullable=False),
+    )
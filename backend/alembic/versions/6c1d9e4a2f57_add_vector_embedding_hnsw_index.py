@@ -0,0 +1,54 @@
+"""add vector embedding hnsw index
+
+Revision ID: 6c1d9e4a2f57
+Revises: 3e9a5c1f7b62
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6c1d9e4a2f57"
+down_revision: Union[str, Sequence[str], None] = "3e9a5c1f7b62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_pgvector() -> bool:
+    return bool(
+        op.get_bind().scalar(sa.text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'vector')"))
+    )
+
+
+def upgrade() -> None:
+    """One embedding per content row, searchable by cosine distance."""
+    op.execute(
+        """
+        DELETE FROM vector_embeddings v
+        USING vector_embeddings newer
+        WHERE v.content_type = newer.content_type
+          AND v.content_id = newer.content_id
+          AND (v.created_at, v.id) < (newer.created_at, newer.id)
+        """
+    )
+    op.create_unique_constraint(
+        "uq_vector_embeddings_content", "vector_embeddings", ["content_type", "content_id"]
+    )
+    if not _has_pgvector():
+        # No pgvector: semantic search uses the in-process index instead.
+        return
+    op.execute(
+        """
+        CREATE INDEX ix_vector_embeddings_embedding_hnsw
+        ON vector_embeddings USING hnsw (embedding vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_vector_embeddings_embedding_hnsw")
+    op.drop_constraint("uq_vector_embeddings_content", "vector_embeddings", type_="unique")
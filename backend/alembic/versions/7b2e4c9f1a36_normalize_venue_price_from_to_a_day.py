@@ -0,0 +1,62 @@
+"""normalize venue price_from to a day
+
+Revision ID: 7b2e4c9f1a36
+Revises: 1f6b8c3d5a27
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7b2e4c9f1a36"
+down_revision: Union[str, Sequence[str], None] = "1f6b8c3d5a27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BILLABLE_HOURS_PER_DAY = 8
+
+
+def _json_number(key: str) -> str:
+    return (
+        f"CASE WHEN jsonb_typeof(pricing_structure -> '{key}') = 'number' "
+        f"THEN (pricing_structure ->> '{key}')::numeric END"
+    )
+
+
+DAILY = (
+    f"COALESCE({_json_number('base_price')}, {_json_number('per_day')}, "
+    f"({_json_number('per_hour')}) * {BILLABLE_HOURS_PER_DAY})"
+)
+MIXED_UNITS = "COALESCE(" + ", ".join(_json_number(key) for key in ("base_price", "per_day", "per_hour")) + ")"
+
+
+def _regenerate_price_from(expression: str) -> None:
+    # A generated column's expression can't be altered in place before PG 17.
+    op.drop_column("venues", "price_from")
+    op.add_column(
+        "venues",
+        sa.Column("price_from", sa.Numeric(12, 2), sa.Computed(expression, persisted=True), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE marketplace_listings AS l
+        SET price_min = v.price_from,
+            price_max = v.price_from,
+            card = jsonb_set(l.card, '{price_from}', coalesce(to_jsonb(v.price_from), 'null'::jsonb))
+        FROM venues AS v
+        WHERE l.listing_type = 'venue' AND l.entity_id = v.id
+        """
+    )
+
+
+def upgrade() -> None:
+    """Scale hourly-only venue prices to a day so price_from has one unit."""
+    _regenerate_price_from(DAILY)
+
+
+def downgrade() -> None:
+    """Restore the first-present price, whatever its unit."""
+    _regenerate_price_from(MIXED_UNITS)
@@ -0,0 +1,31 @@
+"""add planner session index
+
+Revision ID: 8b2e6f0d4a91
+Revises: 5d3f8a1c7e24
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8b2e6f0d4a91"
+down_revision: Union[str, Sequence[str], None] = "5d3f8a1c7e24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Partial index for listing a user's planner sessions newest first."""
+    op.create_index(
+        "ix_conversations_planner_sessions",
+        "conversations",
+        ["user_id", "updated_at", "id"],
+        postgresql_where=sa.text("data->>'_type' = 'planner_session'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_conversations_planner_sessions", table_name="conversations")
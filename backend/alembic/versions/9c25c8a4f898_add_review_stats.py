@@ -0,0 +1,57 @@
+"""add review stats
+
+Revision ID: 9c25c8a4f898
+Revises: 5b0f4b7f6c2d
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c25c8a4f898"
+down_revision: Union[str, Sequence[str], None] = "5b0f4b7f6c2d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create per-reviewee rating aggregates and backfill them from reviews."""
+    op.create_table(
+        "review_stats",
+        sa.Column("reviewee_type", sa.String(length=50), nullable=False),
+        sa.Column("reviewee_id", sa.UUID(), nullable=False),
+        sa.Column("review_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("rating_sum", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("avg_rating", sa.Numeric(precision=3, scale=2), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("reviewee_type", "reviewee_id"),
+    )
+    op.create_index(
+        "ix_review_stats_type_avg_rating",
+        "review_stats",
+        ["reviewee_type", "avg_rating"],
+        unique=False,
+    )
+
+    op.execute(
+        """
+        INSERT INTO review_stats (reviewee_type, reviewee_id, review_count, rating_sum, avg_rating)
+        SELECT reviewee_type,
+               reviewee_id,
+               count(*),
+               sum(rating),
+               round(avg(rating)::numeric, 2)
+        FROM reviews
+        WHERE reviewee_type IS NOT NULL
+        GROUP BY reviewee_type, reviewee_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop per-reviewee rating aggregates."""
+    op.drop_index("ix_review_stats_type_avg_rating", table_name="review_stats")
+    op.drop_table("review_stats")
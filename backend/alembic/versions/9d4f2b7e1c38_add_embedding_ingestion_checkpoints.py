@@ -0,0 +1,53 @@
+"""add embedding ingestion checkpoints
+
+Revision ID: 9d4f2b7e1c38
+Revises: 6c1d9e4a2f57
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4f2b7e1c38"
+down_revision: Union[str, Sequence[str], None] = "6c1d9e4a2f57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Change timestamps and checkpoints for incremental embedding ingestion."""
+    op.add_column(
+        "templates",
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.execute("UPDATE templates SET updated_at = created_at")
+    op.create_index("ix_templates_updated_at", "templates", ["updated_at", "id"])
+    op.create_index(
+        "ix_marketplace_listings_type_refreshed",
+        "marketplace_listings",
+        ["listing_type", "refreshed_at", "entity_id"],
+    )
+    op.add_column(
+        "vector_embeddings",
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.create_table(
+        "embedding_checkpoints",
+        sa.Column("content_type", sa.String(length=50), nullable=False),
+        sa.Column("watermark", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("content_type"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("embedding_checkpoints")
+    op.drop_column("vector_embeddings", "updated_at")
+    op.drop_index("ix_marketplace_listings_type_refreshed", table_name="marketplace_listings")
+    op.drop_index("ix_templates_updated_at", table_name="templates")
+    op.drop_column("templates", "updated_at")
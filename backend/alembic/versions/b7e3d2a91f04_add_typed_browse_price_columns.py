@@ -0,0 +1,92 @@
+"""add typed browse price columns
+
+Revision ID: b7e3d2a91f04
+Revises: 4e1a7b9d2c63
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e3d2a91f04"
+down_revision: Union[str, Sequence[str], None] = "4e1a7b9d2c63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+APPROVED = sa.text("status = 'approved'")
+
+
+def _json_number(key: str) -> str:
+    return (
+        f"CASE WHEN jsonb_typeof(pricing_structure -> '{key}') = 'number' "
+        f"THEN (pricing_structure ->> '{key}')::numeric END"
+    )
+
+
+def _generated(name: str, type_: sa.types.TypeEngine, expression: str) -> sa.Column:
+    return sa.Column(name, type_, sa.Computed(expression, persisted=True), nullable=True)
+
+
+def upgrade() -> None:
+    """Generate typed price/type columns from pricing_structure and index them."""
+    op.add_column("venues", _generated("price_per_hour", sa.Numeric(12, 2), _json_number("per_hour")))
+    op.add_column("venues", _generated("price_per_day", sa.Numeric(12, 2), _json_number("per_day")))
+    op.add_column(
+        "venues",
+        _generated(
+            "price_from",
+            sa.Numeric(12, 2),
+            "COALESCE("
+            + ", ".join(_json_number(key) for key in ("base_price", "per_day", "per_hour"))
+            + ")",
+        ),
+    )
+    op.add_column(
+        "venues",
+        _generated(
+            "venue_type",
+            sa.String(length=100),
+            "lower(NULLIF(btrim(COALESCE(pricing_structure ->> 'venue_type', "
+            "pricing_structure ->> 'type')), ''))",
+        ),
+    )
+    op.add_column("service_providers", _generated("price_min", sa.Numeric(12, 2), _json_number("min_price")))
+    op.add_column("service_providers", _generated("price_max", sa.Numeric(12, 2), _json_number("max_price")))
+
+    op.create_index(
+        "ix_venues_approved_city_type_price",
+        "venues",
+        [sa.text("lower(location_city)"), "venue_type", "price_from"],
+        unique=False,
+        postgresql_where=APPROVED,
+    )
+    op.create_index(
+        "ix_venues_approved_price_capacity",
+        "venues",
+        ["price_from", "capacity"],
+        unique=False,
+        postgresql_where=APPROVED,
+    )
+    op.create_index(
+        "ix_service_providers_approved_price",
+        "service_providers",
+        ["price_min", "price_max"],
+        unique=False,
+        postgresql_where=APPROVED,
+    )
+
+
+def downgrade() -> None:
+    """Drop typed browse price columns and their indexes."""
+    op.drop_index("ix_service_providers_approved_price", table_name="service_providers")
+    op.drop_index("ix_venues_approved_price_capacity", table_name="venues")
+    op.drop_index("ix_venues_approved_city_type_price", table_name="venues")
+    op.drop_column("service_providers", "price_max")
+    op.drop_column("service_providers", "price_min")
+    op.drop_column("venues", "venue_type")
+    op.drop_column("venues", "price_from")
+    op.drop_column("venues", "price_per_day")
+    op.drop_column("venues", "price_per_hour")
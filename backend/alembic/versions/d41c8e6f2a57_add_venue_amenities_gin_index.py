@@ -0,0 +1,34 @@
+"""add venue amenities gin index
+
+Revision ID: d41c8e6f2a57
+Revises: b7e3d2a91f04
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d41c8e6f2a57"
+down_revision: Union[str, Sequence[str], None] = "b7e3d2a91f04"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """GIN-index approved venue amenities for containment / match-any filters."""
+    op.create_index(
+        "ix_venues_approved_amenities",
+        "venues",
+        ["amenities"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_where=sa.text("status = 'approved'"),
+    )
+
+
+def downgrade() -> None:
+    """Drop the venue amenities GIN index."""
+    op.drop_index("ix_venues_approved_amenities", table_name="venues")
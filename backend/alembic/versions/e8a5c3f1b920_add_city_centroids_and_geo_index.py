@@ -0,0 +1,198 @@
+"""add city centroids and geo index
+
+Revision ID: e8a5c3f1b920
+Revises: d41c8e6f2a57
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e8a5c3f1b920"
+down_revision: Union[str, Sequence[str], None] = "d41c8e6f2a57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, state, lat, lng) — major US metros and their inner suburbs.
+CITY_CENTROIDS = [
+    # Chicago
+    ("Chicago", "IL", 41.8781, -87.6298),
+    ("Evanston", "IL", 42.0451, -87.6877),
+    ("Oak Park", "IL", 41.8850, -87.7845),
+    ("Skokie", "IL", 42.0324, -87.7416),
+    ("Cicero", "IL", 41.8456, -87.7539),
+    ("Schaumburg", "IL", 42.0334, -88.0834),
+    ("Naperville", "IL", 41.7508, -88.1535),
+    ("Oak Brook", "IL", 41.8328, -87.9290),
+    # New York
+    ("New York", "NY", 40.7128, -74.0060),
+    ("Brooklyn", "NY", 40.6782, -73.9442),
+    ("Queens", "NY", 40.7282, -73.7949),
+    ("Bronx", "NY", 40.8448, -73.8648),
+    ("Staten Island", "NY", 40.5795, -74.1502),
+    ("Yonkers", "NY", 40.9312, -73.8988),
+    ("Jersey City", "NJ", 40.7178, -74.0431),
+    ("Hoboken", "NJ", 40.7440, -74.0324),
+    ("Newark", "NJ", 40.7357, -74.1724),
+    # Los Angeles
+    ("Los Angeles", "CA", 34.0522, -118.2437),
+    ("Santa Monica", "CA", 34.0195, -118.4912),
+    ("Pasadena", "CA", 34.1478, -118.1445),
+    ("Glendale", "CA", 34.1425, -118.2551),
+    ("Burbank", "CA", 34.1808, -118.3090),
+    ("Long Beach", "CA", 33.7701, -118.1937),
+    ("Beverly Hills", "CA", 34.0736, -118.4004),
+    ("Anaheim", "CA", 33.8366, -117.9143),
+    # San Francisco Bay Area
+    ("San Francisco", "CA", 37.7749, -122.4194),
+    ("Oakland", "CA", 37.8044, -122.2712),
+    ("Berkeley", "CA", 37.8715, -122.2730),
+    ("Daly City", "CA", 37.6879, -122.4702),
+    ("San Mateo", "CA", 37.5630, -122.3255),
+    ("Palo Alto", "CA", 37.4419, -122.1430),
+    ("San Jose", "CA", 37.3382, -121.8863),
+    ("Sausalito", "CA", 37.8591, -122.4853),
+    # San Diego
+    ("San Diego", "CA", 32.7157, -117.1611),
+    ("La Jolla", "CA", 32.8328, -117.2713),
+    ("Chula Vista", "CA", 32.6401, -117.0842),
+    # Seattle
+    ("Seattle", "WA", 47.6062, -122.3321),
+    ("Bellevue", "WA", 47.6101, -122.2015),
+    ("Redmond", "WA", 47.6740, -122.1215),
+    ("Tacoma", "WA", 47.2529, -122.4443),
+    # Portland
+    ("Portland", "OR", 45.5152, -122.6784),
+    ("Beaverton", "OR", 45.4871, -122.8037),
+    # Austin
+    ("Austin", "TX", 30.2672, -97.7431),
+    ("Round Rock", "TX", 30.5083, -97.6789),
+    ("Cedar Park", "TX", 30.5052, -97.8203),
+    # Dallas / Fort Worth
+    ("Dallas", "TX", 32.7767, -96.7970),
+    ("Fort Worth", "TX", 32.7555, -97.3308),
+    ("Arlington", "TX", 32.7357, -97.1081),
+    ("Irving", "TX", 32.8140, -96.9489),
+    ("Plano", "TX", 33.0198, -96.6989),
+    # Houston
+    ("Houston", "TX", 29.7604, -95.3698),
+    ("Sugar Land", "TX", 29.6197, -95.6349),
+    ("The Woodlands", "TX", 30.1658, -95.4613),
+    # San Antonio
+    ("San Antonio", "TX", 29.4241, -98.4936),
+    # Phoenix
+    ("Phoenix", "AZ", 33.4484, -112.0740),
+    ("Scottsdale", "AZ", 33.4942, -111.9261),
+    ("Tempe", "AZ", 33.4255, -111.9400),
+    ("Mesa", "AZ", 33.4152, -111.8315),
+    # Denver
+    ("Denver", "CO", 39.7392, -104.9903),
+    ("Aurora", "CO", 39.7294, -104.8319),
+    ("Boulder", "CO", 40.0150, -105.2705),
+    ("Lakewood", "CO", 39.7047, -105.0814),
+    # Las Vegas
+    ("Las Vegas", "NV", 36.1699, -115.1398),
+    ("Henderson", "NV", 36.0395, -114.9817),
+    # Minneapolis / St. Paul
+    ("Minneapolis", "MN", 44.9778, -93.2650),
+    ("Saint Paul", "MN", 44.9537, -93.0900),
+    # Boston
+    ("Boston", "MA", 42.3601, -71.0589),
+    ("Cambridge", "MA", 42.3736, -71.1097),
+    ("Somerville", "MA", 42.3876, -71.0995),
+    ("Brookline", "MA", 42.3318, -71.1212),
+    # Philadelphia
+    ("Philadelphia", "PA", 39.9526, -75.1652),
+    ("Camden", "NJ", 39.9259, -75.1196),
+    # Pittsburgh
+    ("Pittsburgh", "PA", 40.4406, -79.9959),
+    # Washington, DC
+    ("Washington", "DC", 38.9072, -77.0369),
+    ("Alexandria", "VA", 38.8048, -77.0469),
+    ("Bethesda", "MD", 38.9807, -77.1003),
+    ("Silver Spring", "MD", 38.9907, -77.0261),
+    # Baltimore
+    ("Baltimore", "MD", 39.2904, -76.6122),
+    # Atlanta
+    ("Atlanta", "GA", 33.7490, -84.3880),
+    ("Decatur", "GA", 33.7748, -84.2963),
+    ("Marietta", "GA", 33.9526, -84.5499),
+    ("Sandy Springs", "GA", 33.9304, -84.3733),
+    # Miami
+    ("Miami", "FL", 25.7617, -80.1918),
+    ("Miami Beach", "FL", 25.7907, -80.1300),
+    ("Coral Gables", "FL", 25.7215, -80.2684),
+    ("Fort Lauderdale", "FL", 26.1224, -80.1373),
+    # Florida
+    ("Orlando", "FL", 28.5383, -81.3792),
+    ("Tampa", "FL", 27.9506, -82.4572),
+    ("St. Petersburg", "FL", 27.7676, -82.6403),
+    ("Jacksonville", "FL", 30.3322, -81.6557),
+    # Southeast
+    ("Nashville", "TN", 36.1627, -86.7816),
+    ("Charlotte", "NC", 35.2271, -80.8431),
+    ("Raleigh", "NC", 35.7796, -78.6382),
+    ("Durham", "NC", 35.9940, -78.8986),
+    ("Charleston", "SC", 32.7765, -79.9311),
+    ("New Orleans", "LA", 29.9511, -90.0715),
+    # Midwest
+    ("Detroit", "MI", 42.3314, -83.0458),
+    ("Columbus", "OH", 39.9612, -82.9988),
+    ("Cleveland", "OH", 41.4993, -81.6944),
+    ("Cincinnati", "OH", 39.1031, -84.5120),
+    ("Indianapolis", "IN", 39.7684, -86.1581),
+    ("Milwaukee", "WI", 43.0389, -87.9065),
+    ("Kansas City", "MO", 39.0997, -94.5786),
+    ("St. Louis", "MO", 38.6270, -90.1994),
+    # Mountain / other
+    ("Salt Lake City", "UT", 40.7608, -111.8910),
+    ("Sacramento", "CA", 38.5816, -121.4944),
+    ("Honolulu", "HI", 21.3069, -157.8583),
+    ("Anchorage", "AK", 61.2181, -149.9003),
+]
+
+
+def upgrade() -> None:
+    """Create and seed city centroids; index venue coordinates for radius search."""
+    city_centroids = op.create_table(
+        "city_centroids",
+        sa.Column("id", sa.UUID(), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("state", sa.String(length=2), nullable=False),
+        sa.Column("lat", sa.Numeric(precision=10, scale=8), nullable=False),
+        sa.Column("lng", sa.Numeric(precision=11, scale=8), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_city_centroids_lat_lng", "city_centroids", ["lat", "lng"], unique=False)
+    op.create_index(
+        "uq_city_centroids_lower_name_state",
+        "city_centroids",
+        [sa.text("lower(name)"), "state"],
+        unique=True,
+    )
+    op.bulk_insert(
+        city_centroids,
+        [
+            {"name": name, "state": state, "lat": lat, "lng": lng}
+            for name, state, lat, lng in CITY_CENTROIDS
+        ],
+    )
+
+    op.create_index(
+        "ix_venues_approved_lat_lng",
+        "venues",
+        ["location_lat", "location_lng"],
+        unique=False,
+        postgresql_where=sa.text("status = 'approved'"),
+    )
+
+
+def downgrade() -> None:
+    """Drop city centroids and the venue coordinate index."""
+    op.drop_index("ix_venues_approved_lat_lng", table_name="venues")
+    op.drop_index("uq_city_centroids_lower_name_state", table_name="city_centroids")
+    op.drop_index("ix_city_centroids_lat_lng", table_name="city_centroids")
+    op.drop_table("city_centroids")
@@ -0,0 +1,48 @@
+"""add availability bitmaps
+
+Revision ID: f2b6d9a4c815
+Revises: e8a5c3f1b920
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b6d9a4c815"
+down_revision: Union[str, Sequence[str], None] = "e8a5c3f1b920"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create per-entity, per-year blocked-day bitmaps and backfill from availability."""
+    op.create_table(
+        "availability_bitmaps",
+        sa.Column("entity_type", sa.String(length=50), nullable=False),
+        sa.Column("entity_id", sa.UUID(), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("blocked", postgresql.BIT(length=366), nullable=False),
+        sa.PrimaryKeyConstraint("entity_type", "entity_id", "year"),
+    )
+
+    op.execute(
+        """
+        INSERT INTO availability_bitmaps (entity_type, entity_id, year, blocked)
+        SELECT entity_type,
+               entity_id,
+               extract(year FROM date)::int,
+               bit_or(set_bit(repeat('0', 366)::bit(366), extract(doy FROM date)::int - 1, 1))
+        FROM availability
+        WHERE is_available = false
+        GROUP BY entity_type, entity_id, extract(year FROM date)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop availability bitmaps."""
+    op.drop_table("availability_bitmaps")
@@ -19,6 +19,8 @@ from sqlalchemy import String, Text, inspect, or_, select
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import AppCache, cached
+from app.core.config import settings
 from app.core.deps import get_current_user, get_current_user_optional
 from app.db.base import Base
 from app.db.engine import get_db
@@ -69,6 +71,7 @@ def create_crud_router(
     require_auth: bool = True,
     owner_field: str | None = None,
     tags: list[str] | None = None,
+    cache_tags: tuple[str, ...] = (),
 ) -> APIRouter:
     """Build a full CRUD APIRouter for the given model.
 
@@ -79,9 +82,44 @@ def create_crud_router(
         owner_field: Column name for ownership checks (e.g. "user_id").
                      When set, create auto-sets it and update/delete verify it.
         tags: OpenAPI tags for grouping.
+        cache_tags: When set, list and get-by-id results are cached and
+                    dropped once a write to any of these tags commits.
     """
     router = APIRouter(prefix=f"/api/{resource}", tags=tags or [resource])
     is_jsonb = _is_jsonb_model(model)
+    col_names = {col.name for col in inspect(model).columns}
+
+    async def _list_rows(
+        db: AsyncSession,
+        filters: tuple[tuple[str, str], ...],
+        sort: str | None,
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        stmt = select(model)
+        for key, value in filters:
+            stmt = stmt.where(getattr(model, key) == value)
+
+        if sort:
+            desc = sort.startswith("-")
+            col_name = sort.lstrip("-")
+            if col_name in col_names:
+                col_attr = getattr(model, col_name)
+                stmt = stmt.order_by(col_attr.desc() if desc else col_attr.asc())
+
+        result = await db.execute(stmt.limit(limit))
+        return [_serialize_row(r) for r in result.scalars().all()]
+
+    async def _load_row(db: AsyncSession, item_id: uuid.UUID) -> dict[str, Any] | None:
+        result = await db.execute(select(model).where(model.id == item_id))
+        row = result.scalar_one_or_none()
+        return None if row is None else _serialize_row(row)
+
+    if cache_tags:
+        lookup_cache = AppCache(
+            f"crud:{resource}", ttl=settings.CATALOG_CACHE_TTL_SECONDS, tags=cache_tags
+        )
+        _list_rows = cached(lookup_cache)(_list_rows)
+        _load_row = cached(lookup_cache)(_load_row)
 
     # ------------------------------------------------------------------
     # LIST
@@ -94,33 +132,20 @@ def create_crud_router(
         _sort: str | None = Query(None),
         _limit: int = Query(100, le=500),
     ) -> dict[str, Any]:
-        stmt = select(model)
-
         # Apply field-level filters from query params
-        mapper = inspect(model)
-        col_names = {col.name for col in mapper.columns}
-        for key, value in request.query_params.items():
-            if key.startswith("_"):
-                continue
-            if key in col_names:
-                stmt = stmt.where(getattr(model, key) == value)
-
-        # Sorting
-        if _sort:
-            desc = _sort.startswith("-")
-            col_name = _sort.lstrip("-")
-            if col_name in col_names:
-                col_attr = getattr(model, col_name)
-                stmt = stmt.order_by(col_attr.desc() if desc else col_attr.asc())
-
-        stmt = stmt.limit(_limit)
-        result = await db.execute(stmt)
-        rows = result.scalars().all()
+        filters = tuple(
+            sorted(
+                (key, value)
+                for key, value in request.query_params.items()
+                if not key.startswith("_") and key in col_names
+            )
+        )
+        data = await _list_rows(db, filters, _sort, _limit)
 
         return {
             "success": True,
-            "data": [_serialize_row(r) for r in rows],
-            "total": len(rows),
+            "data": data,
+            "total": len(data),
         }
 
     # ------------------------------------------------------------------
@@ -159,11 +184,10 @@ def create_crud_router(
         db: AsyncSession = Depends(get_db),
         _user: User | None = Depends(get_current_user_optional),
     ) -> dict[str, Any]:
-        result = await db.execute(select(model).where(model.id == item_id))
-        row = result.scalar_one_or_none()
-        if row is None:
+        data = await _load_row(db, item_id)
+        if data is None:
             raise NotFoundError(f"{resource} not found")
-        return {"success": True, "data": _serialize_row(row)}
+        return {"success": True, "data": data}
 
     # ------------------------------------------------------------------
     # CREATE
@@ -189,7 +213,7 @@ def create_crud_router(
             row = model(**kwargs)
         else:
             mapper = inspect(model)
-            col_names = {col.name for col in mapper.columns}
+            col_names = {col.name for col in mapper.columns if col.computed is None}
             kwargs = {k: v for k, v in body.items() if k in col_names and k != "id"}
             if owner_field and user:
                 kwargs[owner_field] = user.id
@@ -232,7 +256,7 @@ def create_crud_router(
             row.data = existing_data
         else:
             mapper = inspect(model)
-            col_names = {col.name for col in mapper.columns}
+            col_names = {col.name for col in mapper.columns if col.computed is None}
             for key, value in body.items():
                 if key in col_names and key not in ("id", "created_at"):
                     setattr(row, key, value)
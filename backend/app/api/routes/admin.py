@@ -14,7 +14,9 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.cache import cache_metrics
 from app.core.deps import require_role
+from app.core.http_clients import http_clients
 from app.db.engine import get_db
 from app.models.audit_log import AuditLog
 from app.models.event import Event, EventService
@@ -655,6 +657,22 @@ async def reconcile_dummy_payments(
     return {"success": True, "reconciled": count}
 
 
+@router.get("/ops/cache-stats")
+async def cache_stats(
+    _admin: User = Depends(admin_user),
+) -> dict[str, Any]:
+    """Hit/miss/eviction counters of this worker's application caches."""
+    return {"success": True, "data": cache_metrics()}
+
+
+@router.get("/ops/upstream-stats")
+async def upstream_stats(
+    _admin: User = Depends(admin_user),
+) -> dict[str, Any]:
+    """Request counts, latency and guard state (bulkhead, circuit) of this worker's outbound HTTP clients."""
+    return {"success": True, "data": http_clients.metrics()}
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -3,7 +3,7 @@
 from typing import Any
 
 from fastapi import APIRouter, Depends, File, UploadFile
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.core.deps import get_current_user
 from app.models.user import User
@@ -22,6 +22,7 @@ class InvokeLLMRequest(BaseModel):
     prompt: str
     response_json_schema: dict[str, Any] | None = None
     add_context_from_internet: bool = False
+    temperature: float = Field(default=0.7, ge=0.0, le=1.0)  # low temperatures are served from the LLM cache
 
 
 class SendEmailRequest(BaseModel):
@@ -67,6 +68,7 @@ async def invoke_llm(
         prompt=body.prompt,
         response_json_schema=body.response_json_schema,
         add_context_from_internet=body.add_context_from_internet,
+        temperature=body.temperature,
     )
     return result
 
@@ -160,5 +162,6 @@ async def extract_data_from_file(
     result = await llm_service.invoke_llm(
         prompt=prompt,
         response_json_schema={"type": "object"},
+        temperature=0.1,
     )
     return result
@@ -1,8 +1,14 @@
 """Marketplace routes — public browsing and direct booking for venues and services.
 
+Browse endpoints read the `marketplace_listings` read model only.
+
 Endpoints:
-- GET /api/marketplace/venues — filter by city, capacity, price, ratings, amenities, venue type
-- GET /api/marketplace/services — filter by service type, location, price, ratings
+- GET /api/marketplace/venues — filter by city, capacity, price, ratings, amenities, venue type, radius, dates
+- GET /api/marketplace/venues/facets — facet counts for the current venue filters
+- GET /api/marketplace/venues/describe — venues most similar to a description, under the venue filters
+- GET /api/marketplace/services — filter by service type, location, price, ratings, radius, dates
+- GET /api/marketplace/services/facets — facet counts for the current service filters
+- GET /api/marketplace/services/describe — providers most similar to a description, under the service filters
 - POST /api/marketplace/book-venue — direct venue booking (bypass AI planner)
 - POST /api/marketplace/book-service — direct service provider booking
 """
@@ -12,16 +18,13 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
-from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_current_user, get_current_user_optional
 from app.db.engine import get_db
-from app.models.review import Review
-from app.models.service import Service
-from app.models.service_provider import ServiceProvider, ServiceProviderService
 from app.models.user import User
-from app.models.venue import Venue
+from app.services import availability_service, marketplace_service
+from app.services.availability_service import MatchMode
 from app.services.booking_service import book_service_provider, book_venue
 
 router = APIRouter(prefix="/api/marketplace", tags=["marketplace"])
@@ -45,75 +48,135 @@ class DirectBookServiceRequest(BaseModel):
 
 
 # ---------------------------------------------------------------------------
-# Browse venues
+# Shared filters
 # ---------------------------------------------------------------------------
 
 
-@router.get("/venues")
-async def list_marketplace_venues(
-    db: AsyncSession = Depends(get_db),
-    _user: User | None = Depends(get_current_user_optional),
+def venue_filters(
+    q: str | None = Query(None, description="Free-text search"),
     city: str | None = Query(None, description="Filter by city name"),
     min_capacity: int | None = Query(None, ge=0),
     max_capacity: int | None = Query(None, ge=0),
     min_price: float | None = Query(None, ge=0),
     max_price: float | None = Query(None, ge=0),
     amenities: str | None = Query(None, description="Comma-separated amenity names"),
+    amenities_match: str = Query("all", description="all | any"),
     venue_type: str | None = Query(None, description="Type of venue"),
     min_rating: float | None = Query(None, ge=0, le=5),
-    sort_by: str = Query("newest", description="newest | rating | capacity"),
+    lat: float | None = Query(None, ge=-90, le=90),
+    lng: float | None = Query(None, ge=-180, le=180),
+    radius_km: float | None = Query(None, gt=0, le=500),
+    available_on: str | None = Query(None, description="Comma-separated ISO dates"),
+    available_between: str | None = Query(None, description="ISO 'start,end' (inclusive)"),
+    availability_match: MatchMode = Query("any", description="any | all requested dates free"),
+) -> dict[str, Any]:
+    """Venue browse filters shared by the listing and facet endpoints."""
+    return {
+        "q": q,
+        "city": city,
+        "min_capacity": min_capacity,
+        "max_capacity": max_capacity,
+        "min_price": min_price,
+        "max_price": max_price,
+        "venue_type": venue_type,
+        "amenities": _split_csv(amenities),
+        "amenities_match": amenities_match,
+        "min_rating": min_rating,
+        "lat": lat,
+        "lng": lng,
+        "radius_km": radius_km,
+        "available_dates": availability_service.requested_dates(available_on, available_between),
+        "availability_match": availability_match,
+    }
+
+
+def service_filters(
+    q: str | None = Query(None, description="Free-text search"),
+    service_type: str | None = Query(None, description="Service category name"),
+    city: str | None = Query(None, description="Provider city"),
+    min_price: float | None = Query(None, ge=0),
+    max_price: float | None = Query(None, ge=0),
+    min_rating: float | None = Query(None, ge=0, le=5),
+    lat: float | None = Query(None, ge=-90, le=90),
+    lng: float | None = Query(None, ge=-180, le=180),
+    radius_km: float | None = Query(None, gt=0, le=500),
+    available_on: str | None = Query(None, description="Comma-separated ISO dates"),
+    available_between: str | None = Query(None, description="ISO 'start,end' (inclusive)"),
+    availability_match: MatchMode = Query("any", description="any | all requested dates free"),
+) -> dict[str, Any]:
+    """Service provider browse filters shared by the listing and facet endpoints."""
+    return {
+        "q": q,
+        "service_type": service_type,
+        "city": city,
+        "min_price": min_price,
+        "max_price": max_price,
+        "min_rating": min_rating,
+        "lat": lat,
+        "lng": lng,
+        "radius_km": radius_km,
+        "available_dates": availability_service.requested_dates(available_on, available_between),
+        "availability_match": availability_match,
+    }
+
+
+def _split_csv(value: str | None) -> list[str] | None:
+    items = [item.strip() for item in (value or "").split(",") if item.strip()]
+    return items or None
+
+
+# ---------------------------------------------------------------------------
+# Browse venues
+# ---------------------------------------------------------------------------
+
+
+@router.get("/venues")
+async def list_marketplace_venues(
+    db: AsyncSession = Depends(get_db),
+    _user: User | None = Depends(get_current_user_optional),
+    filters: dict[str, Any] = Depends(venue_filters),
+    sort_by: str = Query("newest", description="newest | rating | capacity | price | distance | relevance"),
     _limit: int = Query(20, alias="limit", ge=1, le=100),
     _offset: int = Query(0, alias="offset", ge=0),
 ) -> dict[str, Any]:
-    """Browse approved venues with filtering and sorting."""
-    query = select(Venue).where(Venue.status == "approved")
-
-    # Apply filters
-    if city:
-        query = query.where(func.lower(Venue.location_city) == city.lower())
-
-    if min_capacity is not None:
-        query = query.where(Venue.capacity >= min_capacity)
-    if max_capacity is not None:
-        query = query.where(Venue.capacity <= max_capacity)
-
-    if venue_type:
-        # Venue type is stored in pricing_structure JSONB, or in description
-        query = query.where(
-            Venue.description.ilike(f"%{venue_type}%")
-        )
-
-    # Sorting
-    if sort_by == "capacity":
-        query = query.order_by(Venue.capacity.desc())
-    else:  # newest is default
-        query = query.order_by(Venue.created_at.desc())
-
-    query = query.limit(_limit).offset(_offset)
-    result = await db.execute(query)
-    venues = result.scalars().all()
-
-    # Enrich with ratings
-    venue_data = []
-    for v in venues:
-        avg_rating = await _get_avg_rating(db, "venue", v.id)
-
-        if min_rating is not None and (avg_rating or 0) < min_rating:
-            continue
-
-        venue_data.append({
-            "id": str(v.id),
-            "name": v.name,
-            "description": v.description,
-            "city": v.location_city,
-            "address": v.location_address,
-            "capacity": v.capacity,
-            "amenities": v.amenities or [],
-            "photos": v.photos or [],
-            "pricing_structure": v.pricing_structure or {},
-            "avg_rating": avg_rating,
-        })
+    """Browse approved venues with filtering and sorting.
+
+    Also returns amenity facet counts over every matching venue (not just
+    this page) so the UI can show how many results each amenity narrows to.
+    """
+    venue_data = await marketplace_service.list_venues(
+        db, **filters, sort_by=sort_by, limit=_limit, offset=_offset
+    )
+    amenity_facets = await marketplace_service.venue_amenity_facets(db, **filters)
+    return {
+        "data": venue_data,
+        "count": len(venue_data),
+        "facets": {"amenities": amenity_facets},
+    }
+
+
+@router.get("/venues/facets")
+async def marketplace_venue_facets(
+    db: AsyncSession = Depends(get_db),
+    filters: dict[str, Any] = Depends(venue_filters),
+) -> dict[str, Any]:
+    """Counts per city, capacity, price, amenity, venue type and rating band."""
+    return await marketplace_service.venue_facets(db, **filters)
+
 
+@router.get("/venues/describe")
+async def describe_marketplace_venues(
+    description: str = Query(..., min_length=2, max_length=1000, description="What the venue should be like"),
+    db: AsyncSession = Depends(get_db),
+    _user: User | None = Depends(get_current_user_optional),
+    filters: dict[str, Any] = Depends(venue_filters),
+    _limit: int = Query(20, alias="limit", ge=1, le=100),
+    _offset: int = Query(0, alias="offset", ge=0),
+) -> dict[str, Any]:
+    """Venues ranked by similarity to a free-text description, most similar first."""
+    venue_data = await marketplace_service.describe_venues(
+        db, description, **filters, limit=_limit, offset=_offset
+    )
     return {"data": venue_data, "count": len(venue_data)}
 
 
@@ -126,66 +189,40 @@ async def list_marketplace_venues(
 async def list_marketplace_services(
     db: AsyncSession = Depends(get_db),
     _user: User | None = Depends(get_current_user_optional),
-    service_type: str | None = Query(None, description="Service category name"),
-    city: str | None = Query(None, description="Provider city"),
-    min_price: float | None = Query(None, ge=0),
-    max_price: float | None = Query(None, ge=0),
-    min_rating: float | None = Query(None, ge=0, le=5),
-    sort_by: str = Query("newest", description="newest | rating"),
+    filters: dict[str, Any] = Depends(service_filters),
+    sort_by: str = Query("newest", description="newest | rating | price | distance | relevance"),
     _limit: int = Query(20, alias="limit", ge=1, le=100),
     _offset: int = Query(0, alias="offset", ge=0),
 ) -> dict[str, Any]:
     """Browse approved service providers with filtering."""
-    query = select(ServiceProvider).where(ServiceProvider.status == "approved")
-
-    if city:
-        query = query.where(func.lower(ServiceProvider.location_city) == city.lower())
-
-    query = query.order_by(ServiceProvider.created_at.desc())
-    query = query.limit(_limit).offset(_offset)
-
-    result = await db.execute(query)
-    providers = result.scalars().all()
-
-    provider_data = []
-    for sp in providers:
-        # Filter by service type if specified
-        if service_type:
-            has_service = False
-            for sps in sp.offered_services:
-                if sps.service and sps.service.category and sps.service.category.lower() == service_type.lower():
-                    has_service = True
-                    break
-            if not has_service:
-                continue
-
-        avg_rating = await _get_avg_rating(db, "service_provider", sp.id)
-        if min_rating is not None and (avg_rating or 0) < min_rating:
-            continue
-
-        # Build services list
-        services_list = []
-        for sps in sp.offered_services:
-            service_info: dict[str, Any] = {
-                "id": str(sps.service_id),
-                "price_range": sps.price_range,
-            }
-            if sps.service:
-                service_info["name"] = sps.service.name
-                service_info["category"] = sps.service.category
-            services_list.append(service_info)
-
-        provider_data.append({
-            "id": str(sp.id),
-            "business_name": sp.business_name,
-            "description": sp.description,
-            "city": sp.location_city,
-            "service_area": sp.service_area or [],
-            "photos": sp.photos or [],
-            "services": services_list,
-            "avg_rating": avg_rating,
-        })
+    provider_data = await marketplace_service.list_service_providers(
+        db, **filters, sort_by=sort_by, limit=_limit, offset=_offset
+    )
+    return {"data": provider_data, "count": len(provider_data)}
+
 
+@router.get("/services/facets")
+async def marketplace_service_facets(
+    db: AsyncSession = Depends(get_db),
+    filters: dict[str, Any] = Depends(service_filters),
+) -> dict[str, Any]:
+    """Counts per city, price, service category and rating band."""
+    return await marketplace_service.service_provider_facets(db, **filters)
+
+
+@router.get("/services/describe")
+async def describe_marketplace_services(
+    description: str = Query(..., min_length=2, max_length=1000, description="What the provider should offer"),
+    db: AsyncSession = Depends(get_db),
+    _user: User | None = Depends(get_current_user_optional),
+    filters: dict[str, Any] = Depends(service_filters),
+    _limit: int = Query(20, alias="limit", ge=1, le=100),
+    _offset: int = Query(0, alias="offset", ge=0),
+) -> dict[str, Any]:
+    """Service providers ranked by similarity to a free-text description."""
+    provider_data = await marketplace_service.describe_service_providers(
+        db, description, **filters, limit=_limit, offset=_offset
+    )
     return {"data": provider_data, "count": len(provider_data)}
 
 
@@ -226,24 +263,3 @@ async def marketplace_book_service(
         user_id=user.id,
     )
     return result
-
-
-# ---------------------------------------------------------------------------
-# Helpers
-# ---------------------------------------------------------------------------
-
-
-async def _get_avg_rating(
-    db: AsyncSession,
-    reviewee_type: str,
-    reviewee_id: uuid.UUID,
-) -> float | None:
-    """Get the average rating for an entity from the reviews table."""
-    result = await db.execute(
-        select(func.avg(Review.rating)).where(
-            Review.reviewee_type == reviewee_type,
-            Review.reviewee_id == reviewee_id,
-        )
-    )
-    avg = result.scalar_one_or_none()
-    return round(float(avg), 2) if avg else None
@@ -1,15 +1,19 @@
 """Planner routes — AI chat, session management, plan generation."""
 
+import uuid
 from typing import Any
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.sse import sse_response
 from app.core.deps import get_current_user
 from app.db.engine import get_db
 from app.models.user import User
 from app.services import planner_service
+from app.utils.exceptions import BadRequestError, NotFoundError
 
 router = APIRouter(prefix="/api/planner", tags=["planner"])
 
@@ -33,6 +37,9 @@ class DraftBriefPayload(BaseModel):
     budget: int | None = None
     city: str | None = None
     dateRange: str | None = None
+    lat: float | None = None
+    lng: float | None = None
+    radiusKm: float | None = None
 
 
 class PlannerMessageRequest(BaseModel):
@@ -80,6 +87,36 @@ async def planner_message(
     return result
 
 
+@router.post("/message/stream")
+async def planner_message_stream(
+    body: PlannerMessageRequest,
+    request: Request,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """Stream the assistant reply as Server-Sent Events.
+
+    Sends ``delta`` events with text chunks, then one ``done`` event with the
+    same payload as POST /message, or an ``error`` event if the turn failed.
+    A client disconnect cancels the upstream LLM request.
+    """
+    events = planner_service.stream_message(
+        db=db,
+        user_id=user.id,
+        session_id=body.sessionId,
+        user_text=body.userText,
+        messages=[m.model_dump() for m in body.messages],
+        draft_brief=body.draftBrief.model_dump() if body.draftBrief else None,
+        mode=body.mode,
+        brief_status=body.briefStatus,
+        planner_state=body.plannerState,
+    )
+
+    return sse_response(
+        request, db, events, "The planner could not finish this reply.", {"session_id": body.sessionId}
+    )
+
+
 @router.post("/generate")
 async def planner_generate(
     body: GenerateRequest,
@@ -93,19 +130,64 @@ async def planner_generate(
         db=db,
         user_id=user.id,
         draft_brief=draft_brief,
+        session_id=body.sessionId,
     )
 
     return result
 
 
+@router.post("/generate/stream")
+async def planner_generate_stream(
+    body: GenerateRequest,
+    request: Request,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """Stream plan generation as Server-Sent Events.
+
+    Sends a ``plan`` event with the computed plan, ``delta`` events as its
+    title and summary are written, then a ``done`` event with the same
+    payload as POST /generate, or an ``error`` event if generation failed.
+    """
+    events = planner_service.stream_plan(
+        db=db,
+        user_id=user.id,
+        draft_brief=body.draftBrief.model_dump() if body.draftBrief else {},
+        session_id=body.sessionId,
+    )
+
+    return sse_response(
+        request, db, events, "The planner could not finish this plan.", {"session_id": body.sessionId}
+    )
+
+
 @router.get("/sessions")
 async def planner_sessions(
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100),
+    before: str | None = Query(None),
 ) -> dict[str, Any]:
-    """List all planner sessions for the current user."""
-    sessions = await planner_service.get_sessions(db=db, user_id=user.id)
-    return {"sessions": sessions}
+    """List the current user's planner sessions as summaries. Supports cursor-based pagination."""
+    return await planner_service.get_sessions(
+        db=db,
+        user_id=user.id,
+        limit=limit,
+        before=before or None,
+    )
+
+
+@router.get("/sessions/{session_id}")
+async def planner_session(
+    session_id: str,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> dict[str, Any]:
+    """Fetch one planner session with its messages."""
+    session = await planner_service.get_session(db=db, user_id=user.id, session_id=_session_uuid(session_id))
+    if session is None:
+        raise NotFoundError("Session not found")
+    return {"session": session}
 
 
 @router.post("/sessions/{session_id}/approve-layout")
@@ -121,3 +203,15 @@ async def planner_approve_layout(
         session_id=session_id,
     )
     return result
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _session_uuid(value: str) -> uuid.UUID:
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        raise BadRequestError("Invalid session ID")
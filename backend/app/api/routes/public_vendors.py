@@ -19,26 +19,11 @@ def list_public_vendors(
     location: str | None = Query(default=None),
     service_area: str | None = Query(default=None),
 ) -> list[VendorPublicCardOut]:
-    rows = vendors_service.list_public_vendors(
+    cards = vendors_service.list_public_vendor_cards(
         db,
         vendor_type=vendor_type,
         category=category,
         location_text=location,
         service_area=service_area,
     )
-
-    results: list[VendorPublicCardOut] = []
-    for row in rows:
-        vendor = row["vendor"]
-        results.append(
-            VendorPublicCardOut(
-                vendor_id=str(vendor.id),
-                vendor_type=vendor.vendor_type,
-                display_name=row.get("display_name", "Vendor"),
-                location_text=row.get("location_text"),
-                categories=row.get("categories"),
-                service_areas=row.get("service_areas"),
-                assets_json=row.get("assets_json"),
-            )
-        )
-    return results
+    return [VendorPublicCardOut(**card) for card in cards]
@@ -1,4 +1,4 @@
-"""Template library routes — popular, by-type, and customize endpoints."""
+"""Template library routes — popular, by-type, describe, and customize endpoints."""
 
 from typing import Any
 
@@ -11,7 +11,7 @@ from app.core.deps import get_current_user
 from app.db.engine import get_db
 from app.models.template import Template
 from app.models.user import User
-from app.services import llm_service
+from app.services import llm_service, retrieval_service
 
 router = APIRouter(prefix="/api/templates", tags=["templates"])
 
@@ -74,6 +74,26 @@ async def get_templates_by_type(
     }
 
 
+# ---------------------------------------------------------------------------
+# GET /api/templates/describe
+# ---------------------------------------------------------------------------
+
+
+@router.get("/describe")
+async def describe_templates(
+    description: str = Query(..., min_length=2, max_length=1000),
+    event_type: str | None = Query(default=None),
+    limit: int = Query(default=5, ge=1, le=20),
+    db: AsyncSession = Depends(get_db),
+) -> dict[str, Any]:
+    """Return public templates most similar to a free-text description."""
+    matches = await retrieval_service.search_templates(db, description, event_type=event_type, limit=limit)
+    return {
+        "data": [{**_serialize(t), "similarity": round(similarity, 4)} for t, similarity in matches],
+        "count": len(matches),
+    }
+
+
 # ---------------------------------------------------------------------------
 # POST /api/templates/customize
 # ---------------------------------------------------------------------------
@@ -0,0 +1,60 @@
+"""Server-Sent Events responses for streaming endpoints.
+
+Frames ``(event, data)`` pairs from a service generator and ties the
+request's DB session to the stream: the work is committed before ``done``
+is sent and rolled back when the stream fails or the client leaves.
+"""
+
+import json
+import logging
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+
+def sse(event: str, data: dict[str, Any]) -> str:
+    """Format one Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def sse_response(
+    request: Request,
+    db: AsyncSession,
+    events: AsyncIterator[tuple[str, dict[str, Any]]],
+    error_detail: str,
+    log_extra: dict[str, Any],
+) -> StreamingResponse:
+    """Stream ``(event, data)`` pairs as SSE frames until the client disconnects.
+
+    The session is committed before the ``done`` event goes out, so the
+    client is only told about work that was saved. A failure mid-stream, or
+    a client that leaves early, rolls back whatever was flushed; a failure is
+    logged and sent as a final ``error`` event.
+    """
+
+    async def event_source() -> AsyncIterator[str]:
+        try:
+            async for event, data in events:
+                if await request.is_disconnected():
+                    await db.rollback()
+                    break
+                if event == "done":
+                    await db.commit()
+                yield sse(event, data)
+        except Exception:
+            logger.exception("Event stream failed", extra=log_extra)
+            await db.rollback()
+            yield sse("error", {"detail": error_detail})
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,403 @@
+"""In-process and shared caching helpers.
+
+``TTLCache`` is a bounded per-process LRU whose entries expire after a TTL.
+``AppCache`` puts one in front of an optional shared tier speaking the
+Redis protocol (``CACHE_REDIS_URL``) and adds tag invalidation, coalescing
+of concurrent misses and hit/miss/eviction counters. :func:`cached` wraps
+a service function with an ``AppCache``.
+"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable, Mapping
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Any, ParamSpec, TypeVar
+
+from app.core.config import settings
+from app.core.redis_cache import RedisClient, RedisTier
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    """Counters for one cache.
+
+    ``misses`` are in-process misses; ``shared_hits`` counts those that
+    were then served from the shared tier.
+    """
+
+    hits: int = 0
+    shared_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    shared_errors: int = 0
+
+    def snapshot(self) -> dict[str, float]:
+        data: dict[str, float] = asdict(self)
+        lookups = self.hits + self.misses
+        data["hit_rate"] = round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0
+        return data
+
+
+class TTLCache:
+    """Bounded in-memory cache whose entries expire ``ttl`` seconds after set.
+
+    Least recently used entries are evicted first once ``maxsize`` is reached.
+    Per-process only; each worker keeps its own copy.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        stats: CacheStats | None = None,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = stats if stats is not None else CacheStats()
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.stats.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (self._clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def normalize_params(params: Mapping[str, Any]) -> tuple[tuple[str, Any], ...]:
+    """Canonical, hashable form of a filter mapping for use as a cache key.
+
+    Unset values are dropped, strings are trimmed and lower-cased, and
+    sequences are de-duplicated and sorted, so equivalent filters share a key.
+    """
+    normalized: list[tuple[str, Any]] = []
+    for name, value in params.items():
+        if value is None or value == "" or value == [] or value == ():
+            continue
+        if isinstance(value, str):
+            value = value.strip().lower()
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            value = tuple(sorted({str(item).strip() for item in value}))
+        normalized.append((name, value))
+    return tuple(sorted(normalized))
+
+
+# ---------------------------------------------------------------------------
+# Two-tier application cache
+# ---------------------------------------------------------------------------
+
+
+def _build_shared_tier() -> RedisTier | None:
+    if not settings.CACHE_REDIS_URL:
+        return None
+    client = RedisClient.from_url(
+        settings.CACHE_REDIS_URL,
+        timeout=settings.CACHE_REDIS_TIMEOUT_SECONDS,
+        max_connections=settings.CACHE_REDIS_MAX_CONNECTIONS,
+    )
+    return RedisTier(client, prefix=settings.CACHE_KEY_PREFIX)
+
+
+_shared_tier: RedisTier | None = _build_shared_tier()
+# Loop the shared tier's connections belong to; sync code schedules onto it.
+_shared_loop: asyncio.AbstractEventLoop | None = None
+_registry: dict[str, "AppCache"] = {}
+_background: set[asyncio.Task] = set()
+
+
+class AppCache:
+    """In-process LRU+TTL tier in front of the optional shared tier.
+
+    Committed writes to tables mapped to one of ``tags`` (see
+    :mod:`app.db.cache_tags`) clear the in-process tier and drop the shared
+    entries. Other workers' in-process copies age out within ``local_ttl``,
+    so keep it short for data that changes. Only JSON-native values reach
+    the shared tier, and cached values are shared between callers: treat
+    them as read-only.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        ttl: float = 60.0,
+        local_ttl: float | None = None,
+        maxsize: int = 1024,
+        tags: Iterable[str] = (),
+        shared: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.tags = tuple(tags)
+        self.shared = shared
+        self.stats = CacheStats()
+        self._local = TTLCache(
+            maxsize=maxsize,
+            ttl=local_ttl if local_ttl is not None else ttl,
+            clock=clock,
+            stats=self.stats,
+        )
+        self._version = 0
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        _registry[name] = self
+
+    def _tier(self) -> RedisTier | None:
+        global _shared_loop
+        if not self.shared or _shared_tier is None:
+            return None
+        _shared_loop = asyncio.get_running_loop()
+        return _shared_tier
+
+    def _shared_key(self, tier: RedisTier, key: Hashable) -> str:
+        return tier.key(self.name, hashlib.sha256(repr(key).encode()).hexdigest()[:32])
+
+    async def _lookup(self, key: Hashable) -> Any:
+        value = self._local.get(key, _MISSING)
+        tier = self._tier()
+        if value is not _MISSING or tier is None:
+            return value
+        try:
+            raw = await tier.get(self._shared_key(tier, key))
+        except Exception:
+            self.stats.shared_errors += 1
+            logger.debug("Shared cache read failed", extra={"cache": self.name}, exc_info=True)
+            return _MISSING
+        if raw is None:
+            return _MISSING
+        value = json.loads(raw)
+        self.stats.shared_hits += 1
+        self._local.set(key, value)
+        return value
+
+    async def get(self, key: Hashable, default: Any = None) -> Any:
+        if not settings.CACHE_ENABLED:
+            return default
+        value = await self._lookup(key)
+        return default if value is _MISSING else value
+
+    async def set(self, key: Hashable, value: Any, *, version: int | None = None) -> None:
+        """Store ``value`` in both tiers.
+
+        Skipped when ``version`` predates an invalidation: the value may
+        have been read before the write that invalidated it.
+        """
+        if not settings.CACHE_ENABLED or (version is not None and version != self._version):
+            return
+        self._local.set(key, value)
+        tier = self._tier()
+        if tier is None:
+            return
+        try:
+            payload = json.dumps(value, separators=(",", ":")).encode()
+            await tier.set(self._shared_key(tier, key), payload, self.ttl, self.tags)
+        except Exception:
+            self.stats.shared_errors += 1
+            logger.debug("Shared cache write failed", extra={"cache": self.name}, exc_info=True)
+
+    async def get_or_set(self, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+        """Cached value for ``key``, computing it once for concurrent callers."""
+        if not settings.CACHE_ENABLED:
+            return await compute()
+        value = await self._lookup(key)
+        if value is not _MISSING:
+            return value
+
+        flight = self._inflight.get(key)
+        if flight is not None:
+            return await asyncio.shield(flight)
+
+        flight = asyncio.get_running_loop().create_future()
+        self._inflight[key] = flight
+        version = self._version
+        try:
+            value = await compute()
+            await self.set(key, value, version=version)
+        except BaseException as exc:
+            flight.set_exception(exc)
+            # Followers re-raise it; don't warn when there were none.
+            flight.exception()
+            raise
+        else:
+            flight.set_result(value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    def get_or_set_sync(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """Synchronous variant; uses the in-process tier only."""
+        if not settings.CACHE_ENABLED:
+            return compute()
+        value = self._local.get(key, _MISSING)
+        if value is _MISSING:
+            version = self._version
+            value = compute()
+            if version == self._version:
+                self._local.set(key, value)
+        return value
+
+    def invalidate(self) -> None:
+        """Drop the in-process entries; shared entries are dropped by tag."""
+        self._version += 1
+        self._local.clear()
+        self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        self._local.clear()
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+
+def invalidate_tags(*tags: str) -> None:
+    """Invalidate every cache carrying one of ``tags``, in both tiers.
+
+    Callable from synchronous code (ORM events): shared-tier deletes are
+    scheduled on the event loop that owns the shared connections.
+    """
+    wanted = set(tags)
+    for cache in _registry.values():
+        if wanted.intersection(cache.tags):
+            cache.invalidate()
+
+    tier = _shared_tier
+    if tier is None or not wanted:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is not None:
+        task = loop.create_task(_invalidate_shared(tier, wanted))
+        _background.add(task)
+        task.add_done_callback(_background.discard)
+    elif _shared_loop is not None and _shared_loop.is_running():
+        asyncio.run_coroutine_threadsafe(_invalidate_shared(tier, wanted), _shared_loop)
+
+
+async def _invalidate_shared(tier: RedisTier, tags: set[str]) -> None:
+    try:
+        await tier.invalidate_tags(sorted(tags))
+    except Exception:
+        # Entries still expire on their TTL.
+        logger.warning("Shared cache invalidation failed", extra={"tags": sorted(tags)}, exc_info=True)
+
+
+def shared_tier() -> RedisTier | None:
+    """The configured shared tier, if any."""
+    return _shared_tier
+
+
+def configure_shared_tier(tier: RedisTier | None) -> None:
+    """Replace the shared tier (``None`` disables it)."""
+    global _shared_tier
+    _shared_tier = tier
+
+
+async def close_shared_tier() -> None:
+    if _shared_tier is not None:
+        await _shared_tier.close()
+
+
+def cache_metrics() -> dict[str, dict[str, float]]:
+    """Counters of every application cache, by name."""
+    return {name: cache.stats.snapshot() for name, cache in sorted(_registry.items())}
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Mapping):
+        return tuple(sorted((str(name), _freeze(item)) for name, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted((_freeze(item) for item in value), key=repr))
+    return value
+
+
+def cached(
+    cache: AppCache,
+    *,
+    ignore: Iterable[str] = ("db",),
+) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Memoize a service function in ``cache``.
+
+    The key is the function's qualified name and its bound arguments,
+    except those named in ``ignore`` (the session and other per-request
+    handles). Coroutine functions use both tiers and coalesce concurrent
+    misses; plain functions use the in-process tier.
+    """
+    skipped = frozenset(ignore)
+
+    def decorate(func: Callable[P, R]) -> Callable[P, R]:
+        signature = inspect.signature(func)
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        def key_for(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return (
+                name,
+                *((arg, _freeze(value)) for arg, value in bound.arguments.items() if arg not in skipped),
+            )
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+                return await cache.get_or_set(key_for(args, kwargs), lambda: func(*args, **kwargs))
+
+            wrapper: Any = async_wrapper
+        else:
+
+            @functools.wraps(func)
+            def sync_wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+                return cache.get_or_set_sync(key_for(args, kwargs), lambda: func(*args, **kwargs))
+
+            wrapper = sync_wrapper
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorate
@@ -62,6 +62,50 @@ class Settings(BaseSettings):
     GOOGLE_PROJECT_ID: str = ""
     IMAGEN_MODEL: str = "imagegeneration@006"
 
+    # ── AI planner ──────────────────────────────────────────────────────
+    # Brief fields parsed locally below this confidence are confirmed by the LLM.
+    PLANNER_EXTRACTION_MIN_CONFIDENCE: float = 0.8
+    # History sent with each turn; older turns are folded into a rolling summary.
+    PLANNER_HISTORY_TOKEN_BUDGET: int = 3000
+    PLANNER_SUMMARY_MAX_TOKENS: int = 400
+    # Venues/providers scored per plan; only the best go into the prompt.
+    PLANNER_CANDIDATE_LIMIT: int = 500
+    PLANNER_PROMPT_VENUES: int = 10
+    PLANNER_PROMPT_PROVIDERS: int = 20
+    # Share of the budget one venue / one provider is expected to take.
+    PLANNER_VENUE_BUDGET_SHARE: float = 0.35
+    PLANNER_PROVIDER_BUDGET_SHARE: float = 0.15
+    # Relative weights of the match criteria; criteria a brief gives no
+    # basis for (no dates, no location, ...) are left out.
+    PLANNER_WEIGHT_CAPACITY: float = 1.0
+    PLANNER_WEIGHT_PRICE: float = 1.0
+    PLANNER_WEIGHT_RATING: float = 0.75
+    PLANNER_WEIGHT_DISTANCE: float = 0.5
+    PLANNER_WEIGHT_AVAILABILITY: float = 1.0
+    PLANNER_WEIGHT_RELEVANCE: float = 1.0
+    # Plans are computed locally; the LLM only writes their title and summary.
+    PLANNER_PLAN_PROSE: bool = True
+    PLANNER_PROSE_MAX_TOKENS: int = 300
+
+    # ── Outbound HTTP (pooled clients per upstream) ─────────────────────
+    HTTP2_ENABLED: bool = True
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    LLM_TIMEOUT_SECONDS: float = 60.0
+    IMAGEN_TIMEOUT_SECONDS: float = 60.0
+    # Bulkheads: calls in flight per worker, callers allowed to wait for a slot.
+    LLM_MAX_IN_FLIGHT: int = 16
+    LLM_MAX_QUEUE: int = 32
+    IMAGEN_MAX_IN_FLIGHT: int = 4
+    IMAGEN_MAX_QUEUE: int = 8
+    LLM_RETRIES: int = 2  # extra attempts for idempotent completions
+    HTTP_RETRY_BASE_SECONDS: float = 0.25
+    HTTP_RETRY_MAX_SECONDS: float = 4.0
+    HTTP_BREAKER_FAILURE_THRESHOLD: int = 5
+    HTTP_BREAKER_RESET_SECONDS: float = 30.0
+
     # ── Sentry (monitoring) ──────────────────────────────────────────────
     SENTRY_DSN: str = ""
 
@@ -82,9 +126,67 @@ class Settings(BaseSettings):
     API_RATE_LIMIT_REQUESTS: int = 120
     API_RATE_LIMIT_WINDOW_SECONDS: int = 60
 
+    # ── Geo search ──────────────────────────────────────────────────────
+    GEO_DEFAULT_RADIUS_KM: float = 40.0
+    CITY_EXPANSION_RADIUS_KM: float = 25.0
+
+    # ── Marketplace ─────────────────────────────────────────────────────
+    MARKETPLACE_FACETS_CACHE_TTL_SECONDS: float = 30.0
+    MARKETPLACE_FACETS_CACHE_SIZE: int = 512
+
+    # ── Semantic retrieval (pgvector) ───────────────────────────────────
+    # HNSW candidates examined per search; raised automatically for larger pages.
+    VECTOR_EF_SEARCH: int = 100
+    # "pgvector", "numpy" (in-process index, for Postgres without the
+    # extension) or "auto" (pgvector when the database has the extension,
+    # checked at startup).
+    VECTOR_BACKEND: str = "auto"
+    # Memory-mapped index files, shared by the worker processes on a host.
+    VECTOR_INDEX_DIR: str = "/tmp/strathwell-vector-index"
+    VECTOR_INDEX_REFRESH_SECONDS: float = 30.0
+    # IVF partitioning above this many vectors (0 = always exact search).
+    VECTOR_INDEX_IVF_MIN_ROWS: int = 50000
+    VECTOR_INDEX_IVF_PROBES: int = 8
+
+    # ── Embedding ingestion worker ──────────────────────────────────────
+    # Rows read per batch; each batch commits together with its checkpoint.
+    EMBEDDING_BATCH_SIZE: int = 200
+    # Content types synced at once, and processes computing embeddings.
+    EMBEDDING_WORKER_CONCURRENCY: int = 2
+    EMBEDDING_WORKER_INTERVAL_SECONDS: float = 30.0
+    # Re-read window behind the checkpoint, for rows committed out of timestamp order.
+    EMBEDDING_OVERLAP_SECONDS: float = 60.0
+
+    # ── Response cache (anonymous browse endpoints) ─────────────────────
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0
+    RESPONSE_CACHE_STALE_SECONDS: float = 300.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2048
+    # How often a worker polls the shared tier for other workers' invalidations
+    RESPONSE_CACHE_SYNC_SECONDS: float = 1.0
+
+    # ── Application cache ───────────────────────────────────────────────
+    CACHE_ENABLED: bool = True
+    CACHE_REDIS_URL: str = ""  # shared tier, e.g. redis://cache:6379/0; empty = per-process only
+    CACHE_REDIS_TIMEOUT_SECONDS: float = 0.25
+    CACHE_REDIS_MAX_CONNECTIONS: int = 10
+    CACHE_KEY_PREFIX: str = "strathwell:cache"
+    CATALOG_CACHE_TTL_SECONDS: float = 300.0
+    VENDOR_CARDS_CACHE_TTL_SECONDS: float = 60.0
+
+    # ── LLM response cache ──────────────────────────────────────────────
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PERSIST: bool = True  # keep completions in Postgres across restarts and workers
+    LLM_CACHE_MAX_TEMPERATURE: float = 0.3  # hotter calls are never cached
+    LLM_CACHE_TTL_SECONDS: float = 86400.0
+    LLM_CACHE_MAX_ENTRIES: int = 1024
+
     # ── Gunicorn / runtime ──────────────────────────────────────────────
     GUNICORN_WORKERS: int = 4
     GUNICORN_TIMEOUT: int = 60
+    # Budget for outbound calls made while serving one request; clients may
+    # ask for less with an X-Request-Timeout header (seconds).
+    REQUEST_DEADLINE_SECONDS: float = 55.0
 
     # ── Misc ────────────────────────────────────────────────────────────
     ENVIRONMENT: str = "development"
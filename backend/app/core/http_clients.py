@@ -0,0 +1,194 @@
+"""Pooled outbound HTTP clients, one per upstream, kept for the app's lifetime.
+
+Reusing a client keeps connections (and their TLS sessions) alive between
+calls instead of handshaking on every request. Each upstream has its own
+connection limits and timeouts, and records request latency up to the
+response headers. HTTP/2 is used when the ``h2`` package is installed.
+
+Each upstream also has an :class:`~app.core.resilience.UpstreamGuard`
+(bulkhead, circuit breaker, retries) that callers wrap their requests in.
+"""
+
+import importlib.util
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from app.core.config import settings
+from app.core.resilience import UpstreamGuard
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class Upstream:
+    name: str
+    timeout: float  # read/write timeout; connect and pool waits use the shared setting
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 60.0
+    http2: bool = True
+    max_in_flight: int = 16  # below max_connections so callers queue in the bulkhead, not the pool
+    max_queue: int = 32
+    retries: int = 0  # extra attempts for idempotent calls
+    failure_threshold: int = 5
+    reset_seconds: float = 30.0
+
+    def client_timeout(self) -> httpx.Timeout:
+        return request_timeout(self.timeout)
+
+
+def request_timeout(seconds: float) -> httpx.Timeout:
+    """Read/write timeout of ``seconds``; connect and pool waits use the shared setting if shorter."""
+    wait = min(seconds, settings.HTTP_CONNECT_TIMEOUT_SECONDS)
+    return httpx.Timeout(seconds, connect=wait, pool=wait)
+
+
+@dataclass
+class UpstreamStats:
+    """Latency to response headers (seconds) and failures for one upstream."""
+
+    requests: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    recent: deque[float] = field(default_factory=lambda: deque(maxlen=512))
+
+    def record(self, seconds: float, failed: bool) -> None:
+        self.requests += 1
+        self.errors += int(failed)
+        self.total_seconds += seconds
+        self.recent.append(seconds)
+
+    def snapshot(self) -> dict[str, float]:
+        ordered = sorted(self.recent)
+
+        def quantile(q: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 4) if ordered else 0.0
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "mean_seconds": round(self.total_seconds / self.requests, 4) if self.requests else 0.0,
+            "p50_seconds": quantile(0.5),
+            "p95_seconds": quantile(0.95),
+        }
+
+
+class _MeasuredTransport(httpx.AsyncBaseTransport):
+    """Wrap a transport to time each request and count failures (5xx or raised)."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, stats: UpstreamStats) -> None:
+        self._transport = transport
+        self._stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception:
+            self._stats.record(time.perf_counter() - started, failed=True)
+            raise
+        self._stats.record(time.perf_counter() - started, failed=response.status_code >= 500)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class HTTPClientRegistry:
+    """Lazily built ``httpx.AsyncClient`` per registered upstream."""
+
+    def __init__(self, upstreams: list[Upstream] | None = None) -> None:
+        self._upstreams: dict[str, Upstream] = {}
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self.stats: dict[str, UpstreamStats] = {}
+        self.guards: dict[str, UpstreamGuard] = {}
+        for upstream in upstreams or []:
+            self.register(upstream)
+
+    def register(self, upstream: Upstream) -> None:
+        self._upstreams[upstream.name] = upstream
+        self.stats.setdefault(upstream.name, UpstreamStats())
+        self.guards[upstream.name] = UpstreamGuard(
+            upstream.name,
+            timeout=upstream.timeout,
+            max_in_flight=upstream.max_in_flight,
+            max_queue=upstream.max_queue,
+            retries=upstream.retries,
+            retry_base_seconds=settings.HTTP_RETRY_BASE_SECONDS,
+            retry_max_seconds=settings.HTTP_RETRY_MAX_SECONDS,
+            failure_threshold=upstream.failure_threshold,
+            reset_seconds=upstream.reset_seconds,
+        )
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._clients[name] = self._build(self._upstreams[name])
+        return client
+
+    def guard(self, name: str) -> UpstreamGuard:
+        return self.guards[name]
+
+    def _build(self, upstream: Upstream) -> httpx.AsyncClient:
+        http2 = upstream.http2 and settings.HTTP2_ENABLED
+        if http2 and not HTTP2_AVAILABLE:
+            logger.info("h2 is not installed; %s uses HTTP/1.1", upstream.name)
+            http2 = False
+        limits = httpx.Limits(
+            max_connections=upstream.max_connections,
+            max_keepalive_connections=upstream.max_keepalive_connections,
+            keepalive_expiry=upstream.keepalive_expiry,
+        )
+        transport = httpx.AsyncHTTPTransport(http2=http2, limits=limits)
+        return httpx.AsyncClient(
+            transport=_MeasuredTransport(transport, self.stats[upstream.name]),
+            timeout=upstream.client_timeout(),
+        )
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        return {
+            name: {**stats.snapshot(), "guard": self.guards[name].snapshot()}
+            for name, stats in sorted(self.stats.items())
+        }
+
+    async def aclose(self) -> None:
+        """Close every client; later calls to :meth:`get` open new ones."""
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
+
+
+http_clients = HTTPClientRegistry(
+    [
+        Upstream(
+            "nvidia",
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            max_in_flight=settings.LLM_MAX_IN_FLIGHT,
+            max_queue=settings.LLM_MAX_QUEUE,
+            retries=settings.LLM_RETRIES,
+            failure_threshold=settings.HTTP_BREAKER_FAILURE_THRESHOLD,
+            reset_seconds=settings.HTTP_BREAKER_RESET_SECONDS,
+        ),
+        Upstream(
+            "vertex",
+            timeout=settings.IMAGEN_TIMEOUT_SECONDS,
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            max_in_flight=settings.IMAGEN_MAX_IN_FLIGHT,
+            max_queue=settings.IMAGEN_MAX_QUEUE,
+            failure_threshold=settings.HTTP_BREAKER_FAILURE_THRESHOLD,
+            reset_seconds=settings.HTTP_BREAKER_RESET_SECONDS,
+        ),
+    ]
+)
@@ -0,0 +1,42 @@
+"""Per-request deadline for outbound calls.
+
+Outbound calls made while handling a request (see ``app.core.resilience``)
+cap their timeouts at whatever is left of this budget, so a slow upstream
+can't keep a request, and its worker connection, open indefinitely.
+"""
+
+import math
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.resilience import deadline
+
+TIMEOUT_HEADER = b"x-request-timeout"
+
+
+class DeadlineMiddleware:
+    """Run each HTTP request under ``default_seconds``, or less if the client asks."""
+
+    def __init__(self, app: ASGIApp, default_seconds: float) -> None:
+        self.app = app
+        self.default_seconds = default_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with deadline(self._budget(scope)):
+            await self.app(scope, receive, send)
+
+    def _budget(self, scope: Scope) -> float:
+        for name, value in scope["headers"]:
+            if name == TIMEOUT_HEADER:
+                try:
+                    requested = float(value)
+                except ValueError:
+                    break
+                if math.isfinite(requested) and requested > 0:
+                    return min(requested, self.default_seconds)
+                break
+        return self.default_seconds
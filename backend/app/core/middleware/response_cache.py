@@ -0,0 +1,199 @@
+"""Response caching middleware for anonymous, read-only browse endpoints.
+
+Only GET requests without an Authorization header are served from the
+shared cache, keyed by rule, path and normalized query string. Misses for
+the same key are coalesced into one downstream request; stale entries are
+served while a single background request refreshes them. With a shared cache
+tier, invalidations committed by other workers are picked up within
+``RESPONSE_CACHE_SYNC_SECONDS``.
+"""
+
+import asyncio
+import logging
+import re
+from collections.abc import Hashable
+from dataclasses import dataclass
+from urllib.parse import parse_qsl
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import cache as app_cache
+from app.core.config import settings
+from app.core.response_cache import CachedResponse, ResponseCache, response_cache
+
+logger = logging.getLogger(__name__)
+
+# Headers the middleware owns; never stored with a shared response.
+_OWNED_HEADERS = {b"cache-control", b"vary", b"age", b"x-cache"}
+
+
+@dataclass(frozen=True)
+class CacheRule:
+    name: str
+    path_pattern: str  # regular expression matched against the whole path
+    tags: tuple[str, ...]
+    ttl_seconds: float | None = None
+    stale_seconds: float | None = None
+
+    def matches(self, path: str) -> bool:
+        return re.fullmatch(self.path_pattern, path) is not None
+
+    @property
+    def ttl(self) -> float:
+        return self.ttl_seconds if self.ttl_seconds is not None else settings.RESPONSE_CACHE_TTL_SECONDS
+
+    @property
+    def stale(self) -> float:
+        return self.stale_seconds if self.stale_seconds is not None else settings.RESPONSE_CACHE_STALE_SECONDS
+
+
+def normalize_query(query_string: bytes) -> tuple[tuple[str, str], ...]:
+    """Canonical query: blank values dropped, values trimmed, pairs sorted."""
+    pairs = parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)
+    return tuple(sorted((name, value.strip()) for name, value in pairs if value.strip()))
+
+
+class ResponseCacheMiddleware:
+    """Serve matching anonymous GET requests from :class:`ResponseCache`."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rules: list[CacheRule] | None = None,
+        cache: ResponseCache | None = None,
+    ) -> None:
+        self.app = app
+        self.rules = rules or []
+        self.cache = cache if cache is not None else response_cache
+        self._revalidations: set[asyncio.Task] = set()
+        self._tags = sorted({tag for rule in self.rules for tag in rule.tags})
+        self._synced_at: float | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET" or not settings.RESPONSE_CACHE_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        rule = next((r for r in self.rules if r.matches(scope["path"])), None)
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        if "authorization" in Headers(scope=scope):
+            await self.app(scope, receive, _private(send))
+            return
+
+        await self._sync_shared()
+        key = (rule.name, scope["path"], normalize_query(scope.get("query_string", b"")))
+        entry = self.cache.get(key)
+        if entry is not None and entry.fresh_until > self.cache.now():
+            await self._replay(send, entry, rule, "HIT")
+            return
+        if entry is not None:
+            self._revalidate(scope, rule, key)
+            await self._replay(send, entry, rule, "STALE")
+            return
+
+        response = await self.cache.coalesce(
+            key, lambda versions: self._render(scope, rule, key, versions), rule.tags
+        )
+        await self._replay(send, response, rule, "MISS")
+
+    async def _sync_shared(self) -> None:
+        """Apply other workers' invalidations, at most once per sync interval."""
+        tier = app_cache.shared_tier()
+        now = self.cache.now()
+        if tier is None or (
+            self._synced_at is not None and now - self._synced_at < settings.RESPONSE_CACHE_SYNC_SECONDS
+        ):
+            return
+        self._synced_at = now
+        try:
+            generations = await tier.tag_generations(self._tags)
+        except Exception:
+            # Entries still expire on their TTL.
+            logger.debug("Response cache sync failed", exc_info=True)
+            return
+        self.cache.apply_generations(generations)
+
+    async def _render(
+        self,
+        scope: Scope,
+        rule: CacheRule,
+        key: Hashable,
+        tag_versions: dict[str, int],
+    ) -> CachedResponse:
+        """Run the downstream app once, buffer its response and cache a 200."""
+        status = 500
+        headers: list[tuple[bytes, bytes]] = []
+        body = bytearray()
+
+        # The render is shared by every coalesced caller, so it must not
+        # depend on (or stop with) the connection of whoever started it.
+        async def receive() -> Message:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def capture(message: Message) -> None:
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = [
+                    (name, value)
+                    for name, value in message.get("headers", [])
+                    if name.lower() not in _OWNED_HEADERS
+                ]
+            elif message["type"] == "http.response.body":
+                body.extend(message.get("body", b""))
+
+        await self.app(dict(scope), receive, capture)
+
+        response = CachedResponse(status, headers, bytes(body), frozenset(rule.tags))
+        sets_cookie = any(name.lower() == b"set-cookie" for name, _ in headers)
+        if status == 200 and not sets_cookie:
+            self.cache.set(key, response, rule.ttl, rule.stale, tag_versions)
+        return response
+
+    def _revalidate(self, scope: Scope, rule: CacheRule, key: Hashable) -> None:
+        if self.cache.is_inflight(key):
+            return
+        task = asyncio.create_task(
+            self.cache.coalesce(key, lambda versions: self._render(scope, rule, key, versions), rule.tags)
+        )
+        self._revalidations.add(task)
+        task.add_done_callback(self._revalidation_done)
+
+    def _revalidation_done(self, task: asyncio.Task) -> None:
+        self._revalidations.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            # The stale entry keeps being served until its window closes.
+            logger.warning("Response cache revalidation failed", exc_info=task.exception())
+
+    async def _replay(self, send: Send, response: CachedResponse, rule: CacheRule, outcome: str) -> None:
+        headers = MutableHeaders(raw=list(response.headers))
+        if response.status == 200:
+            headers["cache-control"] = (
+                f"public, max-age={int(rule.ttl)}, stale-while-revalidate={int(rule.stale)}"
+            )
+            if outcome != "MISS":
+                headers["age"] = str(max(0, int(self.cache.now() - response.stored_at)))
+        else:
+            headers["cache-control"] = "no-store"
+        headers["vary"] = "Authorization"
+        headers["x-cache"] = outcome
+
+        await send({"type": "http.response.start", "status": response.status, "headers": headers.raw})
+        await send({"type": "http.response.body", "body": response.body})
+
+
+def _private(send: Send) -> Send:
+    """Mark authenticated responses as per-user so shared caches skip them."""
+
+    async def wrapped(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(scope=message)
+            headers["cache-control"] = "private, no-store"
+            headers["vary"] = "Authorization"
+        await send(message)
+
+    return wrapped
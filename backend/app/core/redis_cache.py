@@ -0,0 +1,206 @@
+"""Shared cache tier over the Redis protocol (RESP2).
+
+A deliberately small client: the application cache needs GET, SET, DEL,
+SADD, SREM, SMEMBERS, EXPIRE, INCR and MGET, which lets the shared tier run against
+Redis, Valkey or KeyDB without another dependency. Errors and timeouts
+are raised to the caller, which falls back to its in-process tier.
+"""
+
+import asyncio
+from collections.abc import Iterable, Sequence
+from typing import Any
+from urllib.parse import unquote, urlparse
+
+
+_TAG_INDEX_TTL_SECONDS = 86400
+
+
+class RedisError(Exception):
+    """Error reply from the server or a broken connection."""
+
+
+def _encode(args: Iterable[Any]) -> bytes:
+    parts: list[bytes] = []
+    items = [arg if isinstance(arg, bytes) else str(arg).encode() for arg in args]
+    parts.append(b"*%d\r\n" % len(items))
+    for item in items:
+        parts.append(b"$%d\r\n%s\r\n" % (len(item), item))
+    return b"".join(parts)
+
+
+async def _read_reply(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise RedisError("Connection closed by server")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode()
+    if kind == b"-":
+        # Returned, not raised, so the rest of a pipeline is still read.
+        return RedisError(payload.decode())
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        count = int(payload)
+        if count < 0:
+            return None
+        return [await _read_reply(reader) for _ in range(count)]
+    raise RedisError(f"Unexpected reply type: {line!r}")
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    async def call(self, *commands: tuple[Any, ...]) -> list[Any]:
+        """Send ``commands`` in one pipeline and read every reply."""
+        self.writer.write(b"".join(_encode(command) for command in commands))
+        await self.writer.drain()
+        replies = [await _read_reply(self.reader) for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class RedisClient:
+    """Pooled RESP client; connections open lazily and are dropped on error."""
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        *,
+        db: int = 0,
+        password: str | None = None,
+        timeout: float = 0.25,
+        max_connections: int = 10,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._idle: list[_Connection] = []
+        self._slots = asyncio.Semaphore(max_connections)
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "RedisClient":
+        """Build a client from ``redis://[:password@]host[:port][/db]``."""
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"Unsupported cache URL scheme: {parsed.scheme!r}")
+        db = parsed.path.lstrip("/")
+        return cls(
+            parsed.hostname or "localhost",
+            parsed.port or 6379,
+            db=int(db) if db else 0,
+            password=unquote(parsed.password) if parsed.password else None,
+            **kwargs,
+        )
+
+    async def _connect(self) -> _Connection:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        connection = _Connection(reader, writer)
+        setup: list[tuple[Any, ...]] = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            try:
+                await connection.call(*setup)
+            except BaseException:
+                connection.close()
+                raise
+        return connection
+
+    async def pipeline(self, *commands: tuple[Any, ...]) -> list[Any]:
+        """Run ``commands`` on one connection and return their replies in order."""
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else None
+            try:
+                async with asyncio.timeout(self.timeout):
+                    if connection is None:
+                        connection = await self._connect()
+                    replies = await connection.call(*commands)
+            except BaseException:
+                if connection is not None:
+                    connection.close()
+                raise
+            self._idle.append(connection)
+            return replies
+
+    async def execute(self, *args: Any) -> Any:
+        return (await self.pipeline(args))[0]
+
+    async def close(self) -> None:
+        while self._idle:
+            self._idle.pop().close()
+
+
+class RedisTier:
+    """Shared cache tier storing encoded values with a tag index per tag.
+
+    Each tag is a set of the keys stored under it, so invalidating a tag
+    deletes exactly the entries written with it, from every process. Each
+    tag also has an invalidation counter, for processes that keep their own
+    copies (the response cache) to poll.
+    """
+
+    def __init__(self, client: RedisClient, prefix: str = "cache") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    def _generation_key(self, tag: str) -> str:
+        return f"{self.prefix}:gen:{tag}"
+
+    def key(self, namespace: str, digest: str) -> str:
+        return f"{self.prefix}:{namespace}:{digest}"
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.client.execute("GET", key)
+
+    async def set(self, key: str, value: bytes, ttl: float, tags: Iterable[str] = ()) -> None:
+        ttl_ms = max(1, int(ttl * 1000))
+        commands: list[tuple[Any, ...]] = [("SET", key, value, "PX", ttl_ms)]
+        for tag in tags:
+            commands.append(("SADD", self._tag_key(tag), key))
+            # Indexes idle for a day are dropped; expired members are harmless.
+            commands.append(("EXPIRE", self._tag_key(tag), max(_TAG_INDEX_TTL_SECONDS, int(ttl) + 1)))
+        await self.client.pipeline(*commands)
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        tags = list(tags)
+        for tag in tags:
+            members = await self.client.execute("SMEMBERS", self._tag_key(tag))
+            if members:
+                # SREM only what was deleted: keys added meanwhile stay indexed.
+                await self.client.pipeline(
+                    ("DEL", *members), ("SREM", self._tag_key(tag), *members)
+                )
+        if tags:
+            await self.client.pipeline(*(("INCR", self._generation_key(tag)) for tag in tags))
+
+    async def tag_generations(self, tags: Sequence[str]) -> dict[str, int]:
+        """Invalidation counter of each tag (0 if never invalidated)."""
+        if not tags:
+            return {}
+        values = await self.client.execute("MGET", *(self._generation_key(tag) for tag in tags))
+        return {tag: int(value) if value is not None else 0 for tag, value in zip(tags, values)}
+
+    async def close(self) -> None:
+        await self.client.close()
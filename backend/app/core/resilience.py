@@ -0,0 +1,298 @@
+"""Failure isolation for outbound calls: bulkheads, circuit breakers, retries, deadlines.
+
+Each upstream gets an :class:`UpstreamGuard` that caps how many calls are in
+flight, queues a bounded number of callers behind them, stops calling an
+upstream that keeps failing, and retries idempotent calls with jittered
+backoff. Timeouts are capped by the deadline of the HTTP request being
+served, so a slow upstream costs its own callers time rather than every
+worker connection.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Statuses that mean "try again later" rather than "this request is wrong".
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class UpstreamUnavailableError(Exception):
+    """A call was refused before it could get an answer from the upstream."""
+
+
+class BulkheadFullError(UpstreamUnavailableError):
+    pass
+
+
+class CircuitOpenError(UpstreamUnavailableError):
+    pass
+
+
+class DeadlineExceededError(UpstreamUnavailableError):
+    pass
+
+
+# ---------------------------------------------------------------------------
+# Deadlines
+# ---------------------------------------------------------------------------
+
+_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Bound everything awaited inside the block to ``seconds`` from now.
+
+    Nested deadlines never extend an outer one.
+    """
+    at = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(at if outer is None else min(at, outer))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_remaining() -> float | None:
+    """Seconds left before the current deadline, or None when there is none."""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+# ---------------------------------------------------------------------------
+# Bulkhead
+# ---------------------------------------------------------------------------
+
+
+class Bulkhead:
+    """At most ``max_in_flight`` concurrent calls, with ``max_queue`` callers waiting."""
+
+    def __init__(self, max_in_flight: int, max_queue: int) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+
+    @asynccontextmanager
+    async def slot(self, wait: float | None) -> AsyncIterator[None]:
+        """Hold a slot for the block; give up after waiting ``wait`` seconds."""
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise BulkheadFullError(f"{self.in_flight} calls in flight and {self.waiting} waiting")
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), wait)
+            except TimeoutError:
+                self.rejected += 1
+                raise BulkheadFullError(f"no slot free within {wait:.2f}s") from None
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+
+# ---------------------------------------------------------------------------
+# Circuit breaker
+# ---------------------------------------------------------------------------
+
+
+class CircuitBreaker:
+    """Open after ``failure_threshold`` consecutive failures; probe again after ``reset_seconds``.
+
+    While open every call is refused. Once the cool-down passes a single
+    probe call is let through (half-open): success closes the circuit,
+    failure opens it for another cool-down.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.short_circuited = 0
+        self._clock = clock
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> None:
+        """Raise :class:`CircuitOpenError` unless a call may go through now."""
+        state = self.state
+        if state == "open" or (state == "half_open" and self._probing):
+            self.short_circuited += 1
+            raise CircuitOpenError(f"circuit open after {self.failures} consecutive failures")
+        if state == "half_open":
+            self._probing = True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or (self._opened_at is None and self.failures >= self.failure_threshold):
+            logger.warning("Circuit for %s opened after %d consecutive failures", self.name, self.failures)
+            self._opened_at = self._clock()
+        self._probing = False
+
+    def release(self) -> None:
+        """End a call that said nothing about the upstream's health."""
+        self._probing = False
+
+
+# ---------------------------------------------------------------------------
+# Guard
+# ---------------------------------------------------------------------------
+
+
+def backoff_delays(attempts: int, base: float, cap: float) -> Iterator[float]:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**n))."""
+    for n in range(attempts):
+        yield random.uniform(0, min(cap, base * 2**n))
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """Whether ``exc`` says the upstream is unhealthy (worth a retry and a breaker strike)."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUSES
+    return isinstance(exc, httpx.TransportError)
+
+
+class UpstreamGuard:
+    """Bulkhead, circuit breaker, retries and deadline-capped timeouts for one upstream."""
+
+    def __init__(
+        self,
+        name: str,
+        timeout: float,
+        max_in_flight: int,
+        max_queue: int,
+        retries: int = 0,
+        retry_base_seconds: float = 0.25,
+        retry_max_seconds: float = 4.0,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+    ) -> None:
+        self.name = name
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.bulkhead = Bulkhead(max_in_flight, max_queue)
+        self.breaker = CircuitBreaker(name, failure_threshold, reset_seconds)
+        self.retried = 0
+        self.deadline_exceeded = 0
+
+    def attempt_timeout(self) -> float:
+        """The upstream timeout, cut short by the request deadline if that comes first."""
+        remaining = time_remaining()
+        if remaining is None:
+            return self.timeout
+        if remaining <= 0:
+            self.deadline_exceeded += 1
+            raise DeadlineExceededError(f"request deadline passed before calling {self.name}")
+        return min(self.timeout, remaining)
+
+    @asynccontextmanager
+    async def attempt(self) -> AsyncIterator[float]:
+        """One guarded call; yields the timeout to send it with.
+
+        Exceptions raised inside the block decide the breaker's view of the
+        upstream: transport errors and retryable statuses count as failures,
+        anything else the upstream answered counts as success.
+        """
+        self.breaker.before_call()
+        recorded = False
+        try:
+            async with self.bulkhead.slot(wait=self.attempt_timeout()):
+                timeout = self.attempt_timeout()
+                try:
+                    yield timeout
+                except httpx.TimeoutException as exc:
+                    if timeout < self.timeout:
+                        self.deadline_exceeded += 1
+                        raise DeadlineExceededError(f"{self.name} did not answer before the request deadline") from exc
+                    raise
+        except Exception as exc:
+            if is_upstream_failure(exc):
+                self.breaker.record_failure()
+                recorded = True
+            elif isinstance(exc, httpx.HTTPStatusError):
+                self.breaker.record_success()
+                recorded = True
+            raise
+        else:
+            self.breaker.record_success()
+            recorded = True
+        finally:
+            if not recorded:
+                self.breaker.release()
+
+    async def call(self, send: Callable[[float], Awaitable[T]], *, idempotent: bool) -> T:
+        """Run ``send(timeout)`` under :meth:`attempt`, retrying idempotent calls.
+
+        ``send`` should raise for error statuses (``raise_for_status``) so
+        they can be told apart from successes.
+        """
+        delays = backoff_delays(self.retries if idempotent else 0, self.retry_base_seconds, self.retry_max_seconds)
+        while True:
+            try:
+                async with self.attempt() as timeout:
+                    return await send(timeout)
+            except Exception as exc:
+                if not is_upstream_failure(exc):
+                    raise
+                delay = next(delays, None)
+                remaining = time_remaining()
+                if delay is None or (remaining is not None and remaining <= delay):
+                    raise
+                logger.info("Retrying %s in %.2fs after %r", self.name, delay, exc)
+                self.retried += 1
+            await asyncio.sleep(delay)
+
+    def snapshot(self) -> dict[str, float | str]:
+        return {
+            "state": self.breaker.state,
+            "in_flight": self.bulkhead.in_flight,
+            "waiting": self.bulkhead.waiting,
+            "rejected": self.bulkhead.rejected,
+            "short_circuited": self.breaker.short_circuited,
+            "retried": self.retried,
+            "deadline_exceeded": self.deadline_exceeded,
+        }
@@ -0,0 +1,161 @@
+"""In-process HTTP response cache with request coalescing and tag invalidation.
+
+Entries are fresh for a TTL, then servable as stale for a further window
+while one background request revalidates them. Concurrent misses for the
+same key share a single computation. Tags let writes drop every cached
+response derived from the data they changed.
+
+Entries live in one process. Writes committed in other processes reach it
+through the shared tier's per-tag invalidation counters, which the
+middleware polls (see :meth:`ResponseCache.apply_generations`); without a
+shared tier, other workers' writes only show once entries expire.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+@dataclass
+class CachedResponse:
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    tags: frozenset[str] = frozenset()
+    stored_at: float = 0.0
+    fresh_until: float = 0.0
+    stale_until: float = 0.0
+
+
+@dataclass
+class _Flight:
+    future: asyncio.Future
+    tag_versions: dict[str, int] = field(default_factory=dict)
+
+
+class ResponseCache:
+    """Bounded LRU of rendered responses, shared by every request in the process."""
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        self._inflight: dict[Hashable, _Flight] = {}
+        self._tag_versions: dict[str, int] = {}
+        self._generations: dict[str, int] = {}
+
+    def now(self) -> float:
+        return self._clock()
+
+    def get(self, key: Hashable) -> CachedResponse | None:
+        """Fresh or stale entry for ``key``; None once past its stale window."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.stale_until <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(
+        self,
+        key: Hashable,
+        response: CachedResponse,
+        ttl: float,
+        stale: float,
+        tag_versions: dict[str, int] | None = None,
+    ) -> bool:
+        """Store ``response``; skipped when one of its tags was invalidated
+        after ``tag_versions`` was taken (the response may predate the write).
+        """
+        if tag_versions is not None and any(
+            self._tag_versions.get(tag, 0) != version for tag, version in tag_versions.items()
+        ):
+            return False
+        now = self._clock()
+        response.stored_at = now
+        response.fresh_until = now + ttl
+        response.stale_until = now + ttl + stale
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return True
+
+    def tag_versions(self, tags: Iterable[str]) -> dict[str, int]:
+        return {tag: self._tag_versions.get(tag, 0) for tag in tags}
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """Drop every entry carrying any of ``tags``; returns how many were dropped."""
+        wanted = set(tags)
+        for tag in wanted:
+            self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+        stale_keys = [key for key, entry in self._entries.items() if entry.tags & wanted]
+        for key in stale_keys:
+            del self._entries[key]
+        return len(stale_keys)
+
+    def apply_generations(self, generations: Mapping[str, int]) -> None:
+        """Invalidate the tags whose shared invalidation counter moved.
+
+        ``generations`` are read from the shared tier; a tag seen for the
+        first time is invalidated too, since entries may predate the reading.
+        """
+        changed = {tag for tag, generation in generations.items() if self._generations.get(tag) != generation}
+        self._generations.update(generations)
+        if changed:
+            self.invalidate_tags(*changed)
+
+    def is_inflight(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    async def coalesce(
+        self,
+        key: Hashable,
+        compute: Callable[[dict[str, int]], Awaitable[T]],
+        tags: Iterable[str] = (),
+    ) -> T:
+        """Run ``compute`` once per key at a time; concurrent callers share its result.
+
+        ``compute`` receives the tag versions taken before it started, to pass
+        back to :meth:`set`.
+        """
+        flight = self._inflight.get(key)
+        if flight is not None:
+            return await asyncio.shield(flight.future)
+
+        flight = _Flight(asyncio.get_running_loop().create_future(), self.tag_versions(tags))
+        self._inflight[key] = flight
+        try:
+            result = await compute(flight.tag_versions)
+        except BaseException as exc:
+            flight.future.set_exception(exc)
+            # Followers re-raise it; don't warn when there were none.
+            flight.future.exception()
+            raise
+        else:
+            flight.future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+response_cache = ResponseCache(maxsize=settings.RESPONSE_CACHE_MAX_ENTRIES)
@@ -0,0 +1,62 @@
+"""Cache tag invalidation driven by ORM commits.
+
+Each flush records which cache tags the changed rows affect; once the
+transaction commits, those tags are invalidated in the response cache and
+the application caches. Rolled-back changes invalidate nothing.
+"""
+
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core import cache
+from app.core.response_cache import response_cache
+
+# Table name -> cache tags of the responses built from it.
+TABLE_TAGS: dict[str, tuple[str, ...]] = {
+    "venues": ("vendors",),
+    "service_providers": ("vendors",),
+    "service_provider_services": ("vendors",),
+    "services": ("vendors", "services"),
+    "reviews": ("vendors",),
+    "vendors": ("vendors",),
+    "venue_profiles": ("vendors",),
+    "service_profiles": ("vendors",),
+    "availability": ("vendors",),
+    "availability_bitmaps": ("vendors",),
+    "marketplace_listings": ("vendors",),
+    "review_stats": ("vendors",),
+    "templates": ("templates",),
+}
+
+_PENDING_KEY = "cache_tags"
+
+
+def tags_for(instances: Any) -> set[str]:
+    """Cache tags affected by a collection of ORM instances."""
+    tags: set[str] = set()
+    for instance in instances:
+        table = getattr(instance, "__tablename__", None)
+        tags.update(TABLE_TAGS.get(table, ()))
+    return tags
+
+
+@event.listens_for(Session, "after_flush")
+def _record_tags(session: Session, _flush_context: Any) -> None:
+    tags = tags_for([*session.new, *session.dirty, *session.deleted])
+    if tags:
+        session.info.setdefault(_PENDING_KEY, set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_tags(session: Session) -> None:
+    tags = session.info.pop(_PENDING_KEY, None)
+    if tags:
+        response_cache.invalidate_tags(*tags)
+        cache.invalidate_tags(*tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_tags(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
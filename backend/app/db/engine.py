@@ -5,6 +5,7 @@ from collections.abc import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.config import settings
+from app.db import cache_tags  # noqa: F401  (commit-time cache invalidation hooks)
 
 engine = create_async_engine(
     settings.DATABASE_URL,
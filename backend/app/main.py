@@ -1,6 +1,8 @@
 """FastAPI application factory — wires all routers, CORS, and health check."""
 
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -17,10 +19,16 @@ from app.api.routes.plans import router as plans_router
 from app.api.routes.subscriptions import router as subscriptions_router
 from app.api.routes.templates import router as templates_router
 from app.api.routes.webhooks import router as webhooks_router
+from app.core.cache import close_shared_tier
 from app.core.config import settings
+from app.core.http_clients import http_clients
 from app.core.logging_config import setup_logging
+from app.core.middleware.deadline import DeadlineMiddleware
 from app.core.middleware.rate_limit import RateLimitMiddleware, RateLimitRule
+from app.core.middleware.response_cache import CacheRule, ResponseCacheMiddleware
 from app.core.request_logging import RequestLoggingMiddleware
+from app.db.engine import async_session_factory
+from app.services import vector_index
 
 # Import all models so they are registered with Base.metadata
 import app.models  # noqa: F401
@@ -68,6 +76,18 @@ from app.models.extra import (
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    try:
+        async with async_session_factory() as db:
+            await vector_index.detect_backend(db)
+    except Exception:
+        logger.warning("Could not check the database for pgvector; assuming it is installed", exc_info=True)
+    yield
+    await http_clients.aclose()
+    await close_shared_tier()
+
+
 def create_app() -> FastAPI:
     setup_logging()
 
@@ -77,6 +97,22 @@ def create_app() -> FastAPI:
         docs_url="/api/docs",
         redoc_url="/api/redoc",
         openapi_url="/api/openapi.json",
+        lifespan=lifespan,
+    )
+    app.add_middleware(DeadlineMiddleware, default_seconds=settings.REQUEST_DEADLINE_SECONDS)
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        rules=[
+            CacheRule(name="marketplace", path_pattern=r"/api/marketplace/(venues|services)", tags=("vendors",)),
+            CacheRule(
+                name="marketplace-describe",
+                path_pattern=r"/api/marketplace/(venues|services)/describe",
+                tags=("vendors",),
+            ),
+            CacheRule(name="templates-popular", path_pattern=r"/api/templates/popular", tags=("templates",)),
+            CacheRule(name="templates-by-type", path_pattern=r"/api/templates/by-type/[^/]+", tags=("templates",)),
+            CacheRule(name="vendors-public", path_pattern=r"/vendors/public", tags=("vendors",)),
+        ],
     )
     app.add_middleware(RequestLoggingMiddleware)
     app.add_middleware(
@@ -178,6 +214,12 @@ def create_app() -> FastAPI:
         # without exposing password_hash, otp_code, etc.
     ]
 
+    # Read-mostly catalogs whose lookups go through the application cache.
+    cached_entities: dict[str, tuple[str, ...]] = {
+        "services": ("services",),
+        "templates": ("templates",),
+    }
+
     for model, resource, auth, owner in core_entities:
         app.include_router(
             create_crud_router(
@@ -185,6 +227,7 @@ def create_app() -> FastAPI:
                 resource=resource,
                 require_auth=auth,
                 owner_field=owner,
+                cache_tags=cached_entities.get(resource, ()),
             )
         )
 
@@ -2,12 +2,19 @@
 
 # Core domain models
 from app.models.availability import Availability  # noqa: F401
+from app.models.availability_bitmap import AvailabilityBitmap  # noqa: F401
 from app.models.audit_log import AuditLog  # noqa: F401
 from app.models.chat import ChatGroup, ChatMessage  # noqa: F401
+from app.models.city_centroid import CityCentroid  # noqa: F401
 from app.models.document import Document  # noqa: F401
+from app.models.embedding_checkpoint import EmbeddingCheckpoint  # noqa: F401
 from app.models.event import Event, EventService  # noqa: F401
+from app.models.llm_cache_entry import LLMCacheEntry  # noqa: F401
+from app.models.marketplace_listing import MarketplaceListing  # noqa: F401
 from app.models.payment import Payment  # noqa: F401
+from app.models.planner_message import PlannerMessage  # noqa: F401
 from app.models.review import Review  # noqa: F401
+from app.models.review_stats import ReviewStats  # noqa: F401
 from app.models.service import Service  # noqa: F401
 from app.models.service_provider import ServiceProvider, ServiceProviderService  # noqa: F401
 from app.models.subscription import Subscription  # noqa: F401
@@ -0,0 +1,97 @@
+"""Availability bitmaps — one compact per-year "blocked days" bit string per entity.
+
+Bit ``n`` (0 = Jan 1) is set when the entity is marked unavailable on that
+day of the year. Rows are kept in step with `availability` by ORM flush hooks,
+so date filters become a single bitwise test instead of a per-date lookup.
+Entities with no row for a year are free on every day of it.
+"""
+
+import uuid
+from datetime import date
+
+from sqlalchemy import Integer, String, cast, event, func, inspect, literal
+from sqlalchemy.dialects.postgresql import BIT, UUID, insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.availability import Availability
+
+DAYS_PER_BITMAP = 366
+
+
+def empty_bitmap() -> object:
+    """SQL for an all-free year."""
+    return cast(func.repeat("0", DAYS_PER_BITMAP), BIT(DAYS_PER_BITMAP))
+
+
+class AvailabilityBitmap(Base):
+    __tablename__ = "availability_bitmaps"
+
+    entity_type: Mapped[str] = mapped_column(String(50), primary_key=True)
+    entity_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    year: Mapped[int] = mapped_column(Integer, primary_key=True)
+    blocked: Mapped[str] = mapped_column(BIT(DAYS_PER_BITMAP), nullable=False)
+
+
+def day_of_year(day: date) -> int:
+    """0-based bit index of ``day`` within its year's bitmap."""
+    return day.timetuple().tm_yday - 1
+
+
+def apply_blocked_day(
+    connection: Connection,
+    entity_type: str | None,
+    entity_id: uuid.UUID | None,
+    day: date | None,
+    blocked: bool,
+) -> None:
+    """Set or clear one day's bit for an entity, creating the year row if needed."""
+    if not entity_type or entity_id is None or day is None:
+        return
+
+    table = AvailabilityBitmap.__table__
+    bit_index = day_of_year(day)
+    value = 1 if blocked else 0
+    stmt = insert(table).values(
+        entity_type=entity_type,
+        entity_id=entity_id,
+        year=day.year,
+        blocked=func.set_bit(empty_bitmap(), bit_index, value),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.entity_type, table.c.entity_id, table.c.year],
+        set_={"blocked": func.set_bit(table.c.blocked, literal(bit_index), literal(value))},
+    )
+    connection.execute(stmt)
+
+
+def _previous(row: Availability, attr: str):
+    history = inspect(row).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(row, attr)
+
+
+def _is_blocked(is_available: bool | None) -> bool:
+    # is_available defaults to true, so only an explicit False blocks the day.
+    return is_available is False
+
+
+@event.listens_for(Availability, "after_insert")
+def _availability_inserted(_mapper, connection: Connection, row: Availability) -> None:
+    apply_blocked_day(connection, row.entity_type, row.entity_id, row.date, _is_blocked(row.is_available))
+
+
+@event.listens_for(Availability, "after_update")
+def _availability_updated(_mapper, connection: Connection, row: Availability) -> None:
+    old_key = (_previous(row, "entity_type"), _previous(row, "entity_id"), _previous(row, "date"))
+    new_key = (row.entity_type, row.entity_id, row.date)
+    if old_key != new_key:
+        apply_blocked_day(connection, *old_key, False)
+    apply_blocked_day(connection, *new_key, _is_blocked(row.is_available))
+
+
+@event.listens_for(Availability, "after_delete")
+def _availability_deleted(_mapper, connection: Connection, row: Availability) -> None:
+    apply_blocked_day(connection, row.entity_type, row.entity_id, row.date, False)
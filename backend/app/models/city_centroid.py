@@ -0,0 +1,37 @@
+"""City centroid model — reference coordinates for US cities and suburbs.
+
+Used to expand a text city filter to nearby cities and to place listings
+that only carry a city name on the map for radius search.
+"""
+
+from typing import Any
+
+from sqlalchemy import Index, Numeric, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base, UUIDPrimaryKeyMixin
+
+
+class CityCentroid(Base, UUIDPrimaryKeyMixin):
+    __tablename__ = "city_centroids"
+    __table_args__ = (Index("ix_city_centroids_lat_lng", "lat", "lng"),)
+
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    state: Mapped[str] = mapped_column(String(2), nullable=False)
+    lat: Mapped[float] = mapped_column(Numeric(10, 8), nullable=False)
+    lng: Mapped[float] = mapped_column(Numeric(11, 8), nullable=False)
+
+
+# City names are matched case-insensitively; the same name can exist in
+# several states (Portland OR/ME), once per state.
+Index("uq_city_centroids_lower_name_state", func.lower(CityCentroid.name), CityCentroid.state, unique=True)
+
+
+def city_name_sql(city_column: Any) -> Any:
+    """Lower-cased name part of a stored "Name" or "Name, ST" city."""
+    return func.lower(func.btrim(func.split_part(city_column, ",", 1)))
+
+
+def city_state_sql(city_column: Any) -> Any:
+    """Upper-cased state part of a stored city; '' when none was stored."""
+    return func.upper(func.btrim(func.split_part(city_column, ",", 2)))
@@ -0,0 +1,22 @@
+"""Embedding checkpoints — how far embedding ingestion has got per content type."""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class EmbeddingCheckpoint(Base):
+    __tablename__ = "embedding_checkpoints"
+
+    content_type: Mapped[str] = mapped_column(String(50), primary_key=True)
+    # Keyset position of the last row ingested: its change timestamp, then its id.
+    watermark: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
@@ -7,7 +7,7 @@ Some entities have a `user_id` FK for ownership; others are public/anonymous.
 import uuid
 from typing import Any
 
-from sqlalchemy import ForeignKey, String, text
+from sqlalchemy import ForeignKey, Index, String, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -64,6 +64,16 @@ class Plan(_ExtraWithUser):
 
 class Conversation(_ExtraWithUser):
     __tablename__ = "conversations"
+    __table_args__ = (
+        # Planner session listing: newest first per user, keyset-paginated.
+        Index(
+            "ix_conversations_planner_sessions",
+            "user_id",
+            "updated_at",
+            "id",
+            postgresql_where=text("data->>'_type' = 'planner_session'"),
+        ),
+    )
 
 
 class ConversationParticipant(_ExtraWithUser):
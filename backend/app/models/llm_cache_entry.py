@@ -0,0 +1,21 @@
+"""LLM cache entries — persisted completions of deterministic LLM calls."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class LLMCacheEntry(Base):
+    __tablename__ = "llm_cache_entries"
+    __table_args__ = (Index("ix_llm_cache_entries_expires_at", "expires_at"),)
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)  # sha256 of the normalized request
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    response: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
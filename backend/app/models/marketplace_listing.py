@@ -0,0 +1,389 @@
+"""Marketplace listings — denormalized browse rows for approved venues and providers.
+
+One row per approved venue or service provider, holding the card payload,
+typed filter columns (city, coordinates, capacity, price bounds, amenities,
+service categories), rating aggregates and a full-text search document.
+Rows are rebuilt from the source tables by ORM flush hooks whenever a
+venue, provider, offered service, service or review changes, so
+/api/marketplace/* reads a single table.
+"""
+
+import uuid
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import (
+    JSON,
+    DateTime,
+    Index,
+    Integer,
+    Numeric,
+    Select,
+    String,
+    Text,
+    cast,
+    delete,
+    event,
+    exists,
+    func,
+    inspect,
+    literal,
+    literal_column,
+    select,
+    text,
+    true,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR, UUID, aggregate_order_by, insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.city_centroid import CityCentroid, city_name_sql, city_state_sql
+from app.models.review import Review
+from app.models.review_stats import ReviewStats
+from app.models.service import Service
+from app.models.service_provider import ServiceProvider, ServiceProviderService
+from app.models.venue import Venue
+
+LISTING_TYPES = ("venue", "service_provider")
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+
+
+class MarketplaceListing(Base):
+    __tablename__ = "marketplace_listings"
+    __table_args__ = (
+        Index("ix_marketplace_listings_type_created", "listing_type", "created_at"),
+        Index("ix_marketplace_listings_type_rating", "listing_type", "avg_rating"),
+        Index("ix_marketplace_listings_type_lat_lng", "listing_type", "lat", "lng"),
+        Index("ix_marketplace_listings_amenities", "amenities", postgresql_using="gin"),
+        Index("ix_marketplace_listings_categories", "categories", postgresql_using="gin"),
+        Index("ix_marketplace_listings_search", "search_document", postgresql_using="gin"),
+        # Embedding ingestion scans listings changed since its checkpoint.
+        Index("ix_marketplace_listings_type_refreshed", "listing_type", "refreshed_at", "entity_id"),
+    )
+
+    listing_type: Mapped[str] = mapped_column(String(50), primary_key=True)  # 'venue' or 'service_provider'
+    entity_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    city: Mapped[str] = mapped_column(String(100), nullable=False, default="")
+    # Own coordinates, else the city's centroid
+    lat: Mapped[float | None] = mapped_column(Numeric(10, 8))
+    lng: Mapped[float | None] = mapped_column(Numeric(11, 8))
+    capacity: Mapped[int | None] = mapped_column(Integer)
+    venue_type: Mapped[str | None] = mapped_column(String(100))
+    price_min: Mapped[float | None] = mapped_column(Numeric(12, 2))
+    price_max: Mapped[float | None] = mapped_column(Numeric(12, 2))
+    amenities: Mapped[list] = mapped_column(JSONB, nullable=False, server_default="'[]'")
+    categories: Mapped[list[str]] = mapped_column(ARRAY(Text), nullable=False, server_default="'{}'")
+    avg_rating: Mapped[float | None] = mapped_column(Numeric(3, 2))
+    review_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    search_document: Mapped[Any] = mapped_column(TSVECTOR, nullable=False)
+    card: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=text("now()"), nullable=False
+    )
+
+
+# Browse filters: city + type + price range on one listing type.
+Index(
+    "ix_marketplace_listings_type_city_price",
+    MarketplaceListing.listing_type,
+    city_name_sql(MarketplaceListing.city),
+    MarketplaceListing.venue_type,
+    MarketplaceListing.price_min,
+)
+
+
+# ---------------------------------------------------------------------------
+# Source queries
+# ---------------------------------------------------------------------------
+
+
+def _rating_join(reviewee_type: str, reviewee_id: Any) -> Any:
+    return (ReviewStats.reviewee_type == reviewee_type) & (ReviewStats.reviewee_id == reviewee_id)
+
+
+def _document(weighted: Iterable[tuple[Any, str]]) -> Any:
+    """``tsvector`` concatenating each text with its weight (A = most important)."""
+    parts = [
+        func.setweight(func.to_tsvector(SEARCH_CONFIG, func.coalesce(value, "")), literal_column(f"'{weight}'"))
+        for value, weight in weighted
+    ]
+    document = parts[0]
+    for part in parts[1:]:
+        document = document.op("||")(part)
+    return document
+
+
+def _city_centroid(city: Any, name: str) -> Any:
+    """LATERAL centroid (lat, lng) of a stored city, "Name" or "Name, ST".
+
+    Without a state, same-named cities in several states resolve to the
+    first state alphabetically, so a listing's position is stable.
+    """
+    state = city_state_sql(city)
+    return (
+        select(CityCentroid.lat, CityCentroid.lng)
+        .where(
+            func.lower(CityCentroid.name) == city_name_sql(city),
+            (state == "") | (CityCentroid.state == state),
+        )
+        .order_by(CityCentroid.state, CityCentroid.id)
+        .limit(1)
+        .lateral(name)
+    )
+
+
+def venue_listing_source(entity_ids: Any) -> Select:
+    """Listing rows for the approved venues among ``entity_ids``."""
+    venue_city = _city_centroid(Venue.location_city, "venue_city")
+    amenities = func.coalesce(
+        func.jsonb_path_query_array(Venue.amenities, literal_column("'$[*] ? (@.type() == \"string\")'")),
+        literal_column("'[]'::jsonb"),
+    )
+    card = func.jsonb_build_object(
+        "id", cast(Venue.id, Text),
+        "name", Venue.name,
+        "description", Venue.description,
+        "city", Venue.location_city,
+        "address", Venue.location_address,
+        "capacity", Venue.capacity,
+        "amenities", amenities,
+        "photos", func.to_jsonb(Venue.photos),
+        "pricing_structure", Venue.pricing_structure,
+        "venue_type", Venue.venue_type,
+        "price_from", Venue.price_from,
+    )
+    return (
+        select(
+            literal("venue").label("listing_type"),
+            Venue.id.label("entity_id"),
+            Venue.name,
+            Venue.location_city.label("city"),
+            func.coalesce(Venue.location_lat, venue_city.c.lat).label("lat"),
+            func.coalesce(Venue.location_lng, venue_city.c.lng).label("lng"),
+            Venue.capacity,
+            Venue.venue_type,
+            Venue.price_from.label("price_min"),
+            Venue.price_from.label("price_max"),
+            amenities.label("amenities"),
+            literal_column("'{}'::text[]").label("categories"),
+            ReviewStats.avg_rating,
+            func.coalesce(ReviewStats.review_count, 0).label("review_count"),
+            _document(
+                [
+                    (Venue.name, "A"),
+                    (func.concat_ws(" ", Venue.venue_type, Venue.location_city), "B"),
+                    (cast(amenities, Text), "C"),
+                    (Venue.description, "D"),
+                ]
+            ).label("search_document"),
+            card.label("card"),
+            Venue.created_at,
+            func.now().label("refreshed_at"),
+        )
+        .select_from(Venue)
+        .outerjoin(venue_city, true())
+        .outerjoin(ReviewStats, _rating_join("venue", Venue.id))
+        .where(Venue.status == "approved", Venue.id.in_(entity_ids))
+    )
+
+
+def provider_listing_source(entity_ids: Any) -> Select:
+    """Listing rows for the approved service providers among ``entity_ids``."""
+    provider_city = _city_centroid(ServiceProvider.location_city, "provider_city")
+    categories = (
+        select(
+            func.coalesce(
+                func.array_agg(func.lower(Service.category).distinct()),
+                literal_column("'{}'::text[]"),
+            )
+        )
+        .select_from(ServiceProviderService)
+        .join(Service, Service.id == ServiceProviderService.service_id)
+        .where(
+            ServiceProviderService.service_provider_id == ServiceProvider.id,
+            Service.category.is_not(None),
+        )
+        .correlate(ServiceProvider)
+        .scalar_subquery()
+    )
+    service_names = (
+        select(func.string_agg(Service.name, " "))
+        .select_from(ServiceProviderService)
+        .join(Service, Service.id == ServiceProviderService.service_id)
+        .where(ServiceProviderService.service_provider_id == ServiceProvider.id)
+        .correlate(ServiceProvider)
+        .scalar_subquery()
+    )
+    card = func.jsonb_build_object(
+        "id", cast(ServiceProvider.id, Text),
+        "business_name", ServiceProvider.business_name,
+        "description", ServiceProvider.description,
+        "city", ServiceProvider.location_city,
+        "service_area", func.to_jsonb(func.coalesce(ServiceProvider.service_area, literal_column("'{}'::text[]"))),
+        "photos", func.to_jsonb(ServiceProvider.photos),
+        "services", _offered_services_json(),
+        "price_min", ServiceProvider.price_min,
+        "price_max", ServiceProvider.price_max,
+    )
+    return (
+        select(
+            literal("service_provider").label("listing_type"),
+            ServiceProvider.id.label("entity_id"),
+            ServiceProvider.business_name.label("name"),
+            ServiceProvider.location_city.label("city"),
+            provider_city.c.lat,
+            provider_city.c.lng,
+            literal(None, Integer).label("capacity"),
+            literal(None, String).label("venue_type"),
+            ServiceProvider.price_min,
+            ServiceProvider.price_max,
+            literal_column("'[]'::jsonb").label("amenities"),
+            categories.label("categories"),
+            ReviewStats.avg_rating,
+            func.coalesce(ReviewStats.review_count, 0).label("review_count"),
+            _document(
+                [
+                    (ServiceProvider.business_name, "A"),
+                    (func.concat_ws(" ", func.array_to_string(categories, " "), service_names), "B"),
+                    (ServiceProvider.location_city, "C"),
+                    (ServiceProvider.description, "D"),
+                ]
+            ).label("search_document"),
+            card.label("card"),
+            ServiceProvider.created_at,
+            func.now().label("refreshed_at"),
+        )
+        .select_from(ServiceProvider)
+        .outerjoin(provider_city, true())
+        .outerjoin(ReviewStats, _rating_join("service_provider", ServiceProvider.id))
+        .where(ServiceProvider.status == "approved", ServiceProvider.id.in_(entity_ids))
+    )
+
+
+def _offered_services_json() -> Any:
+    """Correlated ``jsonb_agg`` of the provider's services, ``[]`` when none."""
+    service_json = func.jsonb_build_object(
+        "id", ServiceProviderService.service_id,
+        "price_range", ServiceProviderService.price_range,
+        "name", Service.name,
+        "category", Service.category,
+    )
+    return (
+        select(
+            func.coalesce(
+                func.jsonb_agg(aggregate_order_by(service_json, Service.name)),
+                literal_column("'[]'::jsonb"),
+                type_=JSON,
+            )
+        )
+        .select_from(ServiceProviderService)
+        .outerjoin(Service, Service.id == ServiceProviderService.service_id)
+        .where(ServiceProviderService.service_provider_id == ServiceProvider.id)
+        .correlate(ServiceProvider)
+        .scalar_subquery()
+    )
+
+
+_SOURCES = {
+    "venue": (Venue, venue_listing_source),
+    "service_provider": (ServiceProvider, provider_listing_source),
+}
+
+
+# ---------------------------------------------------------------------------
+# Refresh
+# ---------------------------------------------------------------------------
+
+
+def refresh_listings(connection: Connection, listing_type: str | None, entity_ids: Any) -> None:
+    """Rebuild the listings for ``entity_ids`` (a list or an id subquery).
+
+    Approved entities are upserted from their source rows; listings whose
+    entity is gone or no longer approved are removed.
+    """
+    if listing_type not in _SOURCES:
+        return
+    if isinstance(entity_ids, (list, tuple, set)):
+        entity_ids = [entity_id for entity_id in entity_ids if entity_id is not None]
+        if not entity_ids:
+            return
+
+    model, source = _SOURCES[listing_type]
+    table = MarketplaceListing.__table__
+    source_query = source(entity_ids)
+    columns = [column.name for column in source_query.selected_columns]
+
+    stmt = insert(table).from_select(columns, source_query)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.listing_type, table.c.entity_id],
+        set_={name: stmt.excluded[name] for name in columns if name not in ("listing_type", "entity_id")},
+    )
+    connection.execute(stmt)
+
+    connection.execute(
+        delete(table).where(
+            table.c.listing_type == listing_type,
+            table.c.entity_id.in_(entity_ids),
+            ~exists().where(model.id == table.c.entity_id, model.status == "approved"),
+        )
+    )
+
+
+def _previous(row: Any, attr: str):
+    history = inspect(row).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(row, attr)
+
+
+def _providers_offering(service_id: Any) -> Select:
+    return select(ServiceProviderService.service_provider_id).where(
+        ServiceProviderService.service_id == service_id
+    )
+
+
+# ---------------------------------------------------------------------------
+# Write hooks
+# ---------------------------------------------------------------------------
+
+
+@event.listens_for(Venue, "after_insert")
+@event.listens_for(Venue, "after_update")
+@event.listens_for(Venue, "after_delete")
+def _venue_changed(_mapper, connection: Connection, venue: Venue) -> None:
+    refresh_listings(connection, "venue", [venue.id])
+
+
+@event.listens_for(ServiceProvider, "after_insert")
+@event.listens_for(ServiceProvider, "after_update")
+@event.listens_for(ServiceProvider, "after_delete")
+def _provider_changed(_mapper, connection: Connection, provider: ServiceProvider) -> None:
+    refresh_listings(connection, "service_provider", [provider.id])
+
+
+@event.listens_for(ServiceProviderService, "after_insert")
+@event.listens_for(ServiceProviderService, "after_update")
+@event.listens_for(ServiceProviderService, "after_delete")
+def _offered_service_changed(_mapper, connection: Connection, offered: ServiceProviderService) -> None:
+    provider_ids = {_previous(offered, "service_provider_id"), offered.service_provider_id}
+    refresh_listings(connection, "service_provider", list(provider_ids))
+
+
+@event.listens_for(Service, "after_update")
+def _service_changed(_mapper, connection: Connection, service: Service) -> None:
+    refresh_listings(connection, "service_provider", _providers_offering(service.id))
+
+
+# Registered after the review_stats hooks, so ratings are already updated.
+@event.listens_for(Review, "after_insert")
+@event.listens_for(Review, "after_update")
+@event.listens_for(Review, "after_delete")
+def _review_changed(_mapper, connection: Connection, review: Review) -> None:
+    old_key = (_previous(review, "reviewee_type"), _previous(review, "reviewee_id"))
+    new_key = (review.reviewee_type, review.reviewee_id)
+    for reviewee_type, reviewee_id in {old_key, new_key}:
+        refresh_listings(connection, reviewee_type, [reviewee_id])
@@ -0,0 +1,64 @@
+"""Planner messages — append-only turns of a planner session.
+
+The session itself stays a small header in `conversations.data`; each turn
+adds rows here instead of rewriting the whole message history in JSONB.
+"""
+
+import uuid
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class PlannerMessage(Base):
+    __tablename__ = "planner_messages"
+
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("conversations.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True)
+    message_id: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    role: Mapped[str] = mapped_column(String(20), nullable=False)
+    text: Mapped[str] = mapped_column(Text, nullable=False, server_default="")
+    status: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    @classmethod
+    def from_message(cls, session_id: uuid.UUID, seq: int, message: dict[str, Any]) -> "PlannerMessage":
+        """Row for a frontend ChatMessage dict ({id, role, text, createdAt, status?})."""
+        created_ms = message.get("createdAt")
+        return cls(
+            session_id=session_id,
+            seq=seq,
+            message_id=message.get("id"),
+            role=message.get("role", "user"),
+            text=message.get("text", ""),
+            status=message.get("status"),
+            created_at=(
+                datetime.fromtimestamp(created_ms / 1000, tz=timezone.utc)
+                if isinstance(created_ms, (int, float))
+                else datetime.now(timezone.utc)
+            ),
+        )
+
+    def to_message(self) -> dict[str, Any]:
+        message: dict[str, Any] = {
+            "id": self.message_id,
+            "role": self.role,
+            "text": self.text,
+            "createdAt": int(self.created_at.timestamp() * 1000),
+        }
+        if self.status is not None:
+            message["status"] = self.status
+        return message
@@ -0,0 +1,133 @@
+"""Review statistics — per-reviewee rating aggregates kept in step with `reviews`.
+
+Rows are adjusted incrementally by ORM flush hooks on `Review`, so browse
+endpoints can join ratings in SQL instead of aggregating per result row.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import (
+    DateTime,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    cast,
+    event,
+    func,
+    inspect,
+    text,
+    update,
+)
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.review import Review
+
+
+class ReviewStats(Base):
+    __tablename__ = "review_stats"
+    __table_args__ = (
+        Index("ix_review_stats_type_avg_rating", "reviewee_type", "avg_rating"),
+    )
+
+    reviewee_type: Mapped[str] = mapped_column(String(50), primary_key=True)
+    reviewee_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    review_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    avg_rating: Mapped[float | None] = mapped_column(Numeric(3, 2))
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=text("now()"), nullable=False
+    )
+
+
+def _average(rating_sum, review_count):
+    return func.round(cast(rating_sum, Numeric) / func.nullif(review_count, 0), 2)
+
+
+def apply_review_delta(
+    connection: Connection,
+    reviewee_type: str | None,
+    reviewee_id: uuid.UUID | None,
+    count_delta: int,
+    sum_delta: int,
+) -> None:
+    """Shift the aggregate for one reviewee by the given count/sum deltas."""
+    if not reviewee_type or reviewee_id is None:
+        # Untyped reviews can't be joined to a venue or provider; don't track them.
+        return
+
+    table = ReviewStats.__table__
+    if count_delta > 0:
+        stmt = insert(table).values(
+            reviewee_type=reviewee_type,
+            reviewee_id=reviewee_id,
+            review_count=count_delta,
+            rating_sum=sum_delta,
+            avg_rating=_average(sum_delta, count_delta),
+        )
+        new_count = table.c.review_count + stmt.excluded.review_count
+        new_sum = table.c.rating_sum + stmt.excluded.rating_sum
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.reviewee_type, table.c.reviewee_id],
+            set_={
+                "review_count": new_count,
+                "rating_sum": new_sum,
+                "avg_rating": _average(new_sum, new_count),
+                "updated_at": func.now(),
+            },
+        )
+    else:
+        new_count = table.c.review_count + count_delta
+        new_sum = table.c.rating_sum + sum_delta
+        stmt = (
+            update(table)
+            .where(
+                table.c.reviewee_type == reviewee_type,
+                table.c.reviewee_id == reviewee_id,
+            )
+            .values(
+                review_count=new_count,
+                rating_sum=new_sum,
+                avg_rating=_average(new_sum, new_count),
+                updated_at=func.now(),
+            )
+        )
+    connection.execute(stmt)
+
+
+def _previous(review: Review, attr: str):
+    history = inspect(review).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(review, attr)
+
+
+@event.listens_for(Review, "after_insert")
+def _review_inserted(_mapper, connection: Connection, review: Review) -> None:
+    apply_review_delta(connection, review.reviewee_type, review.reviewee_id, 1, review.rating)
+
+
+@event.listens_for(Review, "after_update")
+def _review_updated(_mapper, connection: Connection, review: Review) -> None:
+    old_type = _previous(review, "reviewee_type")
+    old_id = _previous(review, "reviewee_id")
+    old_rating = _previous(review, "rating")
+
+    if (old_type, old_id) == (review.reviewee_type, review.reviewee_id):
+        if old_rating != review.rating:
+            apply_review_delta(
+                connection, review.reviewee_type, review.reviewee_id, 0, review.rating - old_rating
+            )
+        return
+
+    apply_review_delta(connection, old_type, old_id, -1, -old_rating)
+    apply_review_delta(connection, review.reviewee_type, review.reviewee_id, 1, review.rating)
+
+
+@event.listens_for(Review, "after_delete")
+def _review_deleted(_mapper, connection: Connection, review: Review) -> None:
+    apply_review_delta(connection, review.reviewee_type, review.reviewee_id, -1, -review.rating)
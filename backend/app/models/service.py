@@ -1,6 +1,6 @@
 """Service catalog model."""
 
-from sqlalchemy import String, Text
+from sqlalchemy import Index, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base, UUIDPrimaryKeyMixin
@@ -12,3 +12,7 @@ class Service(Base, UUIDPrimaryKeyMixin):
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     category: Mapped[str | None] = mapped_column(String(100))
     description: Mapped[str | None] = mapped_column(Text)
+
+
+# Category browse filters on lower(category).
+Index("ix_services_lower_category", func.lower(Service.category))
@@ -2,15 +2,18 @@
 
 import uuid
 
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import Computed, ForeignKey, Index, Numeric, String, Text
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
+from app.models.venue import json_number
 
 
 class ServiceProvider(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     __tablename__ = "service_providers"
+    # Fetch generated price columns via RETURNING so they are never lazy-loaded
+    __mapper_args__ = {"eager_defaults": True}
 
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
@@ -26,6 +29,14 @@ class ServiceProvider(Base, UUIDPrimaryKeyMixin, TimestampMixin):
         String(50), default="pending", server_default="pending", index=True
     )
 
+    # Typed price bounds generated from pricing_structure (read-only)
+    price_min: Mapped[float | None] = mapped_column(
+        Numeric(12, 2), Computed(json_number("pricing_structure", "min_price"), persisted=True)
+    )
+    price_max: Mapped[float | None] = mapped_column(
+        Numeric(12, 2), Computed(json_number("pricing_structure", "max_price"), persisted=True)
+    )
+
     # Relationships
     user = relationship("User", back_populates="service_provider_profile")
     offered_services = relationship("ServiceProviderService", back_populates="provider", lazy="selectin")
@@ -35,6 +46,9 @@ class ServiceProviderService(Base, UUIDPrimaryKeyMixin):
     """Junction table: which services a provider offers, with pricing."""
 
     __tablename__ = "service_provider_services"
+    __table_args__ = (
+        Index("ix_service_provider_services_provider_service", "service_provider_id", "service_id"),
+    )
 
     service_provider_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("service_providers.id", ondelete="CASCADE"), nullable=False
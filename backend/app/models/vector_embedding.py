@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, String, text
+from sqlalchemy import DateTime, Index, LargeBinary, String, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -21,13 +21,35 @@ except ImportError:
 
 class VectorEmbedding(Base, UUIDPrimaryKeyMixin):
     __tablename__ = "vector_embeddings"
+    __table_args__ = (
+        UniqueConstraint("content_type", "content_id", name="uq_vector_embeddings_content"),
+        # The in-process index refreshes from rows updated since its watermark.
+        Index("ix_vector_embeddings_type_updated", "content_type", "updated_at", "content_id"),
+    )
 
     content_type: Mapped[str | None] = mapped_column(String(50))  # venue, service, template, provider
     content_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
     # embedding column: 1536 dimensions (adjustable per model)
     if HAS_PGVECTOR:
         embedding = mapped_column(Vector(1536))
+    # Little-endian float32 copy for the in-process index, written instead of
+    # `embedding` when pgvector is unavailable (see app.services.vector_index).
+    packed_embedding: Mapped[bytes | None] = mapped_column(LargeBinary)
     metadata_: Mapped[dict | None] = mapped_column("metadata", JSONB)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=text("now()"), nullable=False
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=text("now()"), nullable=False
+    )
+
+
+if HAS_PGVECTOR:
+    # Approximate nearest neighbours by cosine distance (``<=>``).
+    Index(
+        "ix_vector_embeddings_embedding_hnsw",
+        VectorEmbedding.embedding,
+        postgresql_using="hnsw",
+        postgresql_with={"m": 16, "ef_construction": 64},
+        postgresql_ops={"embedding": "vector_cosine_ops"},
+    )
@@ -2,15 +2,39 @@
 
 import uuid
 
-from sqlalchemy import Boolean, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import Boolean, Computed, ForeignKey, Integer, Numeric, String, Text
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
 
 
+def json_number(column: str, key: str) -> str:
+    """SQL for a numeric JSONB member, NULL when missing or not a number."""
+    return (
+        f"CASE WHEN jsonb_typeof({column} -> '{key}') = 'number' "
+        f"THEN ({column} ->> '{key}')::numeric END"
+    )
+
+
+# An hourly rate is compared with daily and flat prices as a day of this many
+# hours, so price_from is always in one unit.
+BILLABLE_HOURS_PER_DAY = 8
+
+
+def daily_price() -> str:
+    """SQL for a venue's price per event day from its pricing_structure."""
+    hourly = json_number("pricing_structure", "per_hour")
+    return (
+        f"COALESCE({json_number('pricing_structure', 'base_price')}, "
+        f"{json_number('pricing_structure', 'per_day')}, ({hourly}) * {BILLABLE_HOURS_PER_DAY})"
+    )
+
+
 class Venue(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     __tablename__ = "venues"
+    # Fetch generated price columns via RETURNING so they are never lazy-loaded
+    __mapper_args__ = {"eager_defaults": True}
 
     owner_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
@@ -31,5 +55,24 @@ class Venue(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     )
     photos: Mapped[list[str]] = mapped_column(ARRAY(Text), nullable=False, server_default="'{}'", default=list)
 
+    # Typed browse attributes generated from pricing_structure (read-only)
+    price_per_hour: Mapped[float | None] = mapped_column(
+        Numeric(12, 2), Computed(json_number("pricing_structure", "per_hour"), persisted=True)
+    )
+    price_per_day: Mapped[float | None] = mapped_column(
+        Numeric(12, 2), Computed(json_number("pricing_structure", "per_day"), persisted=True)
+    )
+    # Flat or daily price; hourly rates are scaled to a day (see daily_price)
+    price_from: Mapped[float | None] = mapped_column(Numeric(12, 2), Computed(daily_price(), persisted=True))
+    venue_type: Mapped[str | None] = mapped_column(
+        String(100),
+        Computed(
+            "lower(NULLIF(btrim(COALESCE(pricing_structure ->> 'venue_type', "
+            "pricing_structure ->> 'type')), ''))",
+            persisted=True,
+        ),
+    )
+
     # Relationships
     owner = relationship("User", back_populates="venues")
+
@@ -0,0 +1,163 @@
+"""Availability service — date filters backed by per-year availability bitmaps.
+
+Handles:
+- Parsing `available_on` / `available_between` request values into dates
+- Building "free on any / all of these dates" SQL predicates as one bitwise
+  test per requested year against `availability_bitmaps`
+- Counting how many requested days an entity has blocked, for ranking
+- Single-date availability checks used when booking, against the
+  authoritative `availability` rows rather than the derived bitmaps
+"""
+
+import logging
+import uuid
+from datetime import date, timedelta
+from typing import Any, Literal
+
+from sqlalchemy import Integer, String, and_, case, cast, exists, func, literal, not_, or_, select, true
+from sqlalchemy.dialects.postgresql import BIT
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.availability import Availability
+from app.models.availability_bitmap import (
+    DAYS_PER_BITMAP,
+    AvailabilityBitmap,
+    day_of_year,
+    empty_bitmap,
+)
+from app.utils.exceptions import BadRequestError
+
+logger = logging.getLogger(__name__)
+
+MAX_REQUESTED_DAYS = 366
+
+# Whether any or all of the requested dates must be free.
+MatchMode = Literal["any", "all"]
+
+
+# ---------------------------------------------------------------------------
+# Request parsing
+# ---------------------------------------------------------------------------
+
+
+def parse_dates(value: str | None) -> list[date]:
+    """Parse a comma-separated list of ISO dates (``2026-11-07,2026-11-14``)."""
+    if not value:
+        return []
+    try:
+        return sorted({date.fromisoformat(part.strip()) for part in value.split(",") if part.strip()})
+    except ValueError:
+        raise BadRequestError("Dates must be ISO formatted (YYYY-MM-DD)")
+
+
+def parse_date_range(value: str | None) -> list[date]:
+    """Expand an inclusive ``start,end`` ISO date range into its days."""
+    if not value:
+        return []
+    parts = value.split(",")
+    bounds = parse_dates(parts[0]) + parse_dates(parts[-1]) if len(parts) == 2 else []
+    if len(bounds) != 2:
+        raise BadRequestError("available_between must be 'start,end'")
+    start, end = sorted(bounds)
+    days = (end - start).days + 1
+    if days > MAX_REQUESTED_DAYS:
+        raise BadRequestError(f"Date ranges are limited to {MAX_REQUESTED_DAYS} days")
+    return [start + timedelta(days=offset) for offset in range(days)]
+
+
+def requested_dates(available_on: str | None, available_between: str | None) -> list[date] | None:
+    """Union of the dates named by ``available_on`` and ``available_between``."""
+    days = sorted(set(parse_dates(available_on)) | set(parse_date_range(available_between)))
+    if len(days) > MAX_REQUESTED_DAYS:
+        raise BadRequestError(f"At most {MAX_REQUESTED_DAYS} dates can be requested")
+    return days or None
+
+
+# ---------------------------------------------------------------------------
+# Bitmap predicates
+# ---------------------------------------------------------------------------
+
+
+def year_masks(days: list[date]) -> dict[int, str]:
+    """Bit-string masks (``'0101…'``) of the requested days, per year."""
+    masks: dict[int, list[str]] = {}
+    for day in days:
+        bits = masks.setdefault(day.year, ["0"] * DAYS_PER_BITMAP)
+        bits[day_of_year(day)] = "1"
+    return {year: "".join(bits) for year, bits in masks.items()}
+
+
+def availability_filter(
+    entity_type: str,
+    entity_id: Any,
+    days: list[date],
+    match: MatchMode = "any",
+) -> Any:
+    """Predicate: the entity is free on any (or all) of ``days``.
+
+    ``any`` keeps entities with at least one requested day unblocked;
+    ``all`` requires every requested day to be unblocked.
+    """
+    per_year = []
+    for year, mask in year_masks(days).items():
+        mask_bits = cast(literal(mask, String), BIT(DAYS_PER_BITMAP))
+        overlap = AvailabilityBitmap.blocked.op("&")(mask_bits)
+        # "any": excluded only when every requested day is blocked.
+        # "all": excluded when any requested day is blocked.
+        conflict = overlap == mask_bits if match == "any" else overlap != empty_bitmap()
+        per_year.append(
+            not_(
+                exists().where(
+                    AvailabilityBitmap.entity_type == entity_type,
+                    AvailabilityBitmap.entity_id == entity_id,
+                    AvailabilityBitmap.year == year,
+                    conflict,
+                )
+            )
+        )
+    if not per_year:
+        return true()
+    return or_(*per_year) if match == "any" else and_(*per_year)
+
+
+def blocked_day_count(entity_type: str, entity_id: Any, days: list[date]) -> Any:
+    """Scalar subquery: how many of ``days`` the entity has blocked (0 without bitmaps)."""
+    masks = year_masks(days)
+    mask_bits = case(
+        {year: cast(literal(mask, String), BIT(DAYS_PER_BITMAP)) for year, mask in masks.items()},
+        value=AvailabilityBitmap.year,
+    )
+    blocked = func.bit_count(AvailabilityBitmap.blocked.op("&")(mask_bits))
+    return (
+        select(cast(func.coalesce(func.sum(blocked), 0), Integer))
+        .where(
+            AvailabilityBitmap.entity_type == entity_type,
+            AvailabilityBitmap.entity_id == entity_id,
+            AvailabilityBitmap.year.in_(list(masks)),
+        )
+        .scalar_subquery()
+    )
+
+
+async def is_available(
+    db: AsyncSession,
+    entity_type: str,
+    entity_id: uuid.UUID,
+    day: date,
+) -> bool:
+    """Whether the entity is free on ``day`` (no row means free).
+
+    Reads the `availability` row itself, not the bitmap derived from it, and
+    locks it until the transaction ends so the day can't be blocked while a
+    booking based on this answer is written.
+    """
+    result = await db.execute(
+        select(Availability.is_available)
+        .where(
+            Availability.entity_type == entity_type,
+            Availability.entity_id == entity_id,
+            Availability.date == day,
+        )
+        .with_for_update()
+    )
+    return result.scalar_one_or_none() is not False
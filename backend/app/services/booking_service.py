@@ -15,12 +15,12 @@ from typing import Any
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.availability import Availability
 from app.models.chat import ChatGroup
 from app.models.event import Event, EventService
 from app.models.service_provider import ServiceProvider
 from app.models.user import User
 from app.models.venue import Venue
+from app.services import availability_service
 from app.services.email_service import send_booking_notification
 
 logger = logging.getLogger(__name__)
@@ -84,16 +84,8 @@ async def book_venue(
     if venue is None:
         return {"success": False, "error": "Venue not found or not approved"}
 
-    # Check availability
-    avail_result = await db.execute(
-        select(Availability).where(
-            Availability.entity_type == "venue",
-            Availability.entity_id == venue_id,
-            Availability.date == event.event_date,
-        )
-    )
-    avail = avail_result.scalar_one_or_none()
-    if avail and not avail.is_available:
+    # Check availability (locks the day's availability row until commit)
+    if not await availability_service.is_available(db, "venue", venue_id, event.event_date):
         return {"success": False, "error": "Venue not available on this date"}
 
     # Update event with venue
@@ -0,0 +1,704 @@
+"""Brief extractor — deterministic parsing of planner brief fields from chat text.
+
+Handles:
+- Guest counts and budgets (digits, "20k", "$1.5M", "fifty", ranges)
+- US cities from a static gazetteer, with aliases and an optional state suffix
+- Event types from a keyword lexicon
+- Date expressions (ISO and US dates, month names, day ranges, weekdays,
+  "next month", seasons)
+
+Every match carries a confidence in [0, 1] and whether the matched text
+names its field ("150 guests") or only implies it ("for 150"); only the
+former may replace a value the brief already has. Words the parser could not
+account for are reported as well, so the planner can tell "nothing else was
+said" apart from "something was said that we didn't understand".
+
+Dates resolve to the brief's dateRange formats: an ISO date, "start to end"
+ISO dates, or free text such as "May 2027" / "Summer 2027" when no specific
+day was named.
+"""
+
+import re
+from dataclasses import dataclass, field, replace
+from datetime import date, timedelta
+from typing import Any
+
+# Confidence levels shared by the parsers below.
+CERTAIN = 0.95
+LIKELY = 0.85
+PLAUSIBLE = 0.7
+WEAK = 0.5
+
+
+@dataclass(frozen=True)
+class FieldMatch:
+    value: Any
+    confidence: float
+    start: int
+    end: int
+    explicit: bool = True  # the matched text names the field, not just a bare value
+
+
+@dataclass
+class BriefExtraction:
+    """Fields found in one message plus the words left unexplained."""
+
+    fields: dict[str, FieldMatch] = field(default_factory=dict)
+    unparsed: list[str] = field(default_factory=list)
+
+    def resolved(self, min_confidence: float, current: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Confidently matched values; one set in ``current`` is replaced only by an explicit match."""
+        current = current or {}
+        return {
+            name: match.value
+            for name, match in self.fields.items()
+            if match.confidence >= min_confidence and (match.explicit or current.get(name) is None)
+        }
+
+
+def extract_brief(text: str, today: date | None = None) -> BriefExtraction:
+    """Parse eventType, guestCount, budget, city and dateRange out of ``text``."""
+    parser = _Parser(text, today or date.today())
+    return parser.run()
+
+
+# ---------------------------------------------------------------------------
+# Lexicons
+# ---------------------------------------------------------------------------
+
+# (name, state) — the city_centroids seed plus other common event destinations.
+US_CITIES: tuple[tuple[str, str], ...] = (
+    ("Albany", "NY"), ("Albuquerque", "NM"), ("Alexandria", "VA"), ("Anaheim", "CA"),
+    ("Anchorage", "AK"), ("Ann Arbor", "MI"), ("Arlington", "TX"), ("Asheville", "NC"),
+    ("Aspen", "CO"), ("Atlanta", "GA"), ("Aurora", "CO"), ("Austin", "TX"),
+    ("Bakersfield", "CA"), ("Baltimore", "MD"), ("Baton Rouge", "LA"), ("Beaverton", "OR"),
+    ("Bellevue", "WA"), ("Berkeley", "CA"), ("Bethesda", "MD"), ("Beverly Hills", "CA"),
+    ("Birmingham", "AL"), ("Boise", "ID"), ("Boston", "MA"), ("Boulder", "CO"),
+    ("Bronx", "NY"), ("Brookline", "MA"), ("Brooklyn", "NY"), ("Buffalo", "NY"),
+    ("Burbank", "CA"), ("Cambridge", "MA"), ("Camden", "NJ"), ("Cedar Park", "TX"),
+    ("Charleston", "SC"), ("Charlotte", "NC"), ("Chattanooga", "TN"), ("Chicago", "IL"),
+    ("Chula Vista", "CA"), ("Cicero", "IL"), ("Cincinnati", "OH"), ("Cleveland", "OH"),
+    ("Colorado Springs", "CO"), ("Columbus", "OH"), ("Coral Gables", "FL"), ("Dallas", "TX"),
+    ("Daly City", "CA"), ("Decatur", "GA"), ("Denver", "CO"), ("Des Moines", "IA"),
+    ("Detroit", "MI"), ("Durham", "NC"), ("El Paso", "TX"), ("Evanston", "IL"),
+    ("Fort Collins", "CO"), ("Fort Lauderdale", "FL"), ("Fort Worth", "TX"), ("Fresno", "CA"),
+    ("Glendale", "CA"), ("Grand Rapids", "MI"), ("Greenville", "SC"), ("Hartford", "CT"),
+    ("Henderson", "NV"), ("Hoboken", "NJ"), ("Honolulu", "HI"), ("Houston", "TX"),
+    ("Indianapolis", "IN"), ("Irving", "TX"), ("Jacksonville", "FL"), ("Jersey City", "NJ"),
+    ("Kansas City", "MO"), ("Key West", "FL"), ("Knoxville", "TN"), ("La Jolla", "CA"),
+    ("Lakewood", "CO"), ("Las Vegas", "NV"), ("Lexington", "KY"), ("Little Rock", "AR"),
+    ("Long Beach", "CA"), ("Los Angeles", "CA"), ("Louisville", "KY"), ("Madison", "WI"),
+    ("Marietta", "GA"), ("Memphis", "TN"), ("Mesa", "AZ"), ("Miami", "FL"),
+    ("Miami Beach", "FL"), ("Milwaukee", "WI"), ("Minneapolis", "MN"), ("Napa", "CA"),
+    ("Naperville", "IL"), ("Nashville", "TN"), ("New Haven", "CT"), ("New Orleans", "LA"),
+    ("New York", "NY"), ("Newark", "NJ"), ("Norfolk", "VA"), ("Oak Brook", "IL"),
+    ("Oak Park", "IL"), ("Oakland", "CA"), ("Oklahoma City", "OK"), ("Omaha", "NE"),
+    ("Orlando", "FL"), ("Palm Springs", "CA"), ("Palo Alto", "CA"), ("Pasadena", "CA"),
+    ("Philadelphia", "PA"), ("Phoenix", "AZ"), ("Pittsburgh", "PA"), ("Plano", "TX"),
+    ("Portland", "OR"), ("Providence", "RI"), ("Queens", "NY"), ("Raleigh", "NC"),
+    ("Redmond", "WA"), ("Reno", "NV"), ("Richmond", "VA"), ("Rochester", "NY"),
+    ("Round Rock", "TX"), ("Sacramento", "CA"), ("Saint Paul", "MN"), ("Salt Lake City", "UT"),
+    ("San Antonio", "TX"), ("San Diego", "CA"), ("San Francisco", "CA"), ("San Jose", "CA"),
+    ("San Mateo", "CA"), ("Sandy Springs", "GA"), ("Santa Barbara", "CA"), ("Santa Fe", "NM"),
+    ("Santa Monica", "CA"), ("Sausalito", "CA"), ("Savannah", "GA"), ("Schaumburg", "IL"),
+    ("Scottsdale", "AZ"), ("Seattle", "WA"), ("Sedona", "AZ"), ("Silver Spring", "MD"),
+    ("Skokie", "IL"), ("Somerville", "MA"), ("Sonoma", "CA"), ("Spokane", "WA"),
+    ("St. Louis", "MO"), ("St. Petersburg", "FL"), ("Staten Island", "NY"), ("Sugar Land", "TX"),
+    ("Tacoma", "WA"), ("Tallahassee", "FL"), ("Tampa", "FL"), ("Tempe", "AZ"),
+    ("The Woodlands", "TX"), ("Tucson", "AZ"), ("Tulsa", "OK"), ("Virginia Beach", "VA"),
+    ("Washington", "DC"), ("Wichita", "KS"), ("Yonkers", "NY"),
+)
+
+# Extra spellings, matched case-insensitively.
+CITY_ALIASES: dict[str, str] = {
+    "new york city": "New York",
+    "nyc": "New York",
+    "manhattan": "New York",
+    "the bronx": "Bronx",
+    "washington dc": "Washington",
+    "washington d.c.": "Washington",
+    "washington, dc": "Washington",
+    "washington, d.c.": "Washington",
+    "d.c.": "Washington",
+    "vegas": "Las Vegas",
+    "philly": "Philadelphia",
+    "nola": "New Orleans",
+    "saint louis": "St. Louis",
+    "st louis": "St. Louis",
+    "st. paul": "Saint Paul",
+    "st paul": "Saint Paul",
+    "saint petersburg": "St. Petersburg",
+    "st petersburg": "St. Petersburg",
+    "ft. lauderdale": "Fort Lauderdale",
+    "ft lauderdale": "Fort Lauderdale",
+    "ft. worth": "Fort Worth",
+    "ft worth": "Fort Worth",
+    "slc": "Salt Lake City",
+}
+
+# Abbreviations that are only cities when written in capitals.
+CITY_ACRONYMS: dict[str, str] = {
+    "NYC": "New York",
+    "SF": "San Francisco",
+    "LA": "Los Angeles",
+    "DC": "Washington",
+    "ATL": "Atlanta",
+    "KC": "Kansas City",
+}
+
+# City names that are also everyday words; lowercase mentions are weak.
+_COMMON_WORD_CITIES = {"buffalo", "mesa", "aurora", "phoenix", "providence", "madison", "reno"}
+
+US_STATES: dict[str, str] = {
+    "alabama": "AL", "alaska": "AK", "arizona": "AZ", "arkansas": "AR", "california": "CA",
+    "colorado": "CO", "connecticut": "CT", "delaware": "DE", "florida": "FL", "georgia": "GA",
+    "hawaii": "HI", "idaho": "ID", "illinois": "IL", "indiana": "IN", "iowa": "IA",
+    "kansas": "KS", "kentucky": "KY", "louisiana": "LA", "maine": "ME", "maryland": "MD",
+    "massachusetts": "MA", "michigan": "MI", "minnesota": "MN", "mississippi": "MS",
+    "missouri": "MO", "montana": "MT", "nebraska": "NE", "nevada": "NV", "new hampshire": "NH",
+    "new jersey": "NJ", "new mexico": "NM", "new york": "NY", "north carolina": "NC",
+    "north dakota": "ND", "ohio": "OH", "oklahoma": "OK", "oregon": "OR", "pennsylvania": "PA",
+    "rhode island": "RI", "south carolina": "SC", "south dakota": "SD", "tennessee": "TN",
+    "texas": "TX", "utah": "UT", "vermont": "VT", "virginia": "VA", "washington": "WA",
+    "west virginia": "WV", "wisconsin": "WI", "wyoming": "WY",
+}
+
+# canonical event type -> phrases (regex fragments, matched case-insensitively)
+EVENT_TYPES: dict[str, tuple[str, ...]] = {
+    "wedding": (r"weddings?", r"wedding reception", r"nuptials", r"elopement", r"vow renewal"),
+    "rehearsal dinner": (r"rehearsal dinner",),
+    "engagement party": (r"engagement(?: party| celebration)?",),
+    "bridal shower": (r"bridal shower",),
+    "baby shower": (r"baby shower", r"gender reveal(?: party)?"),
+    "bachelor party": (r"bachelor party", r"stag party"),
+    "bachelorette party": (r"bachelorette(?: party)?", r"hen party"),
+    "birthday": (
+        r"birthdays?(?: party| celebration)?", r"b-?day(?: party)?",
+        r"\d{1,3}(?:st|nd|rd|th) birthday", r"sweet (?:16|sixteen)",
+    ),
+    "quinceañera": (r"quincea[ñn]era", r"quince"),
+    "bar mitzvah": (r"bar mitzvah",),
+    "bat mitzvah": (r"bat mitzvah",),
+    "anniversary": (r"anniversary(?: party| dinner| celebration)?",),
+    "graduation": (r"graduation(?: party)?", r"grad party"),
+    "corporate": (
+        r"corporate(?: event| party| dinner| retreat| offsite| function)?",
+        r"company (?:party|event|offsite|off-site|retreat|dinner|picnic|outing)",
+        r"office party", r"off-?site", r"team[- ]building", r"all[- ]hands", r"client dinner",
+        r"board meeting", r"work (?:party|event)",
+    ),
+    "conference": (
+        r"conferences?", r"summit", r"convention", r"symposium", r"expo", r"trade ?show",
+    ),
+    "product launch": (r"product launch", r"launch (?:party|event)"),
+    "gala": (r"gala(?: dinner)?", r"black[- ]tie (?:dinner|event)"),
+    "fundraiser": (
+        r"fund-?raiser", r"fundraising (?:event|dinner|gala)",
+        r"charity (?:event|dinner|auction|gala)", r"benefit (?:dinner|concert|auction)",
+    ),
+    "holiday party": (
+        r"holiday party", r"christmas party", r"new year'?s(?: eve)? party", r"nye party",
+        r"halloween party", r"thanksgiving dinner",
+    ),
+    "retreat": (r"retreat",),
+    "reunion": (r"(?:family |class |high school |college )?reunion",),
+    "networking": (r"networking(?: event| mixer| night)?", r"mixer", r"meetup"),
+    "workshop": (r"workshop", r"seminar", r"training session", r"masterclass", r"bootcamp"),
+    "memorial": (r"memorial(?: service)?", r"celebration of life", r"funeral reception"),
+    "dinner party": (r"dinner party",),
+    "concert": (r"concert",),
+    "festival": (r"festival",),
+}
+
+# Generic words that say "an event" without saying which kind.
+_GENERIC_EVENT = re.compile(r"\b(?:party|celebration|get[- ]together|gathering|shindig)\b", re.I)
+
+# Words that carry no brief information; anything else left over is "unparsed".
+_FILLER = frozenset(
+    """
+    a about actually after again all also am an and any anything approx approximately are
+    around as at be been before being between budget but by can could date day do does
+    event for from get go going great guest guests had has have hello help hey hi hoping
+    how i i'd i'm id if im in is it it's its just keep let let's like looking love make
+    max maximum may me might min minimum more most my need no not now of ok okay on or our
+    ours perfect plan planning please plus probably really roughly say should so some
+    something sound sounds still sure thank thanks that that's the their them then there
+    these they thing think this those to total under up us want wanted was we we'd we'll
+    we're were what when where which who will with would yeah yes you your
+    expecting expect spend spending afford somewhere hosting host having throw throwing
+    organize organizing maybe ideally great awesome cool nice good fine
+    """.split()
+)
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_MONTH_NAMES = (
+    "", "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+_WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+_SEASONS = {"spring": 3, "summer": 6, "fall": 9, "autumn": 9, "winter": 12}
+
+_WORD_VALUES = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13,
+    "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
+    "nineteen": 19, "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50, "sixty": 60,
+    "seventy": 70, "eighty": 80, "ninety": 90,
+}
+_WORD_SCALES = {"dozen": 12, "hundred": 100, "thousand": 1_000}
+_SCALES = {"k": 1_000, "thousand": 1_000, "grand": 1_000, "m": 1_000_000, "mm": 1_000_000, "million": 1_000_000}
+
+
+# ---------------------------------------------------------------------------
+# Patterns
+# ---------------------------------------------------------------------------
+
+_NUM = r"\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?"
+_SCALE = r"\s*(?:million|thousand|grand)\b|(?:mm|k|m)\b"
+_NUMBER_WORD = "|".join([*_WORD_VALUES, *_WORD_SCALES])
+_WORD_NUM = rf"(?:(?:an?|{_NUMBER_WORD})[\s-]+(?:and[\s-]+)?)*(?:{_NUMBER_WORD})"
+_COUNT = rf"(?:{_NUM}|{_WORD_NUM})"
+_RANGE_SEP = r"\s*(?:-|–|—|to|through|thru|until|or)\s*"
+_DATE_SEP = r"\s*(?:-|–|—|to|through|thru|until)\s*"
+
+_GUEST_NOUN = (
+    r"guests?|people|persons|attendees|pax|heads|invitees|adults|participants|ppl|folks"
+    r"|delegates|visitors|covers"
+)
+# Groups that are often only part of the guest list ("3 kids coming too").
+_GUEST_GROUP_NOUN = r"employees|staff|kids|children"
+_GUESTS = re.compile(
+    rf"\b(?P<lo>{_COUNT})(?:{_RANGE_SEP}(?P<hi>{_COUNT}))?\s*\+?\s*(?:{_GUEST_NOUN})\b", re.I
+)
+_GUEST_GROUP = re.compile(rf"\b(?P<lo>{_COUNT})\s*(?:{_GUEST_GROUP_NOUN})\b", re.I)
+_GUESTS_KEYWORD = re.compile(
+    rf"\b(?:guest count|guest list|headcount|head count|attendance|party of|expecting|capacity)"
+    rf"\b\s*(?:of|is|:|=|around|about|roughly|~)?\s*(?:of|around|about|roughly|~)?\s*(?P<lo>{_COUNT})\b(?!\s*(?:{_SCALE}|%|\$))",
+    re.I,
+)
+_GUESTS_FOR = re.compile(rf"\bfor\s+(?:about\s+|around\s+|~\s*)?(?P<lo>{_NUM})\b(?!\s*(?:{_SCALE}|%|/|-\d))", re.I)
+
+_MONEY = re.compile(
+    rf"(?:\$|\busd\s*)\s*(?P<lo>{_NUM})(?P<lo_scale>{_SCALE})?"
+    rf"(?:{_RANGE_SEP}\$?\s*(?P<hi>{_NUM})(?P<hi_scale>{_SCALE})?)?",
+    re.I,
+)
+_MONEY_WORDS = re.compile(
+    rf"\b(?P<lo>{_NUM})(?P<lo_scale>{_SCALE})?(?:{_RANGE_SEP}(?P<hi>{_NUM})(?P<hi_scale>{_SCALE})?)?"
+    rf"\s*(?:dollars|usd|bucks)\b",
+    re.I,
+)
+_BUDGET_KEYWORD = re.compile(
+    rf"\b(?:budget(?:ed)?|spend|spending|afford|cap|max(?:imum)?)\b[^\d$\n]{{0,25}}?"
+    rf"(?P<lo>{_NUM})(?P<lo_scale>{_SCALE})?(?:{_RANGE_SEP}(?P<hi>{_NUM})(?P<hi_scale>{_SCALE})?)?",
+    re.I,
+)
+_AMOUNT_TEXT = re.compile(
+    rf"\s*(?:\$|usd\s*)?\s*(?P<lo>{_NUM})(?P<lo_scale>{_SCALE})?"
+    rf"(?:{_RANGE_SEP}\$?\s*(?P<hi>{_NUM})(?P<hi_scale>{_SCALE})?)?\s*(?:dollars|usd|bucks)?\s*",
+    re.I,
+)
+_SCALED_NUMBER = re.compile(rf"\b(?P<lo>{_NUM})(?P<lo_scale>{_SCALE})", re.I)
+_PER_HEAD = re.compile(r"\s*(?:per|/|a|each)?\s*(?:person|head|guest|plate|pp)\b", re.I)
+
+_MONTH = (
+    r"(?P<{name}>jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+    r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+)
+_ORD = r"(?:st|nd|rd|th)?"
+_ISO_DATE = re.compile(
+    rf"\b(?P<start>\d{{4}}-\d{{2}}-\d{{2}})(?:{_DATE_SEP}(?P<end>\d{{4}}-\d{{2}}-\d{{2}}))?\b"
+)
+_US_DATE = re.compile(
+    rf"\b(?P<m>\d{{1,2}})/(?P<d>\d{{1,2}})(?:/(?P<y>\d{{4}}|\d{{2}}))?"
+    rf"(?:{_DATE_SEP}(?P<m2>\d{{1,2}})/(?P<d2>\d{{1,2}})(?:/(?P<y2>\d{{4}}|\d{{2}}))?)?\b"
+)
+_MONTH_DAY = re.compile(
+    rf"\b{_MONTH.format(name='month')}\s+(?:the\s+)?(?P<d>\d{{1,2}}){_ORD}\b"
+    rf"(?:{_DATE_SEP}(?:{_MONTH.format(name='month2')}\s+)?(?P<d2>\d{{1,2}}){_ORD}\b)?"
+    rf"(?:,?\s*(?P<y>\d{{4}}))?",
+    re.I,
+)
+_DAY_MONTH = re.compile(
+    rf"\b(?:the\s+)?(?P<d>\d{{1,2}}){_ORD}(?:{_DATE_SEP}(?P<d2>\d{{1,2}}){_ORD})?\s+(?:of\s+)?"
+    rf"{_MONTH.format(name='month')}\b(?:,?\s*(?P<y>\d{{4}}))?",
+    re.I,
+)
+_MONTH_YEAR = re.compile(
+    rf"\b(?:(?P<qual>early|mid|late|end of|beginning of|start of)[\s-]+)?"
+    rf"{_MONTH.format(name='month')}(?![\w'])(?:,?\s*(?P<y>\d{{4}}))?",
+    re.I,
+)
+_EVENT_NOUN = re.compile(
+    r"\s+(?:wedding|party|event|gala|retreat|conference|celebration|reception|festival)\b", re.I
+)
+_RELATIVE_DAY = re.compile(r"\b(?P<word>today|tonight|tomorrow)\b", re.I)
+_RELATIVE_PERIOD = re.compile(r"\b(?P<which>this|next|coming)\s+(?P<unit>weekend|week|month|year)\b", re.I)
+_WEEKDAY = re.compile(
+    rf"\b(?:(?P<which>this|next|coming|on)\s+)?(?P<day>{'|'.join(_WEEKDAYS)})\b(?!s)", re.I
+)
+_SEASON = re.compile(
+    r"\b(?:(?P<which>this|next|coming)\s+|(?P<qual>early|mid|late)[\s-]+)?"
+    r"(?P<season>spring|summer|fall|autumn|winter)\b(?:\s+(?P<y>\d{4}))?",
+    re.I,
+)
+
+_DATE_CUE = re.compile(
+    r"(?:\b(?:in|during|for|by|around|this|next|of|until|before|after|on|from|early|mid|late)\s+)$",
+    re.I,
+)
+_PLACE_CUE = re.compile(
+    r"(?:\b(?:in|at|near|around|to|from|based in|located in|downtown|outside|city of)\s+)$",
+    re.I,
+)
+_STATE_SUFFIX = re.compile(
+    rf"(?:,\s*|\s+)(?P<state>{'|'.join(sorted(US_STATES, key=len, reverse=True))}|[A-Z]{{2}})\b",
+    re.I,
+)
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?", re.I)
+
+
+def _city_index() -> tuple[dict[str, tuple[str, str]], re.Pattern[str]]:
+    states = dict(US_CITIES)
+    index = {name.lower(): (name, state) for name, state in US_CITIES if name != "Washington"}
+    for alias, name in CITY_ALIASES.items():
+        index[alias] = (name, states[name])
+    names = sorted(index, key=len, reverse=True)
+    pattern = re.compile(r"(?<![\w.])(?:%s)(?![\w])" % "|".join(re.escape(n) for n in names), re.I)
+    return index, pattern
+
+
+_CITY_INDEX, _CITY_PATTERN = _city_index()
+_CITY_ACRONYM_PATTERN = re.compile(r"\b(?:%s)\b" % "|".join(CITY_ACRONYMS))
+_EVENT_PATTERNS = {
+    event_type: re.compile(r"\b(?:%s)\b" % "|".join(phrases), re.I)
+    for event_type, phrases in EVENT_TYPES.items()
+}
+
+
+# ---------------------------------------------------------------------------
+# Parser
+# ---------------------------------------------------------------------------
+
+
+class _Parser:
+    """Runs the field parsers over one message, each claiming the text it used.
+
+    Order matters: dates go first so "May 14" is never read as 14 guests,
+    and "200 guests" is claimed before "max 200" could read as a budget.
+    """
+
+    def __init__(self, text: str, today: date) -> None:
+        self.text = text
+        self.today = today
+        self.claimed: list[tuple[int, int]] = []
+        self.candidates: dict[str, list[FieldMatch]] = {}
+
+    def run(self) -> BriefExtraction:
+        self._dates()
+        self._budget((_MONEY, CERTAIN, True), (_MONEY_WORDS, CERTAIN, True))
+        self._guests()
+        self._budget((_BUDGET_KEYWORD, 0.9, True), (_SCALED_NUMBER, PLAUSIBLE, False))
+        self._city()
+        self._event_type()
+        return BriefExtraction(
+            fields={name: _pick(matches) for name, matches in self.candidates.items()},
+            unparsed=self._unparsed(),
+        )
+
+    # -- bookkeeping -------------------------------------------------------
+
+    def _free(self, start: int, end: int) -> bool:
+        return all(end <= s or start >= e for s, e in self.claimed)
+
+    def _add(self, name: str, value: Any, confidence: float, start: int, end: int, explicit: bool = True) -> None:
+        self.claimed.append((start, end))
+        self.candidates.setdefault(name, []).append(FieldMatch(value, confidence, start, end, explicit))
+
+    def _scan(self, pattern: re.Pattern[str]) -> list[re.Match[str]]:
+        return [m for m in pattern.finditer(self.text) if self._free(*m.span())]
+
+    def _cued(self, cue: re.Pattern[str], start: int) -> bool:
+        return cue.search(self.text[max(0, start - 16):start]) is not None
+
+    def _unparsed(self) -> list[str]:
+        words = []
+        for m in _WORD.finditer(self.text):
+            if self._free(*m.span()) and m.group().lower() not in _FILLER:
+                words.append(m.group().lower())
+        return words
+
+    # -- numbers -----------------------------------------------------------
+
+    def _budget(self, *patterns: tuple[re.Pattern[str], float, bool]) -> None:
+        for pattern, confidence, explicit in patterns:
+            for m in self._scan(pattern):
+                amount = _amount(m)
+                if amount is None:
+                    continue
+                start, end = m.span()
+                if m.groupdict().get("hi") is not None:
+                    confidence = min(confidence, LIKELY)
+                per_head = _PER_HEAD.match(self.text, end)
+                if per_head:
+                    # "$85 per person" is a rate, not the total budget.
+                    confidence, end = WEAK, per_head.end()
+                self._add("budget", amount, confidence, start, end, explicit)
+
+    def _guests(self) -> None:
+        for pattern, confidence, explicit in (
+            (_GUESTS, CERTAIN, True),
+            (_GUESTS_KEYWORD, 0.9, True),
+            (_GUEST_GROUP, WEAK, False),
+            (_GUESTS_FOR, 0.6, False),
+        ):
+            for m in self._scan(pattern):
+                count = _count(m.group("lo"))
+                hi = _count(m.group("hi")) if m.groupdict().get("hi") else None
+                if count is None or (pattern is _GUESTS_FOR and 1900 <= count <= 2100):
+                    continue
+                if hi is not None:
+                    count, confidence = max(count, hi), min(confidence, LIKELY)
+                if 1 <= count <= 100_000:
+                    self._add("guestCount", count, confidence, *m.span(), explicit)
+
+    # -- places ------------------------------------------------------------
+
+    def _city(self) -> None:
+        matches = [(m, _CITY_INDEX[m.group().lower()]) for m in self._scan(_CITY_PATTERN)]
+        matches += [
+            (m, (CITY_ACRONYMS[m.group()], dict(US_CITIES)[CITY_ACRONYMS[m.group()]]))
+            for m in self._scan(_CITY_ACRONYM_PATTERN)
+        ]
+        for m, (name, state) in matches:
+            start, end = m.span()
+            written = m.group()
+            if written[0].isupper():
+                confidence = 0.9
+            elif written.lower() in _COMMON_WORD_CITIES:
+                confidence = 0.4
+            else:
+                confidence = 0.8
+            # A bare name ("Austin was lovely") may not be where the event is.
+            explicit = self._cued(_PLACE_CUE, start)
+            if explicit:
+                confidence = max(confidence, CERTAIN) if written[0].isupper() else LIKELY
+            if self.text.startswith("'s", end):
+                confidence = 0.4  # "Charlotte's birthday" is a person
+            suffix = _STATE_SUFFIX.match(self.text, end)
+            if suffix:
+                code = US_STATES.get(suffix.group("state").lower(), suffix.group("state").upper())
+                if code == state:
+                    confidence, end, explicit = CERTAIN, suffix.end(), True
+                elif suffix.group("state").isupper() or suffix.group("state").lower() in US_STATES:
+                    confidence = WEAK  # same name, different state
+            self._add("city", name, confidence, start, end, explicit)
+
+    # -- event type --------------------------------------------------------
+
+    def _event_type(self) -> None:
+        found = [
+            (m, event_type)
+            for event_type, pattern in _EVENT_PATTERNS.items()
+            for m in self._scan(pattern)
+        ]
+        # Longest phrase wins where phrases overlap ("company retreat" over "retreat").
+        found.sort(key=lambda item: item[0].start() - item[0].end())
+        for m, event_type in found:
+            if self._free(*m.span()):
+                self._add("eventType", event_type, CERTAIN, *m.span())
+        if "eventType" not in self.candidates:
+            for m in self._scan(_GENERIC_EVENT):
+                self._add("eventType", "party", PLAUSIBLE, *m.span(), explicit=False)
+
+    # -- dates -------------------------------------------------------------
+
+    def _dates(self) -> None:
+        for m in self._scan(_ISO_DATE):
+            start, end = _iso(m.group("start")), _iso(m.group("end"))
+            if start:
+                self._add_dates(start, end, CERTAIN, m)
+        for m in self._scan(_US_DATE):
+            start = self._day(int(m.group("m")), int(m.group("d")), m.group("y"))
+            end = None
+            if m.group("m2"):
+                end = self._day(int(m.group("m2")), int(m.group("d2")), m.group("y2") or m.group("y"))
+            if start:
+                self._add_dates(start, end, LIKELY, m)
+        for pattern in (_MONTH_DAY, _DAY_MONTH):
+            for m in self._scan(pattern):
+                month = _month(m.group("month"))
+                start = self._day(month, int(m.group("d")), m.group("y"))
+                end = None
+                if start and m.group("d2"):
+                    month2 = _month(m.groupdict().get("month2") or "") or month
+                    end = self._day(month2, int(m.group("d2")), str(start.year))
+                    if end and end < start and not m.group("y"):
+                        end = self._day(month2, int(m.group("d2")), str(start.year + 1))
+                if start:
+                    self._add_dates(start, end, CERTAIN if m.group("y") or end else 0.9, m)
+        for m in self._scan(_RELATIVE_DAY):
+            offset = 1 if m.group("word").lower() == "tomorrow" else 0
+            self._add("dateRange", (self.today + timedelta(days=offset)).isoformat(), 0.9, *m.span())
+        for m in self._scan(_RELATIVE_PERIOD):
+            self._relative_period(m)
+        for m in self._scan(_WEEKDAY):
+            if "dateRange" in self.candidates:
+                # A weekday next to an explicit date ("Saturday, June 14") adds nothing.
+                self.claimed.append(m.span())
+            else:
+                self._weekday(m)
+        for m in self._scan(_MONTH_YEAR):
+            self._month_year(m)
+        for m in self._scan(_SEASON):
+            self._season(m)
+
+    def _add_dates(self, start: date, end: date | None, confidence: float, m: re.Match[str]) -> None:
+        if end and end < start:
+            end = None
+            confidence = WEAK
+        value = f"{start.isoformat()} to {end.isoformat()}" if end and end != start else start.isoformat()
+        self._add("dateRange", value, confidence, *m.span())
+
+    def _day(self, month: int, day: int, year: str | None) -> date | None:
+        """A calendar day; without a year, the next one on or after today."""
+        try:
+            if year:
+                return date(int(year) + (2000 if len(year) == 2 else 0), month, day)
+            candidate = date(self.today.year, month, day)
+            return candidate if candidate >= self.today else date(self.today.year + 1, month, day)
+        except ValueError:
+            return None
+
+    def _relative_period(self, m: re.Match[str]) -> None:
+        unit, which = m.group("unit").lower(), m.group("which").lower()
+        step = 1 if which == "next" else 0
+        if unit == "weekend":
+            saturday = self.today + timedelta(days=(5 - self.today.weekday()) % 7)
+            if which == "next" and self.today.weekday() < 5:
+                saturday += timedelta(days=7 * step)
+            value = f"{saturday.isoformat()} to {(saturday + timedelta(days=1)).isoformat()}"
+            self._add("dateRange", value, LIKELY, *m.span())
+        elif unit == "week":
+            monday = self.today - timedelta(days=self.today.weekday()) + timedelta(days=7 * step)
+            self._add("dateRange", f"Week of {monday.isoformat()}", 0.8, *m.span())
+        elif unit == "month":
+            month_index = self.today.month - 1 + step
+            year, month = self.today.year + month_index // 12, month_index % 12 + 1
+            self._add("dateRange", f"{_MONTH_NAMES[month]} {year}", 0.9, *m.span())
+        else:
+            self._add("dateRange", str(self.today.year + step), 0.8, *m.span())
+
+    def _weekday(self, m: re.Match[str]) -> None:
+        weekday = _WEEKDAYS.index(m.group("day").lower())
+        ahead = (weekday - self.today.weekday()) % 7 or 7
+        confidence = LIKELY if m.group("which") else 0.8
+        self._add("dateRange", (self.today + timedelta(days=ahead)).isoformat(), confidence, *m.span())
+
+    def _month_year(self, m: re.Match[str]) -> None:
+        written = m.group("month")
+        month = _month(written)
+        year = m.group("y")
+        cued = m.group("qual") is not None or self._cued(_DATE_CUE, m.start())
+        if year or cued:
+            confidence = CERTAIN if year else 0.9
+        elif written.lower() in ("may", "mar", "march"):
+            return  # the verbs
+        else:
+            confidence = 0.8
+        if not year:
+            year = str(self.today.year if month >= self.today.month else self.today.year + 1)
+        qual = (m.group("qual") or "").lower()
+        qual = {"beginning of": "early", "start of": "early", "end of": "late"}.get(qual, qual)
+        value = f"{_MONTH_NAMES[month]} {year}"
+        self._add("dateRange", f"{qual.title()} {value}" if qual else value, confidence, *m.span())
+
+    def _season(self, m: re.Match[str]) -> None:
+        season = m.group("season").lower()
+        cued = m.group("which") or m.group("qual") or m.group("y") or self._cued(_DATE_CUE, m.start())
+        if not cued and season == "fall" and not _EVENT_NOUN.match(self.text, m.end()):
+            return  # "fall" the verb
+        starts = _SEASONS[season]
+        if m.group("y"):
+            year = int(m.group("y"))
+        else:
+            year = self.today.year
+            season_end = date(year + (1 if starts == 12 else 0), (starts + 2) % 12 + 1, 1)
+            if self.today >= season_end:
+                year += 1
+            in_season = date(year, starts, 1) <= self.today
+            if (m.group("which") or "").lower() == "next" and in_season:
+                year += 1
+        name = "Fall" if season == "autumn" else season.title()
+        qual = m.group("qual")
+        value = f"{qual.title()} {name} {year}" if qual else f"{name} {year}"
+        self._add("dateRange", value, 0.9 if cued else 0.8, *m.span())
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def parse_amount(text: str) -> int | None:
+    """Whole dollars from text that is nothing but an amount ("$20k", "15k-20k"), else None."""
+    m = _AMOUNT_TEXT.fullmatch(text)
+    return _amount(m) if m else None
+
+
+def _pick(matches: list[FieldMatch]) -> FieldMatch:
+    """Best match for a field; disagreeing matches lower the confidence."""
+    best = max(matches, key=lambda match: match.confidence)
+    if any(match.value != best.value for match in matches):
+        return replace(best, confidence=min(best.confidence, 0.6))
+    return best
+
+
+def _number(text: str, scale: str | None) -> float:
+    value = float(text.replace(",", ""))
+    return value * _SCALES[scale.strip().lower()] if scale else value
+
+
+def _amount(m: re.Match[str]) -> int | None:
+    """Budget in whole dollars; a range resolves to its upper bound."""
+    groups = m.groupdict()
+    lo_scale, hi_scale = groups.get("lo_scale"), groups.get("hi_scale")
+    amount = _number(m.group("lo"), lo_scale or hi_scale)
+    if groups.get("hi"):
+        amount = max(amount, _number(m.group("hi"), hi_scale or lo_scale))
+    return int(amount) if amount >= 1 else None
+
+
+def _count(text: str) -> int | None:
+    """An integer written in digits ("1,200") or words ("two hundred")."""
+    if text[0].isdigit():
+        value = float(text.replace(",", ""))
+        return int(value) if value.is_integer() else None
+    total = current = 0
+    for word in re.split(r"[\s-]+", text.lower()):
+        if word in ("a", "an"):
+            current += 1
+        elif word in _WORD_VALUES:
+            current += _WORD_VALUES[word]
+        elif word == "thousand":
+            total += max(current, 1) * 1_000
+            current = 0
+        elif word in _WORD_SCALES:
+            current = max(current, 1) * _WORD_SCALES[word]
+    return total + current or None
+
+
+def _month(text: str) -> int:
+    return _MONTHS.get(text.lower().rstrip(".")[:3], 0)
+
+
+def _iso(text: str | None) -> date | None:
+    if not text:
+        return None
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        return None
@@ -0,0 +1,83 @@
+"""Context window service — token-budgeted conversation history for LLM prompts.
+
+Handles:
+- Approximate token counting without a tokenizer dependency
+- Picking the newest messages that fit a token budget
+- Deciding when older turns should be folded into a rolling summary
+
+Counts are estimates tuned to BPE tokenizers (roughly one token per short
+word or four characters of a long one, one per punctuation mark); budgets
+should leave some headroom below the model's real limit.
+"""
+
+import math
+import re
+from typing import Any
+
+# Role markers and separators the chat format adds around each message.
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Fold older turns into the summary once unsummarized history passes this
+# share of the budget, keeping the newest turns up to COMPACT_KEEP of it.
+COMPACT_AT = 0.75
+COMPACT_KEEP = 0.5
+
+_PIECES = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+
+def count_tokens(text: str) -> int:
+    """Estimated token count of ``text``."""
+    tokens = 0
+    for piece in _PIECES.findall(text):
+        if piece[0].isdigit():
+            tokens += math.ceil(len(piece) / 3)
+        elif piece[0].isalpha():
+            tokens += 1 if len(piece) <= 6 else math.ceil(len(piece) / 4)
+        else:
+            tokens += 1
+    return tokens
+
+
+def message_tokens(message: dict[str, Any]) -> int:
+    """Estimated tokens for a chat message (``text`` or ``content``) including overhead."""
+    return count_tokens(message.get("content") or message.get("text") or "") + MESSAGE_OVERHEAD_TOKENS
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """``text`` cut at a piece boundary so it fits ``budget`` tokens."""
+    if count_tokens(text) <= budget:
+        return text
+    used = 0
+    for match in _PIECES.finditer(text):
+        used += count_tokens(match.group())
+        if used > budget:
+            return text[: match.start()].rstrip() + " …"
+    return text
+
+
+def fit_window(messages: list[dict[str, Any]], budget: int) -> list[dict[str, Any]]:
+    """The newest messages whose combined size fits ``budget`` tokens, oldest first."""
+    window: list[dict[str, Any]] = []
+    used = 0
+    for message in reversed(messages):
+        used += message_tokens(message)
+        if used > budget:
+            break
+        window.append(message)
+    window.reverse()
+    return window
+
+
+def compaction_point(messages: list[dict[str, Any]], covered: int, budget: int) -> int | None:
+    """New summary coverage if the history after ``covered`` has grown too large.
+
+    Returns the index up to which messages should be folded into the summary,
+    leaving the newest messages that fit ``COMPACT_KEEP`` of the budget, or
+    None while the unsummarized history is still under ``COMPACT_AT`` of it.
+    """
+    pending = messages[covered:]
+    if sum(message_tokens(m) for m in pending) <= budget * COMPACT_AT:
+        return None
+    keep = len(fit_window(pending, int(budget * COMPACT_KEEP)))
+    point = len(messages) - keep
+    return point if point > covered else None
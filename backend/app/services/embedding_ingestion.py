@@ -0,0 +1,220 @@
+"""Embedding ingestion service — keep ``vector_embeddings`` in step with content.
+
+Handles:
+- Scanning venues, providers and public templates changed since a per-type
+  checkpoint, in ``(changed_at, id)`` keyset order
+- Re-embedding only rows whose document hash differs from the stored one
+- Computing each batch's embeddings off the event loop and bulk-upserting them
+- Saving the checkpoint in the same transaction as each batch, so an
+  interrupted run resumes after the last committed batch
+- Dropping embeddings of content that is gone or no longer public
+- Bringing the in-process vector index files up to date when pgvector is
+  unavailable, so request handlers only ever reload them
+
+Runs in the embedding worker (``python -m scripts.embedding_worker``),
+never in request handlers.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.engine import async_session_factory
+from app.models.embedding_checkpoint import EmbeddingCheckpoint
+from app.models.marketplace_listing import MarketplaceListing
+from app.models.template import Template
+from app.services import retrieval_service, vector_index
+
+logger = logging.getLogger(__name__)
+
+_ZERO_ID = uuid.UUID(int=0)
+
+
+@dataclass(frozen=True)
+class Source:
+    """Where one content type's documents come from."""
+
+    entity: Any
+    changed_at: Any  # column bumped whenever the row may have changed
+    content_id: Any
+    scope: Any  # rows that should have an embedding
+    document: Callable[[Any], str]
+
+
+SOURCES: dict[str, Source] = {
+    listing_type: Source(
+        entity=MarketplaceListing,
+        changed_at=MarketplaceListing.refreshed_at,
+        content_id=MarketplaceListing.entity_id,
+        scope=MarketplaceListing.listing_type == listing_type,
+        document=retrieval_service.listing_document,
+    )
+    for listing_type in ("venue", "service_provider")
+}
+SOURCES["template"] = Source(
+    entity=Template,
+    changed_at=Template.updated_at,
+    content_id=Template.id,
+    scope=Template.is_public.is_(True),
+    document=retrieval_service.template_document,
+)
+
+
+@dataclass
+class SyncResult:
+    content_type: str
+    batches: int = 0
+    scanned: int = 0
+    embedded: int = 0
+    unchanged: int = 0
+    dropped: int = 0
+    completed: bool = False
+
+
+# ---------------------------------------------------------------------------
+# Sync
+# ---------------------------------------------------------------------------
+
+
+async def sync(
+    content_type: str,
+    *,
+    batch_size: int | None = None,
+    executor: Executor | None = None,
+    session_factory: async_sessionmaker[AsyncSession] = async_session_factory,
+    stop: asyncio.Event | None = None,
+) -> SyncResult:
+    """Bring one content type's embeddings up to date.
+
+    Each batch runs in its own transaction. Setting ``stop`` ends the run
+    after the current batch. The scan starts ``EMBEDDING_OVERLAP_SECONDS``
+    before the checkpoint: ``now()`` is a transaction's start time, so a
+    row committed late can carry a timestamp behind rows already ingested.
+    Re-read rows cost a hash comparison, not an embedding.
+    """
+    result = SyncResult(content_type)
+    source = SOURCES[content_type]
+    batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+    loop = asyncio.get_running_loop()
+
+    async with session_factory() as db:
+        saved = await _load_checkpoint(db, content_type)
+    cursor = None
+    if saved is not None:
+        cursor = (saved[0] - timedelta(seconds=settings.EMBEDDING_OVERLAP_SECONDS), _ZERO_ID)
+
+    while True:
+        if stop is not None and stop.is_set():
+            return result
+        async with session_factory() as db:
+            rows = await _changed(db, source, cursor, batch_size)
+            if not rows:
+                break
+            documents = [(_value(row, source.content_id), source.document(row)) for row in rows]
+            stored = await retrieval_service.stored_hashes(db, content_type, [cid for cid, _ in documents])
+            changed = [
+                (content_id, document)
+                for content_id, document in documents
+                if stored.get(content_id) != retrieval_service.document_hash(document)
+            ]
+            if changed:
+                embedded = await loop.run_in_executor(
+                    executor, retrieval_service.embedding_rows, content_type, changed, vector_index.enabled()
+                )
+                await retrieval_service.upsert_rows(db, embedded)
+                result.embedded += len(embedded)
+
+            cursor = (_value(rows[-1], source.changed_at), _value(rows[-1], source.content_id))
+            if saved is None or cursor > saved:
+                await _save_checkpoint(db, content_type, cursor)
+                saved = cursor
+            await db.commit()
+
+        result.batches += 1
+        result.scanned += len(rows)
+        result.unchanged += len(rows) - len(changed)
+        if len(rows) < batch_size:
+            break
+
+    async with session_factory() as db:
+        current = select(source.content_id).where(source.scope)
+        result.dropped = await retrieval_service.drop_missing(db, content_type, current)
+        await db.commit()
+    if vector_index.enabled():
+        async with session_factory() as db:
+            await vector_index.get_index(content_type).refresh(db)
+    result.completed = True
+    return result
+
+
+async def sync_all(
+    content_types: Iterable[str] | None = None,
+    *,
+    concurrency: int | None = None,
+    **options: Any,
+) -> list[SyncResult]:
+    """Sync several content types, at most ``concurrency`` at a time.
+
+    A failing content type is logged and left for the next run; the others
+    still sync.
+    """
+    semaphore = asyncio.Semaphore(concurrency or settings.EMBEDDING_WORKER_CONCURRENCY)
+
+    async def one(content_type: str) -> SyncResult | None:
+        async with semaphore:
+            try:
+                return await sync(content_type, **options)
+            except Exception:
+                logger.exception("Embedding sync failed for %s", content_type)
+                return None
+
+    results = await asyncio.gather(*(one(content_type) for content_type in content_types or SOURCES))
+    return [result for result in results if result is not None]
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+async def _changed(
+    db: AsyncSession,
+    source: Source,
+    cursor: tuple[datetime, uuid.UUID] | None,
+    limit: int,
+) -> list[Any]:
+    stmt = select(source.entity).where(source.scope)
+    if cursor is not None:
+        stmt = stmt.where(tuple_(source.changed_at, source.content_id) > tuple_(*cursor))
+    stmt = stmt.order_by(source.changed_at, source.content_id).limit(limit)
+    return list((await db.execute(stmt)).scalars().all())
+
+
+def _value(row: Any, column: Any) -> Any:
+    return getattr(row, column.key)
+
+
+async def _load_checkpoint(db: AsyncSession, content_type: str) -> tuple[datetime, uuid.UUID] | None:
+    checkpoint = await db.get(EmbeddingCheckpoint, content_type)
+    if checkpoint is None:
+        return None
+    return checkpoint.watermark, checkpoint.last_id
+
+
+async def _save_checkpoint(db: AsyncSession, content_type: str, cursor: tuple[datetime, uuid.UUID]) -> None:
+    stmt = insert(EmbeddingCheckpoint).values(content_type=content_type, watermark=cursor[0], last_id=cursor[1])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EmbeddingCheckpoint.content_type],
+        set_={"watermark": stmt.excluded.watermark, "last_id": stmt.excluded.last_id, "updated_at": func.now()},
+    )
+    await db.execute(stmt)
@@ -0,0 +1,88 @@
+"""Embeddings service — local text embeddings for semantic retrieval.
+
+Handles:
+- Turning text into a fixed-size, L2-normalized vector with a signed
+  hashing vectorizer (words, word bigrams and character trigrams)
+- Stable feature hashing, so vectors match across processes and restarts
+
+No model download or network call is involved: vectors are computed in
+process and fit the 1536-dimension `vector_embeddings.embedding` column.
+Similar wording gives similar vectors; synonyms don't, so retrieval
+combines these with structured filters rather than relying on them alone.
+"""
+
+import hashlib
+import math
+import re
+from collections import defaultdict
+from functools import lru_cache
+
+EMBEDDING_DIM = 1536
+EMBEDDING_MODEL = "hashing-v1"
+
+WORD_WEIGHT = 1.0
+BIGRAM_WEIGHT = 0.5
+# Shared among a word's trigrams, so long words don't outweigh short ones.
+TRIGRAM_WEIGHT = 0.5
+
+_WORDS = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    """
+    a about an and any are as at be but by can do for from have i in is it its
+    looking me my need of on or our please some that the their them this to
+    us want we with would you your
+    """.split()
+)
+
+
+def tokens(text: str) -> list[str]:
+    """Lower-cased words of ``text`` without stopwords."""
+    return [word for word in _WORDS.findall(text.lower()) if word not in STOPWORDS]
+
+
+@lru_cache(maxsize=65536)
+def _slot(feature: str) -> tuple[int, float]:
+    """Dimension and sign of ``feature`` (the hashing trick; stable across processes)."""
+    digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+    return digest % EMBEDDING_DIM, 1.0 if digest >> 63 else -1.0
+
+
+def _features(words: list[str]) -> dict[str, float]:
+    counts: dict[str, float] = defaultdict(float)
+    for word in words:
+        counts[word] += WORD_WEIGHT
+        if len(word) > 3:
+            padded = f"<{word}>"
+            grams = [padded[i : i + 3] for i in range(len(padded) - 2)]
+            for gram in grams:
+                counts["#" + gram] += TRIGRAM_WEIGHT / len(grams)
+    for first, second in zip(words, words[1:]):
+        counts[f"{first} {second}"] += BIGRAM_WEIGHT
+    return counts
+
+
+def embed(text: str) -> list[float] | None:
+    """Unit-length embedding of ``text``, or None when it has no words to embed."""
+    words = tokens(text)
+    if not words:
+        return None
+    vector = [0.0] * EMBEDDING_DIM
+    for feature, weight in _features(words).items():
+        index, sign = _slot(feature)
+        # Sub-linear term frequency: repeating a word adds less each time.
+        vector[index] += sign * (1.0 + math.log(weight)) if weight >= 1 else sign * weight
+    norm = math.sqrt(sum(value * value for value in vector))
+    if norm == 0:
+        return None
+    return [value / norm for value in vector]
+
+
+def embed_many(texts: list[str]) -> list[list[float] | None]:
+    """Embeddings of ``texts``, in order (one call per batch, e.g. in a worker process)."""
+    return [embed(text) for text in texts]
+
+
+def similarity(a: list[float], b: list[float]) -> float:
+    """Cosine similarity of two unit vectors."""
+    return sum(x * y for x, y in zip(a, b))
@@ -0,0 +1,145 @@
+"""Geo service — distance math and SQL predicates for radius search.
+
+Handles:
+- Great-circle (haversine) distance in Python and as a SQL expression
+- Bounding boxes used as an index-friendly prefilter before exact distance
+- Expanding a text city ("Portland" or "Portland, OR") to nearby cities via
+  the `city_centroids` table
+
+No PostGIS: the bounding box narrows rows through plain btree indexes on
+lat/lng, then haversine gives the exact distance for filtering and ranking.
+"""
+
+import math
+from typing import Any, NamedTuple
+
+from sqlalchemy import Select, and_, exists, func, literal, or_, select, true
+
+from app.models.city_centroid import CityCentroid, city_name_sql, city_state_sql
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+
+class BoundingBox(NamedTuple):
+    min_lat: float
+    max_lat: float
+    min_lng: float
+    max_lng: float
+
+
+# ---------------------------------------------------------------------------
+# Pure math
+# ---------------------------------------------------------------------------
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points, in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat: float, lng: float, radius_km: float) -> BoundingBox:
+    """Smallest lat/lng box containing every point within ``radius_km``.
+
+    Near the poles, or when the box would cross the antimeridian, longitude
+    widens to the full range; the exact distance check still applies.
+    """
+    d_lat = radius_km / KM_PER_DEGREE_LAT
+    min_lat, max_lat = max(lat - d_lat, -90.0), min(lat + d_lat, 90.0)
+
+    cos_lat = math.cos(math.radians(lat))
+    if min_lat <= -90.0 or max_lat >= 90.0 or cos_lat < 1e-9:
+        return BoundingBox(min_lat, max_lat, -180.0, 180.0)
+
+    d_lng = radius_km / (KM_PER_DEGREE_LAT * cos_lat)
+    if lng - d_lng < -180.0 or lng + d_lng > 180.0:
+        return BoundingBox(min_lat, max_lat, -180.0, 180.0)
+    return BoundingBox(min_lat, max_lat, lng - d_lng, lng + d_lng)
+
+
+# ---------------------------------------------------------------------------
+# SQL expressions
+# ---------------------------------------------------------------------------
+
+
+def distance_km_sql(lat_expr: Any, lng_expr: Any, lat: Any, lng: Any) -> Any:
+    """Haversine distance in km between SQL coordinates and an origin."""
+    phi1, phi2 = func.radians(lat_expr), func.radians(lat)
+    half_d_phi = func.radians(lat - lat_expr) / 2
+    half_d_lambda = func.radians(lng - lng_expr) / 2
+    a = func.power(func.sin(half_d_phi), 2) + func.cos(phi1) * func.cos(phi2) * func.power(
+        func.sin(half_d_lambda), 2
+    )
+    return 2 * EARTH_RADIUS_KM * func.asin(func.least(1.0, func.sqrt(a)))
+
+
+def in_box(lat_expr: Any, lng_expr: Any, box: BoundingBox) -> Any:
+    """Bounding-box predicate (served by a btree index on lat, lng)."""
+    return and_(
+        lat_expr.between(box.min_lat, box.max_lat),
+        lng_expr.between(box.min_lng, box.max_lng),
+    )
+
+
+def cities_within(lat: float, lng: float, radius_km: float) -> Select:
+    """Lower-cased names of centroid cities within ``radius_km`` of a point."""
+    box = bounding_box(lat, lng, radius_km)
+    return select(func.lower(CityCentroid.name)).where(
+        in_box(CityCentroid.lat, CityCentroid.lng, box),
+        distance_km_sql(CityCentroid.lat, CityCentroid.lng, literal(lat), literal(lng)) <= radius_km,
+    )
+
+
+def split_city(city: str) -> tuple[str, str | None]:
+    """``("Portland", "OR")`` for "Portland, OR"; the state is None when not given."""
+    name, _, state = city.partition(",")
+    state = state.strip().upper()
+    return name.strip(), state if len(state) == 2 and state.isalpha() else None
+
+
+def cities_near_city(city: str, radius_km: float) -> Select:
+    """``(name, state)`` of centroid cities within ``radius_km`` of ``city``.
+
+    Names are lower-cased. Resolved entirely in SQL; empty when ``city``
+    isn't in the table. With a state ("Portland, OR") only that state's city
+    is the origin; without one, every city of that name is.
+    """
+    name, state = split_city(city)
+    origin = CityCentroid.__table__.alias("origin")
+    nearby = CityCentroid.__table__.alias("nearby")
+    stmt = (
+        select(func.lower(nearby.c.name).label("name"), nearby.c.state)
+        .select_from(origin)
+        .join(nearby, true())
+        .where(
+            func.lower(origin.c.name) == name.lower(),
+            distance_km_sql(nearby.c.lat, nearby.c.lng, origin.c.lat, origin.c.lng) <= radius_km,
+        )
+    )
+    if state:
+        stmt = stmt.where(origin.c.state == state)
+    return stmt
+
+
+def city_matches(city_column: Any, city: str, radius_km: float) -> Any:
+    """Predicate: ``city_column`` is ``city`` or a centroid city near it.
+
+    Stored values may be "Name" or "Name, ST". A stored state must match the
+    one searched for (or the nearby city's); a value stored without a state
+    matches on the name alone.
+    """
+    name, state = split_city(city)
+    stored_name, stored_state = city_name_sql(city_column), city_state_sql(city_column)
+    same_city = stored_name == name.lower()
+    if state:
+        same_city = and_(same_city, or_(stored_state == "", stored_state == state))
+    nearby = cities_near_city(city, radius_km).subquery("nearby_cities")
+    near_city = exists().where(
+        nearby.c.name == stored_name,
+        or_(stored_state == "", nearby.c.state == stored_state),
+    )
+    return or_(same_city, near_city)
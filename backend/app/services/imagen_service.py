@@ -7,9 +7,9 @@ import base64
 import logging
 from typing import Any
 
-import httpx
-
 from app.core.config import settings
+from app.core.http_clients import http_clients, request_timeout
+from app.core.resilience import UpstreamUnavailableError
 from app.services.cloudinary_service import upload_bytes
 
 logger = logging.getLogger(__name__)
@@ -21,8 +21,6 @@ VERTEX_URL_TEMPLATE = (
     "publishers/google/models/{model}:predict"
 )
 
-IMAGEN_TIMEOUT = 60.0
-
 
 async def generate_image(
     prompt: str,
@@ -70,11 +68,20 @@ async def generate_image(
         "Content-Type": "application/json",
     }
 
-    async with httpx.AsyncClient(timeout=IMAGEN_TIMEOUT) as client:
-        response = await client.post(url, json=request_body, headers=headers)
+    async def send(timeout: float) -> dict[str, Any]:
+        response = await http_clients.get("vertex").post(
+            url, json=request_body, headers=headers, timeout=request_timeout(timeout)
+        )
         response.raise_for_status()
+        return response.json()
+
+    # Each attempt is billed, so generation is never retried.
+    try:
+        data = await http_clients.guard("vertex").call(send, idempotent=False)
+    except UpstreamUnavailableError as exc:
+        logger.warning("Imagen unavailable (%s) — returning placeholder", exc)
+        return _placeholder_url(prompt)
 
-    data = response.json()
     predictions = data.get("predictions", [])
 
     if not predictions:
@@ -0,0 +1,145 @@
+"""LLM cache service — reuse completions of repeated deterministic LLM calls.
+
+Handles:
+- Cache keys from the model, normalized messages, temperature, token limit
+  and response format of a chat completion request
+- An in-process LRU in front of a Postgres table whose entries expire
+- Coalescing concurrent identical requests into one upstream call
+- Hit-rate counters (``llm-responses`` in the admin cache metrics)
+
+Only requests at or below ``LLM_CACHE_MAX_TEMPERATURE`` are cached; at
+higher temperatures callers expect a different answer each time.
+"""
+
+import hashlib
+import json
+import logging
+import re
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.cache import AppCache
+from app.core.config import settings
+from app.db.engine import async_session_factory
+from app.models.llm_cache_entry import LLMCacheEntry
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Expired rows are deleted every this many writes per worker.
+PURGE_EVERY_WRITES = 200
+
+_memory = AppCache(
+    "llm-responses",
+    ttl=settings.LLM_CACHE_TTL_SECONDS,
+    maxsize=settings.LLM_CACHE_MAX_ENTRIES,
+    shared=False,
+)
+_writes = 0
+
+
+def is_cacheable(request_body: dict[str, Any]) -> bool:
+    return (
+        settings.LLM_CACHE_ENABLED
+        and not request_body.get("stream")
+        and request_body.get("temperature", 1.0) <= settings.LLM_CACHE_MAX_TEMPERATURE
+    )
+
+
+def cache_key(request_body: dict[str, Any]) -> str:
+    """Digest of a chat completion request, equal for requests differing only in whitespace."""
+    normalized = {
+        "model": request_body.get("model"),
+        "messages": [
+            {
+                "role": str(message.get("role", "")).strip().lower(),
+                "content": _WHITESPACE.sub(" ", str(message.get("content", ""))).strip(),
+            }
+            for message in request_body.get("messages", [])
+        ],
+        "temperature": round(float(request_body.get("temperature", 1.0)), 2),
+        "max_tokens": request_body.get("max_tokens"),
+        "response_format": request_body.get("response_format"),
+    }
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+async def get_or_complete(request_body: dict[str, Any], complete: Callable[[], Awaitable[str]]) -> str:
+    """Cached completion text for ``request_body``, calling ``complete`` on a miss.
+
+    Concurrent misses for the same key share one ``complete`` call. Errors
+    (including a refused upstream call) are not cached.
+    """
+    key = cache_key(request_body)
+
+    async def load() -> str:
+        stored = await _load(key)
+        if stored is not None:
+            _memory.stats.shared_hits += 1
+            return stored
+        text = await complete()
+        await _store(key, request_body.get("model", ""), text)
+        return text
+
+    return await _memory.get_or_set(key, load)
+
+
+def clear() -> None:
+    """Drop the in-process entries (the persistent tier keeps its rows)."""
+    _memory.clear()
+
+
+# ---------------------------------------------------------------------------
+# Persistent tier
+# ---------------------------------------------------------------------------
+
+
+async def _load(key: str) -> str | None:
+    if not settings.LLM_CACHE_PERSIST:
+        return None
+    try:
+        async with async_session_factory() as session:
+            result = await session.execute(
+                select(LLMCacheEntry.response).where(
+                    LLMCacheEntry.key == key, LLMCacheEntry.expires_at > datetime.now(timezone.utc)
+                )
+            )
+            return result.scalar_one_or_none()
+    except Exception:
+        _memory.stats.shared_errors += 1
+        logger.debug("LLM cache read failed", exc_info=True)
+        return None
+
+
+async def _store(key: str, model: str, text: str) -> None:
+    global _writes
+    if not settings.LLM_CACHE_PERSIST:
+        return
+    now = datetime.now(timezone.utc)
+    values = {
+        "key": key,
+        "model": model[:100],
+        "response": text,
+        "created_at": now,
+        "expires_at": now + timedelta(seconds=settings.LLM_CACHE_TTL_SECONDS),
+    }
+    stmt = insert(LLMCacheEntry).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[LLMCacheEntry.key],
+        set_={name: stmt.excluded[name] for name in ("model", "response", "created_at", "expires_at")},
+    )
+    try:
+        async with async_session_factory() as session:
+            await session.execute(stmt)
+            _writes += 1
+            if _writes % PURGE_EVERY_WRITES == 0:
+                await session.execute(delete(LLMCacheEntry).where(LLMCacheEntry.expires_at <= now))
+            await session.commit()
+    except Exception:
+        _memory.stats.shared_errors += 1
+        logger.debug("LLM cache write failed", exc_info=True)
@@ -1,17 +1,29 @@
-"""LLM service — calls NVIDIA NeMo (OpenAI-compatible chat completions API)."""
+"""LLM service — calls NVIDIA NeMo (OpenAI-compatible chat completions API).
+
+Calls go through the "nvidia" upstream guard: completions are retried on
+transient failures, and when the bulkhead is full, the circuit is open or
+the request deadline has passed they return a fallback response instead of
+waiting on the upstream. Low-temperature completions are served from the
+LLM cache when the same request was answered before.
+"""
 
 import json
 import logging
+from collections.abc import AsyncIterator
 from typing import Any
 
-import httpx
-
 from app.core.config import settings
+from app.core.http_clients import http_clients, request_timeout
+from app.core.resilience import DeadlineExceededError, UpstreamUnavailableError, time_remaining
+from app.services import llm_cache
 
 logger = logging.getLogger(__name__)
 
-# Timeout for LLM API calls (seconds)
-LLM_TIMEOUT = 60.0
+_MOCK_MESSAGE = "I'm a mock assistant response. Configure NVIDIA_API_KEY for real LLM calls."
+_UNAVAILABLE_MESSAGE = (
+    "I'm having trouble reaching the planning assistant right now. "
+    "Your details are saved — please try again in a moment."
+)
 
 
 async def invoke_llm(
@@ -76,18 +88,11 @@ async def invoke_llm(
     if response_json_schema:
         request_body["response_format"] = {"type": "json_object"}
 
-    url = f"{settings.NVIDIA_API_BASE}/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {settings.NVIDIA_API_KEY}",
-        "Content-Type": "application/json",
-    }
-
-    async with httpx.AsyncClient(timeout=LLM_TIMEOUT) as client:
-        response = await client.post(url, json=request_body, headers=headers)
-        response.raise_for_status()
-
-    data = response.json()
-    content = data["choices"][0]["message"]["content"]
+    try:
+        content = await _complete(request_body)
+    except UpstreamUnavailableError as exc:
+        logger.warning("LLM unavailable (%s) — returning fallback response", exc)
+        return _unavailable_response(response_json_schema)
 
     if response_json_schema:
         try:
@@ -112,7 +117,7 @@ async def invoke_llm_with_messages(
     """
     if not settings.NVIDIA_API_KEY:
         logger.warning("NVIDIA_API_KEY not set — returning mock message response")
-        return "I'm a mock assistant response. Configure NVIDIA_API_KEY for real LLM calls."
+        return _MOCK_MESSAGE
 
     request_body: dict[str, Any] = {
         "model": settings.NVIDIA_MODEL,
@@ -124,18 +129,118 @@ async def invoke_llm_with_messages(
     if response_json:
         request_body["response_format"] = {"type": "json_object"}
 
+    try:
+        return await _complete(request_body)
+    except UpstreamUnavailableError as exc:
+        logger.warning("LLM unavailable (%s) — returning fallback message", exc)
+        return _UNAVAILABLE_MESSAGE
+
+
+async def stream_llm_with_messages(
+    messages: list[dict[str, str]],
+    temperature: float = 0.7,
+    max_tokens: int = 2048,
+) -> AsyncIterator[str]:
+    """Streaming variant of :func:`invoke_llm_with_messages`: yields text deltas.
+
+    Closing the iterator early (e.g. when the browser disconnects) closes the
+    upstream response, which cancels generation on the provider's side.
+    Streams are not retried: a retry could repeat text already sent.
+    """
+    if not settings.NVIDIA_API_KEY:
+        logger.warning("NVIDIA_API_KEY not set — streaming mock message response")
+        async for word in _stream_words(_MOCK_MESSAGE):
+            yield word
+        return
+
+    request_body: dict[str, Any] = {
+        "model": settings.NVIDIA_MODEL,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "stream": True,
+    }
+
     url = f"{settings.NVIDIA_API_BASE}/chat/completions"
     headers = {
         "Authorization": f"Bearer {settings.NVIDIA_API_KEY}",
         "Content-Type": "application/json",
+        "Accept": "text/event-stream",
     }
 
-    async with httpx.AsyncClient(timeout=LLM_TIMEOUT) as client:
-        response = await client.post(url, json=request_body, headers=headers)
+    streamed = False
+    try:
+        async with http_clients.guard("nvidia").attempt() as timeout:
+            client = http_clients.get("nvidia")
+            async with client.stream(
+                "POST", url, json=request_body, headers=headers, timeout=request_timeout(timeout)
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    payload = line[len("data:"):].strip()
+                    if payload == "[DONE]":
+                        break
+                    choices = json.loads(payload).get("choices") or [{}]
+                    delta = (choices[0].get("delta") or {}).get("content")
+                    if delta:
+                        streamed = True
+                        yield delta
+                    remaining = time_remaining()
+                    if remaining is not None and remaining <= 0:
+                        raise DeadlineExceededError("request deadline passed mid-stream")
+    except UpstreamUnavailableError as exc:
+        if streamed:
+            raise
+        logger.warning("LLM unavailable (%s) — streaming fallback message", exc)
+        async for word in _stream_words(_UNAVAILABLE_MESSAGE):
+            yield word
+
+
+def is_fallback(text: str) -> bool:
+    """Whether ``text`` is the mock or "unavailable" stand-in rather than a completion."""
+    return text in (_MOCK_MESSAGE, _UNAVAILABLE_MESSAGE)
+
+
+async def _complete(request_body: dict[str, Any]) -> str:
+    """Message text of a chat completion, from the LLM cache when the request allows it."""
+    if llm_cache.is_cacheable(request_body):
+        return await llm_cache.get_or_complete(request_body, lambda: _post_completion(request_body))
+    return await _post_completion(request_body)
+
+
+async def _post_completion(request_body: dict[str, Any]) -> str:
+    """POST a chat completion through the upstream guard and return the message text."""
+    url = f"{settings.NVIDIA_API_BASE}/chat/completions"
+    headers = {
+        "Authorization": f"Bearer {settings.NVIDIA_API_KEY}",
+        "Content-Type": "application/json",
+    }
+
+    async def send(timeout: float) -> str:
+        response = await http_clients.get("nvidia").post(
+            url, json=request_body, headers=headers, timeout=request_timeout(timeout)
+        )
         response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
 
-    data = response.json()
-    return data["choices"][0]["message"]["content"]
+    # Completions have no side effects, so a failed attempt is safe to repeat.
+    return await http_clients.guard("nvidia").call(send, idempotent=True)
+
+
+async def _stream_words(text: str) -> AsyncIterator[str]:
+    words = text.split(" ")
+    yield words[0]
+    for word in words[1:]:
+        yield " " + word
+
+
+def _unavailable_response(schema: dict[str, Any] | None) -> dict[str, Any]:
+    """Fallback when the LLM can't be called; callers keep their defaults for structured output."""
+    if schema:
+        return {"unavailable": True}
+    return {"text": _UNAVAILABLE_MESSAGE, "unavailable": True}
 
 
 def _mock_response(prompt: str, schema: dict[str, Any] | None) -> dict[str, Any]:
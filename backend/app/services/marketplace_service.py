@@ -0,0 +1,626 @@
+"""Marketplace service — public browse queries for venues and service providers.
+
+Handles:
+- Browse queries over the `marketplace_listings` read model: one row per
+  approved venue or provider with the card payload, rating aggregates, price
+  bounds, facet columns and search document precomputed, so filtering,
+  sorting and pagination read a single table
+- Typed price / venue-type / capacity filters and rating filters and sorts
+- Amenity containment filters (match all / match any) and service category
+  filters served by GIN indexes
+- Free-text search against the listing search document
+- "Describe what you want" search: listings ranked by semantic similarity
+  to a description, under the same filters as browsing
+- Radius search and distance sort around a lat/lng, and expanding a text
+  city to nearby cities via `city_centroids`
+- Facet counts (city, capacity, price, amenity, type, rating) for the current
+  filters in one GROUPING SETS query, cached briefly per normalized filter
+- Date availability filters checked against per-year availability bitmaps
+- Shaping rows into the card payloads returned by /api/marketplace/*
+"""
+
+import logging
+from datetime import date
+from typing import Any
+
+from sqlalchemy import Numeric, Select, cast, func, literal_column, null, select, true
+from sqlalchemy.dialects.postgresql import ARRAY, array
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import AppCache, normalize_params
+from app.core.config import settings
+from app.models.marketplace_listing import SEARCH_CONFIG, MarketplaceListing
+from app.services import availability_service, geo, retrieval_service
+from app.services.availability_service import MatchMode
+from app.utils.exceptions import BadRequestError
+
+logger = logging.getLogger(__name__)
+
+Listing = MarketplaceListing
+
+# Facet bucket lower edges; each bucket runs up to the next edge.
+CAPACITY_BUCKETS = (0, 50, 100, 250, 500, 1000)
+PRICE_BUCKETS = (0, 500, 1000, 2500, 5000, 10000)
+RATING_BANDS = (0, 1, 2, 3, 4, 4.5)
+
+_facet_cache = AppCache(
+    "marketplace-facets",
+    maxsize=settings.MARKETPLACE_FACETS_CACHE_SIZE,
+    ttl=settings.MARKETPLACE_FACETS_CACHE_TTL_SECONDS,
+    tags=("vendors",),
+)
+
+
+async def list_venues(
+    db: AsyncSession,
+    *,
+    q: str | None = None,
+    city: str | None = None,
+    min_capacity: int | None = None,
+    max_capacity: int | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    venue_type: str | None = None,
+    amenities: list[str] | None = None,
+    amenities_match: str = "all",
+    min_rating: float | None = None,
+    lat: float | None = None,
+    lng: float | None = None,
+    radius_km: float | None = None,
+    available_dates: list[date] | None = None,
+    availability_match: MatchMode = "any",
+    sort_by: str = "newest",
+    limit: int = 20,
+    offset: int = 0,
+) -> list[dict[str, Any]]:
+    """Return one page of approved venue cards."""
+    query = build_venue_query(
+        q=q,
+        city=city,
+        min_capacity=min_capacity,
+        max_capacity=max_capacity,
+        min_price=min_price,
+        max_price=max_price,
+        venue_type=venue_type,
+        amenities=amenities,
+        amenities_match=amenities_match,
+        min_rating=min_rating,
+        lat=lat,
+        lng=lng,
+        radius_km=radius_km,
+        available_dates=available_dates,
+        availability_match=availability_match,
+        sort_by=sort_by,
+    )
+    result = await db.execute(query.limit(limit).offset(offset))
+    return [_card(row, price_from=_price(row.price_min)) for row in result.all()]
+
+
+async def venue_amenity_facets(
+    db: AsyncSession,
+    *,
+    limit: int = 50,
+    **filters: Any,
+) -> list[dict[str, Any]]:
+    """Count venues per amenity across the whole filtered result set.
+
+    Accepts the same filters as :func:`list_venues`; pagination and sorting
+    don't apply since facets describe every matching venue, not one page.
+    """
+    result = await db.execute(build_venue_amenity_facet_query(limit=limit, **filters))
+    return [{"value": row.amenity, "count": row.count} for row in result.all()]
+
+
+async def list_service_providers(
+    db: AsyncSession,
+    *,
+    q: str | None = None,
+    service_type: str | None = None,
+    city: str | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    min_rating: float | None = None,
+    lat: float | None = None,
+    lng: float | None = None,
+    radius_km: float | None = None,
+    available_dates: list[date] | None = None,
+    availability_match: MatchMode = "any",
+    sort_by: str = "newest",
+    limit: int = 20,
+    offset: int = 0,
+) -> list[dict[str, Any]]:
+    """Return one page of approved service provider cards."""
+    query = build_service_provider_query(
+        q=q,
+        service_type=service_type,
+        city=city,
+        min_price=min_price,
+        max_price=max_price,
+        min_rating=min_rating,
+        lat=lat,
+        lng=lng,
+        radius_km=radius_km,
+        available_dates=available_dates,
+        availability_match=availability_match,
+        sort_by=sort_by,
+    )
+    result = await db.execute(query.limit(limit).offset(offset))
+    return [
+        _card(row, price_min=_price(row.price_min), price_max=_price(row.price_max))
+        for row in result.all()
+    ]
+
+
+async def venue_facets(db: AsyncSession, **filters: Any) -> dict[str, Any]:
+    """Facet counts over all approved venues matching ``filters``.
+
+    Accepts the browse filters of :func:`list_venues`. Results are cached
+    for a few seconds per normalized filter set.
+    """
+    filters.pop("sort_by", None)
+
+    async def compute() -> dict[str, Any]:
+        result = await db.execute(build_venue_facet_query(**filters))
+        return _collect_facets(result.all(), VENUE_FACETS)
+
+    return await _facet_cache.get_or_set(("venues", normalize_params(filters)), compute)
+
+
+async def service_provider_facets(db: AsyncSession, **filters: Any) -> dict[str, Any]:
+    """Facet counts over all approved service providers matching ``filters``."""
+    filters.pop("sort_by", None)
+
+    async def compute() -> dict[str, Any]:
+        result = await db.execute(build_service_provider_facet_query(**filters))
+        return _collect_facets(result.all(), PROVIDER_FACETS)
+
+    return await _facet_cache.get_or_set(("services", normalize_params(filters)), compute)
+
+
+# ---------------------------------------------------------------------------
+# Query builders
+# ---------------------------------------------------------------------------
+
+
+async def describe_venues(
+    db: AsyncSession,
+    description: str,
+    *,
+    limit: int = 20,
+    offset: int = 0,
+    **filters: Any,
+) -> list[dict[str, Any]]:
+    """Venue cards most similar to ``description`` among those matching ``filters``.
+
+    Accepts the filters of :func:`list_venues`; cards carry a ``similarity``.
+    """
+    filters.pop("sort_by", None)
+    ranked = retrieval_service.nearest(build_venue_query(**filters), "venue", Listing.entity_id, description)
+    if ranked is None:
+        raise BadRequestError("Describe what you are looking for in a few words")
+    rows = await retrieval_service.fetch_nearest(db, ranked, limit, offset)
+    return [_card(row, price_from=_price(row.price_min), similarity=_similarity(row.similarity)) for row in rows]
+
+
+async def describe_service_providers(
+    db: AsyncSession,
+    description: str,
+    *,
+    limit: int = 20,
+    offset: int = 0,
+    **filters: Any,
+) -> list[dict[str, Any]]:
+    """Service provider cards most similar to ``description`` among those matching ``filters``."""
+    filters.pop("sort_by", None)
+    ranked = retrieval_service.nearest(
+        build_service_provider_query(**filters), "service_provider", Listing.entity_id, description
+    )
+    if ranked is None:
+        raise BadRequestError("Describe what you are looking for in a few words")
+    rows = await retrieval_service.fetch_nearest(db, ranked, limit, offset)
+    return [
+        _card(
+            row,
+            price_min=_price(row.price_min),
+            price_max=_price(row.price_max),
+            similarity=_similarity(row.similarity),
+        )
+        for row in rows
+    ]
+
+
+def build_venue_query(
+    q: str | None = None,
+    city: str | None = None,
+    min_capacity: int | None = None,
+    max_capacity: int | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    venue_type: str | None = None,
+    amenities: list[str] | None = None,
+    amenities_match: str = "all",
+    min_rating: float | None = None,
+    lat: float | None = None,
+    lng: float | None = None,
+    radius_km: float | None = None,
+    available_dates: list[date] | None = None,
+    availability_match: MatchMode = "any",
+    sort_by: str = "newest",
+) -> Select:
+    """Build the venue browse query over venue listings (without pagination).
+
+    With ``lat``/``lng`` the query keeps venues within ``radius_km`` and
+    projects ``distance_km``; listings carry the venue's own coordinates or,
+    failing that, its city's centroid.
+    """
+    query, distance = _browse_query(
+        "venue",
+        q=q,
+        city=city,
+        min_price=min_price,
+        max_price=max_price,
+        min_rating=min_rating,
+        lat=lat,
+        lng=lng,
+        radius_km=radius_km,
+        available_dates=available_dates,
+        availability_match=availability_match,
+    )
+
+    if min_capacity is not None:
+        query = query.where(Listing.capacity >= min_capacity)
+    if max_capacity is not None:
+        query = query.where(Listing.capacity <= max_capacity)
+
+    if venue_type:
+        query = query.where(Listing.venue_type == venue_type.strip().lower())
+
+    if amenities:
+        query = query.where(_has_amenities(amenities, amenities_match))
+
+    if sort_by == "capacity":
+        return query.order_by(Listing.capacity.desc().nulls_last(), Listing.created_at.desc())
+    return _order_by(query, sort_by, distance, q)
+
+
+def build_venue_amenity_facet_query(limit: int = 50, **filters: Any) -> Select:
+    """Build the amenity facet query: ``(amenity, count)`` over filtered venues."""
+    filters.pop("sort_by", None)
+    matching = (
+        build_venue_query(**filters)
+        .with_only_columns(Listing.amenities)
+        .order_by(None)
+        .subquery("matching")
+    )
+    amenity = (
+        func.jsonb_array_elements_text(matching.c.amenities)
+        .table_valued("amenity")
+        .render_derived()
+        .lateral("amenity_values")
+    )
+    count = func.count().label("count")
+    return (
+        select(amenity.c.amenity, count)
+        .select_from(matching.join(amenity, true()))
+        .group_by(amenity.c.amenity)
+        .order_by(count.desc(), amenity.c.amenity)
+        .limit(limit)
+    )
+
+
+def build_service_provider_query(
+    q: str | None = None,
+    service_type: str | None = None,
+    city: str | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    min_rating: float | None = None,
+    lat: float | None = None,
+    lng: float | None = None,
+    radius_km: float | None = None,
+    available_dates: list[date] | None = None,
+    availability_match: MatchMode = "any",
+    sort_by: str = "newest",
+) -> Select:
+    """Build the service provider browse query over provider listings.
+
+    Offered services are already aggregated into each listing's card, and
+    providers are placed at their city's centroid for radius search.
+    """
+    query, distance = _browse_query(
+        "service_provider",
+        q=q,
+        city=city,
+        min_price=min_price,
+        max_price=max_price,
+        min_rating=min_rating,
+        lat=lat,
+        lng=lng,
+        radius_km=radius_km,
+        available_dates=available_dates,
+        availability_match=availability_match,
+    )
+
+    if service_type:
+        query = query.where(Listing.categories.contains([service_type.strip().lower()]))
+
+    return _order_by(query, sort_by, distance, q)
+
+
+def build_venue_facet_query(**filters: Any) -> Select:
+    """Build the venue facet query: one GROUPING SETS pass over the filtered set.
+
+    Each output row belongs to exactly one facet (or the grand total); the
+    ``g_*`` columns are ``GROUPING()`` flags saying which.
+    """
+    matching = (
+        build_venue_query(**filters)
+        .with_only_columns(
+            Listing.entity_id,
+            Listing.city,
+            _bucket_index(Listing.capacity, CAPACITY_BUCKETS).label("capacity"),
+            _bucket_index(Listing.price_min, PRICE_BUCKETS).label("price"),
+            Listing.venue_type,
+            _bucket_index(Listing.avg_rating, RATING_BANDS).label("rating"),
+            Listing.amenities,
+        )
+        .order_by(None)
+        .subquery("matching")
+    )
+    amenity = (
+        func.jsonb_array_elements_text(matching.c.amenities)
+        .table_valued("amenity")
+        .render_derived()
+        .lateral("amenity_values")
+    )
+    dimensions = [
+        matching.c.city,
+        matching.c.capacity,
+        matching.c.price,
+        amenity.c.amenity,
+        matching.c.venue_type,
+        matching.c.rating,
+    ]
+    return _grouping_sets_query(matching.outerjoin(amenity, true()), matching.c.entity_id, dimensions)
+
+
+def build_service_provider_facet_query(**filters: Any) -> Select:
+    """Build the provider facet query (city, price, service category, rating)."""
+    matching = (
+        build_service_provider_query(**filters)
+        .with_only_columns(
+            Listing.entity_id,
+            Listing.city,
+            _bucket_index(Listing.price_min, PRICE_BUCKETS).label("price"),
+            _bucket_index(Listing.avg_rating, RATING_BANDS).label("rating"),
+            Listing.categories,
+        )
+        .order_by(None)
+        .subquery("matching")
+    )
+    category = (
+        func.unnest(matching.c.categories)
+        .table_valued("category")
+        .render_derived()
+        .lateral("category_values")
+    )
+    dimensions = [matching.c.city, matching.c.price, category.c.category, matching.c.rating]
+    source = matching.outerjoin(category, true())
+    return _grouping_sets_query(source, matching.c.entity_id, dimensions)
+
+
+def _browse_query(
+    listing_type: str,
+    *,
+    q: str | None,
+    city: str | None,
+    min_price: float | None,
+    max_price: float | None,
+    min_rating: float | None,
+    lat: float | None,
+    lng: float | None,
+    radius_km: float | None,
+    available_dates: list[date] | None,
+    availability_match: MatchMode,
+) -> tuple[Select, Any]:
+    """Card columns of one listing type with the filters both types share.
+
+    Returns the query and the distance expression (None without an origin).
+    """
+    has_origin = _has_origin(lat, lng)
+    distance = null()
+    if has_origin:
+        distance = geo.distance_km_sql(Listing.lat, Listing.lng, lat, lng)
+
+    query = select(
+        Listing.entity_id,
+        Listing.name,
+        Listing.city,
+        Listing.capacity,
+        Listing.price_min,
+        Listing.price_max,
+        Listing.avg_rating,
+        Listing.review_count,
+        Listing.card,
+        distance.label("distance_km"),
+    ).where(Listing.listing_type == listing_type)
+
+    if q and q.strip():
+        query = query.where(Listing.search_document.op("@@")(_search_query(q)))
+
+    if has_origin:
+        radius = radius_km or settings.GEO_DEFAULT_RADIUS_KM
+        box = geo.bounding_box(lat, lng, radius)
+        # Index-assisted prefilter, then the exact great-circle distance.
+        query = query.where(geo.in_box(Listing.lat, Listing.lng, box), distance <= radius)
+
+    if city:
+        query = query.where(geo.city_matches(Listing.city, city, _city_radius(radius_km, has_origin)))
+
+    # A listing matches when its price range overlaps the requested one; an
+    # open-ended quote (no max) overlaps any upper bound above its min, and
+    # unpriced listings drop out. Venues have a single headline price.
+    if min_price is not None:
+        query = query.where(func.coalesce(Listing.price_max, Listing.price_min) >= min_price)
+    if max_price is not None:
+        query = query.where(Listing.price_min <= max_price)
+
+    if available_dates:
+        query = query.where(
+            availability_service.availability_filter(
+                listing_type, Listing.entity_id, available_dates, availability_match
+            )
+        )
+
+    if min_rating is not None:
+        # Unrated listings count as 0 so they drop out of any positive threshold.
+        query = query.where(func.coalesce(Listing.avg_rating, 0) >= min_rating)
+
+    return query, distance if has_origin else None
+
+
+def _order_by(query: Select, sort_by: str, distance: Any, q: str | None) -> Select:
+    if sort_by == "rating":
+        return query.order_by(
+            Listing.avg_rating.desc().nulls_last(),
+            Listing.review_count.desc(),
+            Listing.created_at.desc(),
+        )
+    if sort_by == "price":
+        return query.order_by(Listing.price_min.asc().nulls_last(), Listing.created_at.desc())
+    if sort_by == "distance" and distance is not None:
+        return query.order_by(distance.asc(), Listing.created_at.desc())
+    if sort_by == "relevance" and q and q.strip():
+        rank = func.ts_rank(Listing.search_document, _search_query(q))
+        return query.order_by(rank.desc(), Listing.created_at.desc())
+    # newest is default
+    return query.order_by(Listing.created_at.desc())
+
+
+def _search_query(q: str) -> Any:
+    return func.websearch_to_tsquery(SEARCH_CONFIG, q.strip())
+
+
+def _grouping_sets_query(source: Any, entity_id: Any, dimensions: list[Any]) -> Select:
+    # Joins to multi-valued facets (amenities, categories) repeat rows, so
+    # every facet counts distinct entities.
+    return (
+        select(
+            *dimensions,
+            *(func.grouping(dim).label(f"g_{i}") for i, dim in enumerate(dimensions)),
+            func.count(entity_id.distinct()).label("count"),
+        )
+        .select_from(source)
+        .group_by(func.grouping_sets(*dimensions, literal_column("()")))
+    )
+
+
+def _has_amenities(amenities: list[str], match: str) -> Any:
+    """JSONB containment predicate served by the amenities GIN index."""
+    if match == "any":
+        return Listing.amenities.has_any(array(amenities))
+    return Listing.amenities.contains(amenities)
+
+
+def _bucket_index(value: Any, edges: tuple[float, ...]) -> Any:
+    """1-based index of the bucket ``value`` falls in (0 below the first edge)."""
+    return func.width_bucket(value, cast(array(edges), ARRAY(Numeric)))
+
+
+# ---------------------------------------------------------------------------
+# Facet shaping
+# ---------------------------------------------------------------------------
+
+# (facet name, bucket edges or None for categorical values), in query order.
+VENUE_FACETS: list[tuple[str, tuple[float, ...] | None]] = [
+    ("city", None),
+    ("capacity", CAPACITY_BUCKETS),
+    ("price", PRICE_BUCKETS),
+    ("amenity", None),
+    ("venue_type", None),
+    ("rating", RATING_BANDS),
+]
+PROVIDER_FACETS: list[tuple[str, tuple[float, ...] | None]] = [
+    ("city", None),
+    ("price", PRICE_BUCKETS),
+    ("category", None),
+    ("rating", RATING_BANDS),
+]
+
+
+def _collect_facets(rows: list[Any], spec: list[tuple[str, tuple[float, ...] | None]]) -> dict[str, Any]:
+    """Split GROUPING SETS rows into ``{"total": n, "facets": {name: [...]}}``."""
+    facets: dict[str, list[dict[str, Any]]] = {name: [] for name, _ in spec}
+    total = 0
+    for row in rows:
+        grouped = [i for i in range(len(spec)) if getattr(row, f"g_{i}") == 0]
+        if not grouped:
+            total = row.count
+            continue
+        i = grouped[0]
+        name, edges = spec[i]
+        value = row[i]
+        if edges is None:
+            if value is not None:
+                facets[name].append({"value": value, "count": row.count})
+        else:
+            facets[name].append({**_bucket_range(value, edges), "count": row.count})
+
+    for name, edges in spec:
+        if edges is None:
+            facets[name].sort(key=lambda item: (-item["count"], str(item["value"])))
+        else:
+            facets[name].sort(key=lambda item: (item["min"] is None, item["min"] or 0))
+    return {"total": total, "facets": facets}
+
+
+def _bucket_range(index: int | None, edges: tuple[float, ...]) -> dict[str, Any]:
+    """``{"min", "max"}`` for a ``width_bucket`` index; max is exclusive."""
+    if index is None or index < 1:
+        # No value (unpriced / unrated), or below the first edge.
+        return {"min": None, "max": None}
+    upper = edges[index] if index < len(edges) else None
+    return {"min": edges[index - 1], "max": upper}
+
+
+def _has_origin(lat: float | None, lng: float | None) -> bool:
+    if (lat is None) != (lng is None):
+        raise BadRequestError("lat and lng must be provided together")
+    return lat is not None
+
+
+def _city_radius(radius_km: float | None, has_origin: bool) -> float:
+    """Radius for expanding a text city to nearby cities.
+
+    Without a lat/lng, ``radius_km`` means "within this distance of the city".
+    """
+    if radius_km is not None and not has_origin:
+        return radius_km
+    return settings.CITY_EXPANSION_RADIUS_KM
+
+
+def _card(row: Any, **typed: Any) -> dict[str, Any]:
+    """Listing card payload plus its typed, rating and distance fields."""
+    return {
+        **row.card,
+        **typed,
+        "avg_rating": _rating(row.avg_rating),
+        "review_count": row.review_count or 0,
+        "distance_km": _distance(row.distance_km),
+    }
+
+
+def _rating(avg: Any) -> float | None:
+    return round(float(avg), 2) if avg is not None else None
+
+
+def _price(value: Any) -> float | None:
+    return float(value) if value is not None else None
+
+
+def _distance(value: Any) -> float | None:
+    return round(float(value), 2) if value is not None else None
+
+
+def _similarity(value: Any) -> float:
+    return round(float(value), 4)
@@ -0,0 +1,152 @@
+"""Match scoring service — rank venue and provider candidates against a brief.
+
+Handles:
+- Turning candidate rows into one NumPy column per scored field
+- Per-criterion fit scores in [0, 1]: capacity vs guest count, price vs the
+  budget share, rating (shrunk toward a prior for few reviews), distance
+  within the search radius, availability on the requested dates and
+  semantic relevance to the brief
+- A weighted mean over the criteria the brief and candidates give a basis
+  for, and the top-k candidates by it
+
+Everything is vectorized, so a few thousand candidates score in well under
+a millisecond; the planner can pull a broad candidate set in one query and
+keep only the best for the LLM prompt.
+"""
+
+import logging
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CRITERIA = ("capacity", "price", "rating", "distance", "availability", "relevance")
+
+# Row attributes read for scoring; missing or NULL values become NaN.
+FIELDS = ("capacity", "price_min", "avg_rating", "review_count", "distance_km", "blocked_days", "similarity")
+
+# A venue is a full fit from this share of its capacity up to all of it.
+IDEAL_FILL = 0.8
+# Ratings are averaged with this many reviews at the prior rating.
+RATING_PRIOR = 3.5
+RATING_PRIOR_REVIEWS = 5
+MAX_RATING = 5.0
+# Score given where one candidate lacks a value others have (e.g. unpriced).
+NEUTRAL_SCORE = 0.5
+
+
+@dataclass(frozen=True)
+class MatchRequest:
+    """What the brief asks of a candidate; None leaves a criterion out."""
+
+    guest_count: int | None = None
+    price_target: float | None = None
+    radius_km: float | None = None
+    requested_days: int = 0
+
+
+def default_weights() -> dict[str, float]:
+    """Criterion weights from settings (``PLANNER_WEIGHT_*``)."""
+    return {name: getattr(settings, f"PLANNER_WEIGHT_{name.upper()}") for name in CRITERIA}
+
+
+# ---------------------------------------------------------------------------
+# Scoring
+# ---------------------------------------------------------------------------
+
+
+def columns(rows: Sequence[Any]) -> dict[str, np.ndarray]:
+    """One float array per scored field of ``rows``."""
+    return {
+        name: np.fromiter((_number(getattr(row, name, None)) for row in rows), dtype=np.float64, count=len(rows))
+        for name in FIELDS
+    }
+
+
+def criterion_scores(cols: Mapping[str, np.ndarray], request: MatchRequest) -> dict[str, np.ndarray]:
+    """Fit of each candidate per criterion, in [0, 1].
+
+    Criteria without a basis in the request are left out; NaN marks a
+    candidate missing the value a criterion needs.
+    """
+    scores: dict[str, np.ndarray] = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if request.guest_count:
+            fill = request.guest_count / cols["capacity"]
+            # Too small scores 0; oversized venues lose fit as they empty out.
+            scores["capacity"] = np.where(fill > 1, 0.0, np.minimum(fill / IDEAL_FILL, 1.0))
+        if request.price_target:
+            price = cols["price_min"]
+            scores["price"] = np.where(price > 0, np.minimum(request.price_target / price, 1.0), 1.0)
+            scores["price"][np.isnan(price)] = np.nan
+        reviews = np.nan_to_num(cols["review_count"])
+        rated = np.where(np.isnan(cols["avg_rating"]), 0.0, cols["avg_rating"] * reviews)
+        scores["rating"] = (rated + RATING_PRIOR * RATING_PRIOR_REVIEWS) / (reviews + RATING_PRIOR_REVIEWS) / MAX_RATING
+        if request.radius_km:
+            scores["distance"] = np.clip(1.0 - cols["distance_km"] / request.radius_km, 0.0, 1.0)
+        if request.requested_days:
+            scores["availability"] = np.clip(1.0 - cols["blocked_days"] / request.requested_days, 0.0, 1.0)
+        scores["relevance"] = np.clip(cols["similarity"], 0.0, 1.0)
+    return scores
+
+
+def score(
+    cols: Mapping[str, np.ndarray],
+    request: MatchRequest,
+    weights: Mapping[str, float] | None = None,
+) -> np.ndarray:
+    """Weighted mean of the criteria that apply; one score per candidate.
+
+    A criterion no candidate has a value for is skipped rather than scored
+    neutral, so it doesn't dilute the others.
+    """
+    weights = default_weights() if weights is None else weights
+    size = len(next(iter(cols.values()))) if cols else 0
+    total = np.zeros(size)
+    weight_sum = 0.0
+    for name, values in criterion_scores(cols, request).items():
+        weight = weights.get(name, 0.0)
+        if weight <= 0 or not size:
+            continue
+        missing = np.isnan(values)
+        if missing.all():
+            continue
+        total += weight * np.where(missing, NEUTRAL_SCORE, values)
+        weight_sum += weight
+    return total / weight_sum if weight_sum else total
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` best scores, best first; ties keep input order."""
+    if k <= 0 or not len(scores):
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        # Keep everything tied with the k-th best, so input order breaks ties.
+        cutoff = np.partition(scores, len(scores) - k)[len(scores) - k]
+        candidates = np.flatnonzero(scores >= cutoff)
+    else:
+        candidates = np.arange(len(scores))
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order[:k]]
+
+
+def best(
+    rows: Sequence[Any],
+    request: MatchRequest,
+    k: int,
+    weights: Mapping[str, float] | None = None,
+) -> list[Any]:
+    """The ``k`` rows that best fit ``request``, best first."""
+    if not rows:
+        return []
+    scores = score(columns(rows), request, weights)
+    return [rows[index] for index in top_k(scores, k)]
+
+
+def _number(value: Any) -> float:
+    return np.nan if value is None else float(value)
@@ -0,0 +1,407 @@
+"""Plan engine — deterministic event plans from a brief, template priors and matched vendors.
+
+Handles:
+- The plan's basis: the brief's numbers, the best-matched venue and providers,
+  and the budget shares and run of show of the closest public template
+- Budget split: line items from the template's shares (or event-type
+  defaults), anchored to the matched venue's price, plus the platform fee,
+  never exceeding the user's budget
+- Space plan inventory (chairs, tables, stage, buffet) per event type
+- KPIs: total cost, cost per attendee and a confidence that rises with how
+  much of the plan rests on real listings and template priors
+- A phase timeline: setup sized to the guest count, the template's program
+  (or a default one) and teardown
+- Recomputing a plan from its basis after edits such as a new guest count
+
+Pure functions without I/O, so plans build in well under a millisecond; the
+LLM only writes the title and summary (see ``planner_service``).
+"""
+
+import logging
+import math
+import re
+import uuid
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.config import settings
+from app.services.brief_extractor import parse_amount
+
+logger = logging.getLogger(__name__)
+
+# Brief fields a plan can be recomputed for without matching vendors again.
+RECOMPUTED_FIELDS = ("guestCount", "budget")
+
+# Line-item shares of the spend after the platform fee, without a template.
+DEFAULT_SHARES = {
+    "Venue": 35,
+    "Catering": 25,
+    "Entertainment": 15,
+    "Decor": 10,
+    "Miscellaneous": 5,
+}
+PLATFORM_FEE_LABEL = "Platform Fee"
+# A venue priced above its share may take up to this much of the spend.
+MAX_VENUE_SHARE = 0.6
+# Providers kept in the basis (best first).
+BASIS_PROVIDERS = 5
+
+SPARE_CHAIR_RATE = 0.05
+# Setup time before the first guests arrive: a base plus a slice per 100 guests.
+SETUP_BASE_MINUTES = 90
+SETUP_MINUTES_PER_100_GUESTS = 30
+MAX_SETUP_MINUTES = 300
+TEARDOWN_AFTER_MINUTES = 60
+
+
+@dataclass(frozen=True)
+class Layout:
+    seats_per_table: int
+    stage: bool
+    buffet: bool
+
+
+LAYOUTS = {
+    "wedding": Layout(seats_per_table=8, stage=True, buffet=False),
+    "corporate": Layout(seats_per_table=10, stage=True, buffet=False),
+    "conference": Layout(seats_per_table=6, stage=True, buffet=True),
+    "birthday": Layout(seats_per_table=8, stage=False, buffet=True),
+}
+DEFAULT_LAYOUT = Layout(seats_per_table=8, stage=False, buffet=True)
+
+# (minutes after arrival, title, notes) when no template gives a program.
+DEFAULT_PROGRAM_START = 10 * 60
+DEFAULT_PROGRAM = (
+    (0, "Guest Arrival", "Welcome and registration"),
+    (120, "Main Event", "{event} program"),
+    (300, "Wrap Up", "Closing remarks and farewells"),
+)
+
+_CLOCK = re.compile(r"^\s*(\d{1,2})(?::(\d{2}))?\s*([ap]\.?m\.?)?\s*$", re.IGNORECASE)
+
+
+# ---------------------------------------------------------------------------
+# Basis
+# ---------------------------------------------------------------------------
+
+
+def plan_basis(
+    draft_brief: Mapping[str, Any],
+    venues: Sequence[Any],
+    providers: Sequence[Any],
+    template: Any | None = None,
+) -> dict[str, Any]:
+    """Everything a plan is computed from, as a JSON-ready dict stored with the plan.
+
+    ``venues`` and ``providers`` are matched listings, best first; ``template``
+    is the closest public template, if any.
+    """
+    venue = venues[0] if venues else None
+    template_data = (template.template_data or {}) if template is not None else {}
+    return {
+        "eventType": str(draft_brief.get("eventType") or "event"),
+        "guestCount": _count(draft_brief.get("guestCount"), default=50),
+        "budget": _amount(draft_brief.get("budget")) or 5000.0,
+        "city": draft_brief.get("city") or "",
+        "dateRange": draft_brief.get("dateRange") or "TBD",
+        "venue": _vendor(venue, capacity=True) if venue is not None else None,
+        "providers": [_vendor(provider) for provider in providers[:BASIS_PROVIDERS]],
+        "templateId": str(template.id) if template is not None else None,
+        "shares": template_shares(template_data),
+        "program": template_program(template_data),
+    }
+
+
+def template_shares(template_data: Mapping[str, Any]) -> dict[str, float] | None:
+    """Budget line items of a template as ``{label: weight}``, without its platform fee.
+
+    Reads ``budget.breakdown`` entries with an ``amount`` ("$8,000" or a
+    number) or a ``pct``.
+    """
+    budget = template_data.get("budget")
+    breakdown = budget.get("breakdown") if isinstance(budget, dict) else None
+    shares: dict[str, float] = {}
+    for line in breakdown if isinstance(breakdown, list) else ():
+        if not isinstance(line, dict) or not line.get("label"):
+            continue
+        label = str(line["label"])
+        if label.strip().lower() == PLATFORM_FEE_LABEL.lower():
+            continue
+        weight = _amount(line.get("amount", line.get("pct")))
+        if weight:
+            shares[label] = shares.get(label, 0.0) + weight
+    return shares or None
+
+
+def template_program(template_data: Mapping[str, Any]) -> list[dict[str, str]] | None:
+    """A template's run of show as ``[{time: "HH:MM", title, notes}]``, in its own order."""
+    timeline = template_data.get("timeline")
+    program = []
+    for item in timeline if isinstance(timeline, list) else ():
+        if not isinstance(item, dict) or not item.get("title"):
+            continue
+        minutes = parse_clock(item.get("time"))
+        if minutes is None:
+            continue
+        notes = item.get("notes") or item.get("description") or ""
+        program.append({"time": format_clock(minutes), "title": str(item["title"]), "notes": str(notes)})
+    return program or None
+
+
+# ---------------------------------------------------------------------------
+# Plan
+# ---------------------------------------------------------------------------
+
+
+def build_plan(
+    basis: Mapping[str, Any],
+    *,
+    title: str | None = None,
+    summary: str | None = None,
+    blueprint_id: str | None = None,
+    status: str = "draft",
+) -> dict[str, Any]:
+    """The PlannerState for ``basis``; title and summary default to plain ones."""
+    default_title, default_summary = default_prose(basis)
+    budget = budget_split(basis)
+    guest_count = basis["guestCount"]
+    return {
+        "blueprintId": blueprint_id or str(uuid.uuid4()),
+        "title": title or default_title,
+        "summary": summary or default_summary,
+        "kpis": {
+            "totalCost": budget["totalCost"],
+            "costPerAttendee": round(budget["totalCost"] / max(guest_count, 1), 2),
+            "confidencePct": confidence(basis),
+        },
+        "spacePlan": space_plan(basis),
+        "timeline": timeline(basis),
+        "budget": {
+            "total": basis["budget"],
+            "breakdown": budget["breakdown"],
+            "tradeoffNote": " ".join(filter(None, (capacity_note(basis), budget["tradeoffNote"]))) or None,
+        },
+        "status": status,
+        "basis": dict(basis),
+    }
+
+
+def recompute(plan: Mapping[str, Any], changes: Mapping[str, Any]) -> dict[str, Any]:
+    """``plan`` rebuilt for edited brief fields (see ``RECOMPUTED_FIELDS``).
+
+    Keeps the plan's id, prose and status; plans without a basis (built
+    before the engine) are returned unchanged.
+    """
+    basis = plan.get("basis")
+    if not isinstance(basis, dict):
+        return dict(plan)
+    updated = dict(basis)
+    if changes.get("guestCount") is not None:
+        updated["guestCount"] = _count(changes["guestCount"], default=basis["guestCount"])
+    if changes.get("budget") is not None:
+        updated["budget"] = _amount(changes["budget"]) or basis["budget"]
+    return build_plan(
+        updated,
+        title=plan.get("title"),
+        summary=plan.get("summary"),
+        blueprint_id=plan.get("blueprintId"),
+        status=plan.get("status") or "draft",
+    )
+
+
+def brief_changes(before: Mapping[str, Any], after: Mapping[str, Any]) -> dict[str, Any]:
+    """Recomputable brief fields whose value changed between two drafts."""
+    return {
+        field: after[field]
+        for field in RECOMPUTED_FIELDS
+        if after.get(field) is not None and after.get(field) != before.get(field)
+    }
+
+
+def budget_split(basis: Mapping[str, Any]) -> dict[str, Any]:
+    """Line items and platform fee in whole dollars, with the total cost.
+
+    The fee is the platform commission on the total, so it comes off the
+    top: line items share ``budget * (1 - commission)``. A venue priced under
+    its share leaves the rest unspent; one priced over it takes up to
+    ``MAX_VENUE_SHARE`` of the spend and the other lines shrink to fit.
+    """
+    budget = float(basis["budget"])
+    fee_rate = settings.STRIPE_PLATFORM_COMMISSION
+    spendable = budget * (1 - fee_rate)
+    weights = basis.get("shares") or DEFAULT_SHARES
+    weight_sum = sum(weights.values())
+    amounts = {label: spendable * weight / weight_sum for label, weight in weights.items()}
+
+    note = None
+    venue = basis.get("venue") or {}
+    venue_label = next((label for label in amounts if "venue" in label.lower()), None)
+    price = venue.get("price")
+    if price and venue_label:
+        planned = amounts[venue_label]
+        if price <= planned:
+            amounts[venue_label] = price
+            note = f"{venue['name']} comes in ${planned - price:,.0f} under the venue budget; that amount is left unspent."
+        else:
+            covered = min(price, max(planned, spendable * MAX_VENUE_SHARE))
+            others = spendable - planned
+            scale = (spendable - covered) / others if others else 0.0
+            amounts = {label: amount * scale for label, amount in amounts.items()}
+            amounts[venue_label] = covered
+            if covered < price:
+                note = (
+                    f"{venue['name']} asks ${price:,.0f}, more than this budget can put toward a venue; "
+                    "consider a smaller venue or a higher budget."
+                )
+            else:
+                note = f"{venue['name']} takes {covered / budget:.0%} of the budget, so other categories are scaled down."
+
+    lines = {label: math.floor(amount) for label, amount in amounts.items()}
+    spend = sum(lines.values())
+    fee = math.floor(spend * fee_rate / (1 - fee_rate) * 100) / 100 if fee_rate < 1 else 0.0
+    lines[PLATFORM_FEE_LABEL] = fee
+    return {
+        "breakdown": [
+            {"label": label, "amount": amount, "pct": round(amount / budget * 100, 1) if budget else 0.0}
+            for label, amount in lines.items()
+        ],
+        "totalCost": round(spend + fee, 2),
+        "tradeoffNote": note,
+    }
+
+
+def space_plan(basis: Mapping[str, Any]) -> dict[str, Any]:
+    """Before/after labels and the chair, table, stage and buffet counts."""
+    guest_count = basis["guestCount"]
+    layout = LAYOUTS.get(str(basis["eventType"]).strip().lower(), DEFAULT_LAYOUT)
+    tables = max(math.ceil(guest_count / layout.seats_per_table), 1)
+    venue = basis.get("venue")
+    before = "Empty venue space"
+    if venue:
+        before = f"{venue['name']}" + (f" (capacity {venue['capacity']})" if venue.get("capacity") else "")
+    after = f"{tables} tables of {layout.seats_per_table} for {guest_count} guests"
+    after += "".join(part for part, wanted in ((", stage", layout.stage), (", buffet", layout.buffet)) if wanted)
+    return {
+        "beforeLabel": before,
+        "afterLabel": after,
+        "inventory": {
+            "chairs": guest_count + math.ceil(guest_count * SPARE_CHAIR_RATE),
+            "tables": tables,
+            "stage": int(layout.stage),
+            "buffet": int(layout.buffet),
+        },
+    }
+
+
+def timeline(basis: Mapping[str, Any]) -> list[dict[str, str]]:
+    """Setup, the program, then teardown, as ``[{time, title, notes}]``."""
+    event = str(basis["eventType"]).title()
+    program = basis.get("program") or [
+        {
+            "time": format_clock(DEFAULT_PROGRAM_START + offset),
+            "title": title,
+            "notes": notes.format(event=event),
+        }
+        for offset, title, notes in DEFAULT_PROGRAM
+    ]
+    times = [minutes for minutes in (parse_clock(item.get("time")) for item in program) if minutes is not None]
+    start, end = (times[0], times[-1]) if times else (DEFAULT_PROGRAM_START, DEFAULT_PROGRAM_START)
+    guest_count = basis["guestCount"]
+    setup = min(
+        SETUP_BASE_MINUTES + SETUP_MINUTES_PER_100_GUESTS * math.ceil(guest_count / 100), MAX_SETUP_MINUTES
+    )
+    venue = basis.get("venue")
+    setup_notes = f"{venue['name']} preparation and decoration" if venue else "Venue preparation and decoration"
+    return [
+        {"time": format_clock(start - setup), "title": "Setup", "notes": setup_notes},
+        *program,
+        {"time": format_clock(end + TEARDOWN_AFTER_MINUTES), "title": "Teardown", "notes": "Breakdown and vendor load-out"},
+    ]
+
+
+def confidence(basis: Mapping[str, Any]) -> int:
+    """How much of the plan rests on real listings and priors, 20-95."""
+    score = 50
+    venue = basis.get("venue")
+    if venue:
+        score += 15
+        if venue.get("price"):
+            score += 5
+        capacity = venue.get("capacity")
+        if capacity:
+            score += 5 if capacity >= basis["guestCount"] else -15
+    score += 5 * min(len(basis.get("providers") or ()), 3)
+    if basis.get("shares") or basis.get("program"):
+        score += 10
+    return max(20, min(score, 95))
+
+
+def capacity_note(basis: Mapping[str, Any]) -> str | None:
+    """A warning when the matched venue seats fewer than the guest count."""
+    venue = basis.get("venue") or {}
+    capacity = venue.get("capacity")
+    if capacity and capacity < basis["guestCount"]:
+        return f"{venue['name']} seats {capacity}, fewer than {basis['guestCount']} guests; look for a larger venue."
+    return None
+
+
+def default_prose(basis: Mapping[str, Any]) -> tuple[str, str]:
+    """Plain title and summary, used when the LLM doesn't write them."""
+    event = str(basis["eventType"])
+    title = f"{event.title()} Event Plan"
+    summary = f"A {event} for {basis['guestCount']} guests"
+    if basis.get("city"):
+        summary += f" in {basis['city']}"
+    venue = basis.get("venue")
+    if venue:
+        summary += f" at {venue['name']}"
+    return title, summary + "."
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def parse_clock(value: Any) -> int | None:
+    """Minutes after midnight for "15:30", "3:30 PM" or "3 pm"; None otherwise."""
+    match = _CLOCK.match(str(value or ""))
+    if match is None:
+        return None
+    hour, minute, meridiem = int(match[1]), int(match[2] or 0), match[3]
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem[0].lower() == "p" else 0)
+    if hour > 23 or minute > 59:
+        return None
+    return hour * 60 + minute
+
+
+def format_clock(minutes: int) -> str:
+    minutes %= 24 * 60
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _vendor(row: Any, capacity: bool = False) -> dict[str, Any]:
+    vendor: dict[str, Any] = {"name": row.name, "price": _amount(getattr(row, "price_min", None))}
+    if capacity:
+        vendor["capacity"] = getattr(row, "capacity", None)
+    return vendor
+
+
+def _amount(value: Any) -> float | None:
+    """A positive amount from a number or a string like "$8,000" or "15k-20k"."""
+    if isinstance(value, str):
+        value = parse_amount(value)
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) and number > 0 else None
+
+
+def _count(value: Any, default: int) -> int:
+    number = _amount(value)
+    return int(number) if number and number >= 1 else default
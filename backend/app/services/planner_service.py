@@ -1,31 +1,74 @@
 """Planner service — AI-powered event planning conversation and generation.
 
 Handles:
-- Conversational requirement collection (event type, date, budget, city, guests)
-- Session persistence via the Conversation JSONB table
-- Event plan generation from collected requirements
-- Venue/provider matching via DB queries
+- Conversational requirement collection (event type, date, budget, city, guests),
+  with an optional token-streaming variant; brief fields are parsed locally and
+  only unresolved ones go to the LLM
+- Session persistence: a small header in the Conversation JSONB table plus
+  append-only turns in `planner_messages`
+- Event plan generation from collected requirements: budget, inventory, KPIs and
+  timeline computed locally (see `plan_engine`), with only the title and summary
+  written by the LLM, optionally streamed; a plan is re-priced locally when the
+  brief's guest count or budget changes
+- Venue/provider matching over marketplace listings (city expanded to nearby cities,
+  optional radius search around a lat/lng): a broad candidate set, most similar
+  to the brief first when listings have embeddings, scored on capacity, price,
+  rating, distance, availability and relevance so only the best reach the prompt
 """
 
+import asyncio
 import json
 import logging
+import time
 import uuid
-from typing import Any
+from collections.abc import AsyncIterator, Awaitable
+from datetime import date
+from typing import Any, TypeVar
 
-from sqlalchemy import select
+from sqlalchemy import Integer, Text, case, cast, func, literal, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.extra import Conversation
+from app.models.marketplace_listing import MarketplaceListing
+from app.models.planner_message import PlannerMessage
 from app.models.template import Template
-from app.models.venue import Venue
-from app.models.service_provider import ServiceProvider
-from app.services.llm_service import invoke_llm, invoke_llm_with_messages
+from app.services import (
+    availability_service,
+    brief_extractor,
+    context_window,
+    llm_service,
+    marketplace_service,
+    match_scoring,
+    plan_engine,
+    retrieval_service,
+)
+from app.services.llm_service import invoke_llm, invoke_llm_with_messages, stream_llm_with_messages
+from app.utils.exceptions import BadRequestError
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 # Fields the planner needs to collect before generating
 REQUIRED_BRIEF_FIELDS = ["eventType", "guestCount", "budget", "city", "dateRange"]
 
+SESSION_TITLE_LENGTH = 60
+
+# Inlined rather than bound so it matches the predicate of the partial index
+# ix_conversations_planner_sessions.
+_IS_PLANNER_SESSION = text("conversations.data->>'_type' = 'planner_session'")
+
+# How each brief field is described to the LLM when the local parser can't resolve it
+_BRIEF_FIELD_FORMATS = {
+    "eventType": 'string or null (e.g. "wedding", "corporate", "birthday")',
+    "guestCount": "integer or null",
+    "budget": "integer or null (in USD)",
+    "city": "string or null (US city name)",
+    "dateRange": 'string or null (e.g. "March 2026", "next Saturday")',
+}
+
 SYSTEM_PROMPT = """You are Strathwell's AI event planner. Your job is to help users plan events.
 
 CURRENT PHASE: Collecting event requirements.
@@ -51,56 +94,39 @@ STILL NEEDED:
 {missing_fields}
 """
 
-GENERATION_PROMPT = """Generate a complete event plan based on these requirements:
+SUMMARY_PROMPT = """Update the running summary of an event planning conversation.
+
+Current summary:
+{summary}
+
+New messages since that summary:
+{transcript}
+
+Write the updated summary in at most {max_words} words of plain text. Keep every
+decision, number, date, place, preference and open question; drop greetings and
+repetition.
+"""
+
+PLAN_PROSE_PROMPT = """Write the title and summary of this event plan.
 
 Event Type: {event_type}
 Guest Count: {guest_count}
 Budget: ${budget}
 City: {city}
 Date Range: {date_range}
+Planned Cost: ${total_cost}
 
-Available Venues:
+Venue:
 {venues_summary}
 
-Available Service Providers:
+Service Providers:
 {providers_summary}
 
-Generate a JSON response with this exact structure:
-{{
-  "blueprintId": "<uuid>",
-  "title": "<event title>",
-  "summary": "<2-3 sentence summary>",
-  "kpis": {{
-    "totalCost": <number>,
-    "costPerAttendee": <number>,
-    "confidencePct": <0-100>
-  }},
-  "spacePlan": {{
-    "beforeLabel": "<venue before description>",
-    "afterLabel": "<planned setup description>",
-    "inventory": {{
-      "chairs": <number>,
-      "tables": <number>,
-      "stage": <0 or 1>,
-      "buffet": <0 or 1>
-    }}
-  }},
-  "timeline": [
-    {{"time": "<HH:MM>", "title": "<activity>", "notes": "<details>"}}
-  ],
-  "budget": {{
-    "total": <number>,
-    "breakdown": [
-      {{"label": "<category>", "pct": <percentage>}}
-    ],
-    "tradeoffNote": "<optional cost-saving suggestion>"
-  }},
-  "status": "draft"
-}}
-
-Include a 10% platform fee in the budget breakdown labeled "Platform Fee".
-The total should not exceed the user's budget.
-Timeline should include setup, main event phases, and breakdown.
+Run of Show:
+{timeline}
+
+Reply with the title (at most 8 words) on the first line and a 2-3 sentence
+summary on the next. Plain text only: no JSON, labels or markdown.
 """
 
 
@@ -123,154 +149,272 @@ async def handle_message(
     """
     current_brief = draft_brief or {}
     current_status = brief_status or "collecting"
-
-    # Build the LLM conversation
-    collected = {k: v for k, v in current_brief.items() if v is not None}
-    missing = [f for f in REQUIRED_BRIEF_FIELDS if f not in collected or collected[f] is None]
-
-    system_msg = SYSTEM_PROMPT.format(
-        collected_fields=json.dumps(collected, indent=2) if collected else "None yet",
-        missing_fields=", ".join(missing) if missing else "ALL COLLECTED",
-    )
-
-    llm_messages: list[dict[str, str]] = [{"role": "system", "content": system_msg}]
-
-    # Add conversation history (last 20 messages max for context window)
-    for msg in messages[-20:]:
-        role = msg.get("role", "user")
-        text = msg.get("text", "")
-        if role in ("user", "assistant"):
-            llm_messages.append({"role": role, "content": text})
-
-    llm_messages.append({"role": "user", "content": user_text})
-
-    # Call LLM
-    assistant_text = await invoke_llm_with_messages(llm_messages, temperature=0.7)
-
-    # Try to extract any brief fields the user mentioned
-    updated_brief = await _extract_brief_fields(user_text, current_brief)
-
-    # Check if brief is now complete
-    updated_missing = [
-        f for f in REQUIRED_BRIEF_FIELDS
-        if f not in updated_brief or updated_brief[f] is None
+    timer = _TurnTimer()
+    summary = await timer.measure("load", _load_summary(db, user_id, session_id, messages))
+    llm_messages = _conversation(user_text, messages, current_brief, summary)
+
+    # The reply, the brief extraction and the summary refresh are independent
+    # LLM calls, so run them together; if the reply fails the rest is cancelled.
+    tasks = [
+        asyncio.ensure_future(
+            timer.measure("reply", invoke_llm_with_messages(llm_messages, temperature=0.7))
+        ),
+        asyncio.ensure_future(
+            timer.measure("extract", _extract_brief_fields(user_text, current_brief))
+        ),
+        asyncio.ensure_future(timer.measure("summary", _refresh_summary(summary, messages))),
     ]
-    new_status = current_status
-    if not updated_missing and current_status == "collecting":
-        new_status = "ready_to_generate"
-
-    # Build response
-    now_ms = int(__import__("time").time() * 1000)
-    assistant_message = {
-        "id": f"msg-{uuid.uuid4()}",
-        "role": "assistant",
-        "text": assistant_text,
-        "createdAt": now_ms,
-        "status": "final",
-    }
+    try:
+        assistant_text, updated_brief, summary = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    response = await timer.measure("save", _complete_turn(
+        db,
+        user_id,
+        session_id,
+        user_text=user_text,
+        messages=messages,
+        current_brief=current_brief,
+        current_status=current_status,
+        assistant_text=assistant_text,
+        updated_brief=updated_brief,
+        mode=mode,
+        planner_state=planner_state,
+        summary=summary,
+    ))
+    timer.log(session_id)
+    return response
 
-    response: dict[str, Any] = {
-        "assistantMessage": assistant_message,
-    }
 
-    # Include session updates if brief changed
-    session_update: dict[str, Any] = {}
-    if updated_brief != current_brief:
-        session_update["draftBrief"] = updated_brief
-    if new_status != current_status:
-        session_update["briefStatus"] = new_status
-    if session_update:
-        response["updatedSession"] = session_update
-
-    # Persist session to DB
-    await _save_session(db, user_id, session_id, {
-        "messages": messages + [
-            {"id": f"msg-{uuid.uuid4()}", "role": "user", "text": user_text, "createdAt": now_ms},
-            assistant_message,
-        ],
-        "draftBrief": updated_brief,
-        "briefStatus": new_status,
-        "mode": mode or "scratch",
-        "plannerState": planner_state,
-    })
+async def stream_message(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    session_id: str,
+    user_text: str,
+    messages: list[dict[str, Any]],
+    draft_brief: dict[str, Any] | None,
+    mode: str | None,
+    brief_status: str | None,
+    planner_state: dict[str, Any] | None,
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """Streaming :func:`handle_message`.
+
+    Yields ``("delta", {"text": ...})`` as reply tokens arrive, then
+    ``("done", response)`` with the :func:`handle_message` payload once the
+    session is saved. Brief extraction and the summary refresh run while the
+    reply streams. If the consumer stops early, the upstream request and the
+    background work are cancelled and nothing is persisted.
+    """
+    current_brief = draft_brief or {}
+    current_status = brief_status or "collecting"
+    timer = _TurnTimer()
+    summary = await timer.measure("load", _load_summary(db, user_id, session_id, messages))
+    llm_messages = _conversation(user_text, messages, current_brief, summary)
 
-    return response
+    extraction = asyncio.create_task(
+        timer.measure("extract", _extract_brief_fields(user_text, current_brief))
+    )
+    summarizing = asyncio.create_task(timer.measure("summary", _refresh_summary(summary, messages)))
+    stream = stream_llm_with_messages(llm_messages, temperature=0.7)
+    chunks: list[str] = []
+    try:
+        async for delta in stream:
+            if not chunks:
+                timer.mark("first_token")
+            chunks.append(delta)
+            yield "delta", {"text": delta}
+        timer.mark("reply")
+        updated_brief = await extraction
+        summary = await summarizing
+    finally:
+        extraction.cancel()
+        summarizing.cancel()
+        await stream.aclose()
+
+    response = await timer.measure("save", _complete_turn(
+        db,
+        user_id,
+        session_id,
+        user_text=user_text,
+        messages=messages,
+        current_brief=current_brief,
+        current_status=current_status,
+        assistant_text="".join(chunks),
+        updated_brief=updated_brief,
+        mode=mode,
+        planner_state=planner_state,
+        summary=summary,
+    ))
+    await db.flush()
+    timer.log(session_id)
+    yield "done", response
 
 
 async def generate_plan(
     db: AsyncSession,
     user_id: uuid.UUID,
     draft_brief: dict[str, Any],
+    session_id: str | None = None,
 ) -> dict[str, Any]:
     """Generate a complete event plan from the collected brief.
 
-    Queries the database for matching venues and providers,
-    then uses the LLM to generate a full plan.
+    Budget, inventory, KPIs and timeline are computed locally from the
+    matched venues and providers and the closest template
+    (:mod:`app.services.plan_engine`), or the one the session's current plan
+    already uses; the LLM only writes the title and summary, and plain ones
+    are kept when it is off or unavailable.
 
     Returns:
         {plan: PlannerState, success: True}
     """
-    event_type = draft_brief.get("eventType", "event")
-    guest_count = draft_brief.get("guestCount", 50)
-    budget = draft_brief.get("budget", 5000)
-    city = draft_brief.get("city", "")
-    date_range = draft_brief.get("dateRange", "TBD")
-
-    # Query matching venues
-    venues = await _find_matching_venues(db, city, guest_count, budget)
-    venues_summary = _format_venues(venues)
-
-    # Query matching providers
-    providers = await _find_matching_providers(db, city)
-    providers_summary = _format_providers(providers)
-
-    # Generate plan via LLM
-    prompt = GENERATION_PROMPT.format(
-        event_type=event_type,
-        guest_count=guest_count,
-        budget=budget,
-        city=city,
-        date_range=date_range,
-        venues_summary=venues_summary or "No venues found in database yet.",
-        providers_summary=providers_summary or "No providers found in database yet.",
-    )
+    plan, prose_messages = await _draft_plan(db, user_id, draft_brief, session_id)
+    if prose_messages is not None:
+        text = await invoke_llm_with_messages(
+            prose_messages, temperature=0.3, max_tokens=settings.PLANNER_PROSE_MAX_TOKENS
+        )
+        _apply_prose(plan, text)
+    return {"plan": plan, "success": True}
 
-    result = await invoke_llm(
-        prompt=prompt,
-        response_json_schema={"type": "object"},
-        system_prompt="You are an expert event planner. Return valid JSON only.",
-    )
 
-    # Ensure we have a valid plan structure
-    plan = _ensure_plan_structure(result, event_type, guest_count, budget)
+async def stream_plan(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    draft_brief: dict[str, Any],
+    session_id: str | None = None,
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """Streaming :func:`generate_plan`.
 
-    return {"plan": plan, "success": True}
+    Yields ``("plan", {"plan": ...})`` as soon as the plan is computed, then
+    ``("delta", {"text": ...})`` as the title and summary stream, then
+    ``("done", {"plan": ..., "success": True})`` with the prose applied.
+    """
+    plan, prose_messages = await _draft_plan(db, user_id, draft_brief, session_id)
+    yield "plan", {"plan": plan}
+    if prose_messages is not None:
+        stream = stream_llm_with_messages(
+            prose_messages, temperature=0.3, max_tokens=settings.PLANNER_PROSE_MAX_TOKENS
+        )
+        chunks: list[str] = []
+        try:
+            async for delta in stream:
+                chunks.append(delta)
+                yield "delta", {"text": delta}
+        finally:
+            await stream.aclose()
+        _apply_prose(plan, "".join(chunks))
+    yield "done", {"plan": plan, "success": True}
 
 
 async def get_sessions(
     db: AsyncSession,
     user_id: uuid.UUID,
-) -> list[dict[str, Any]]:
-    """Fetch all planner sessions for a user from the conversations table."""
+    limit: int = 20,
+    before: str | None = None,
+) -> dict[str, Any]:
+    """List a user's planner sessions, newest first, as summaries.
+
+    Title, status and message count are projected in SQL, so transcripts are
+    never loaded; :func:`get_session` returns one session in full. Pass the
+    previous page's ``nextCursor`` as ``before`` to continue the listing; a
+    cursor that is not one of the user's sessions raises BadRequestError.
+
+    Returns:
+        {sessions: [{id, title, status, briefStatus, mode, messageCount,
+        createdAt, updatedAt}], nextCursor}
+    """
+    data = Conversation.data
+    brief_status = data[("session", "briefStatus")].astext
+    first_user_text = (
+        select(func.left(PlannerMessage.text, SESSION_TITLE_LENGTH))
+        .where(PlannerMessage.session_id == Conversation.id, PlannerMessage.role == "user")
+        .order_by(PlannerMessage.seq)
+        .limit(1)
+        .scalar_subquery()
+    )
     stmt = (
-        select(Conversation)
-        .where(Conversation.user_id == user_id)
-        .order_by(Conversation.updated_at.desc())
-        .limit(50)
+        select(
+            Conversation.id,
+            Conversation.created_at,
+            Conversation.updated_at,
+            func.coalesce(data[("session", "plannerState", "title")].astext, first_user_text).label("title"),
+            func.coalesce(data[("session", "plannerState", "status")].astext, brief_status).label("status"),
+            brief_status.label("brief_status"),
+            data[("session", "mode")].astext.label("mode"),
+            cast(data[("session", "messageCount")].astext, Integer).label("message_count"),
+        )
+        .where(Conversation.user_id == user_id, _IS_PLANNER_SESSION)
+        .order_by(Conversation.updated_at.desc(), Conversation.id.desc())
+        .limit(limit + 1)
     )
-    result = await db.execute(stmt)
-    rows = result.scalars().all()
 
-    sessions: list[dict[str, Any]] = []
-    for row in rows:
-        data = row.data or {}
-        if data.get("_type") != "planner_session":
-            continue
-        session_data = data.get("session", {})
-        session_data["id"] = str(row.id)
-        sessions.append(session_data)
+    if before is not None:
+        # Cursor-based pagination; restarting from the first page on a bad
+        # cursor would hand the client the same sessions again.
+        try:
+            cursor_id = uuid.UUID(before)
+        except ValueError:
+            raise BadRequestError("Invalid cursor")
+        cursor_result = await db.execute(
+            select(Conversation.updated_at).where(
+                Conversation.id == cursor_id,
+                Conversation.user_id == user_id,
+                _IS_PLANNER_SESSION,
+            )
+        )
+        cursor_ts = cursor_result.scalar_one_or_none()
+        if cursor_ts is None:
+            raise BadRequestError("Invalid cursor")
+        stmt = stmt.where(tuple_(Conversation.updated_at, Conversation.id) < tuple_(cursor_ts, cursor_id))
+
+    rows = (await db.execute(stmt)).all()
+    page = rows[:limit]
+    sessions = [
+        {
+            "id": str(row.id),
+            "title": row.title or "New plan",
+            "status": row.status,
+            "briefStatus": row.brief_status,
+            "mode": row.mode,
+            "messageCount": row.message_count or 0,
+            "createdAt": int(row.created_at.timestamp() * 1000),
+            "updatedAt": int(row.updated_at.timestamp() * 1000),
+        }
+        for row in page
+    ]
+    next_cursor = str(page[-1].id) if len(rows) > limit else None
+    return {"sessions": sessions, "nextCursor": next_cursor}
+
 
-    return sessions
+async def get_session(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    session_id: uuid.UUID,
+) -> dict[str, Any] | None:
+    """One planner session with its full transcript, or None if not found."""
+    result = await db.execute(
+        select(Conversation).where(
+            Conversation.id == session_id,
+            Conversation.user_id == user_id,
+            _IS_PLANNER_SESSION,
+        )
+    )
+    row = result.scalar_one_or_none()
+    if row is None:
+        return None
+
+    messages = await db.execute(
+        select(PlannerMessage)
+        .where(PlannerMessage.session_id == row.id)
+        .order_by(PlannerMessage.seq)
+    )
+    session_data = dict(row.data.get("session", {}))
+    session_data.pop("messageCount", None)
+    session_data["messages"] = [message.to_message() for message in messages.scalars()]
+    session_data["id"] = str(row.id)
+    return session_data
 
 
 async def approve_layout(
@@ -289,28 +433,31 @@ async def approve_layout(
     except ValueError:
         return {"success": False, "error": "Invalid session ID"}
 
+    # Patch the two keys in place rather than rewriting the session document;
+    # sessions without a plan yet are left untouched.
+    data = Conversation.data
+    planner_state = data[("session", "plannerState")]
+    has_plan = (func.jsonb_typeof(planner_state) == "object") & (planner_state != func.jsonb_build_object())
+    approved = func.jsonb_set(
+        func.jsonb_set(data, _json_path("session", "plannerState", "status"), literal("approved", JSONB)),
+        _json_path("session", "canvasState"),
+        literal("visible", JSONB),
+    )
     result = await db.execute(
-        select(Conversation).where(
+        update(Conversation)
+        .where(
             Conversation.id == sid,
             Conversation.user_id == user_id,
         )
+        .values(data=case((has_plan, approved), else_=data))
+        .returning(data[("session", "plannerState")])
+        .execution_options(synchronize_session=False)
     )
-    row = result.scalar_one_or_none()
+    row = result.one_or_none()
     if row is None:
         return {"success": False, "error": "Session not found"}
 
-    data = row.data or {}
-    session_data = data.get("session", {})
-    planner_state = session_data.get("plannerState", {})
-
-    if planner_state:
-        planner_state["status"] = "approved"
-        session_data["plannerState"] = planner_state
-        session_data["canvasState"] = "visible"
-        data["session"] = session_data
-        row.data = data
-
-    return {"success": True, "plannerState": planner_state}
+    return {"success": True, "plannerState": row[0] if row[0] is not None else {}}
 
 
 # ---------------------------------------------------------------------------
@@ -318,27 +465,263 @@ async def approve_layout(
 # ---------------------------------------------------------------------------
 
 
+class _TurnTimer:
+    """Per-stage latency of one planner turn, logged when the turn completes."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.stages: dict[str, float] = {}
+
+    def _elapsed_ms(self, since: float) -> float:
+        return round((time.perf_counter() - since) * 1000, 1)
+
+    async def measure(self, stage: str, awaitable: Awaitable[T]) -> T:
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.stages[stage] = self._elapsed_ms(started)
+
+    def mark(self, stage: str) -> None:
+        """Record the time from the start of the turn to now."""
+        self.stages[stage] = self._elapsed_ms(self.started)
+
+    def log(self, session_id: str) -> None:
+        logger.info(
+            "Planner turn completed",
+            extra={
+                "session_id": session_id,
+                "duration_ms": self._elapsed_ms(self.started),
+                "stage_ms": self.stages,
+            },
+        )
+
+
+def _conversation(
+    user_text: str,
+    messages: list[dict[str, Any]],
+    current_brief: dict[str, Any],
+    summary: dict[str, Any] | None = None,
+) -> list[dict[str, str]]:
+    """LLM messages for a turn: system prompt, summary, recent history, the new message.
+
+    Turns covered by the rolling summary are replaced by it; the newest
+    remaining turns are included up to PLANNER_HISTORY_TOKEN_BUDGET.
+    """
+    collected = {k: v for k, v in current_brief.items() if v is not None}
+    missing = [f for f in REQUIRED_BRIEF_FIELDS if f not in collected or collected[f] is None]
+
+    system_msg = SYSTEM_PROMPT.format(
+        collected_fields=json.dumps(collected, indent=2) if collected else "None yet",
+        missing_fields=", ".join(missing) if missing else "ALL COLLECTED",
+    )
+
+    llm_messages: list[dict[str, str]] = [{"role": "system", "content": system_msg}]
+    if summary:
+        llm_messages.append({
+            "role": "system",
+            "content": f"Summary of the earlier conversation:\n{summary['text']}",
+        })
+
+    budget = settings.PLANNER_HISTORY_TOKEN_BUDGET
+    user_message = {"role": "user", "content": context_window.truncate_to_tokens(user_text, budget // 2)}
+    history = [
+        {"role": msg.get("role", "user"), "content": msg.get("text", "")}
+        for msg in messages[summary["messageCount"] if summary else 0:]
+        if msg.get("role", "user") in ("user", "assistant")
+    ]
+    llm_messages.extend(
+        context_window.fit_window(history, budget - context_window.message_tokens(user_message))
+    )
+    llm_messages.append(user_message)
+    return llm_messages
+
+
+async def _load_summary(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    session_id: str,
+    messages: list[dict[str, Any]],
+) -> dict[str, Any] | None:
+    """The session's rolling summary, if it still lines up with the client's history."""
+    try:
+        sid = uuid.UUID(session_id)
+    except ValueError:
+        return None
+
+    result = await db.execute(
+        select(Conversation.data[("session", "summary")]).where(
+            Conversation.id == sid,
+            Conversation.user_id == user_id,
+        )
+    )
+    summary = result.scalar_one_or_none()
+    if not isinstance(summary, dict) or not summary.get("text"):
+        return None
+    # A client that sends less history than the summary covers has started over.
+    if not 0 < summary.get("messageCount", 0) <= len(messages):
+        return None
+    return summary
+
+
+async def _refresh_summary(
+    summary: dict[str, Any] | None,
+    messages: list[dict[str, Any]],
+) -> dict[str, Any] | None:
+    """Fold older turns into the rolling summary once the raw history outgrows its budget.
+
+    Only the turns not yet covered are sent, along with the previous summary.
+    Returns the summary to store with the session: the previous one when no
+    folding is due or the LLM call fails.
+    """
+    covered = summary["messageCount"] if summary else 0
+    point = context_window.compaction_point(messages, covered, settings.PLANNER_HISTORY_TOKEN_BUDGET)
+    if point is None:
+        return summary
+
+    transcript = "\n".join(
+        f"{msg.get('role', 'user')}: {msg.get('text', '')}"
+        for msg in messages[covered:point]
+        if msg.get("role", "user") in ("user", "assistant")
+    )
+    prompt = SUMMARY_PROMPT.format(
+        summary=summary["text"] if summary else "None yet",
+        transcript=transcript,
+        max_words=int(settings.PLANNER_SUMMARY_MAX_TOKENS * 0.7),
+    )
+    try:
+        result = await invoke_llm(
+            prompt=prompt,
+            system_prompt="You maintain concise running summaries of event planning conversations.",
+            temperature=0.2,
+            max_tokens=settings.PLANNER_SUMMARY_MAX_TOKENS,
+        )
+    except Exception:
+        logger.warning("Summary refresh failed, keeping the previous summary", exc_info=True)
+        return summary
+
+    text = (result.get("text") or "").strip()
+    if not text or result.get("unavailable"):
+        return summary
+    return {
+        "text": context_window.truncate_to_tokens(text, settings.PLANNER_SUMMARY_MAX_TOKENS),
+        "messageCount": point,
+    }
+
+
+async def _complete_turn(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    session_id: str,
+    user_text: str,
+    messages: list[dict[str, Any]],
+    current_brief: dict[str, Any],
+    current_status: str,
+    assistant_text: str,
+    updated_brief: dict[str, Any],
+    mode: str | None,
+    planner_state: dict[str, Any] | None,
+    summary: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Build the SendMessageResponse for a finished turn and persist the session.
+
+    Returns:
+        {assistantMessage, updatedSession?}
+    """
+    # Check if brief is now complete
+    updated_missing = [
+        f for f in REQUIRED_BRIEF_FIELDS
+        if f not in updated_brief or updated_brief[f] is None
+    ]
+    new_status = current_status
+    if not updated_missing and current_status == "collecting":
+        new_status = "ready_to_generate"
+
+    # Build response
+    now_ms = int(time.time() * 1000)
+    assistant_message = {
+        "id": f"msg-{uuid.uuid4()}",
+        "role": "assistant",
+        "text": assistant_text,
+        "createdAt": now_ms,
+        "status": "final",
+    }
+
+    response: dict[str, Any] = {
+        "assistantMessage": assistant_message,
+    }
+
+    # Include session updates if brief changed
+    session_update: dict[str, Any] = {}
+    if updated_brief != current_brief:
+        session_update["draftBrief"] = updated_brief
+        # A new guest count or budget re-prices an existing plan locally.
+        changes = plan_engine.brief_changes(current_brief, updated_brief)
+        if changes and isinstance(planner_state, dict) and planner_state.get("basis"):
+            planner_state = plan_engine.recompute(planner_state, changes)
+            session_update["plannerState"] = planner_state
+    if new_status != current_status:
+        session_update["briefStatus"] = new_status
+    if session_update:
+        response["updatedSession"] = session_update
+
+    # Persist session to DB
+    user_message = {"id": f"msg-{uuid.uuid4()}", "role": "user", "text": user_text, "createdAt": now_ms}
+    header: dict[str, Any] = {
+        "draftBrief": updated_brief,
+        "briefStatus": new_status,
+        "mode": mode or "scratch",
+        "plannerState": planner_state,
+    }
+    if summary:
+        header["summary"] = summary
+    await _save_session(
+        db,
+        user_id,
+        session_id,
+        header,
+        history=messages,
+        turn=[user_message, assistant_message],
+    )
+
+    return response
+
+
 async def _extract_brief_fields(
     user_text: str,
     current_brief: dict[str, Any],
 ) -> dict[str, Any]:
-    """Use the LLM to extract structured brief fields from user text.
+    """Extract structured brief fields from user text.
+
+    The local parser handles common phrasings ("100 guests, $20k, Austin in
+    May"); a value already in the brief is only replaced by a confident match
+    that names its field. The LLM is asked about fields matched otherwise,
+    or, when the message has words the parser couldn't account for, about
+    every field the parser didn't resolve, so "move it to Montpelier" can
+    still correct a city that is already set.
 
     Returns the updated brief dict with any newly extracted fields merged in.
     """
+    extraction = brief_extractor.extract_brief(user_text)
+    resolved = extraction.resolved(settings.PLANNER_EXTRACTION_MIN_CONFIDENCE, current_brief)
+    updated = {**current_brief, **resolved}
+    pending = [
+        f for f in REQUIRED_BRIEF_FIELDS
+        if f not in resolved and (f in extraction.fields or extraction.unparsed)
+    ]
+    if not pending:
+        return updated
+
+    fields = "\n".join(f"- {f}: {_BRIEF_FIELD_FORMATS[f]}" for f in pending)
     extraction_prompt = f"""Extract event planning details from this user message.
 Only extract fields that are explicitly mentioned. Return a JSON object with these keys
 (use null for fields not mentioned):
 
-- eventType: string or null (e.g. "wedding", "corporate", "birthday")
-- guestCount: integer or null
-- budget: integer or null (in USD)
-- city: string or null (US city name)
-- dateRange: string or null (e.g. "March 2026", "next Saturday")
+{fields}
 
 User message: "{user_text}"
 
-Current known values: {json.dumps(current_brief)}
+Current known values: {json.dumps(updated)}
 
 Return JSON only, no extra text."""
 
@@ -348,27 +731,32 @@ Return JSON only, no extra text."""
             response_json_schema={"type": "object"},
             temperature=0.1,
         )
-
-        # Merge non-null extracted values into current brief
-        updated = dict(current_brief)
-        for field in REQUIRED_BRIEF_FIELDS:
-            extracted_value = result.get(field)
-            if extracted_value is not None:
-                updated[field] = extracted_value
-
-        return updated
     except Exception:
-        logger.warning("Brief extraction failed, returning current brief", exc_info=True)
-        return current_brief
+        logger.warning("Brief extraction failed, keeping locally parsed fields", exc_info=True)
+        return updated
+
+    # Merge non-null extracted values into the brief
+    for field in pending:
+        extracted_value = result.get(field)
+        if extracted_value is not None:
+            updated[field] = extracted_value
+    return updated
 
 
 async def _save_session(
     db: AsyncSession,
     user_id: uuid.UUID,
     session_id: str,
-    session_data: dict[str, Any],
+    header: dict[str, Any],
+    history: list[dict[str, Any]],
+    turn: list[dict[str, Any]],
 ) -> None:
-    """Persist a planner session to the conversations table."""
+    """Persist a planner turn: rewrite the small session header, append the turn.
+
+    Only a new session stores the client's earlier ``history``; existing
+    sessions already hold it in `planner_messages`. The header row is locked
+    so concurrent turns on one session get consecutive sequence numbers.
+    """
     try:
         sid = uuid.UUID(session_id)
     except ValueError:
@@ -376,20 +764,36 @@ async def _save_session(
         sid = uuid.uuid4()
 
     result = await db.execute(
-        select(Conversation).where(
+        select(Conversation)
+        .where(
             Conversation.id == sid,
             Conversation.user_id == user_id,
         )
+        .with_for_update()
     )
     row = result.scalar_one_or_none()
 
-    payload = {"_type": "planner_session", "session": session_data}
+    if row:
+        start = (row.data or {}).get("session", {}).get("messageCount", 0)
+        appended = turn
+    else:
+        start = 0
+        appended = history + turn
+
+    payload = {
+        "_type": "planner_session",
+        "session": {**header, "messageCount": start + len(appended)},
+    }
 
     if row:
         row.data = payload
     else:
         row = Conversation(id=sid, user_id=user_id, data=payload)
         db.add(row)
+    db.add_all(
+        PlannerMessage.from_message(sid, start + offset, message)
+        for offset, message in enumerate(appended)
+    )
 
 
 async def _find_matching_venues(
@@ -397,34 +801,265 @@ async def _find_matching_venues(
     city: str,
     guest_count: int,
     budget: float,
+    lat: float | None = None,
+    lng: float | None = None,
+    radius_km: float | None = None,
+    available_dates: list[date] | None = None,
+    description: str | None = None,
 ) -> list[Any]:
-    """Find venues matching the brief criteria."""
-    stmt = select(Venue).where(Venue.status == "approved")
-
-    if city:
-        stmt = stmt.where(Venue.location_city.ilike(f"%{city}%"))
+    """Find the venue listings that best fit the brief, best first.
 
-    stmt = stmt.where(Venue.capacity >= guest_count)
-    stmt = stmt.limit(10)
-
-    result = await db.execute(stmt)
-    return list(result.scalars().all())
+    Candidates that seat the guests (most similar to ``description`` when
+    venues have embeddings, else nearest or best rated) are scored on how
+    snugly they fit the guest count, their price against the venue's share
+    of ``budget``, rating, distance, availability and relevance.
+    """
+    has_origin = lat is not None and lng is not None
+    stmt = marketplace_service.build_venue_query(
+        city=city or None,
+        min_capacity=guest_count,
+        lat=lat if has_origin else None,
+        lng=lng if has_origin else None,
+        radius_km=radius_km,
+        available_dates=available_dates,
+        sort_by="distance" if has_origin else "rating",
+    )
+    rows = await _candidates(db, stmt, "venue", description, available_dates)
+    request = _match_request(
+        budget, settings.PLANNER_VENUE_BUDGET_SHARE, radius_km, available_dates, guest_count=guest_count
+    )
+    return match_scoring.best(rows, request, settings.PLANNER_PROMPT_VENUES)
 
 
 async def _find_matching_providers(
     db: AsyncSession,
     city: str,
+    lat: float | None = None,
+    lng: float | None = None,
+    radius_km: float | None = None,
+    available_dates: list[date] | None = None,
+    description: str | None = None,
+    budget: float | None = None,
+) -> list[Any]:
+    """Find the service provider listings that best fit the brief, best first."""
+    has_origin = lat is not None and lng is not None
+    stmt = marketplace_service.build_service_provider_query(
+        city=city or None,
+        lat=lat if has_origin else None,
+        lng=lng if has_origin else None,
+        radius_km=radius_km,
+        available_dates=available_dates,
+        sort_by="rating",
+    )
+    rows = await _candidates(db, stmt, "service_provider", description, available_dates)
+    request = _match_request(budget, settings.PLANNER_PROVIDER_BUDGET_SHARE, radius_km, available_dates)
+    return match_scoring.best(rows, request, settings.PLANNER_PROMPT_PROVIDERS)
+
+
+async def _candidates(
+    db: AsyncSession,
+    stmt: Any,
+    listing_type: str,
+    description: str | None,
+    available_dates: list[date] | None,
 ) -> list[Any]:
-    """Find service providers matching the brief criteria."""
-    stmt = select(ServiceProvider).where(ServiceProvider.status == "approved")
+    """Up to ``PLANNER_CANDIDATE_LIMIT`` rows of a listing query, for scoring.
+
+    The most similar to ``description`` when there is one and matching
+    listings have embeddings, else the first in the query's own order.
+    With dates, rows carry ``blocked_days``: how many of them are booked.
+    """
+    if available_dates:
+        blocked = availability_service.blocked_day_count(listing_type, MarketplaceListing.entity_id, available_dates)
+        stmt = stmt.add_columns(blocked.label("blocked_days"))
+    limit = settings.PLANNER_CANDIDATE_LIMIT
+    ranked = retrieval_service.nearest(stmt, listing_type, MarketplaceListing.entity_id, description or "")
+    if ranked is not None:
+        query = await retrieval_service.ranked_query(db, ranked, limit)
+        if query is not None:
+            rows = (await db.execute(query.limit(limit))).all()
+            if rows:
+                return list(rows)
+    result = await db.execute(stmt.limit(limit))
+    return list(result.all())
+
+
+def _match_request(
+    budget: Any,
+    budget_share: float,
+    radius_km: float | None,
+    available_dates: list[date] | None,
+    guest_count: Any = None,
+) -> match_scoring.MatchRequest:
+    budget = _positive(budget)
+    guests = _positive(guest_count)
+    return match_scoring.MatchRequest(
+        guest_count=int(guests) if guests else None,
+        price_target=budget * budget_share if budget else None,
+        radius_km=radius_km or settings.GEO_DEFAULT_RADIUS_KM,
+        requested_days=len(available_dates or ()),
+    )
+
+
+def _positive(value: Any) -> float | None:
+    """``value`` as a number when it is a positive one (briefs hold strings too)."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
+async def _draft_plan(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    draft_brief: dict[str, Any],
+    session_id: str | None,
+) -> tuple[dict[str, Any], list[dict[str, str]] | None]:
+    """The locally computed plan, and the messages asking for its prose (None when off)."""
+    event_type = draft_brief.get("eventType") or "event"
+    guest_count = draft_brief.get("guestCount") or 50
+    budget = draft_brief.get("budget") or 5000
+    city = draft_brief.get("city") or ""
+    lat, lng = draft_brief.get("lat"), draft_brief.get("lng")
+    radius_km = draft_brief.get("radiusKm")
+    event_dates = _brief_dates(draft_brief.get("dateRange"))
+    description = _brief_description(draft_brief)
+
+    venues = await _find_matching_venues(
+        db, city, guest_count, budget, lat, lng, radius_km,
+        available_dates=event_dates, description=description,
+    )
+    providers = await _find_matching_providers(
+        db, city, lat, lng, radius_km,
+        available_dates=event_dates, description=description, budget=budget,
+    )
+    template = await _plan_template(db, user_id, session_id, event_type, draft_brief)
+
+    basis = plan_engine.plan_basis(draft_brief, venues, providers, template)
+    plan = plan_engine.build_plan(basis)
+    if not settings.PLANNER_PLAN_PROSE:
+        return plan, None
+
+    prompt = PLAN_PROSE_PROMPT.format(
+        event_type=basis["eventType"],
+        guest_count=basis["guestCount"],
+        budget=f"{basis['budget']:,.0f}",
+        city=basis["city"] or "TBD",
+        date_range=basis["dateRange"],
+        total_cost=f"{plan['kpis']['totalCost']:,.0f}",
+        venues_summary=_format_venues(venues[:1]) or "None matched yet.",
+        providers_summary=_format_providers(providers[: plan_engine.BASIS_PROVIDERS]) or "None matched yet.",
+        timeline="\n".join(f"- {item['time']} {item['title']}" for item in plan["timeline"]),
+    )
+    return plan, [
+        {"role": "system", "content": "You are an expert event planner writing concise, inviting copy."},
+        {"role": "user", "content": prompt},
+    ]
+
+
+async def _plan_template(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    session_id: str | None,
+    event_type: str,
+    draft_brief: dict[str, Any],
+) -> Template | None:
+    """The public template whose priors a plan starts from.
+
+    The one the session's current plan was built on, if any; else the most
+    similar one of the event type when the brief describes the event and
+    templates have embeddings; else the most used featured one.
+    """
+    template = await _session_template(db, user_id, session_id)
+    if template is not None:
+        return template
+    if _brief_details(draft_brief):
+        matches = await retrieval_service.search_templates(
+            db, _brief_description(draft_brief), event_type=event_type, limit=1
+        )
+        if matches:
+            return matches[0][0]
+    result = await db.execute(
+        select(Template)
+        .where(Template.is_public.is_(True), func.lower(Template.event_type) == event_type.strip().lower())
+        .order_by(Template.is_featured.desc(), Template.times_used.desc())
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
+async def _session_template(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    session_id: str | None,
+) -> Template | None:
+    """The public template named by the basis of the session's stored plan, if any."""
+    try:
+        sid = uuid.UUID(session_id) if session_id else None
+    except ValueError:
+        return None
+    if sid is None:
+        return None
+    template_id = Conversation.data[("session", "plannerState", "basis", "templateId")].astext
+    result = await db.execute(
+        select(Template)
+        .join(Conversation, cast(Template.id, Text) == template_id)
+        .where(
+            Conversation.id == sid,
+            Conversation.user_id == user_id,
+            _IS_PLANNER_SESSION,
+            Template.is_public.is_(True),
+        )
+    )
+    return result.scalars().first()
+
 
-    if city:
-        stmt = stmt.where(ServiceProvider.location_city.ilike(f"%{city}%"))
+def _apply_prose(plan: dict[str, Any], text: str) -> None:
+    """Set the plan's title and summary from "title line, then summary" text, if usable."""
+    if llm_service.is_fallback(text):
+        return
+    lines = [line.strip().strip("#*\"").strip() for line in text.strip().splitlines()]
+    lines = [line for line in lines if line]
+    if len(lines) < 2:
+        return
+    plan["title"] = lines[0]
+    plan["summary"] = " ".join(lines[1:])
 
-    stmt = stmt.limit(20)
 
-    result = await db.execute(stmt)
-    return list(result.scalars().all())
+def _brief_description(draft_brief: dict[str, Any]) -> str:
+    """What the brief says the event is like, for semantic matching."""
+    parts = [draft_brief.get("eventType"), *_brief_details(draft_brief)]
+    return " ".join(part for part in parts if isinstance(part, str) and part.strip())
+
+
+def _brief_details(draft_brief: dict[str, Any]) -> list[str]:
+    """The brief's free-text description of the event, beyond its type."""
+    parts = [draft_brief.get(key) for key in ("description", "notes", "vibe")]
+    return [part for part in parts if isinstance(part, str) and part.strip()]
+
+
+def _json_path(*keys: str) -> Any:
+    """A ``text[]`` path literal for ``jsonb_set``."""
+    return literal(list(keys), ARRAY(Text))
+
+
+def _brief_dates(date_range: Any) -> list[date] | None:
+    """Concrete dates named by the brief's dateRange, if it has any.
+
+    Accepts an ISO date, a comma-separated list, or "start to end"; free-form
+    text like "next spring" yields None so matching isn't date-restricted.
+    """
+    if not isinstance(date_range, str):
+        return None
+    text = date_range.strip()
+    try:
+        if " to " in text:
+            start, _, end = text.partition(" to ")
+            return availability_service.parse_date_range(f"{start},{end}") or None
+        return availability_service.parse_dates(text) or None
+    except BadRequestError:
+        return None
 
 
 def _format_venues(venues: list[Any]) -> str:
@@ -434,10 +1069,8 @@ def _format_venues(venues: list[Any]) -> str:
 
     lines: list[str] = []
     for v in venues:
-        lines.append(
-            f"- {v.name} in {v.location_city} "
-            f"(capacity: {v.capacity}, status: {v.status})"
-        )
+        details = [f"capacity: {v.capacity}", *_listing_details(v)]
+        lines.append(f"- {v.name} in {v.city} ({', '.join(details)})")
     return "\n".join(lines)
 
 
@@ -448,59 +1081,24 @@ def _format_providers(providers: list[Any]) -> str:
 
     lines: list[str] = []
     for p in providers:
-        lines.append(
-            f"- {p.business_name} in {p.location_city} (status: {p.status})"
-        )
+        details = _listing_details(p)
+        lines.append(f"- {p.name} in {p.city}" + (f" ({', '.join(details)})" if details else ""))
     return "\n".join(lines)
 
 
-def _ensure_plan_structure(
-    raw: dict[str, Any],
-    event_type: str,
-    guest_count: int,
-    budget: float,
-) -> dict[str, Any]:
-    """Ensure the LLM response has the required PlannerState structure.
-
-    Fills in defaults for any missing fields.
-    """
-    plan: dict[str, Any] = {
-        "blueprintId": raw.get("blueprintId", str(uuid.uuid4())),
-        "title": raw.get("title", f"{event_type.title()} Event Plan"),
-        "summary": raw.get("summary", f"A {event_type} for {guest_count} guests."),
-        "kpis": raw.get("kpis", {
-            "totalCost": budget,
-            "costPerAttendee": round(budget / max(guest_count, 1), 2),
-            "confidencePct": 75,
-        }),
-        "spacePlan": raw.get("spacePlan", {
-            "beforeLabel": "Empty venue space",
-            "afterLabel": f"Configured for {event_type}",
-            "inventory": {
-                "chairs": guest_count,
-                "tables": max(guest_count // 8, 1),
-                "stage": 1 if event_type in ("wedding", "conference", "corporate") else 0,
-                "buffet": 1,
-            },
-        }),
-        "timeline": raw.get("timeline", [
-            {"time": "08:00", "title": "Setup", "notes": "Venue preparation and decoration"},
-            {"time": "10:00", "title": "Guest Arrival", "notes": "Welcome and registration"},
-            {"time": "12:00", "title": "Main Event", "notes": f"{event_type.title()} program"},
-            {"time": "15:00", "title": "Wrap Up", "notes": "Closing and teardown"},
-        ]),
-        "budget": raw.get("budget", {
-            "total": budget,
-            "breakdown": [
-                {"label": "Venue", "pct": 35},
-                {"label": "Catering", "pct": 25},
-                {"label": "Entertainment", "pct": 15},
-                {"label": "Decor", "pct": 10},
-                {"label": "Platform Fee", "pct": 10},
-                {"label": "Miscellaneous", "pct": 5},
-            ],
-            "tradeoffNote": None,
-        }),
-        "status": raw.get("status", "draft"),
-    }
-    return plan
+def _listing_details(row: Any) -> list[str]:
+    """Price, rating, distance and booked dates of a candidate, where known."""
+    details: list[str] = []
+    price = getattr(row, "price_min", None)
+    if price is not None:
+        details.append(f"from ${float(price):,.0f}")
+    rating = getattr(row, "avg_rating", None)
+    if rating is not None:
+        details.append(f"rated {float(rating):.1f} ({getattr(row, 'review_count', 0) or 0} reviews)")
+    distance = getattr(row, "distance_km", None)
+    if distance is not None:
+        details.append(f"{float(distance):.1f} km away")
+    blocked = getattr(row, "blocked_days", None)
+    if blocked:
+        details.append(f"booked on {blocked} requested date{'s' if blocked != 1 else ''}")
+    return details
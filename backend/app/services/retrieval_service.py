@@ -0,0 +1,313 @@
+"""Retrieval service — semantic search over venues, providers and templates.
+
+Handles:
+- Building the text document embedded for a marketplace listing or template
+- Upserting one `vector_embeddings` row per venue, provider and public template,
+  tagged with the embedding model and a hash of the embedded document
+- Ranking any listing or template query by similarity to a free-text
+  description, so ANN search composes with the marketplace's structured
+  filters in a single SQL query served by the HNSW index
+- Widening the HNSW candidate list (``hnsw.ef_search``) so filtered
+  searches still fill their page
+- Without pgvector, taking the candidates from the in-process index
+  (:mod:`app.services.vector_index`) and filtering them in SQL
+
+Embeddings are computed locally (see :mod:`app.services.embeddings`).
+"""
+
+import hashlib
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Float, Select, and_, column, delete, func, select, values
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.marketplace_listing import LISTING_TYPES, MarketplaceListing
+from app.models.template import Template
+from app.models.vector_embedding import VectorEmbedding
+from app.services import embeddings, vector_index
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPES = (*LISTING_TYPES, "template")
+
+# Rows per INSERT when upserting embeddings.
+UPSERT_BATCH_SIZE = 200
+# pgvector's upper bound for hnsw.ef_search.
+MAX_EF_SEARCH = 1000
+
+
+# ---------------------------------------------------------------------------
+# Documents
+# ---------------------------------------------------------------------------
+
+
+def listing_document(listing: MarketplaceListing) -> str:
+    """Text embedded for a venue or provider listing."""
+    card = listing.card or {}
+    services = " ".join(
+        " ".join(filter(None, (service.get("name"), service.get("category"))))
+        for service in card.get("services") or []
+        if isinstance(service, dict)
+    )
+    return _join(
+        listing.name,
+        listing.venue_type,
+        listing.city,
+        " ".join(str(amenity) for amenity in listing.amenities or []),
+        " ".join(listing.categories or []),
+        services,
+        card.get("description"),
+    )
+
+
+def template_document(template: Template) -> str:
+    """Text embedded for a template: its name, event type, description and plan text."""
+    return _join(
+        template.name,
+        template.event_type,
+        template.description,
+        " ".join(_strings(template.template_data)),
+    )
+
+
+def document_hash(document: str) -> str:
+    return hashlib.sha256(f"{embeddings.EMBEDDING_MODEL}:{document}".encode()).hexdigest()
+
+
+def _join(*parts: Any) -> str:
+    return "\n".join(str(part).strip() for part in parts if part and str(part).strip())
+
+
+def _strings(value: Any, limit: int = 200) -> list[str]:
+    """String leaves of a JSON value (at most ``limit``), depth first."""
+    found: list[str] = []
+    stack = [value]
+    while stack and len(found) < limit:
+        item = stack.pop()
+        if isinstance(item, str):
+            found.append(item)
+        elif isinstance(item, dict):
+            stack.extend(reversed(list(item.values())))
+        elif isinstance(item, list):
+            stack.extend(reversed(item))
+    return found
+
+
+# ---------------------------------------------------------------------------
+# Indexing
+# ---------------------------------------------------------------------------
+
+
+async def index_listings(
+    db: AsyncSession,
+    listing_type: str,
+    entity_ids: Iterable[Any] | None = None,
+) -> int:
+    """Embed the listings of ``listing_type`` (all of them, or ``entity_ids``).
+
+    A full pass also drops embeddings whose listing is gone. Returns the
+    number of embeddings written.
+    """
+    stmt = select(MarketplaceListing).where(MarketplaceListing.listing_type == listing_type)
+    if entity_ids is not None:
+        stmt = stmt.where(MarketplaceListing.entity_id.in_(list(entity_ids)))
+    listings = (await db.execute(stmt)).scalars().all()
+    written = await _upsert(db, listing_type, [(row.entity_id, listing_document(row)) for row in listings])
+    if entity_ids is None:
+        current = select(MarketplaceListing.entity_id).where(MarketplaceListing.listing_type == listing_type)
+        await drop_missing(db, listing_type, current)
+    return written
+
+
+async def index_templates(db: AsyncSession, template_ids: Iterable[Any] | None = None) -> int:
+    """Embed public templates (all of them, or ``template_ids``)."""
+    stmt = select(Template).where(Template.is_public.is_(True))
+    if template_ids is not None:
+        stmt = stmt.where(Template.id.in_(list(template_ids)))
+    templates = (await db.execute(stmt)).scalars().all()
+    written = await _upsert(db, "template", [(row.id, template_document(row)) for row in templates])
+    if template_ids is None:
+        await drop_missing(db, "template", select(Template.id).where(Template.is_public.is_(True)))
+    return written
+
+
+async def index_all(db: AsyncSession) -> dict[str, int]:
+    """Re-embed every listing and public template."""
+    counts = {listing_type: await index_listings(db, listing_type) for listing_type in LISTING_TYPES}
+    counts["template"] = await index_templates(db)
+    return counts
+
+
+async def _upsert(db: AsyncSession, content_type: str, documents: list[tuple[Any, str]]) -> int:
+    rows = embedding_rows(content_type, documents, vector_index.enabled())
+    await upsert_rows(db, rows)
+    return len(rows)
+
+
+def embedding_rows(content_type: str, documents: list[tuple[Any, str]], packed: bool) -> list[dict[str, Any]]:
+    """``vector_embeddings`` rows for ``(content_id, document)`` pairs with words to embed.
+
+    CPU-bound and free of I/O, so callers may run it in an executor. With
+    ``packed`` (no pgvector) the vector is stored packed, for the in-process
+    index; callers decide, since a worker process hasn't detected the backend.
+    """
+    vectors = embeddings.embed_many([document for _, document in documents])
+    return [
+        {
+            "content_type": content_type,
+            "content_id": content_id,
+            **({"packed_embedding": vector_index.pack(vector)} if packed else {"embedding": vector}),
+            "metadata": {"model": embeddings.EMBEDDING_MODEL, "hash": document_hash(document)},
+        }
+        for (content_id, document), vector in zip(documents, vectors)
+        if vector is not None
+    ]
+
+
+async def upsert_rows(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """Insert or replace embeddings, ``UPSERT_BATCH_SIZE`` rows per statement."""
+    table = VectorEmbedding.__table__
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        stmt = insert(table).values(rows[start : start + UPSERT_BATCH_SIZE])
+        replaced = [name for name in ("embedding", "packed_embedding", "metadata") if name in rows[start]]
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_vector_embeddings_content",
+            set_={**{name: stmt.excluded[name] for name in replaced}, "updated_at": func.now()},
+        )
+        await db.execute(stmt)
+
+
+async def stored_hashes(db: AsyncSession, content_type: str, content_ids: list[Any]) -> dict[Any, str]:
+    """Document hash of the stored embedding for each of ``content_ids`` that has one.
+
+    Embeddings from another model, or without a vector for the current
+    backend, count as missing, so they are redone.
+    """
+    if not content_ids:
+        return {}
+    vector = VectorEmbedding.packed_embedding if vector_index.enabled() else VectorEmbedding.embedding
+    result = await db.execute(
+        select(VectorEmbedding.content_id, VectorEmbedding.metadata_["hash"].astext).where(
+            VectorEmbedding.content_type == content_type,
+            VectorEmbedding.content_id.in_(content_ids),
+            VectorEmbedding.metadata_["model"].astext == embeddings.EMBEDDING_MODEL,
+            vector.is_not(None),
+        )
+    )
+    return {content_id: digest for content_id, digest in result.all()}
+
+
+async def drop_missing(db: AsyncSession, content_type: str, current_ids: Select) -> int:
+    """Delete ``content_type`` embeddings whose id is not in ``current_ids``; returns how many."""
+    result = await db.execute(
+        delete(VectorEmbedding).where(
+            VectorEmbedding.content_type == content_type,
+            VectorEmbedding.content_id.not_in(current_ids),
+        )
+    )
+    return result.rowcount
+
+
+# ---------------------------------------------------------------------------
+# Search
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Ranking:
+    """A query to order by similarity to an embedded description (see :func:`nearest`)."""
+
+    query: Select
+    content_type: str
+    content_id: Any
+    vector: list[float]
+
+
+def nearest(query: Select, content_type: str, content_id: Any, description: str) -> Ranking | None:
+    """``query`` restricted to embedded rows, most similar to ``description`` first.
+
+    ``content_id`` is the query's column holding the embedded row's id. The
+    query keeps its filters; :func:`fetch_nearest` adds a ``similarity``
+    column (cosine, 1 is identical). Returns None when there is nothing to
+    search with.
+    """
+    vector = embeddings.embed(description or "")
+    if vector is None:
+        return None
+    return Ranking(query, content_type, content_id, vector)
+
+
+async def fetch_nearest(db: AsyncSession, ranked: Ranking, limit: int, offset: int = 0) -> list[Row]:
+    """Run a :func:`nearest` query for one page."""
+    stmt = await ranked_query(db, ranked, limit + offset)
+    if stmt is None:
+        return []
+    result = await db.execute(stmt.limit(limit).offset(offset))
+    return list(result.all())
+
+
+async def ranked_query(db: AsyncSession, ranked: Ranking, rows: int) -> Select | None:
+    """The executable form of a :func:`nearest` query, for its first ``rows`` rows.
+
+    The HNSW index (or the in-process index without pgvector) returns
+    ``ef_search`` candidates before filters apply, so the candidate list is
+    widened with the rows wanted; selective filters are better served by
+    the planner's exact scan anyway. Returns None when the in-process index
+    has no candidates. Callers add the limit.
+    """
+    ef_search = min(MAX_EF_SEARCH, max(settings.VECTOR_EF_SEARCH, rows * 4))
+    if vector_index.enabled():
+        return await _index_query(ranked, ef_search)
+    await db.execute(select(func.set_config("hnsw.ef_search", str(ef_search), True)))
+    return _pgvector_query(ranked)
+
+
+def _pgvector_query(ranked: Ranking) -> Select:
+    distance = VectorEmbedding.embedding.cosine_distance(ranked.vector)
+    return (
+        ranked.query.join(
+            VectorEmbedding,
+            and_(VectorEmbedding.content_type == ranked.content_type, VectorEmbedding.content_id == ranked.content_id),
+        )
+        .add_columns((1 - distance).label("similarity"))
+        .order_by(None)
+        .order_by(distance)
+    )
+
+
+async def _index_query(ranked: Ranking, candidates: int) -> Select | None:
+    """The query joined to the in-process index's nearest candidates and their scores."""
+    matches = await vector_index.search(ranked.content_type, ranked.vector, candidates)
+    if not matches:
+        return None
+    scores = values(
+        column("content_id", UUID(as_uuid=True)), column("similarity", Float), name="candidates"
+    ).data(matches)
+    return (
+        ranked.query.join(scores, scores.c.content_id == ranked.content_id)
+        .add_columns(scores.c.similarity)
+        .order_by(None)
+        .order_by(scores.c.similarity.desc(), ranked.content_id)
+    )
+
+
+async def search_templates(
+    db: AsyncSession,
+    description: str,
+    event_type: str | None = None,
+    limit: int = 5,
+) -> list[tuple[Template, float]]:
+    """Public templates most similar to ``description``, with their similarity."""
+    query = select(Template).where(Template.is_public.is_(True))
+    if event_type:
+        query = query.where(func.lower(Template.event_type) == event_type.strip().lower())
+    ranked = nearest(query, "template", Template.id, description)
+    if ranked is None:
+        return []
+    return [(row[0], float(row.similarity)) for row in await fetch_nearest(db, ranked, limit)]
@@ -0,0 +1,504 @@
+"""Vector index service — in-process nearest-neighbour search without pgvector.
+
+Handles:
+- One index per content type: unit float32 vectors in a memory-mapped file,
+  shared by the worker processes on a host
+- Exact top-k by dot product with ``argpartition``, or IVF search over the
+  nearest partitions once an index holds ``VECTOR_INDEX_IVF_MIN_ROWS`` vectors
+- Refreshing incrementally from ``vector_embeddings`` (rows updated since
+  the index's watermark, plus deletions) in the embedding worker, after
+  each sync; request handlers only remap the saved files, at most every
+  ``VECTOR_INDEX_REFRESH_SECONDS``
+
+:mod:`app.services.retrieval_service` searches here instead of SQL when
+the database lacks the pgvector extension (``VECTOR_BACKEND``, checked at
+startup by :func:`detect_backend`).
+"""
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import time
+import uuid
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from sqlalchemy import func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.vector_embedding import HAS_PGVECTOR, VectorEmbedding
+from app.services import embeddings
+
+logger = logging.getLogger(__name__)
+
+# Embedding rows read per query while refreshing.
+REFRESH_BATCH_SIZE = 1000
+# Rows scored per matrix product when assigning IVF partitions.
+ASSIGN_CHUNK_ROWS = 8192
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_PER_LIST = 64
+
+_ZERO_ID = uuid.UUID(int=0)
+
+# Whether the database has the pgvector extension; None until detected.
+_database_has_pgvector: bool | None = None
+
+
+def enabled() -> bool:
+    """Whether semantic search uses this index rather than pgvector.
+
+    ``"auto"`` picks pgvector only when the database has the extension (see
+    :func:`detect_backend`); until that is known, it assumes pgvector.
+    """
+    backend = settings.VECTOR_BACKEND
+    if backend == "auto":
+        return not HAS_PGVECTOR or _database_has_pgvector is False
+    return backend == "numpy"
+
+
+async def detect_backend(db: AsyncSession) -> bool:
+    """Record whether the database has pgvector installed; returns :func:`enabled`."""
+    global _database_has_pgvector
+    _database_has_pgvector = bool(
+        await db.scalar(text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'vector')"))
+    )
+    return enabled()
+
+
+def pack(vector: list[float]) -> bytes:
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    """One saved generation of an index, replaced whole rather than mutated.
+
+    A search reads a single snapshot, so a reload running alongside it can
+    never mix arrays from two generations.
+    """
+
+    manifest: dict[str, Any]
+    vectors: np.ndarray
+    ids: np.ndarray
+    live: np.ndarray
+    size: int = 0
+    centroids: np.ndarray | None = None
+    lists: np.ndarray | None = None
+    partitions: tuple[np.ndarray, ...] = ()
+
+    @classmethod
+    def empty(cls, dim: int) -> "_Snapshot":
+        return cls({}, np.zeros((0, dim), dtype=np.float32), np.zeros((0, 16), dtype=np.uint8), np.zeros(0, dtype=bool))
+
+
+class VectorIndex:
+    """Unit vectors of one content type, searchable by cosine similarity.
+
+    Files live in ``directory``: ``vectors-<n>.f32`` (rows of ``dim``
+    floats, grown in place by doubling and rewritten only to drop deleted
+    rows), then per saved generation ``ids``, ``live`` (False for deleted
+    rows) and optional IVF ``centroids``/``lists`` arrays, and
+    ``manifest.json`` naming the current generation. The manifest is
+    replaced last, so readers never see a half-written index. One process
+    refreshes at a time (``flock``); the others reread the files.
+    """
+
+    def __init__(self, content_type: str, directory: Path, *, dim: int = embeddings.EMBEDDING_DIM) -> None:
+        self.content_type = content_type
+        self.directory = directory
+        self.dim = dim
+        self.snapshot = _Snapshot.empty(dim)
+        self._checked_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def manifest(self) -> dict[str, Any]:
+        return self.snapshot.manifest
+
+    @property
+    def size(self) -> int:
+        return self.snapshot.size
+
+    # -- search --------------------------------------------------------------
+
+    def search(self, vector: list[float], k: int) -> list[tuple[uuid.UUID, float]]:
+        """The ``k`` live rows most similar to ``vector``, best first."""
+        snapshot = self.snapshot
+        if k <= 0 or not snapshot.size:
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+
+        candidates = _probe(snapshot, query, k)
+        if candidates is None:
+            scores = snapshot.vectors @ query
+            scores[~snapshot.live] = -np.inf
+            candidates = np.arange(len(scores))
+        else:
+            scores = snapshot.vectors[candidates] @ query
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(uuid.UUID(bytes=snapshot.ids[candidates[i]].tobytes()), float(scores[i])) for i in top]
+
+    # -- loading -------------------------------------------------------------
+
+    async def ensure_loaded(self) -> None:
+        """Remap the saved files, in a thread, when the last check is older than the refresh interval."""
+        if self._fresh():
+            return
+        async with self._lock:
+            if self._fresh():
+                return
+            await asyncio.get_running_loop().run_in_executor(None, self.open)
+            self._checked_at = time.monotonic()
+
+    def _fresh(self) -> bool:
+        return (
+            self._checked_at is not None
+            and time.monotonic() - self._checked_at < settings.VECTOR_INDEX_REFRESH_SECONDS
+        )
+
+    def open(self) -> None:
+        """Map the index as last saved (by this or another process)."""
+        try:
+            manifest = json.loads((self.directory / "manifest.json").read_text())
+        except FileNotFoundError:
+            manifest = {}
+        if manifest.get("model") != embeddings.EMBEDDING_MODEL or manifest.get("dim") != self.dim:
+            manifest = {}
+        if manifest == self.manifest:
+            return
+        if not manifest.get("count"):
+            self.snapshot = _Snapshot.empty(self.dim)
+            return
+        count = manifest["count"]
+        vectors = np.memmap(
+            self.directory / manifest["vectors"],
+            dtype=np.float32,
+            mode="r",
+            shape=(manifest["capacity"], self.dim),
+        )[:count]
+        live = self._load(manifest, "live")
+        centroids = lists = None
+        partitions: tuple[np.ndarray, ...] = ()
+        if manifest.get("ivf_lists"):
+            centroids = self._load(manifest, "centroids")
+            lists = self._load(manifest, "lists")
+            order = np.argsort(lists, kind="stable")
+            bounds = np.searchsorted(lists[order], np.arange(len(centroids) + 1))
+            partitions = tuple(order[bounds[i] : bounds[i + 1]] for i in range(len(centroids)))
+        # One assignment: a concurrent search sees the old snapshot or this one.
+        self.snapshot = _Snapshot(
+            manifest, vectors, self._load(manifest, "ids"), live, int(live.sum()), centroids, lists, partitions
+        )
+
+    def _load(self, manifest: dict[str, Any], name: str) -> np.ndarray:
+        return np.load(self.directory / f"{name}-{manifest['generation']}.npy")
+
+    # -- refresh -------------------------------------------------------------
+
+    async def refresh(self, db: AsyncSession) -> bool:
+        """Catch up with ``vector_embeddings`` and save a new generation.
+
+        Run by the embedding worker. Queries run on the loop; applying rows,
+        IVF training, compaction and saving run in a thread. Returns False
+        without waiting when another process is writing.
+        """
+        loop = asyncio.get_running_loop()
+        with self._writer_lock() as writer:
+            if not writer:
+                return False
+            await loop.run_in_executor(None, self.open)
+            await self._catch_up(db, loop)
+        return True
+
+    async def _catch_up(self, db: AsyncSession, loop: asyncio.AbstractEventLoop) -> None:
+        watermark = self.manifest.get("watermark")
+        latest = datetime.fromisoformat(watermark) if watermark else None
+        cursor = None
+        if latest is not None:
+            cursor = (latest - timedelta(seconds=settings.EMBEDDING_OVERLAP_SECONDS), _ZERO_ID)
+        writer = _Writer(self)
+        while True:
+            stmt = self._rows().order_by(VectorEmbedding.updated_at, VectorEmbedding.content_id)
+            if cursor is not None:
+                stmt = stmt.where(tuple_(VectorEmbedding.updated_at, VectorEmbedding.content_id) > tuple_(*cursor))
+            rows = (await db.execute(stmt.limit(REFRESH_BATCH_SIZE))).all()
+            await loop.run_in_executor(None, writer.put_rows, rows)
+            if rows:
+                cursor = (rows[-1].updated_at, rows[-1].content_id)
+                latest = max(latest, cursor[0]) if latest else cursor[0]
+            if len(rows) < REFRESH_BATCH_SIZE:
+                break
+
+        # Deleted rows leave no trace in the scan above, and a row committed
+        # behind the overlap window would be missed: compare the id sets
+        # whenever the counts disagree.
+        stored = await db.scalar(select(func.count()).select_from(VectorEmbedding).where(*self._scope()))
+        if stored != writer.live_count():
+            ids = set((await db.execute(select(VectorEmbedding.content_id).where(*self._scope()))).scalars())
+            await loop.run_in_executor(None, writer.keep_only, ids)
+            missing = [content_id for content_id in ids if content_id.bytes not in writer.positions]
+            for start in range(0, len(missing), REFRESH_BATCH_SIZE):
+                chunk = missing[start : start + REFRESH_BATCH_SIZE]
+                rows = (await db.execute(self._rows().where(VectorEmbedding.content_id.in_(chunk)))).all()
+                await loop.run_in_executor(None, writer.put_rows, rows)
+
+        new_watermark = latest.isoformat() if latest else None
+        if writer.changed or new_watermark != watermark:
+            await loop.run_in_executor(None, writer.save, new_watermark)
+            await loop.run_in_executor(None, self.open)
+
+    def _scope(self) -> tuple[Any, ...]:
+        return (
+            VectorEmbedding.content_type == self.content_type,
+            VectorEmbedding.packed_embedding.is_not(None),
+        )
+
+    def _rows(self) -> Any:
+        return select(
+            VectorEmbedding.content_id, VectorEmbedding.updated_at, VectorEmbedding.packed_embedding
+        ).where(*self._scope())
+
+    @contextmanager
+    def _writer_lock(self) -> Iterator[bool]:
+        """Yields whether this process may write; never waits for another writer."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / ".lock", "a+b") as handle:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+class _Writer:
+    """Applies one refresh to an index's files (under the writer lock)."""
+
+    def __init__(self, index: VectorIndex) -> None:
+        snapshot = index.snapshot
+        self.index = index
+        self.directory = index.directory
+        self.dim = index.dim
+        self.count = len(snapshot.ids)
+        self.capacity = snapshot.manifest.get("capacity", 0)
+        self.ids = snapshot.ids.copy()
+        self.live = snapshot.live.copy()
+        self.lists = snapshot.lists.copy() if snapshot.lists is not None else None
+        self.centroids = snapshot.centroids
+        self.positions = {row.tobytes(): position for position, row in enumerate(self.ids)}
+        self.vectors_file = snapshot.manifest.get("vectors", "vectors-0.f32")
+        self.generation = snapshot.manifest.get("generation", 0) + 1
+        self.trained_on = snapshot.manifest.get("ivf_trained_on", 0)
+        self.vectors: np.memmap | None = None
+        self.changed = False
+
+    def live_count(self) -> int:
+        return int(self.live[: self.count].sum())
+
+    def put(self, content_id: uuid.UUID, packed: bytes) -> None:
+        vector = np.frombuffer(packed, dtype="<f4")
+        if vector.shape != (self.dim,):
+            return
+        key = content_id.bytes
+        position = self.positions.get(key)
+        if position is None:
+            position = self._append(key)
+        self._matrix()[position] = vector / (np.linalg.norm(vector) or 1.0)
+        self.live[position] = True
+        if self.lists is not None:
+            self.lists[position] = int(np.argmax(self.centroids @ vector))
+        self.changed = True
+
+    def put_rows(self, rows: Iterable[Any]) -> None:
+        for content_id, _updated_at, packed in rows:
+            self.put(content_id, packed)
+
+    def keep_only(self, content_ids: set[uuid.UUID]) -> None:
+        keep = {content_id.bytes for content_id in content_ids}
+        for key, position in self.positions.items():
+            if self.live[position] and key not in keep:
+                self.live[position] = False
+                self.changed = True
+
+    def save(self, watermark: str | None) -> None:
+        if self.vectors is not None:
+            self.vectors.flush()
+        live = self.live_count()
+        if self.count > 2 * live + REFRESH_BATCH_SIZE:
+            self._compact()
+            live = self.count
+        ivf_lists = self._partition(live)
+
+        self._save_array("ids", self.ids[: self.count])
+        self._save_array("live", self.live[: self.count])
+        if ivf_lists:
+            self._save_array("centroids", self.centroids)
+            self._save_array("lists", self.lists[: self.count])
+        manifest = {
+            "model": embeddings.EMBEDDING_MODEL,
+            "dim": self.dim,
+            "generation": self.generation,
+            "vectors": self.vectors_file,
+            "count": self.count,
+            "capacity": self.capacity,
+            "watermark": watermark,
+            "ivf_lists": ivf_lists,
+            "ivf_trained_on": self.trained_on if ivf_lists else 0,
+        }
+        tmp = self.directory / ".manifest.json.tmp"
+        tmp.write_text(json.dumps(manifest))
+        os.replace(tmp, self.directory / "manifest.json")
+        self._remove_stale()
+        logger.info("Vector index %s saved: %d vectors (%d live)", self.index.content_type, self.count, live)
+
+    def _save_array(self, name: str, array: np.ndarray) -> None:
+        with open(self.directory / f"{name}-{self.generation}.npy", "wb") as handle:
+            np.save(handle, array)
+
+    def _remove_stale(self) -> None:
+        """Drop files older than the previous generation (a reader may still be loading that one)."""
+        for path in self.directory.iterdir():
+            stem, _, suffix = path.stem.rpartition("-")
+            if not suffix.isdigit():
+                continue
+            stale = (
+                path.suffix == ".npy" and int(suffix) < self.generation - 1
+                or path.suffix == ".f32" and path.name != self.vectors_file
+            )
+            if stem and stale:
+                path.unlink(missing_ok=True)
+
+    # -- storage -------------------------------------------------------------
+
+    def _matrix(self) -> np.memmap:
+        if self.vectors is None:
+            self.vectors = np.memmap(
+                self.directory / self.vectors_file, dtype=np.float32, mode="r+", shape=(self.capacity, self.dim)
+            )
+        return self.vectors
+
+    def _append(self, key: bytes) -> int:
+        if self.count == self.capacity:
+            self._grow(max(1024, self.capacity * 2))
+        position = self.count
+        self.count += 1
+        if len(self.ids) < self.count:
+            extra = max(REFRESH_BATCH_SIZE, len(self.ids))
+            self.ids = np.concatenate([self.ids, np.zeros((extra, 16), dtype=np.uint8)])
+            self.live = np.concatenate([self.live, np.zeros(extra, dtype=bool)])
+            if self.lists is not None:
+                self.lists = np.concatenate([self.lists, np.zeros(extra, dtype=self.lists.dtype)])
+        self.ids[position] = np.frombuffer(key, dtype=np.uint8)
+        self.positions[key] = position
+        return position
+
+    def _grow(self, capacity: int) -> None:
+        # Extending the file in place keeps mappings held by other processes valid.
+        if self.vectors is not None:
+            self.vectors.flush()
+            self.vectors = None
+        with open(self.directory / self.vectors_file, "a+b") as handle:
+            handle.truncate(capacity * self.dim * 4)
+        self.capacity = capacity
+
+    def _compact(self) -> None:
+        """Rewrite the index without deleted rows, to a new file (readers keep the old one)."""
+        keep = np.flatnonzero(self.live[: self.count])
+        source = self._matrix()
+        self.vectors_file = f"vectors-{self.generation}.f32"
+        capacity = max(1024, len(keep) * 2)
+        compacted = np.memmap(self.directory / self.vectors_file, dtype=np.float32, mode="w+", shape=(capacity, self.dim))
+        for start in range(0, len(keep), ASSIGN_CHUNK_ROWS):
+            chunk = keep[start : start + ASSIGN_CHUNK_ROWS]
+            compacted[start : start + len(chunk)] = source[chunk]
+        compacted.flush()
+        self.vectors, self.capacity, self.count = compacted, capacity, len(keep)
+        self.ids = self.ids[keep]
+        self.live = np.ones(len(keep), dtype=bool)
+        self.lists = self.lists[keep] if self.lists is not None else None
+        self.positions = {row.tobytes(): position for position, row in enumerate(self.ids)}
+
+    # -- IVF -----------------------------------------------------------------
+
+    def _partition(self, live: int) -> int:
+        """Number of IVF lists to save (0 for exact search), retraining as the index doubles."""
+        minimum = settings.VECTOR_INDEX_IVF_MIN_ROWS
+        if not minimum or live < minimum:
+            self.centroids = self.lists = None
+            return 0
+        if self.centroids is None or live > 2 * self.trained_on:
+            self._train(live)
+        return len(self.centroids)
+
+    def _train(self, live: int) -> None:
+        """Spherical k-means on a sample of live rows, then assign every row."""
+        rng = np.random.default_rng(0)
+        matrix = self._matrix()[: self.count]
+        nlist = int(min(4096, max(16, np.sqrt(live))))
+        rows = np.flatnonzero(self.live[: self.count])
+        sample = matrix[rng.choice(rows, size=min(len(rows), nlist * KMEANS_SAMPLE_PER_LIST), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            assigned = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assigned, sample)
+            norms = np.linalg.norm(sums, axis=1)
+            empty = norms == 0
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()), replace=False)]
+            norms[empty] = 1.0
+            centroids = sums / norms[:, None]
+        self.centroids = centroids.astype(np.float32)
+        self.lists = np.zeros(len(self.ids), dtype=np.int32)
+        for start in range(0, self.count, ASSIGN_CHUNK_ROWS):
+            chunk = matrix[start : start + ASSIGN_CHUNK_ROWS]
+            self.lists[start : start + len(chunk)] = np.argmax(chunk @ self.centroids.T, axis=1)
+        self.trained_on = live
+
+
+def _probe(snapshot: _Snapshot, query: np.ndarray, k: int) -> np.ndarray | None:
+    """Live rows in the partitions nearest ``query``; None means scan everything."""
+    if snapshot.centroids is None or not snapshot.partitions:
+        return None
+    probes = min(settings.VECTOR_INDEX_IVF_PROBES, len(snapshot.partitions))
+    nearest = np.argpartition(-(snapshot.centroids @ query), probes - 1)[:probes]
+    candidates = np.concatenate([snapshot.partitions[p] for p in nearest])
+    candidates = candidates[snapshot.live[candidates]]
+    # Too few to fill the page: an exact scan costs little more.
+    return candidates if len(candidates) >= k else None
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+_indexes: dict[str, VectorIndex] = {}
+
+
+def get_index(content_type: str) -> VectorIndex:
+    if content_type not in _indexes:
+        _indexes[content_type] = VectorIndex(content_type, Path(settings.VECTOR_INDEX_DIR) / content_type)
+    return _indexes[content_type]
+
+
+async def search(content_type: str, vector: list[float], k: int) -> list[tuple[uuid.UUID, float]]:
+    """The ``k`` embeddings of ``content_type`` most similar to ``vector``, with their similarity."""
+    index = get_index(content_type)
+    await index.ensure_loaded()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, index.search, vector, k)
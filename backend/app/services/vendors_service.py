@@ -4,6 +4,8 @@ from typing import Any
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.cache import AppCache, cached
+from app.core.config import settings
 from app.models.enums import VendorType, VendorVerificationStatus
 from app.models.service_profile import ServiceProfile
 from app.models.user import User
@@ -11,6 +13,10 @@ from app.models.vendor import Vendor
 from app.models.venue_profile import VenueProfile
 from app.schemas.vendors import ServiceProviderOnboardingIn, VenueOwnerOnboardingIn
 
+_vendor_card_cache = AppCache(
+    "public-vendor-cards", ttl=settings.VENDOR_CARDS_CACHE_TTL_SECONDS, tags=("vendors",)
+)
+
 
 def get_or_create_vendor_for_user(
     db: Session, user: User, vendor_type: VendorType
@@ -183,3 +189,33 @@ def list_public_vendors(
             )
 
     return results
+
+
+@cached(_vendor_card_cache)
+def list_public_vendor_cards(
+    db: Session,
+    vendor_type: VendorType | None = None,
+    category: str | None = None,
+    location_text: str | None = None,
+    service_area: str | None = None,
+) -> list[dict[str, Any]]:
+    """Public card fields for :func:`list_public_vendors`, cached per filter set."""
+    rows = list_public_vendors(
+        db,
+        vendor_type=vendor_type,
+        category=category,
+        location_text=location_text,
+        service_area=service_area,
+    )
+    return [
+        {
+            "vendor_id": str(row["vendor"].id),
+            "vendor_type": VendorType(row["vendor"].vendor_type).value,
+            "display_name": row.get("display_name", "Vendor"),
+            "location_text": row.get("location_text"),
+            "categories": row.get("categories"),
+            "service_areas": row.get("service_areas"),
+            "assets_json": row.get("assets_json"),
+        }
+        for row in rows
+    ]
@@ -0,0 +1 @@
+"""Micro-benchmarks for CPU-bound helpers on the request path."""
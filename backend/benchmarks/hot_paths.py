@@ -0,0 +1,378 @@
+"""Micro-benchmarks for pure helpers that run on every request.
+
+Each case times a single call of a hot function and compares the best
+per-call time against ``baselines.json``. A case regresses when it is more
+than ``--threshold`` (fractional) slower than its stored baseline.
+
+Usage (from ``backend/``):
+    python -m benchmarks.hot_paths                    # compare, exit 1 on regression
+    python -m benchmarks.hot_paths --update-baseline  # re-record baselines
+    python -m benchmarks.hot_paths --only jwt_decode_token --threshold 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import timeit
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+BASELINE_PATH = Path(__file__).with_name("baselines.json")
+DEFAULT_THRESHOLD = float(os.getenv("BENCH_THRESHOLD", "0.50"))
+DEFAULT_REPEAT = 5
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    number: int = 2000
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    name: str
+    ns_per_call: float
+    baseline_ns: float | None
+    regressed: bool
+
+    @property
+    def ratio(self) -> float | None:
+        if not self.baseline_ns:
+            return None
+        return self.ns_per_call / self.baseline_ns
+
+
+# ---------------------------------------------------------------------------
+# Case setup — imports stay inside so a broken module only fails its case
+# ---------------------------------------------------------------------------
+
+
+def _setup_payout_allocation() -> Callable[[], object]:
+    from app.services.payouts.allocation import allocate_paid_amount_across_vendors
+
+    vendors = [
+        SimpleNamespace(id=uuid.uuid4(), agreed_amount_cents=amount)
+        for amount in (125_000, 87_550, 43_210, 19_999, 7_001)
+    ]
+    total = sum(v.agreed_amount_cents for v in vendors)
+
+    return lambda: allocate_paid_amount_across_vendors(total, total // 3, vendors, 0.10)
+
+
+def _setup_guardrails_clean() -> Callable[[], object]:
+    from app.services.chat_service import check_content_guardrails
+
+    text = (
+        "Thanks for confirming the floor plan. Could we move the buffet closer to the "
+        "stage and add two more round tables for the family? Setup starts at 8 and we "
+        "need the dance floor cleared by 21:30 for the speeches."
+    )
+    return lambda: check_content_guardrails(text)
+
+
+def _setup_guardrails_blocked() -> Callable[[], object]:
+    from app.services.chat_service import check_content_guardrails
+
+    text = "Happy to share the menu, just reach me directly at planner.jane@example.com."
+    return lambda: check_content_guardrails(text)
+
+
+def _venue_row() -> object:
+    import app.models  # noqa: F401 — resolve string relationships
+    from app.models.venue import Venue
+
+    now = datetime.now(timezone.utc)
+    return Venue(
+        id=uuid.uuid4(),
+        owner_id=uuid.uuid4(),
+        name="Riverside Loft",
+        description="Industrial loft with river views and a rooftop terrace.",
+        location_address="100 Congress Ave",
+        location_city="Austin",
+        location_lat=Decimal("30.26666600"),
+        location_lng=Decimal("-97.74277800"),
+        capacity=220,
+        amenities=["wifi", "parking", "av_system", "catering_kitchen"],
+        pricing_structure={"per_hour": 450, "per_day": 3200},
+        floor_plan_url=None,
+        floor_plan_generated=False,
+        status="approved",
+        photos=["https://cdn.example.com/a.jpg", "https://cdn.example.com/b.jpg"],
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _setup_serialize_row() -> Callable[[], object]:
+    from app.api.crud_factory import _serialize_row
+
+    row = _venue_row()
+    return lambda: _serialize_row(row)
+
+
+def _setup_model_to_dict() -> Callable[[], object]:
+    from app.utils.serialization import model_to_dict
+
+    row = _venue_row()
+    return lambda: model_to_dict(row)
+
+
+def _setup_json_formatter() -> Callable[[], object]:
+    from app.core.logging_config import JsonFormatter
+
+    formatter = JsonFormatter()
+    record = logging.LogRecord(
+        name="app.request",
+        level=logging.INFO,
+        pathname=__file__,
+        lineno=1,
+        msg="request completed",
+        args=(),
+        exc_info=None,
+    )
+    record.request_id = str(uuid.uuid4())
+    record.method = "GET"
+    record.path = "/api/marketplace/venues"
+    record.status_code = 200
+    record.duration_ms = 12.5
+    record.client_ip = "203.0.113.7"
+    record.user_id = str(uuid.uuid4())
+    return lambda: formatter.format(record)
+
+
+def _setup_create_access_token() -> Callable[[], object]:
+    from app.core.security import create_access_token
+
+    subject = str(uuid.uuid4())
+    claims = {"role": "organizer", "csrf": "abc123"}
+    return lambda: create_access_token(subject, claims)
+
+
+def _setup_decode_token() -> Callable[[], object]:
+    from app.core.security import create_access_token, decode_token
+
+    token = create_access_token(str(uuid.uuid4()), {"role": "organizer", "csrf": "abc123"})
+    return lambda: decode_token(token)
+
+
+def _setup_rate_limit_rule_matches() -> Callable[[], object]:
+    from fastapi import Request
+
+    from app.core.middleware.rate_limit import RateLimitRule
+
+    rules = [
+        RateLimitRule(
+            name="auth-sensitive",
+            path_prefixes=(
+                "/api/auth/login",
+                "/api/auth/signup",
+                "/api/auth/register",
+                "/api/auth/forgot-password",
+                "/api/auth/reset-password",
+                "/api/auth/verify-email",
+                "/api/auth/resend-verification",
+            ),
+            methods=("POST",),
+            limit=10,
+            window_seconds=60,
+        ),
+        RateLimitRule(
+            name="api-write",
+            path_prefixes=("/api/",),
+            methods=("POST", "PUT", "PATCH", "DELETE"),
+            limit=120,
+            window_seconds=60,
+        ),
+    ]
+    request = Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "scheme": "http",
+            "path": "/api/planner/message",
+            "query_string": b"",
+            "headers": [(b"host", b"testserver")],
+            "server": ("testserver", 80),
+        }
+    )
+
+    return lambda: [rule.matches(request) for rule in rules]
+
+
+def _setup_planner_match_scoring() -> Callable[[], object]:
+    import numpy as np
+
+    from app.services import match_scoring
+
+    rng = np.random.default_rng(7)
+    size = 2000
+    cols = {
+        "capacity": rng.integers(50, 500, size).astype(float),
+        "price_min": np.where(rng.random(size) < 0.1, np.nan, rng.uniform(500, 20000, size)),
+        "avg_rating": np.where(rng.random(size) < 0.3, np.nan, rng.uniform(2.5, 5.0, size)),
+        "review_count": rng.integers(0, 300, size).astype(float),
+        "distance_km": rng.uniform(0, 40, size),
+        "blocked_days": rng.integers(0, 3, size).astype(float),
+        "similarity": rng.uniform(0, 0.6, size),
+    }
+    request = match_scoring.MatchRequest(guest_count=120, price_target=7000, radius_km=40, requested_days=2)
+    weights = dict.fromkeys(match_scoring.CRITERIA, 1.0)
+    return lambda: match_scoring.top_k(match_scoring.score(cols, request, weights), 10)
+
+
+def _setup_plan_engine_build_plan() -> Callable[[], object]:
+    from app.services import plan_engine
+
+    template = SimpleNamespace(
+        id=uuid.UUID(int=1),
+        template_data={
+            "timeline": [
+                {"time": "3:00 PM", "title": "Guest Arrival", "description": "Welcome drinks."},
+                {"time": "3:30 PM", "title": "Ceremony", "description": "String trio."},
+                {"time": "5:00 PM", "title": "Reception & Dinner", "description": "Plated dinner."},
+                {"time": "10:30 PM", "title": "Farewell", "description": "Sparkler send-off."},
+            ],
+            "budget": {
+                "breakdown": [
+                    {"label": "Venue & rentals", "amount": "$8,000"},
+                    {"label": "Food & beverage", "amount": "$5,000"},
+                    {"label": "Photography", "amount": "$2,500"},
+                    {"label": "Entertainment", "amount": "$1,500"},
+                    {"label": "Decor & florals", "amount": "$2,500"},
+                ],
+            },
+        },
+    )
+    venues = [SimpleNamespace(name="Harbor Loft", capacity=180, price_min=Decimal("6000"))]
+    providers = [SimpleNamespace(name=f"Provider {i}", price_min=Decimal("800")) for i in range(5)]
+    brief = {"eventType": "wedding", "guestCount": 150, "budget": 20000, "city": "Chicago"}
+    basis = plan_engine.plan_basis(brief, venues, providers, template)
+    return lambda: plan_engine.build_plan(basis)
+
+
+CASES: list[BenchmarkCase] = [
+    BenchmarkCase("payout_allocation", _setup_payout_allocation),
+    BenchmarkCase("chat_guardrails_clean", _setup_guardrails_clean),
+    BenchmarkCase("chat_guardrails_blocked", _setup_guardrails_blocked),
+    BenchmarkCase("crud_serialize_row", _setup_serialize_row),
+    BenchmarkCase("model_to_dict", _setup_model_to_dict),
+    BenchmarkCase("json_formatter_format", _setup_json_formatter),
+    BenchmarkCase("jwt_create_access_token", _setup_create_access_token, number=500),
+    BenchmarkCase("jwt_decode_token", _setup_decode_token, number=500),
+    BenchmarkCase("rate_limit_rule_matches", _setup_rate_limit_rule_matches),
+    BenchmarkCase("planner_match_scoring", _setup_planner_match_scoring, number=500),
+    BenchmarkCase("plan_engine_build_plan", _setup_plan_engine_build_plan),
+]
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+
+def measure(case: BenchmarkCase, repeat: int = DEFAULT_REPEAT, number: int | None = None) -> float:
+    """Return the best observed time per call in nanoseconds."""
+    fn = case.setup()
+    fn()  # warm caches, lazy imports and regex compilation
+    loops = number or case.number
+    timings = timeit.Timer(fn).repeat(repeat=repeat, number=loops)
+    return min(timings) / loops * 1e9
+
+
+def compare(
+    name: str,
+    ns_per_call: float,
+    baselines: dict[str, float],
+    threshold: float,
+) -> BenchmarkResult:
+    baseline_ns = baselines.get(name)
+    regressed = baseline_ns is not None and ns_per_call > baseline_ns * (1 + threshold)
+    return BenchmarkResult(
+        name=name,
+        ns_per_call=ns_per_call,
+        baseline_ns=baseline_ns,
+        regressed=regressed,
+    )
+
+
+def load_baselines(path: Path = BASELINE_PATH) -> dict[str, float]:
+    if not path.exists():
+        return {}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {name: float(value) for name, value in data.get("cases", {}).items()}
+
+
+def save_baselines(results: dict[str, float], path: Path = BASELINE_PATH) -> None:
+    existing = load_baselines(path)
+    existing.update(results)
+    payload = {
+        "python": platform.python_version(),
+        "unit": "ns_per_call",
+        "cases": {name: round(value, 1) for name, value in sorted(existing.items())},
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def run(
+    cases: list[BenchmarkCase],
+    threshold: float,
+    repeat: int = DEFAULT_REPEAT,
+    baselines: dict[str, float] | None = None,
+) -> list[BenchmarkResult]:
+    baselines = load_baselines() if baselines is None else baselines
+    return [compare(case.name, measure(case, repeat=repeat), baselines, threshold) for case in cases]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark hot request-path helpers.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--only", action="append", default=[], help="Case name (repeatable)")
+    parser.add_argument("--update-baseline", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    selected = [case for case in CASES if not args.only or case.name in args.only]
+    if not selected:
+        print(f"No benchmark cases match {args.only}", file=sys.stderr)
+        return 2
+
+    results = run(selected, threshold=args.threshold, repeat=args.repeat)
+
+    print(f"{'case':<28} {'ns/call':>12} {'baseline':>12} {'ratio':>7}")
+    for result in results:
+        baseline = f"{result.baseline_ns:,.0f}" if result.baseline_ns else "-"
+        ratio = f"{result.ratio:.2f}" if result.ratio else "-"
+        flag = "  REGRESSED" if result.regressed else ""
+        print(f"{result.name:<28} {result.ns_per_call:>12,.0f} {baseline:>12} {ratio:>7}{flag}")
+
+    if args.update_baseline:
+        save_baselines({result.name: result.ns_per_call for result in results})
+        print(f"Baselines written to {BASELINE_PATH}")
+        return 0
+
+    regressed = [result.name for result in results if result.regressed]
+    if regressed:
+        print(
+            f"{len(regressed)} case(s) regressed beyond {args.threshold:.0%}: {', '.join(regressed)}",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Keep semantic search embeddings current as listings and templates change.
+
+Usage: python -m scripts.embedding_worker [--type venue|service_provider|template] [--once]
+
+Runs at a lower CPU priority than the API, embedding in a small process
+pool, and picks up from its checkpoints after a restart.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.config import settings
+from app.db.engine import async_session_factory, engine
+from app.services import embedding_ingestion, vector_index
+
+logger = logging.getLogger("scripts.embedding_worker")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Incrementally ingest search embeddings.")
+    parser.add_argument("--type", choices=tuple(embedding_ingestion.SOURCES), action="append", dest="types")
+    parser.add_argument("--once", action="store_true", help="Sync once and exit.")
+    parser.add_argument("--batch-size", type=int, default=settings.EMBEDDING_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=settings.EMBEDDING_WORKER_CONCURRENCY)
+    parser.add_argument("--interval", type=float, default=settings.EMBEDDING_WORKER_INTERVAL_SECONDS)
+    parser.add_argument("--nice", type=int, default=10, help="CPU priority increment for the worker.")
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    async with async_session_factory() as db:
+        await vector_index.detect_backend(db)
+
+    with ProcessPoolExecutor(max_workers=args.concurrency) as executor:
+        while not stop.is_set():
+            results = await embedding_ingestion.sync_all(
+                args.types,
+                concurrency=args.concurrency,
+                batch_size=args.batch_size,
+                executor=executor,
+                stop=stop,
+            )
+            for result in results:
+                if result.scanned or result.dropped:
+                    logger.info(
+                        "Embeddings %s: scanned=%d embedded=%d unchanged=%d dropped=%d",
+                        result.content_type,
+                        result.scanned,
+                        result.embedded,
+                        result.unchanged,
+                        result.dropped,
+                    )
+            if args.once:
+                break
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stop.wait(), args.interval)
+    await engine.dispose()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO)
+    if args.nice:
+        # Children of the process pool inherit the lower priority.
+        os.nice(args.nice)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
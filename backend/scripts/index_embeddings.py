@@ -0,0 +1,50 @@
+"""Embed marketplace listings and public templates into vector_embeddings.
+
+Usage: python -m scripts.index_embeddings [--type venue|service_provider|template]
+
+Re-embeds everything; ``scripts.embedding_worker`` keeps embeddings current
+incrementally after that.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+
+from app.db.engine import async_session_factory, engine
+from app.models.marketplace_listing import LISTING_TYPES
+from app.services import retrieval_service, vector_index
+
+logger = logging.getLogger("scripts.index_embeddings")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild semantic search embeddings.")
+    parser.add_argument("--type", choices=retrieval_service.CONTENT_TYPES, default=None)
+    return parser.parse_args()
+
+
+async def run(content_type: str | None) -> dict[str, int]:
+    async with async_session_factory() as db:
+        await vector_index.detect_backend(db)
+        if content_type is None:
+            counts = await retrieval_service.index_all(db)
+        elif content_type in LISTING_TYPES:
+            counts = {content_type: await retrieval_service.index_listings(db, content_type)}
+        else:
+            counts = {content_type: await retrieval_service.index_templates(db)}
+        await db.commit()
+    await engine.dispose()
+    return counts
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO)
+    counts = asyncio.run(run(args.type))
+    logger.info("Indexed embeddings: %s", counts)
+
+
+if __name__ == "__main__":
+    main()
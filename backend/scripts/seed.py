@@ -584,6 +584,13 @@ async def _clear_seeded_data(db: AsyncSession) -> None:
         # Delete in FK-safe order using raw SQL (no ORM cascade interference)
         await db.execute(text("DELETE FROM templates WHERE created_by = ANY(:ids)"), {"ids": user_ids})
         await db.execute(text("DELETE FROM subscriptions WHERE user_id = ANY(:ids)"), {"ids": user_ids})
+        # Raw deletes skip the ORM hooks that keep the listing read model current
+        await db.execute(text(
+            "DELETE FROM marketplace_listings WHERE "
+            "(listing_type = 'venue' AND entity_id IN (SELECT id FROM venues WHERE owner_id = ANY(:ids))) OR "
+            "(listing_type = 'service_provider' AND entity_id IN "
+            "(SELECT id FROM service_providers WHERE user_id = ANY(:ids)))"
+        ), {"ids": user_ids})
         await db.execute(text(
             "DELETE FROM service_provider_services WHERE service_provider_id IN "
             "(SELECT id FROM service_providers WHERE user_id = ANY(:ids))"
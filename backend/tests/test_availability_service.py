@@ -0,0 +1,133 @@
+"""Tests for date parsing, availability bitmap predicates and bitmap upkeep."""
+
+import uuid
+from datetime import date
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, Mock
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.dialects import postgresql
+
+from app.models.availability_bitmap import DAYS_PER_BITMAP, apply_blocked_day, day_of_year
+from app.models.venue import Venue
+from app.services import availability_service, marketplace_service
+from app.utils.exceptions import BadRequestError
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class DateParsingTests(TestCase):
+    def test_available_on_is_sorted_and_deduplicated(self) -> None:
+        days = availability_service.parse_dates("2026-11-14, 2026-11-07,2026-11-14")
+
+        self.assertEqual(days, [date(2026, 11, 7), date(2026, 11, 14)])
+
+    def test_available_between_is_inclusive(self) -> None:
+        days = availability_service.parse_date_range("2026-12-30,2027-01-02")
+
+        self.assertEqual(len(days), 4)
+        self.assertEqual((days[0], days[-1]), (date(2026, 12, 30), date(2027, 1, 2)))
+
+    def test_bad_values_are_rejected(self) -> None:
+        with self.assertRaises(BadRequestError):
+            availability_service.parse_dates("next friday")
+        with self.assertRaises(BadRequestError):
+            availability_service.parse_date_range("2026-01-01")
+        with self.assertRaises(BadRequestError):
+            availability_service.parse_date_range("2026-01-01,2028-01-01")
+
+    def test_no_dates_means_no_filter(self) -> None:
+        self.assertIsNone(availability_service.requested_dates(None, ""))
+
+
+class BitmapPredicateTests(TestCase):
+    def test_masks_are_split_per_year(self) -> None:
+        masks = availability_service.year_masks([date(2026, 1, 1), date(2026, 12, 31), date(2027, 1, 2)])
+
+        self.assertEqual(set(masks), {2026, 2027})
+        self.assertEqual(len(masks[2026]), DAYS_PER_BITMAP)
+        self.assertEqual(masks[2026].count("1"), 2)
+        self.assertEqual(masks[2027].index("1"), 1)
+
+    def test_day_of_year_covers_leap_day(self) -> None:
+        self.assertEqual(day_of_year(date(2028, 12, 31)), DAYS_PER_BITMAP - 1)
+
+    def test_any_match_excludes_only_fully_blocked_requests(self) -> None:
+        predicate = availability_service.availability_filter(
+            "venue", Venue.id, [date(2026, 12, 31), date(2027, 1, 1)], "any"
+        )
+        sql = _sql(predicate)
+
+        self.assertEqual(sql.count("NOT (EXISTS"), 2)
+        self.assertIn(" OR ", sql)
+        self.assertIn("availability_bitmaps.blocked & CAST(", sql)
+
+    def test_all_match_requires_every_year_clear(self) -> None:
+        predicate = availability_service.availability_filter(
+            "venue", Venue.id, [date(2026, 12, 31), date(2027, 1, 1)], "all"
+        )
+        sql = _sql(predicate)
+
+        self.assertIn(" AND NOT (EXISTS", sql)
+        self.assertIn("!= CAST(repeat(", sql)
+
+    def test_marketplace_applies_filter_before_pagination(self) -> None:
+        sql = _sql(
+            marketplace_service.build_venue_query(available_dates=[date(2026, 11, 7)]).limit(20)
+        )
+
+        self.assertLess(sql.index("availability_bitmaps"), sql.index("LIMIT"))
+
+
+class BitmapUpkeepTests(TestCase):
+    def test_blocked_day_upserts_year_row(self) -> None:
+        connection = Mock()
+        apply_blocked_day(connection, "venue", uuid.uuid4(), date(2026, 3, 1), True)
+
+        sql = _sql(connection.execute.call_args.args[0])
+        self.assertIn("INSERT INTO availability_bitmaps", sql)
+        self.assertIn("ON CONFLICT (entity_type, entity_id, year) DO UPDATE", sql)
+        self.assertIn("set_bit(availability_bitmaps.blocked", sql)
+
+    def test_incomplete_rows_are_ignored(self) -> None:
+        connection = Mock()
+        apply_blocked_day(connection, "venue", uuid.uuid4(), None, True)
+
+        connection.execute.assert_not_called()
+
+
+class IsAvailableTests(IsolatedAsyncioTestCase):
+    async def test_missing_row_means_free(self) -> None:
+        db = AsyncMock()
+        db.execute.return_value = Mock(scalar_one_or_none=Mock(return_value=None))
+
+        self.assertTrue(await availability_service.is_available(db, "venue", uuid.uuid4(), date(2026, 5, 1)))
+
+    async def test_unavailable_row_means_blocked(self) -> None:
+        db = AsyncMock()
+        db.execute.return_value = Mock(scalar_one_or_none=Mock(return_value=False))
+
+        self.assertFalse(await availability_service.is_available(db, "venue", uuid.uuid4(), date(2026, 5, 1)))
+
+    async def test_booking_check_locks_the_authoritative_row(self) -> None:
+        db = AsyncMock()
+        db.execute.return_value = Mock(scalar_one_or_none=Mock(return_value=True))
+
+        self.assertTrue(await availability_service.is_available(db, "venue", uuid.uuid4(), date(2026, 5, 1)))
+
+        sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        self.assertIn("FROM availability \nWHERE", sql)
+        self.assertNotIn("availability_bitmaps", sql)
+        self.assertTrue(sql.endswith("FOR UPDATE"))
+
+
+class MatchModeTests(TestCase):
+    def test_unknown_modes_are_rejected(self) -> None:
+        # Query parameters typed MatchMode turn anything else into a 422.
+        adapter = TypeAdapter(availability_service.MatchMode)
+
+        self.assertEqual(adapter.validate_python("all"), "all")
+        with self.assertRaises(ValidationError):
+            adapter.validate_python("every")
@@ -0,0 +1,36 @@
+"""Smoke tests for the hot-path micro-benchmark harness."""
+
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from benchmarks.hot_paths import CASES, compare, load_baselines, measure, save_baselines
+
+
+class BenchmarkHarnessTests(TestCase):
+    def test_every_case_runs(self) -> None:
+        for case in CASES:
+            with self.subTest(case=case.name):
+                self.assertGreater(measure(case, repeat=1, number=1), 0)
+
+    def test_every_case_has_a_stored_baseline(self) -> None:
+        baselines = load_baselines()
+        missing = [case.name for case in CASES if case.name not in baselines]
+        self.assertEqual(missing, [])
+
+    def test_compare_flags_only_regressions_beyond_threshold(self) -> None:
+        baselines = {"fast": 1000.0}
+
+        self.assertFalse(compare("fast", 1250.0, baselines, threshold=0.3).regressed)
+        self.assertTrue(compare("fast", 1400.0, baselines, threshold=0.3).regressed)
+        self.assertFalse(compare("new_case", 9999.0, baselines, threshold=0.3).regressed)
+
+    def test_save_baselines_merges_existing_cases(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "baselines.json"
+            save_baselines({"a": 10.0, "b": 20.0}, path)
+            save_baselines({"b": 25.0}, path)
+
+            self.assertEqual(load_baselines(path), {"a": 10.0, "b": 25.0})
+            self.assertEqual(json.loads(path.read_text())["unit"], "ns_per_call")
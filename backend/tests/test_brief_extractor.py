@@ -0,0 +1,90 @@
+"""Tests for the local planner brief extractor."""
+
+from datetime import date
+from unittest import TestCase
+
+from app.services.brief_extractor import extract_brief
+
+TODAY = date(2026, 10, 19)  # a Monday
+
+
+def _values(text: str) -> dict:
+    return {name: match.value for name, match in extract_brief(text, TODAY).fields.items()}
+
+
+class ExtractBriefTests(TestCase):
+    def test_typical_message_resolves_every_field_it_mentions(self) -> None:
+        extraction = extract_brief("100 guests, $20k, Austin in May", TODAY)
+
+        self.assertEqual(
+            extraction.resolved(0.8),
+            {"guestCount": 100, "budget": 20000, "city": "Austin", "dateRange": "May 2027"},
+        )
+        self.assertEqual(extraction.unparsed, [])
+
+    def test_full_sentence(self) -> None:
+        values = _values(
+            "We're planning a wedding for about 150 people in San Francisco, CA on "
+            "June 14th, 2027. Budget is around 45,000 dollars."
+        )
+
+        self.assertEqual(
+            values,
+            {
+                "eventType": "wedding",
+                "guestCount": 150,
+                "budget": 45000,
+                "city": "San Francisco",
+                "dateRange": "2027-06-14",
+            },
+        )
+
+    def test_numbers_in_words_ranges_and_scales(self) -> None:
+        self.assertEqual(_values("a hundred and fifty guests")["guestCount"], 150)
+        self.assertEqual(_values("40-60 attendees")["guestCount"], 60)
+        self.assertEqual(_values("budget $15-20k")["budget"], 20000)
+        self.assertEqual(_values("$1.5M gala")["budget"], 1_500_000)
+        self.assertEqual(_values("max 200 guests"), {"guestCount": 200})
+
+    def test_date_expressions(self) -> None:
+        self.assertEqual(_values("Dec 30 - Jan 2")["dateRange"], "2026-12-30 to 2027-01-02")
+        self.assertEqual(_values("Saturday, June 14")["dateRange"], "2027-06-14")
+        self.assertEqual(_values("next Saturday")["dateRange"], "2026-10-24")
+        self.assertEqual(_values("sometime next month")["dateRange"], "November 2026")
+        self.assertEqual(_values("late summer")["dateRange"], "Late Summer 2027")
+        self.assertNotIn("dateRange", _values("we may go bigger"))
+
+    def test_city_aliases_and_state_suffix(self) -> None:
+        self.assertEqual(_values("in NYC")["city"], "New York")
+        self.assertEqual(_values("St Louis, Missouri")["city"], "St. Louis")
+        portland = extract_brief("Portland, Maine", TODAY).fields["city"]
+        self.assertLess(portland.confidence, 0.8)
+
+    def test_ambiguous_mentions_are_low_confidence(self) -> None:
+        extraction = extract_brief("my daughter Charlotte's birthday, $85 per person", TODAY)
+
+        self.assertEqual(extraction.resolved(0.8), {"eventType": "birthday"})
+        self.assertEqual(set(extraction.fields), {"eventType", "city", "budget"})
+
+    def test_groups_within_the_guest_list_are_weak(self) -> None:
+        kids = extract_brief("We have 3 kids coming too", TODAY).fields["guestCount"]
+
+        self.assertEqual(kids.value, 3)
+        self.assertLess(kids.confidence, 0.8)
+        self.assertFalse(kids.explicit)
+
+    def test_only_explicit_matches_replace_a_set_value(self) -> None:
+        current = {"city": "Chicago", "guestCount": 150}
+
+        self.assertEqual(extract_brief("Austin was lovely", TODAY).resolved(0.8, current), {})
+        self.assertEqual(extract_brief("Austin was lovely", TODAY).resolved(0.8), {"city": "Austin"})
+        self.assertEqual(
+            extract_brief("Let's do it in Austin with 90 guests", TODAY).resolved(0.8, current),
+            {"city": "Austin", "guestCount": 90},
+        )
+
+    def test_unrecognised_words_are_reported(self) -> None:
+        extraction = extract_brief("Thinking Boise for the quinceañera", TODAY)
+
+        self.assertEqual(extraction.resolved(0.8), {"city": "Boise", "eventType": "quinceañera"})
+        self.assertEqual(extract_brief("Somewhere in Montpelier", TODAY).unparsed, ["montpelier"])
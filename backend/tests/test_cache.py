@@ -0,0 +1,255 @@
+"""Tests for in-process cache helpers."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from app.core import cache as cache_module
+from app.core.cache import (
+    AppCache,
+    TTLCache,
+    cache_metrics,
+    cached,
+    configure_shared_tier,
+    invalidate_tags,
+    normalize_params,
+)
+from app.core.redis_cache import RedisClient, RedisTier
+from app.db import cache_tags
+from app.models.service import Service
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TTLCacheTests(TestCase):
+    def test_entries_expire_after_ttl(self) -> None:
+        clock = FakeClock()
+        cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+        cache.set("k", "v")
+
+        clock.now = 4.9
+        self.assertEqual(cache.get("k"), "v")
+        clock.now = 5.0
+        self.assertIsNone(cache.get("k"))
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+
+class NormalizeParamsTests(TestCase):
+    def test_equivalent_filters_share_a_key(self) -> None:
+        first = normalize_params({"city": " Chicago ", "amenities": ["WiFi", "Parking"], "lat": None})
+        second = normalize_params({"amenities": ["Parking", "WiFi", "Parking"], "city": "chicago"})
+
+        self.assertEqual(first, second)
+        hash(first)
+
+    def test_list_items_keep_their_case(self) -> None:
+        key = dict(normalize_params({"amenities": ["WiFi"]}))
+
+        self.assertEqual(key["amenities"], ("WiFi",))
+
+
+class FakeRedisServer:
+    """Just enough of the Redis protocol for the shared cache tier."""
+
+    def __init__(self) -> None:
+        self.values: dict[bytes, bytes] = {}
+        self.sets: dict[bytes, set[bytes]] = {}
+        self.server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while line := await reader.readline():
+            args = []
+            for _ in range(int(line[1:])):
+                length = int((await reader.readline())[1:])
+                args.append((await reader.readexactly(length + 2))[:-2])
+            writer.write(self._reply(args[0].upper(), args[1:]))
+            await writer.drain()
+        writer.close()
+
+    def _reply(self, command: bytes, args: list[bytes]) -> bytes:
+        if command == b"GET":
+            value = self.values.get(args[0])
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+        if command == b"SET":
+            self.values[args[0]] = args[1]
+            return b"+OK\r\n"
+        if command == b"DEL":
+            return b":%d\r\n" % sum(self.values.pop(key, None) is not None for key in args)
+        if command == b"SADD":
+            self.sets.setdefault(args[0], set()).update(args[1:])
+            return b":1\r\n"
+        if command == b"SREM":
+            self.sets.get(args[0], set()).difference_update(args[1:])
+            return b":1\r\n"
+        if command == b"SMEMBERS":
+            members = sorted(self.sets.get(args[0], set()))
+            return b"*%d\r\n" % len(members) + b"".join(
+                b"$%d\r\n%s\r\n" % (len(member), member) for member in members
+            )
+        if command == b"EXPIRE":
+            return b":1\r\n"
+        if command == b"INCR":
+            value = int(self.values.get(args[0], b"0")) + 1
+            self.values[args[0]] = b"%d" % value
+            return b":%d\r\n" % value
+        if command == b"MGET":
+            values = [self.values.get(key) for key in args]
+            return b"*%d\r\n" % len(values) + b"".join(
+                b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value) for value in values
+            )
+        return b"-ERR unknown command\r\n"
+
+
+class AppCacheTests(IsolatedAsyncioTestCase):
+    async def test_concurrent_misses_compute_once(self) -> None:
+        cache = AppCache("test-coalesce")
+        calls = 0
+
+        async def compute() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return 42
+
+        results = await asyncio.gather(*(cache.get_or_set("k", compute) for _ in range(5)))
+
+        self.assertEqual(results, [42] * 5)
+        self.assertEqual(calls, 1)
+        self.assertEqual(await cache.get("k"), 42)
+
+    async def test_tag_invalidation_clears_matching_caches_only(self) -> None:
+        templates = AppCache("test-templates", tags=("templates",))
+        vendors = AppCache("test-vendors", tags=("vendors",))
+        await templates.set("k", 1)
+        await vendors.set("k", 2)
+
+        invalidate_tags("templates")
+
+        self.assertIsNone(await templates.get("k"))
+        self.assertEqual(await vendors.get("k"), 2)
+
+    async def test_value_read_before_an_invalidation_is_not_stored(self) -> None:
+        cache = AppCache("test-race", tags=("templates",))
+
+        async def compute() -> str:
+            invalidate_tags("templates")  # a write commits while we read
+            return "old"
+
+        self.assertEqual(await cache.get_or_set("k", compute), "old")
+        self.assertEqual(len(cache), 0)
+
+    async def test_stats_count_hits_misses_and_evictions(self) -> None:
+        cache = AppCache("test-stats", maxsize=1)
+        await cache.get("a")
+        await cache.set("a", 1)
+        await cache.get("a")
+        await cache.set("b", 2)
+
+        stats = cache_metrics()["test-stats"]
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (1, 1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    async def test_decorator_keys_on_arguments_but_not_the_session(self) -> None:
+        calls: list[tuple[str, int]] = []
+
+        @cached(AppCache("test-decorator"))
+        async def lookup(db: object, name: str, limit: int = 10) -> list[int]:
+            calls.append((name, limit))
+            return [limit]
+
+        @cached(AppCache("test-decorator-sync"))
+        def lookup_sync(db: object, name: str) -> str:
+            calls.append((name, 0))
+            return name.upper()
+
+        await lookup(object(), "a")
+        await lookup(object(), name="a", limit=10)
+        await lookup(object(), "a", 5)
+        lookup_sync(object(), "b")
+        self.assertEqual(lookup_sync(object(), "b"), "B")
+
+        self.assertEqual(calls, [("a", 10), ("a", 5), ("b", 0)])
+
+    async def test_commit_hook_invalidates_application_caches(self) -> None:
+        cache = AppCache("test-commit", tags=("services",))
+        await cache.set("k", 1)
+        session = SimpleNamespace(new=[Service()], dirty=[], deleted=[], info={})
+
+        cache_tags._record_tags(session, None)
+        cache_tags._invalidate_tags(session)
+
+        self.assertIsNone(await cache.get("k"))
+
+
+class SharedTierTests(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.server = FakeRedisServer()
+        port = await self.server.start()
+        self.tier = RedisTier(RedisClient("127.0.0.1", port), prefix="test")
+        configure_shared_tier(self.tier)
+
+    async def asyncTearDown(self) -> None:
+        configure_shared_tier(None)
+        await self.tier.close()
+        await self.server.stop()
+
+    async def test_workers_share_entries_and_invalidate_them_by_tag(self) -> None:
+        worker_a = AppCache("test-shared", tags=("templates",))
+        await worker_a.set("k", {"name": "Gala"})
+
+        worker_b = AppCache("test-shared", tags=("templates",))
+        self.assertEqual(await worker_b.get("k"), {"name": "Gala"})
+        self.assertEqual(worker_b.stats.shared_hits, 1)
+
+        invalidate_tags("templates")
+        await asyncio.gather(*cache_module._background)
+
+        worker_c = AppCache("test-shared", tags=("templates",))
+        self.assertIsNone(await worker_c.get("k"))
+        self.assertEqual(self.server.values, {b"test:gen:templates": b"1"})
+
+    async def test_invalidation_moves_the_tag_counter(self) -> None:
+        self.assertEqual(await self.tier.tag_generations(["templates"]), {"templates": 0})
+
+        invalidate_tags("templates")
+        await asyncio.gather(*cache_module._background)
+        invalidate_tags("templates", "vendors")
+        await asyncio.gather(*cache_module._background)
+
+        self.assertEqual(await self.tier.tag_generations(["templates", "vendors"]), {"templates": 2, "vendors": 1})
+
+    async def test_unreachable_shared_tier_falls_back_to_memory(self) -> None:
+        configure_shared_tier(RedisTier(RedisClient("127.0.0.1", 1, timeout=0.1)))
+        cache = AppCache("test-down")
+
+        async def compute() -> int:
+            return 42
+
+        self.assertEqual(await cache.get_or_set("k", compute), 42)
+        self.assertEqual(await cache.get("k"), 42)
+        self.assertGreaterEqual(cache.stats.shared_errors, 1)
@@ -0,0 +1,40 @@
+"""Tests for token estimates and history windows."""
+
+from unittest import TestCase
+
+from app.services import context_window
+
+
+def _messages(*sizes: int) -> list[dict]:
+    return [{"role": "user", "text": " ".join(["word"] * size)} for size in sizes]
+
+
+class ContextWindowTests(TestCase):
+    def test_token_estimates(self) -> None:
+        self.assertEqual(context_window.count_tokens(""), 0)
+        self.assertEqual(context_window.count_tokens("100 guests, $20k!"), 7)
+        self.assertEqual(context_window.count_tokens("extraordinarily"), 4)
+        self.assertEqual(context_window.message_tokens({"content": "hi"}), 1 + context_window.MESSAGE_OVERHEAD_TOKENS)
+
+    def test_truncate_keeps_text_within_budget(self) -> None:
+        text = " ".join(["word"] * 100)
+
+        truncated = context_window.truncate_to_tokens(text, 10)
+
+        self.assertTrue(truncated.endswith("…"))
+        self.assertLessEqual(context_window.count_tokens(truncated.rstrip(" …")), 10)
+        self.assertEqual(context_window.truncate_to_tokens("short", 10), "short")
+
+    def test_window_keeps_the_newest_messages_that_fit(self) -> None:
+        messages = _messages(50, 10, 10)
+
+        window = context_window.fit_window(messages, 30)
+
+        self.assertEqual(window, messages[1:])
+
+    def test_compaction_point_leaves_the_newest_half_budget(self) -> None:
+        messages = _messages(30, 30, 30, 30)  # 34 tokens each
+
+        self.assertIsNone(context_window.compaction_point(messages, 0, 200))
+        self.assertEqual(context_window.compaction_point(messages, 0, 150), 2)
+        self.assertIsNone(context_window.compaction_point(messages, 2, 150))
@@ -0,0 +1,152 @@
+"""Tests for incremental embedding ingestion."""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.core.config import settings
+from app.services import embedding_ingestion, retrieval_service, vector_index
+
+T0 = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+def _listing(n: int, description: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        entity_id=uuid.UUID(int=n), refreshed_at=T0 + timedelta(minutes=n), name=f"Venue {n}",
+        venue_type="barn", city="Austin", amenities=[], categories=[], card={"description": description},
+    )
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.commit = AsyncMock()
+
+    async def __aenter__(self) -> "FakeSession":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+class SyncTests(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.listings = [_listing(n, f"Rustic barn number {n}") for n in range(1, 6)]
+        self.stored: dict = {}
+        self.checkpoint = None
+        self.sessions: list[FakeSession] = []
+        self.upserted: list = []
+
+        async def changed(_db, _source, cursor, limit):
+            rows = [row for row in self.listings if cursor is None or (row.refreshed_at, row.entity_id) > cursor]
+            return rows[:limit]
+
+        async def save(_db, _content_type, cursor):
+            self.checkpoint = cursor
+
+        async def upsert(_db, rows):
+            self.upserted.extend(rows)
+            for row in rows:
+                self.stored[row["content_id"]] = row["metadata"]["hash"]
+
+        self.upsert = AsyncMock(side_effect=upsert)
+        self.patches = [
+            patch.object(embedding_ingestion, "_changed", changed),
+            patch.object(embedding_ingestion, "_save_checkpoint", save),
+            patch.object(embedding_ingestion, "_load_checkpoint", AsyncMock(side_effect=lambda *_: self.checkpoint)),
+            patch.object(retrieval_service, "stored_hashes", AsyncMock(side_effect=lambda *_: dict(self.stored))),
+            patch.object(retrieval_service, "upsert_rows", self.upsert),
+            patch.object(retrieval_service, "drop_missing", AsyncMock(return_value=0)),
+            patch.object(vector_index, "enabled", Mock(return_value=False)),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self) -> None:
+        for p in self.patches:
+            p.stop()
+
+    def _session(self) -> FakeSession:
+        self.sessions.append(FakeSession())
+        return self.sessions[-1]
+
+    async def _sync(self) -> embedding_ingestion.SyncResult:
+        return await embedding_ingestion.sync("venue", batch_size=2, session_factory=self._session)
+
+    async def test_in_process_index_is_refreshed_after_the_sync(self) -> None:
+        index = Mock(refresh=AsyncMock(return_value=True))
+        with (
+            patch.object(vector_index, "enabled", Mock(return_value=True)),
+            patch.object(vector_index, "get_index", Mock(return_value=index)) as get_index,
+        ):
+            result = await self._sync()
+
+        self.assertTrue(result.completed)
+        get_index.assert_called_once_with("venue")
+        index.refresh.assert_awaited_once_with(self.sessions[-1])
+
+    async def test_only_changed_documents_are_embedded(self) -> None:
+        first = await self._sync()
+        self.assertEqual((first.scanned, first.embedded, first.batches), (5, 5, 3))
+        self.assertEqual(self.checkpoint, (self.listings[-1].refreshed_at, self.listings[-1].entity_id))
+
+        # A rating refresh bumps refreshed_at without changing the document.
+        self.listings[3].refreshed_at = self.listings[4].refreshed_at = T0 + timedelta(hours=1)
+        self.listings[4].card = {"description": "Glass conservatory with garden views"}
+        self.listings.sort(key=lambda row: (row.refreshed_at, row.entity_id))
+        self.upserted.clear()
+
+        second = await self._sync()
+        self.assertEqual((second.embedded, second.unchanged), (1, 1))
+        self.assertEqual([row["content_id"] for row in self.upserted], [uuid.UUID(int=5)])
+        self.assertTrue(second.completed)
+
+    async def test_interrupted_run_resumes_after_the_last_committed_batch(self) -> None:
+        upsert = self.upsert.side_effect
+
+        async def fail_second_batch(db, rows):
+            if self.upsert.await_count == 2:
+                raise RuntimeError("connection lost")
+            await upsert(db, rows)
+
+        self.upsert.side_effect = fail_second_batch
+        with self.assertRaises(RuntimeError):
+            await self._sync()
+        self.assertEqual(self.checkpoint, (self.listings[1].refreshed_at, self.listings[1].entity_id))
+
+        self.upsert.side_effect = upsert
+        with patch.object(settings, "EMBEDDING_OVERLAP_SECONDS", 0):
+            result = await self._sync()
+        # The row at the checkpoint is re-read, but only later rows are embedded.
+        self.assertEqual((result.scanned, result.embedded), (4, 3))
+        self.assertEqual(self.checkpoint, (self.listings[-1].refreshed_at, self.listings[-1].entity_id))
+
+    async def test_stop_ends_the_run_between_batches(self) -> None:
+        stop = asyncio.Event()
+        stop.set()
+        result = await embedding_ingestion.sync("venue", session_factory=self._session, stop=stop)
+        self.assertEqual(result.batches, 0)
+        self.assertFalse(result.completed)
+
+
+class SyncAllTests(IsolatedAsyncioTestCase):
+    async def test_content_types_sync_with_bounded_concurrency(self) -> None:
+        active = peak = 0
+
+        async def fake_sync(content_type, **_options):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            if content_type == "template":
+                raise RuntimeError("boom")
+            return embedding_ingestion.SyncResult(content_type)
+
+        with patch.object(embedding_ingestion, "sync", fake_sync), self.assertLogs(embedding_ingestion.logger):
+            results = await embedding_ingestion.sync_all(concurrency=2)
+
+        self.assertEqual(peak, 2)
+        self.assertEqual([result.content_type for result in results], ["venue", "service_provider"])
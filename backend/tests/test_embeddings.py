@@ -0,0 +1,27 @@
+"""Tests for local hashing-vectorizer embeddings."""
+
+import math
+from unittest import TestCase
+
+from app.services import embeddings
+
+
+class EmbedTests(TestCase):
+    def test_vectors_are_unit_length_and_stable(self) -> None:
+        vector = embeddings.embed("Rustic barn with string lights")
+
+        self.assertEqual(len(vector), embeddings.EMBEDDING_DIM)
+        self.assertAlmostEqual(math.sqrt(sum(v * v for v in vector)), 1.0, places=6)
+        # blake2b, not the per-process salted hash(): same text, same vector everywhere.
+        self.assertEqual(vector, embeddings.embed("rustic  BARN with string lights!"))
+
+    def test_similar_descriptions_score_higher(self) -> None:
+        query = embeddings.embed("barn wedding with string lights")
+        barn = embeddings.embed("A rustic barn for weddings, strung with lights and a dance floor")
+        office = embeddings.embed("Conference center with projector, breakout rooms and parking")
+
+        self.assertGreater(embeddings.similarity(query, barn), embeddings.similarity(query, office) + 0.2)
+
+    def test_text_without_words_has_no_embedding(self) -> None:
+        self.assertIsNone(embeddings.embed(""))
+        self.assertIsNone(embeddings.embed("the and of ?!"))
@@ -0,0 +1,78 @@
+"""Tests for geo distance math and radius-search SQL helpers."""
+
+from unittest import TestCase
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.venue import Venue
+from app.services import geo
+
+
+class HaversineTests(TestCase):
+    def test_known_city_distance(self) -> None:
+        # Chicago -> New York is roughly 1145 km great-circle.
+        distance = geo.haversine_km(41.8781, -87.6298, 40.7128, -74.0060)
+        self.assertAlmostEqual(distance, 1145, delta=5)
+
+    def test_zero_distance(self) -> None:
+        self.assertEqual(geo.haversine_km(30.0, -97.0, 30.0, -97.0), 0.0)
+
+
+class BoundingBoxTests(TestCase):
+    def test_box_contains_every_point_on_the_radius(self) -> None:
+        lat, lng, radius = 41.8781, -87.6298, 25.0
+        box = geo.bounding_box(lat, lng, radius)
+
+        for bearing_point in [(box.min_lat, lng), (box.max_lat, lng), (lat, box.min_lng), (lat, box.max_lng)]:
+            self.assertGreaterEqual(geo.haversine_km(lat, lng, *bearing_point), radius - 0.01)
+
+    def test_antimeridian_widens_longitude(self) -> None:
+        box = geo.bounding_box(51.0, 179.9, 50.0)
+
+        self.assertEqual((box.min_lng, box.max_lng), (-180.0, 180.0))
+
+
+class GeoSqlTests(TestCase):
+    def test_city_match_expands_through_centroids(self) -> None:
+        predicate = geo.city_matches(Venue.location_city, " Chicago ", 25.0)
+        compiled = predicate.compile(dialect=postgresql.dialect())
+
+        self.assertIn("lower(btrim(split_part(venues.location_city,", str(compiled))
+        self.assertIn("FROM city_centroids AS origin JOIN city_centroids AS nearby", str(compiled))
+        self.assertIn("nearby_cities.name = lower(btrim(split_part(venues.location_city,", str(compiled))
+        self.assertIn("chicago", compiled.params.values())
+
+    def test_stored_state_must_agree_with_the_searched_one(self) -> None:
+        compiled = geo.city_matches(Venue.location_city, "Austin, tx", 25.0).compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+
+        # The stored "Name, ST" is split like the searched city; a stored
+        # state has to be the searched (or nearby) city's state.
+        self.assertIn("upper(btrim(split_part(venues.location_city,", sql)
+        self.assertIn("nearby_cities.state = upper(btrim(split_part(venues.location_city,", sql)
+        self.assertTrue({"austin", "TX", ","} <= set(compiled.params.values()))
+        without_state = geo.city_matches(Venue.location_city, "Austin", 25.0).compile(dialect=postgresql.dialect())
+        self.assertNotIn("TX", without_state.params.values())
+
+    def test_a_given_state_picks_the_origin_city(self) -> None:
+        with_state = geo.cities_near_city("Portland, me", 25.0).compile(dialect=postgresql.dialect())
+        without_state = geo.cities_near_city("Portland", 25.0).compile(dialect=postgresql.dialect())
+
+        self.assertIn("SELECT lower(nearby.name) AS name, nearby.state", str(with_state))
+        self.assertIn("origin.state =", str(with_state))
+        self.assertTrue({"portland", "ME"} <= set(with_state.params.values()))
+        self.assertNotIn("origin.state", str(without_state))
+
+    def test_split_city(self) -> None:
+        self.assertEqual(geo.split_city(" Portland, OR "), ("Portland", "OR"))
+        self.assertEqual(geo.split_city("Portland"), ("Portland", None))
+        self.assertEqual(geo.split_city("Washington, District of Columbia"), ("Washington", None))
+
+    def test_distance_expression_is_clamped_for_asin(self) -> None:
+        sql = str(
+            geo.distance_km_sql(Venue.location_lat, Venue.location_lng, 41.0, -87.0).compile(
+                dialect=postgresql.dialect()
+            )
+        )
+
+        self.assertIn("asin(least(", sql)
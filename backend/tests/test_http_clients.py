@@ -0,0 +1,98 @@
+"""Tests for the pooled outbound HTTP client registry."""
+
+import asyncio
+import json
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.core.http_clients import HTTPClientRegistry, Upstream, http_clients
+from app.services import llm_service
+
+
+class KeepAliveServer:
+    """Minimal HTTP/1.1 server that counts TCP connections."""
+
+    def __init__(self, status: int = 200) -> None:
+        self.status = status
+        self.connections = 0
+        self.requests = 0
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.IncompleteReadError:
+                return
+            length = next(
+                (
+                    int(line.split(b":")[1])
+                    for line in head.split(b"\r\n")
+                    if line.lower().startswith(b"content-length:")
+                ),
+                0,
+            )
+            await reader.readexactly(length)
+            self.requests += 1
+            body = json.dumps({"choices": [{"message": {"content": f"reply {self.requests}"}}]}).encode()
+            writer.write(
+                b"HTTP/1.1 %d OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s"
+                % (self.status, len(body), body)
+            )
+            await writer.drain()
+
+
+class HTTPClientRegistryTests(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.server = KeepAliveServer()
+        self.base_url = await self.server.start()
+        self.registry = HTTPClientRegistry([Upstream("test", timeout=5)])
+
+    async def asyncTearDown(self) -> None:
+        await self.registry.aclose()
+        await self.server.stop()
+
+    async def test_requests_reuse_one_connection_and_are_timed(self) -> None:
+        client = self.registry.get("test")
+        for _ in range(3):
+            (await client.get(f"{self.base_url}/")).raise_for_status()
+
+        self.assertIs(self.registry.get("test"), client)
+        self.assertEqual(self.server.connections, 1)
+        stats = self.registry.metrics()["test"]
+        self.assertEqual((stats["requests"], stats["errors"]), (3, 0))
+        self.assertGreater(stats["p95_seconds"], 0)
+
+    async def test_server_errors_are_counted(self) -> None:
+        self.server.status = 503
+        await self.registry.get("test").get(f"{self.base_url}/")
+
+        self.assertEqual(self.registry.metrics()["test"]["errors"], 1)
+
+    async def test_closed_registry_opens_fresh_clients(self) -> None:
+        client = self.registry.get("test")
+        await self.registry.aclose()
+
+        self.assertTrue(client.is_closed)
+        self.assertIsNot(self.registry.get("test"), client)
+
+    async def test_planner_turns_share_the_llm_connection(self) -> None:
+        with (
+            patch.object(settings, "NVIDIA_API_KEY", "test-key"),
+            patch.object(settings, "NVIDIA_API_BASE", self.base_url),
+        ):
+            first = await llm_service.invoke_llm_with_messages([{"role": "user", "content": "hi"}])
+            second = await llm_service.invoke_llm_with_messages([{"role": "user", "content": "again"}])
+        await http_clients.aclose()
+
+        self.assertEqual((first, second), ("reply 1", "reply 2"))
+        self.assertEqual(self.server.connections, 1)
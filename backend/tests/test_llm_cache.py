@@ -0,0 +1,107 @@
+"""Tests for the LLM response cache."""
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.resilience import CircuitOpenError
+from app.services import llm_cache
+
+
+def _body(content: str = "Extract fields from: hi", temperature: float = 0.1, **extra) -> dict:
+    return {
+        "model": "test-model",
+        "messages": [{"role": "system", "content": "Be terse."}, {"role": "user", "content": content}],
+        "temperature": temperature,
+        "max_tokens": 256,
+        **extra,
+    }
+
+
+class CacheKeyTests(TestCase):
+    def test_whitespace_does_not_change_the_key(self) -> None:
+        self.assertEqual(
+            llm_cache.cache_key(_body("Extract  fields\nfrom: hi ")),
+            llm_cache.cache_key(_body("Extract fields from: hi")),
+        )
+
+    def test_sampling_and_format_change_the_key(self) -> None:
+        base = llm_cache.cache_key(_body())
+        self.assertNotEqual(base, llm_cache.cache_key(_body(temperature=0.2)))
+        self.assertNotEqual(base, llm_cache.cache_key(_body(response_format={"type": "json_object"})))
+        self.assertNotEqual(base, llm_cache.cache_key({**_body(), "model": "other-model"}))
+
+    def test_only_low_temperature_requests_are_cached(self) -> None:
+        self.assertTrue(llm_cache.is_cacheable(_body(temperature=0.1)))
+        self.assertFalse(llm_cache.is_cacheable(_body(temperature=0.7)))
+        self.assertFalse(llm_cache.is_cacheable(_body(temperature=0.0, stream=True)))
+
+
+class GetOrCompleteTests(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        llm_cache.clear()
+        self.load = AsyncMock(return_value=None)
+        self.store = AsyncMock()
+        self.patches = [
+            patch.object(llm_cache, "_load", self.load),
+            patch.object(llm_cache, "_store", self.store),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self) -> None:
+        for p in self.patches:
+            p.stop()
+        llm_cache.clear()
+
+    async def test_concurrent_identical_requests_share_one_call(self) -> None:
+        calls = 0
+
+        async def complete() -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return '{"city": "Austin"}'
+
+        replies = await asyncio.gather(*(llm_cache.get_or_complete(_body(), complete) for _ in range(5)))
+        again = await llm_cache.get_or_complete(_body("Extract fields  from: hi"), complete)
+
+        self.assertEqual(set(replies) | {again}, {'{"city": "Austin"}'})
+        self.assertEqual(calls, 1)
+        self.store.assert_awaited_once_with(llm_cache.cache_key(_body()), "test-model", '{"city": "Austin"}')
+        self.assertGreaterEqual(llm_cache._memory.stats.hits, 1)
+
+    async def test_persistent_tier_is_read_before_calling_upstream(self) -> None:
+        self.load.return_value = "stored reply"
+        complete = AsyncMock()
+
+        self.assertEqual(await llm_cache.get_or_complete(_body(), complete), "stored reply")
+        complete.assert_not_awaited()
+        self.store.assert_not_awaited()
+
+    async def test_refused_calls_are_not_cached(self) -> None:
+        complete = AsyncMock(side_effect=[CircuitOpenError("open"), "fresh reply"])
+
+        with self.assertRaises(CircuitOpenError):
+            await llm_cache.get_or_complete(_body(), complete)
+        self.assertEqual(await llm_cache.get_or_complete(_body(), complete), "fresh reply")
+        self.assertEqual(complete.await_count, 2)
+
+
+class PersistentTierTests(IsolatedAsyncioTestCase):
+    async def test_a_read_only_selects(self) -> None:
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = "stored reply"
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+        session.commit = AsyncMock()
+        factory = MagicMock()
+        factory.return_value.__aenter__ = AsyncMock(return_value=session)
+        factory.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        with patch.object(llm_cache, "async_session_factory", factory):
+            self.assertEqual(await llm_cache._load("k" * 64), "stored reply")
+
+        stmt = str(session.execute.await_args.args[0])
+        self.assertTrue(stmt.startswith("SELECT llm_cache_entries.response"), stmt)
+        session.commit.assert_not_awaited()
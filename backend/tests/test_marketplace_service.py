@@ -0,0 +1,275 @@
+"""Tests for marketplace browse queries over listings and rating aggregates."""
+
+import uuid
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, Mock
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.marketplace_listing import refresh_listings
+from app.models.review_stats import apply_review_delta
+from app.models.venue import BILLABLE_HOURS_PER_DAY, Venue, json_number
+from app.services import marketplace_service
+from app.utils.exceptions import BadRequestError
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class VenueQueryTests(TestCase):
+    def test_browse_reads_only_the_listing_table(self) -> None:
+        sql = _sql(marketplace_service.build_venue_query(min_rating=4.0, sort_by="rating").limit(20))
+
+        self.assertIn("FROM marketplace_listings \nWHERE", sql)
+        self.assertNotIn("JOIN", sql)
+        self.assertNotIn("venues", sql)
+
+    def test_rating_filter_runs_in_sql_before_pagination(self) -> None:
+        query = marketplace_service.build_venue_query(min_rating=4.0).limit(20).offset(40)
+        sql = _sql(query)
+
+        self.assertIn("coalesce(marketplace_listings.avg_rating", sql)
+        self.assertLess(sql.index("coalesce(marketplace_listings.avg_rating"), sql.index("LIMIT"))
+
+    def test_rating_sort_orders_by_aggregate(self) -> None:
+        sql = _sql(marketplace_service.build_venue_query(sort_by="rating"))
+
+        self.assertIn(
+            "ORDER BY marketplace_listings.avg_rating DESC NULLS LAST, marketplace_listings.review_count DESC",
+            sql,
+        )
+
+    def test_default_sort_is_newest(self) -> None:
+        compiled = marketplace_service.build_venue_query().compile(dialect=postgresql.dialect())
+
+        self.assertIn("ORDER BY marketplace_listings.created_at DESC", str(compiled))
+        self.assertIn("venue", compiled.params.values())
+
+    def test_price_and_type_filters_use_typed_columns(self) -> None:
+        query = marketplace_service.build_venue_query(
+            city="Austin", min_capacity=50, min_price=100, max_price=500, venue_type=" Ballroom "
+        )
+        compiled = query.compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+
+        self.assertIn("coalesce(marketplace_listings.price_max, marketplace_listings.price_min) >= ", sql)
+        self.assertIn("marketplace_listings.price_min <= ", sql)
+        self.assertIn("marketplace_listings.venue_type = ", sql)
+        self.assertIn("ballroom", compiled.params.values())
+        self.assertNotIn("ILIKE", sql.upper())
+
+    def test_amenities_match_all_uses_containment(self) -> None:
+        sql = _sql(marketplace_service.build_venue_query(amenities=["Parking", "WiFi"]))
+
+        self.assertIn("marketplace_listings.amenities @> ", sql)
+
+    def test_amenities_match_any_uses_key_exists_any(self) -> None:
+        sql = _sql(
+            marketplace_service.build_venue_query(amenities=["Parking", "WiFi"], amenities_match="any")
+        )
+
+        self.assertIn("marketplace_listings.amenities ?| ARRAY[", sql)
+
+    def test_text_search_matches_and_ranks_the_search_document(self) -> None:
+        sql = _sql(marketplace_service.build_venue_query(q="rooftop loft", sort_by="relevance"))
+
+        self.assertIn("marketplace_listings.search_document @@ websearch_to_tsquery(", sql)
+        self.assertIn("ORDER BY ts_rank(marketplace_listings.search_document", sql)
+
+    def test_amenity_facets_count_the_filtered_set_without_paging(self) -> None:
+        sql = _sql(
+            marketplace_service.build_venue_amenity_facet_query(
+                city="Austin", amenities=["Parking"], sort_by="rating"
+            )
+        )
+
+        self.assertIn("jsonb_array_elements_text(matching.amenities)", sql)
+        self.assertIn("lower(btrim(split_part(marketplace_listings.city,", sql)
+        self.assertIn("marketplace_listings.amenities @> ", sql)
+        self.assertIn("GROUP BY amenity_values.amenity", sql)
+        self.assertNotIn("avg_rating DESC", sql)
+
+    def test_radius_search_prefilters_by_box_and_sorts_by_distance(self) -> None:
+        query = marketplace_service.build_venue_query(
+            lat=41.88, lng=-87.63, radius_km=10, sort_by="distance"
+        )
+        sql = _sql(query)
+
+        self.assertIn("marketplace_listings.lat BETWEEN", sql)
+        self.assertIn("AS distance_km", sql)
+        self.assertRegex(sql, r"ORDER BY \S+ \* asin\(least")
+
+    def test_distance_sort_without_origin_falls_back_to_newest(self) -> None:
+        sql = _sql(marketplace_service.build_venue_query(sort_by="distance"))
+
+        self.assertIn("ORDER BY marketplace_listings.created_at DESC", sql)
+
+    def test_lat_without_lng_is_rejected(self) -> None:
+        with self.assertRaises(BadRequestError):
+            marketplace_service.build_venue_query(lat=41.88)
+
+    def test_price_columns_are_generated_from_pricing_structure(self) -> None:
+        price_from = Venue.__table__.c.price_from
+        self.assertIsNotNone(price_from.computed)
+        self.assertIn("'base_price'", str(price_from.computed.sqltext))
+
+
+class ServiceProviderQueryTests(TestCase):
+    def test_provider_listings_are_filtered_by_type(self) -> None:
+        query = marketplace_service.build_service_provider_query(min_rating=3.5, sort_by="rating")
+        compiled = query.compile(dialect=postgresql.dialect())
+
+        self.assertIn("service_provider", compiled.params.values())
+        self.assertIn("ORDER BY marketplace_listings.avg_rating DESC NULLS LAST", str(compiled))
+
+    def test_service_type_filter_uses_category_containment(self) -> None:
+        query = marketplace_service.build_service_provider_query(service_type=" Catering").limit(20)
+        compiled = query.compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+
+        self.assertIn("marketplace_listings.categories @> ", sql)
+        self.assertIn(["catering"], compiled.params.values())
+        self.assertLess(sql.index("categories @>"), sql.index("LIMIT"))
+
+    def test_price_filter_matches_overlapping_ranges(self) -> None:
+        sql = _sql(marketplace_service.build_service_provider_query(min_price=200, max_price=800))
+
+        self.assertIn("coalesce(marketplace_listings.price_max, marketplace_listings.price_min) >= ", sql)
+        self.assertIn("marketplace_listings.price_min <= ", sql)
+
+    def test_card_rows_become_payloads(self) -> None:
+        row = Mock(
+            card={"id": "p1", "business_name": "SP", "price_min": 200},
+            price_min=200,
+            price_max=None,
+            avg_rating=4.567,
+            review_count=3,
+            distance_km=None,
+        )
+        card = marketplace_service._card(row, price_min=200.0, price_max=None)
+
+        self.assertEqual(card["business_name"], "SP")
+        self.assertEqual(card["price_min"], 200.0)
+        self.assertEqual(card["avg_rating"], 4.57)
+        self.assertIsNone(card["distance_km"])
+
+
+class FacetTests(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        marketplace_service._facet_cache.clear()
+
+    def test_venue_facets_use_one_grouping_sets_query(self) -> None:
+        sql = _sql(marketplace_service.build_venue_facet_query(city="Chicago", min_rating=4))
+
+        self.assertEqual(sql.count("GROUP BY GROUPING SETS("), 1)
+        self.assertIn("count(DISTINCT matching.entity_id)", sql)
+        self.assertIn("width_bucket(marketplace_listings.capacity", sql)
+        self.assertIn("LEFT OUTER JOIN LATERAL jsonb_array_elements_text(matching.amenities)", sql)
+
+    def test_provider_category_facet_unnests_listing_categories(self) -> None:
+        sql = _sql(marketplace_service.build_service_provider_facet_query(city="Chicago"))
+
+        self.assertIn("LEFT OUTER JOIN LATERAL unnest(matching.categories)", sql)
+        self.assertNotIn("service_provider_services", sql)
+
+    def test_rows_are_split_per_facet(self) -> None:
+        spec = [("city", None), ("price", (0, 500, 1000))]
+
+        rows = [
+            _Row(("Chicago", None), g=(0, 1), count=3),
+            _Row(("Evanston", None), g=(0, 1), count=1),
+            _Row((None, 2), g=(1, 0), count=2),
+            _Row((None, None), g=(1, 0), count=2),
+            _Row((None, None), g=(1, 1), count=4),
+        ]
+        result = marketplace_service._collect_facets(rows, spec)
+
+        self.assertEqual(result["total"], 4)
+        self.assertEqual([c["value"] for c in result["facets"]["city"]], ["Chicago", "Evanston"])
+        self.assertEqual(
+            result["facets"]["price"],
+            [{"min": 500, "max": 1000, "count": 2}, {"min": None, "max": None, "count": 2}],
+        )
+
+    async def test_facets_are_cached_per_normalized_filter(self) -> None:
+        db = AsyncMock()
+        db.execute.return_value = Mock(all=Mock(return_value=[]))
+
+        await marketplace_service.venue_facets(db, city="Chicago", amenities=["WiFi", "Parking"])
+        await marketplace_service.venue_facets(db, city=" chicago", amenities=["Parking", "WiFi"])
+        await marketplace_service.venue_facets(db, city="Austin")
+
+        self.assertEqual(db.execute.await_count, 2)
+
+
+class _Row(tuple):
+    """Minimal stand-in for a SQLAlchemy Row: positional values plus g_* flags."""
+
+    def __new__(cls, values, g, count):
+        row = super().__new__(cls, values)
+        for i, flag in enumerate(g):
+            setattr(row, f"g_{i}", flag)
+        row.count = count
+        return row
+
+
+class ReviewDeltaTests(TestCase):
+    def test_positive_delta_upserts(self) -> None:
+        connection = Mock()
+        apply_review_delta(connection, "venue", uuid.uuid4(), 1, 5)
+
+        sql = _sql(connection.execute.call_args.args[0])
+        self.assertIn("INSERT INTO review_stats", sql)
+        self.assertIn("ON CONFLICT (reviewee_type, reviewee_id) DO UPDATE", sql)
+
+    def test_removal_updates_existing_row(self) -> None:
+        connection = Mock()
+        apply_review_delta(connection, "venue", uuid.uuid4(), -1, -4)
+
+        sql = _sql(connection.execute.call_args.args[0])
+        self.assertTrue(sql.startswith("UPDATE review_stats"))
+
+    def test_untyped_reviews_are_not_tracked(self) -> None:
+        connection = Mock()
+        apply_review_delta(connection, None, uuid.uuid4(), 1, 5)
+
+        connection.execute.assert_not_called()
+
+
+class ListingRefreshTests(TestCase):
+    def test_refresh_upserts_approved_rows_then_prunes(self) -> None:
+        connection = Mock()
+        refresh_listings(connection, "venue", [uuid.uuid4()])
+
+        upsert, prune = (_sql(c.args[0]) for c in connection.execute.call_args_list)
+        self.assertIn("INSERT INTO marketplace_listings", upsert)
+        self.assertIn("FROM venues LEFT OUTER JOIN LATERAL (SELECT city_centroids.lat", upsert)
+        self.assertIn("ON CONFLICT (listing_type, entity_id) DO UPDATE", upsert)
+        self.assertTrue(prune.startswith("DELETE FROM marketplace_listings"))
+        self.assertIn("NOT (EXISTS", prune)
+
+    def test_hourly_and_daily_venue_prices_share_one_unit(self) -> None:
+        # A venue priced only per hour and one priced only per day must both
+        # filter and sort on a price per day.
+        expression = str(Venue.__table__.c.price_from.computed.sqltext)
+        hourly = json_number("pricing_structure", "per_hour")
+        daily = json_number("pricing_structure", "per_day")
+
+        self.assertIn(f"{daily}, ({hourly}) * {BILLABLE_HOURS_PER_DAY})", expression)
+        self.assertEqual(expression.count("'per_hour'"), 2)
+
+    def test_provider_listing_aggregates_services_and_categories(self) -> None:
+        connection = Mock()
+        refresh_listings(connection, "service_provider", [uuid.uuid4()])
+
+        upsert = _sql(connection.execute.call_args_list[0].args[0])
+        self.assertIn("jsonb_agg(jsonb_build_object(", upsert)
+        self.assertIn("array_agg(DISTINCT lower(services.category))", upsert)
+
+    def test_unknown_types_and_empty_ids_are_ignored(self) -> None:
+        connection = Mock()
+        refresh_listings(connection, "user", [uuid.uuid4()])
+        refresh_listings(connection, "venue", [None])
+
+        connection.execute.assert_not_called()
@@ -0,0 +1,91 @@
+"""Tests for vectorized venue and provider match scoring."""
+
+from types import SimpleNamespace
+from unittest import TestCase
+
+import numpy as np
+
+from app.services import match_scoring
+from app.services.match_scoring import MatchRequest
+
+WEIGHTS = dict.fromkeys(match_scoring.CRITERIA, 1.0)
+
+
+def _row(name: str, **fields) -> SimpleNamespace:
+    return SimpleNamespace(name=name, **fields)
+
+
+class CriterionScoreTests(TestCase):
+    def test_capacity_prefers_a_snug_fit(self) -> None:
+        cols = match_scoring.columns([_row("snug", capacity=100), _row("vast", capacity=1000), _row("small", capacity=60)])
+
+        scores = match_scoring.criterion_scores(cols, MatchRequest(guest_count=80))
+
+        np.testing.assert_allclose(scores["capacity"], [1.0, 0.1, 0.0])
+
+    def test_price_scores_the_budget_share_and_marks_unpriced(self) -> None:
+        cols = match_scoring.columns([_row("a", price_min=1000), _row("b", price_min=4000), _row("c", price_min=None)])
+
+        scores = match_scoring.criterion_scores(cols, MatchRequest(price_target=2000))
+
+        np.testing.assert_allclose(scores["price"], [1.0, 0.5, np.nan])
+
+    def test_rating_is_shrunk_toward_the_prior(self) -> None:
+        cols = match_scoring.columns([
+            _row("proven", avg_rating=4.8, review_count=200),
+            _row("one review", avg_rating=5.0, review_count=1),
+            _row("unrated", avg_rating=None, review_count=0),
+        ])
+
+        rating = match_scoring.criterion_scores(cols, MatchRequest())["rating"]
+
+        self.assertGreater(rating[0], rating[1])
+        self.assertAlmostEqual(rating[2], match_scoring.RATING_PRIOR / match_scoring.MAX_RATING)
+
+    def test_criteria_without_a_basis_are_left_out(self) -> None:
+        cols = match_scoring.columns([_row("a", capacity=100)])
+
+        scores = match_scoring.criterion_scores(cols, MatchRequest())
+
+        self.assertEqual(set(scores), {"rating", "relevance"})
+
+
+class RankingTests(TestCase):
+    def test_best_weighs_every_criterion(self) -> None:
+        rows = [
+            _row("far and booked", capacity=90, price_min=3000, distance_km=35.0, blocked_days=2),
+            _row("near and free", capacity=90, price_min=3000, distance_km=2.0, blocked_days=0),
+            _row("too small", capacity=40, price_min=7000, distance_km=20.0, blocked_days=0),
+        ]
+        request = MatchRequest(guest_count=80, price_target=3500, radius_km=40, requested_days=2)
+
+        best = match_scoring.best(rows, request, k=2, weights=WEIGHTS)
+
+        self.assertEqual([row.name for row in best], ["near and free", "far and booked"])
+
+    def test_weights_change_the_order(self) -> None:
+        rows = [_row("cheap", price_min=1000, distance_km=30.0), _row("close", price_min=5000, distance_km=1.0)]
+        request = MatchRequest(price_target=1000, radius_km=40)
+
+        by_price = match_scoring.best(rows, request, k=1, weights={**WEIGHTS, "distance": 0.1})
+        by_distance = match_scoring.best(rows, request, k=1, weights={**WEIGHTS, "price": 0.1})
+
+        self.assertEqual(by_price[0].name, "cheap")
+        self.assertEqual(by_distance[0].name, "close")
+
+    def test_a_criterion_no_candidate_has_is_skipped(self) -> None:
+        cols = match_scoring.columns([_row("a", avg_rating=5.0, review_count=1000)])
+
+        scores = match_scoring.score(cols, MatchRequest(radius_km=40), {**WEIGHTS, "relevance": 0})
+
+        np.testing.assert_allclose(scores, match_scoring.criterion_scores(cols, MatchRequest())["rating"])
+
+    def test_top_k_is_best_first_with_ties_in_input_order(self) -> None:
+        scores = np.array([0.2, 0.9, 0.5, 0.9, 0.5, 0.1])
+
+        self.assertEqual(match_scoring.top_k(scores, 4).tolist(), [1, 3, 2, 4])
+        self.assertEqual(match_scoring.top_k(scores, 10).tolist(), [1, 3, 2, 4, 0, 5])
+        self.assertEqual(match_scoring.top_k(scores, 0).tolist(), [])
+
+    def test_no_candidates(self) -> None:
+        self.assertEqual(match_scoring.best([], MatchRequest(guest_count=10), k=5), [])
@@ -0,0 +1,202 @@
+"""Tests for the deterministic plan engine and its planner wiring."""
+
+import uuid
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.services import llm_service, plan_engine, planner_service
+
+TEMPLATE = SimpleNamespace(
+    id=uuid.UUID(int=1),
+    template_data={
+        "timeline": [
+            {"time": "3:00 PM", "title": "Guest Arrival", "description": "Welcome drinks."},
+            {"time": "3:30 PM", "title": "Ceremony", "description": "String trio."},
+            {"time": "soon", "title": "Unscheduled"},
+            {"time": "10:30 PM", "title": "Sparkler Exit", "description": "Send-off."},
+        ],
+        "budget": {
+            "total": "$20,000",
+            "breakdown": [
+                {"label": "Venue & rentals", "amount": "$8,000"},
+                {"label": "Food & beverage", "amount": "$6,000"},
+                {"label": "Platform Fee", "amount": "$2,000"},
+                {"label": "Decor", "amount": "$4,000"},
+            ],
+        },
+    },
+)
+BRIEF = {"eventType": "wedding", "guestCount": 150, "budget": 20000, "city": "Chicago"}
+
+
+def _venue(price=None, capacity=180):
+    return SimpleNamespace(name="Harbor Loft", city="Chicago", capacity=capacity, price_min=price)
+
+
+def _plan(brief=BRIEF, venues=(), template=TEMPLATE):
+    return plan_engine.build_plan(plan_engine.plan_basis(brief, list(venues), [], template))
+
+
+class BudgetTests(TestCase):
+    def test_template_shares_split_the_spend_after_the_fee(self) -> None:
+        budget = _plan()["budget"]
+
+        amounts = {line["label"]: line["amount"] for line in budget["breakdown"]}
+        self.assertEqual(
+            amounts, {"Venue & rentals": 8000, "Food & beverage": 6000, "Decor": 4000, "Platform Fee": 2000.0}
+        )
+        self.assertEqual(budget["total"], 20000.0)
+
+    def test_a_cheaper_venue_leaves_the_difference_unspent(self) -> None:
+        plan = _plan(venues=[_venue(price=6000)])
+
+        venue_line = plan["budget"]["breakdown"][0]
+        self.assertEqual(venue_line["amount"], 6000)
+        self.assertLess(plan["kpis"]["totalCost"], 20000)
+        self.assertIn("under the venue budget", plan["budget"]["tradeoffNote"])
+
+    def test_a_pricier_venue_never_breaks_the_budget(self) -> None:
+        for price in (10000, 50000):
+            with self.subTest(price=price):
+                plan = _plan(venues=[_venue(price=price)])
+
+                self.assertLessEqual(plan["kpis"]["totalCost"], 20000)
+                fee = plan["budget"]["breakdown"][-1]
+                self.assertEqual(fee["label"], "Platform Fee")
+                self.assertAlmostEqual(fee["amount"], plan["kpis"]["totalCost"] * 0.10, delta=0.01)
+
+    def test_budget_text_is_parsed_or_ignored(self) -> None:
+        cases = {"$20k": 20000, "15k-20k": 20000, "20,000 - 30,000": 30000, "$8,000": 8000, "about 20": None}
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(plan_engine._amount(text), expected)
+
+        self.assertEqual(_plan(brief={**BRIEF, "budget": "twenty-ish"})["kpis"]["totalCost"], 5000.0)
+
+    def test_default_shares_without_a_template(self) -> None:
+        labels = [line["label"] for line in _plan(template=None)["budget"]["breakdown"]]
+
+        self.assertEqual(labels, [*plan_engine.DEFAULT_SHARES, "Platform Fee"])
+
+
+class LayoutAndTimelineTests(TestCase):
+    def test_inventory_follows_the_event_type(self) -> None:
+        plan = _plan(brief={**BRIEF, "guestCount": 100})
+
+        self.assertEqual(plan["spacePlan"]["inventory"], {"chairs": 105, "tables": 13, "stage": 1, "buffet": 0})
+        self.assertEqual(plan["kpis"]["costPerAttendee"], 200.0)
+
+    def test_timeline_wraps_the_template_program_in_setup_and_teardown(self) -> None:
+        timeline = _plan(venues=[_venue()])["timeline"]
+
+        self.assertEqual(
+            [(item["time"], item["title"]) for item in timeline],
+            [
+                ("12:30", "Setup"),
+                ("15:00", "Guest Arrival"),
+                ("15:30", "Ceremony"),
+                ("22:30", "Sparkler Exit"),
+                ("23:30", "Teardown"),
+            ],
+        )
+        self.assertEqual(timeline[0]["notes"], "Harbor Loft preparation and decoration")
+
+    def test_parse_clock(self) -> None:
+        self.assertEqual(plan_engine.parse_clock("3:30 PM"), 15 * 60 + 30)
+        self.assertEqual(plan_engine.parse_clock("12 am"), 0)
+        self.assertEqual(plan_engine.parse_clock("18:05"), 18 * 60 + 5)
+        self.assertIsNone(plan_engine.parse_clock("13:00 PM"))
+        self.assertIsNone(plan_engine.parse_clock("noon"))
+
+
+class RecomputeTests(TestCase):
+    def test_guest_count_edit_is_recomputed_locally(self) -> None:
+        plan = {**_plan(venues=[_venue(price=6000)]), "title": "Garden Vows"}
+
+        updated = plan_engine.recompute(plan, plan_engine.brief_changes(BRIEF, {**BRIEF, "guestCount": 220}))
+
+        self.assertEqual(updated["title"], "Garden Vows")
+        self.assertEqual(updated["blueprintId"], plan["blueprintId"])
+        self.assertEqual(updated["spacePlan"]["inventory"]["chairs"], 231)
+        self.assertLess(updated["kpis"]["confidencePct"], plan["kpis"]["confidencePct"])
+        self.assertIn("seats 180, fewer than 220 guests", updated["budget"]["tradeoffNote"])
+
+    def test_plans_without_a_basis_are_left_alone(self) -> None:
+        plan = {"title": "Legacy", "kpis": {}}
+
+        self.assertEqual(plan_engine.recompute(plan, {"guestCount": 10}), plan)
+
+
+class GeneratePlanTests(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        patches = [
+            patch.object(planner_service, "_find_matching_venues", AsyncMock(return_value=[_venue(price=6000)])),
+            patch.object(planner_service, "_find_matching_providers", AsyncMock(return_value=[])),
+            patch.object(planner_service, "_plan_template", AsyncMock(return_value=TEMPLATE)),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_llm_only_writes_the_prose(self) -> None:
+        llm = AsyncMock(return_value="Garden Vows at Harbor Loft\nAn evening wedding for 150 guests.")
+        with patch.object(planner_service, "invoke_llm_with_messages", llm):
+            result = await planner_service.generate_plan(Mock(), uuid.uuid4(), BRIEF)
+
+        plan = result["plan"]
+        self.assertEqual(plan["title"], "Garden Vows at Harbor Loft")
+        self.assertEqual(plan["summary"], "An evening wedding for 150 guests.")
+        self.assertEqual(plan["budget"]["breakdown"][0]["amount"], 6000)
+        self.assertLessEqual(llm.await_args.kwargs["max_tokens"], 300)
+
+    async def test_fallback_text_keeps_the_plain_prose(self) -> None:
+        llm = AsyncMock(return_value=llm_service._UNAVAILABLE_MESSAGE)
+        with patch.object(planner_service, "invoke_llm_with_messages", llm):
+            plan = (await planner_service.generate_plan(Mock(), uuid.uuid4(), BRIEF))["plan"]
+
+        self.assertEqual(plan["title"], "Wedding Event Plan")
+
+    async def test_prose_can_be_turned_off(self) -> None:
+        llm = AsyncMock()
+        with (
+            patch.object(planner_service, "invoke_llm_with_messages", llm),
+            patch.object(planner_service.settings, "PLANNER_PLAN_PROSE", False),
+        ):
+            plan = (await planner_service.generate_plan(Mock(), uuid.uuid4(), BRIEF))["plan"]
+
+        llm.assert_not_awaited()
+        self.assertEqual(plan["summary"], "A wedding for 150 guests in Chicago at Harbor Loft.")
+
+    async def test_stream_sends_the_plan_before_the_prose(self) -> None:
+        async def stream(messages, temperature, max_tokens):
+            for delta in ("Garden Vows", "\nA wedding", " for 150."):
+                yield delta
+
+        with patch.object(planner_service, "stream_llm_with_messages", stream):
+            events = [event async for event in planner_service.stream_plan(Mock(), uuid.uuid4(), BRIEF)]
+
+        self.assertEqual([name for name, _ in events], ["plan", "delta", "delta", "delta", "done"])
+        self.assertEqual(events[-1][1]["plan"]["summary"], "A wedding for 150.")
+
+    async def test_brief_edit_reprices_the_saved_plan(self) -> None:
+        plan = _plan(venues=[_venue(price=6000)])
+        result = Mock()
+        result.scalar_one_or_none.return_value = None
+        db = Mock(execute=AsyncMock(return_value=result), add=Mock(), add_all=Mock())
+
+        response = await planner_service._complete_turn(
+            db, uuid.uuid4(), str(uuid.uuid4()),
+            user_text="Make it 100 guests",
+            messages=[],
+            current_brief=BRIEF,
+            current_status="ready_to_generate",
+            assistant_text="Done!",
+            updated_brief={**BRIEF, "guestCount": 100},
+            mode=None,
+            planner_state=plan,
+        )
+
+        updated = response["updatedSession"]["plannerState"]
+        self.assertEqual(updated["spacePlan"]["inventory"]["chairs"], 105)
+        self.assertEqual(updated["blueprintId"], plan["blueprintId"])
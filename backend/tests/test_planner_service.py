@@ -0,0 +1,317 @@
+"""Tests for the planner turn pipeline."""
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.services import planner_service
+from app.utils.exceptions import BadRequestError
+
+
+def _result(value):
+    result = Mock()
+    result.scalar_one_or_none.return_value = value
+    return result
+
+
+class HandleMessageTests(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.db = Mock()
+        self.db.execute = AsyncMock(return_value=_result(None))
+        self.db.add = Mock()
+
+    async def _handle(self, text: str = "A wedding") -> dict:
+        return await planner_service.handle_message(
+            self.db, uuid.uuid4(), str(uuid.uuid4()), text, [], None, None, None, None
+        )
+
+    async def test_reply_and_extraction_run_concurrently(self) -> None:
+        replying, extracting = asyncio.Event(), asyncio.Event()
+
+        # Each fake waits for the other to start, so running them one after
+        # the other times out instead of passing.
+        async def reply(messages, temperature):
+            replying.set()
+            await asyncio.wait_for(extracting.wait(), timeout=1)
+            return "Congratulations!"
+
+        async def extract(user_text, current_brief):
+            extracting.set()
+            await asyncio.wait_for(replying.wait(), timeout=1)
+            return {"eventType": "wedding"}
+
+        with (
+            patch.object(planner_service, "invoke_llm_with_messages", reply),
+            patch.object(planner_service, "_extract_brief_fields", extract),
+            self.assertLogs(planner_service.logger, "INFO") as logs,
+        ):
+            result = await self._handle()
+
+        self.assertEqual(result["assistantMessage"]["text"], "Congratulations!")
+        self.assertEqual(result["updatedSession"]["draftBrief"], {"eventType": "wedding"})
+        stages = logs.records[-1].stage_ms
+        self.assertEqual(set(stages), {"load", "reply", "extract", "summary", "save"})
+
+    async def test_reply_failure_cancels_extraction(self) -> None:
+        cancelled = asyncio.Event()
+
+        async def reply(messages, temperature):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        async def extract(user_text, current_brief):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with (
+            patch.object(planner_service, "invoke_llm_with_messages", reply),
+            patch.object(planner_service, "_extract_brief_fields", extract),
+        ):
+            with self.assertRaisesRegex(RuntimeError, "upstream down"):
+                await self._handle()
+            await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+        self.db.add.assert_not_called()
+
+
+class ExtractBriefFieldsTests(IsolatedAsyncioTestCase):
+    async def test_locally_parsed_message_skips_the_llm(self) -> None:
+        llm = AsyncMock()
+        with patch.object(planner_service, "invoke_llm", llm):
+            brief = await planner_service._extract_brief_fields(
+                "100 guests, $20k, Austin in May", {"eventType": "wedding"}
+            )
+
+        llm.assert_not_awaited()
+        self.assertEqual(
+            {k: brief[k] for k in ("eventType", "guestCount", "budget", "city")},
+            {"eventType": "wedding", "guestCount": 100, "budget": 20000, "city": "Austin"},
+        )
+
+    async def test_llm_is_asked_for_every_unresolved_field(self) -> None:
+        llm = AsyncMock(return_value={"city": "Montpelier", "budget": None})
+        with patch.object(planner_service, "invoke_llm", llm):
+            brief = await planner_service._extract_brief_fields(
+                "A wedding in Montpelier, 80 guests", {"budget": 5000, "dateRange": "June 2027"}
+            )
+
+        prompt = llm.await_args.kwargs["prompt"]
+        self.assertIn("- city:", prompt)
+        self.assertIn("- budget:", prompt)
+        self.assertNotIn("- guestCount:", prompt)
+        self.assertEqual(brief["city"], "Montpelier")
+        self.assertEqual((brief["budget"], brief["guestCount"]), (5000, 80))
+
+    async def test_llm_can_correct_a_field_that_is_already_set(self) -> None:
+        llm = AsyncMock(return_value={"city": "Montpelier"})
+        with patch.object(planner_service, "invoke_llm", llm):
+            brief = await planner_service._extract_brief_fields(
+                "Actually, let's move it to Montpelier instead", {"city": "Austin", "guestCount": 150}
+            )
+
+        self.assertIn("- city:", llm.await_args.kwargs["prompt"])
+        self.assertEqual(brief, {"city": "Montpelier", "guestCount": 150})
+
+    async def test_a_partial_headcount_does_not_replace_the_guest_count(self) -> None:
+        llm = AsyncMock(return_value={"guestCount": None})
+        with patch.object(planner_service, "invoke_llm", llm):
+            brief = await planner_service._extract_brief_fields("We have 3 kids coming too", {"guestCount": 150})
+
+        self.assertIn("- guestCount:", llm.await_args.kwargs["prompt"])
+        self.assertEqual(brief, {"guestCount": 150})
+
+    async def test_llm_failure_keeps_local_fields(self) -> None:
+        llm = AsyncMock(side_effect=RuntimeError("upstream down"))
+        with patch.object(planner_service, "invoke_llm", llm):
+            brief = await planner_service._extract_brief_fields("80 guests in Montpelier", {})
+
+        self.assertEqual(brief, {"guestCount": 80})
+
+
+class SaveSessionTests(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.db = Mock()
+        self.db.add = Mock()
+        self.db.add_all = Mock()
+        self.turn = [
+            {"id": "msg-u", "role": "user", "text": "hi", "createdAt": 1_760_000_000_000},
+            {"id": "msg-a", "role": "assistant", "text": "hello", "createdAt": 1_760_000_000_500, "status": "final"},
+        ]
+        self.history = [{"id": "msg-0", "role": "assistant", "text": "Welcome", "createdAt": 1_759_999_999_000}]
+
+    async def _save(self, row) -> list:
+        self.db.execute = AsyncMock(return_value=_result(row))
+        await planner_service._save_session(
+            self.db, uuid.uuid4(), str(uuid.uuid4()), {"briefStatus": "collecting"},
+            history=self.history, turn=self.turn,
+        )
+        return list(self.db.add_all.call_args.args[0])
+
+    async def test_existing_session_appends_only_the_turn(self) -> None:
+        row = Mock(data={"_type": "planner_session", "session": {"messageCount": 6}})
+
+        appended = await self._save(row)
+
+        self.assertEqual([(m.seq, m.text) for m in appended], [(6, "hi"), (7, "hello")])
+        self.assertEqual(row.data["session"], {"briefStatus": "collecting", "messageCount": 8})
+        self.assertEqual(appended[1].to_message(), self.turn[1])
+        self.db.add.assert_not_called()
+
+    async def test_new_session_stores_client_history(self) -> None:
+        appended = await self._save(None)
+
+        self.assertEqual([m.seq for m in appended], [0, 1, 2])
+        self.assertEqual(appended[0].text, "Welcome")
+        self.assertEqual(self.db.add.call_args.args[0].data["session"]["messageCount"], 3)
+
+
+class GetSessionsTests(IsolatedAsyncioTestCase):
+    def _row(self, title: str | None) -> SimpleNamespace:
+        now = datetime(2026, 10, 19, tzinfo=timezone.utc)
+        return SimpleNamespace(
+            id=uuid.uuid4(), created_at=now, updated_at=now, title=title, status="draft",
+            brief_status="ready_to_generate", mode="scratch", message_count=4,
+        )
+
+    async def test_returns_projected_summaries_with_a_cursor(self) -> None:
+        rows = [self._row("Austin wedding"), self._row(None), self._row("Extra")]
+        result = Mock()
+        result.all.return_value = rows
+        db = Mock()
+        db.execute = AsyncMock(return_value=result)
+
+        page = await planner_service.get_sessions(db, uuid.uuid4(), limit=2)
+
+        stmt = str(db.execute.await_args.args[0])
+        self.assertIn("conversations.data->>'_type' = 'planner_session'", stmt)
+        self.assertEqual([s["title"] for s in page["sessions"]], ["Austin wedding", "New plan"])
+        self.assertEqual(page["sessions"][0]["messageCount"], 4)
+        self.assertEqual(page["nextCursor"], str(rows[1].id))
+
+
+    async def test_a_cursor_continues_after_its_session(self) -> None:
+        cursor = uuid.uuid4()
+        page = Mock()
+        page.all.return_value = []
+        db = Mock()
+        db.execute = AsyncMock(side_effect=[_result(datetime(2026, 10, 19, tzinfo=timezone.utc)), page])
+
+        await planner_service.get_sessions(db, uuid.uuid4(), before=str(cursor))
+
+        stmt = db.execute.await_args.args[0]
+        self.assertIn("(conversations.updated_at, conversations.id) <", str(stmt))
+        self.assertIn(cursor, stmt.compile().params.values())
+
+    async def test_a_bad_cursor_is_rejected(self) -> None:
+        db = Mock()
+        db.execute = AsyncMock(return_value=_result(None))
+
+        for cursor in ("not-a-session", str(uuid.uuid4())):
+            with self.subTest(cursor=cursor), self.assertRaises(BadRequestError) as raised:
+                await planner_service.get_sessions(db, uuid.uuid4(), before=cursor)
+            self.assertEqual(raised.exception.status_code, 400)
+        self.assertEqual(db.execute.await_count, 1)
+
+
+class PlanTemplateTests(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.db = Mock()
+        self.search = AsyncMock(return_value=[])
+        patcher = patch.object(planner_service.retrieval_service, "search_templates", self.search)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _templates(self, *templates) -> None:
+        results = []
+        for template in templates:
+            result = Mock()
+            result.scalars.return_value.first.return_value = template
+            results.append(result)
+        self.db.execute = AsyncMock(side_effect=results)
+
+    async def _template(self, brief: dict, session_id: str | None = None):
+        return await planner_service._plan_template(self.db, uuid.uuid4(), session_id, "wedding", brief)
+
+    async def test_the_sessions_template_skips_the_search(self) -> None:
+        template = SimpleNamespace(id=uuid.uuid4())
+        self._templates(template)
+
+        chosen = await self._template({"eventType": "wedding", "vibe": "rustic barn"}, str(uuid.uuid4()))
+
+        self.assertIs(chosen, template)
+        self.search.assert_not_awaited()
+        stmt = str(self.db.execute.await_args.args[0])
+        self.assertIn("conversations.data->>'_type' = 'planner_session'", stmt)
+
+    async def test_a_described_brief_without_a_template_is_searched(self) -> None:
+        template = SimpleNamespace(id=uuid.uuid4())
+        self.search.return_value = [(template, 0.9)]
+        self._templates(None)
+
+        chosen = await self._template({"eventType": "wedding", "vibe": "rustic barn"}, str(uuid.uuid4()))
+
+        self.assertIs(chosen, template)
+        self.assertEqual(self.search.await_args.args[1], "wedding rustic barn")
+
+    async def test_a_brief_with_only_a_type_takes_the_featured_template(self) -> None:
+        featured = SimpleNamespace(id=uuid.uuid4())
+        self._templates(featured)
+
+        chosen = await self._template({"eventType": "wedding"})
+
+        self.assertIs(chosen, featured)
+        self.search.assert_not_awaited()
+        self.assertEqual(self.db.execute.await_count, 1)
+
+
+class ContextWindowTests(IsolatedAsyncioTestCase):
+    def _history(self, turns: int) -> list[dict]:
+        return [
+            {"role": "user" if i % 2 == 0 else "assistant", "text": f"message {i} " + "detail " * 40}
+            for i in range(turns)
+        ]
+
+    def test_history_is_trimmed_to_the_token_budget(self) -> None:
+        with patch.object(planner_service.settings, "PLANNER_HISTORY_TOKEN_BUDGET", 300):
+            llm_messages = planner_service._conversation("Next?", self._history(30), {})
+
+        history = llm_messages[1:-1]
+        self.assertTrue(0 < len(history) < 30)
+        self.assertTrue(history[-1]["content"].startswith("message 29"))
+        self.assertEqual(llm_messages[-1], {"role": "user", "content": "Next?"})
+
+    def test_summary_replaces_the_turns_it_covers(self) -> None:
+        summary = {"text": "Wedding for 100 in Austin.", "messageCount": 28}
+        llm_messages = planner_service._conversation("Next?", self._history(30), {}, summary)
+
+        self.assertIn("Wedding for 100 in Austin.", llm_messages[1]["content"])
+        self.assertEqual([m["content"][:10] for m in llm_messages[2:4]], ["message 28", "message 29"])
+
+    async def test_refresh_folds_only_uncovered_turns(self) -> None:
+        llm = AsyncMock(return_value={"text": "Updated summary."})
+        summary = {"text": "Earlier summary.", "messageCount": 4}
+        with (
+            patch.object(planner_service, "invoke_llm", llm),
+            patch.object(planner_service.settings, "PLANNER_HISTORY_TOKEN_BUDGET", 300),
+        ):
+            refreshed = await planner_service._refresh_summary(summary, self._history(30))
+
+        prompt = llm.await_args.kwargs["prompt"]
+        self.assertIn("Earlier summary.", prompt)
+        self.assertNotIn("message 3 ", prompt)
+        self.assertIn("message 4 ", prompt)
+        self.assertEqual(refreshed["text"], "Updated summary.")
+        self.assertGreater(refreshed["messageCount"], 4)
+        self.assertNotIn(f"message {refreshed['messageCount']} ", prompt)
+
+    async def test_short_history_is_not_summarized(self) -> None:
+        llm = AsyncMock()
+        with patch.object(planner_service, "invoke_llm", llm):
+            self.assertIsNone(await planner_service._refresh_summary(None, self._history(4)))
+        llm.assert_not_awaited()
@@ -0,0 +1,203 @@
+"""Tests for streaming planner replies."""
+
+import asyncio
+import json
+import uuid
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.api import sse
+from app.core.config import settings
+from app.core.http_clients import http_clients
+from app.services import llm_service, planner_service
+
+
+def _result(value):
+    result = Mock()
+    result.scalar_one_or_none.return_value = value
+    return result
+
+
+class FakeCompletionsServer:
+    """Serves one streamed chat completion per connection."""
+
+    def __init__(self, deltas: list[str], hang: bool = False) -> None:
+        self.deltas = deltas
+        self.hang = hang
+        self.request_body: dict | None = None
+        self.closed = asyncio.Event()
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = next(
+            int(line.split(b":")[1])
+            for line in head.split(b"\r\n")
+            if line.lower().startswith(b"content-length:")
+        )
+        self.request_body = json.loads(await reader.readexactly(length))
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nTransfer-Encoding: chunked\r\n\r\n"
+        )
+        for delta in self.deltas:
+            event = f"data: {json.dumps({'choices': [{'delta': {'content': delta}}]})}\n\n".encode()
+            writer.write(b"%x\r\n%s\r\n" % (len(event), event))
+            await writer.drain()
+        if self.hang:
+            # Keep generating until the client goes away.
+            await reader.read()
+            self.closed.set()
+            return
+        done = b"data: [DONE]\n\n"
+        writer.write(b"%x\r\n%s\r\n0\r\n\r\n" % (len(done), done))
+        await writer.drain()
+
+
+class StreamLLMTests(IsolatedAsyncioTestCase):
+    async def asyncTearDown(self) -> None:
+        await http_clients.aclose()
+        await self.server.stop()
+
+    async def _start(self, server: FakeCompletionsServer):
+        self.server = server
+        base_url = await server.start()
+        return (
+            patch.object(settings, "NVIDIA_API_KEY", "test-key"),
+            patch.object(settings, "NVIDIA_API_BASE", base_url),
+        )
+
+    async def test_yields_content_deltas_until_done(self) -> None:
+        key, base = await self._start(FakeCompletionsServer(["Hel", "lo", "!"]))
+        with key, base:
+            deltas = [d async for d in llm_service.stream_llm_with_messages([{"role": "user", "content": "hi"}])]
+
+        self.assertEqual(deltas, ["Hel", "lo", "!"])
+        self.assertTrue(self.server.request_body["stream"])
+
+    async def test_closing_the_stream_disconnects_upstream(self) -> None:
+        key, base = await self._start(FakeCompletionsServer(["first"], hang=True))
+        with key, base:
+            stream = llm_service.stream_llm_with_messages([{"role": "user", "content": "hi"}])
+            self.assertEqual(await anext(stream), "first")
+            await stream.aclose()
+
+        await asyncio.wait_for(self.server.closed.wait(), timeout=2)
+
+
+class StreamMessageTests(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.db = Mock()
+        self.db.execute = AsyncMock(return_value=_result(None))
+        self.db.add = Mock()
+        self.db.flush = AsyncMock()
+
+    def _events(self, stream, extract):
+        return (
+            patch.object(planner_service, "stream_llm_with_messages", stream),
+            patch.object(planner_service, "_extract_brief_fields", extract),
+        )
+
+    async def test_streams_deltas_then_persists_the_turn(self) -> None:
+        async def stream(messages, temperature):
+            for delta in ("Sounds ", "fun!"):
+                yield delta
+
+        extract = AsyncMock(return_value={"eventType": "wedding"})
+        llm, extraction = self._events(stream, extract)
+        with llm, extraction:
+            events = [
+                e
+                async for e in planner_service.stream_message(
+                    self.db, uuid.uuid4(), str(uuid.uuid4()), "A wedding", [], None, None, None, None
+                )
+            ]
+
+        self.assertEqual([name for name, _ in events], ["delta", "delta", "done"])
+        done = events[-1][1]
+        self.assertEqual(done["assistantMessage"]["text"], "Sounds fun!")
+        self.assertEqual(done["updatedSession"], {"draftBrief": {"eventType": "wedding"}})
+        self.assertEqual(self.db.add.call_args.args[0].data["session"]["messageCount"], 2)
+        saved = list(self.db.add_all.call_args.args[0])
+        self.assertEqual(saved[-1].text, "Sounds fun!")
+        self.db.flush.assert_awaited()
+
+    async def test_disconnect_cancels_extraction_and_saves_nothing(self) -> None:
+        started = asyncio.Event()
+
+        async def stream(messages, temperature):
+            yield "Hi"
+            await asyncio.sleep(10)
+
+        async def extract(user_text, current_brief):
+            started.set()
+            await asyncio.sleep(10)
+
+        llm, extraction = self._events(stream, extract)
+        with llm, extraction:
+            events = planner_service.stream_message(
+                self.db, uuid.uuid4(), str(uuid.uuid4()), "Hi", [], None, None, None, None
+            )
+            self.assertEqual(await anext(events), ("delta", {"text": "Hi"}))
+            await started.wait()
+            tasks = {t for t in asyncio.all_tasks() if t is not asyncio.current_task()}
+            await events.aclose()
+            await asyncio.sleep(0)
+
+        self.assertTrue(all(t.cancelled() or t.done() for t in tasks))
+        self.db.add.assert_not_called()
+
+
+class SSEResponseTests(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.calls: list[str] = []
+        self.db = Mock(
+            commit=AsyncMock(side_effect=lambda: self.calls.append("commit")),
+            rollback=AsyncMock(side_effect=lambda: self.calls.append("rollback")),
+        )
+        self.request = Mock(is_disconnected=AsyncMock(return_value=False))
+
+    async def _frames(self, events) -> list[str]:
+        response = sse.sse_response(self.request, self.db, events, "Failed.", {})
+        frames = []
+        async for frame in response.body_iterator:
+            self.calls.append(frame.split("\n", 1)[0])
+            frames.append(frame)
+        return frames
+
+    async def test_the_turn_is_committed_before_done_is_sent(self) -> None:
+        async def events():
+            yield "delta", {"text": "Hi"}
+            yield "done", {"success": True}
+
+        await self._frames(events())
+
+        self.assertEqual(self.calls, ["event: delta", "commit", "event: done"])
+        self.db.rollback.assert_not_awaited()
+
+    async def test_a_failed_commit_rolls_back_and_sends_an_error(self) -> None:
+        self.db.commit.side_effect = RuntimeError("commit failed")
+
+        async def events():
+            yield "done", {"success": True}
+
+        frames = await self._frames(events())
+
+        self.assertEqual(self.calls, ["rollback", "event: error"])
+        self.assertIn('"detail": "Failed."', frames[-1])
+
+    async def test_a_failed_turn_rolls_back_before_the_error(self) -> None:
+        async def events():
+            yield "delta", {"text": "Hi"}
+            raise RuntimeError("extraction failed")
+
+        await self._frames(events())
+
+        self.assertEqual(self.calls, ["event: delta", "rollback", "event: error"])
+        self.db.commit.assert_not_awaited()
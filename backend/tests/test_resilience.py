@@ -0,0 +1,192 @@
+"""Tests for upstream bulkheads, circuit breakers, retries and request deadlines."""
+
+import asyncio
+import json
+import time
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import patch
+
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core import resilience
+from app.core.config import settings
+from app.core.http_clients import HTTPClientRegistry, Upstream
+from app.core.middleware.deadline import DeadlineMiddleware
+from app.services import llm_service
+
+
+class FakeOpenAIServer:
+    """OpenAI-compatible /chat/completions that answers from a script of (status, delay)."""
+
+    def __init__(self, script: list[tuple[int, float]] | None = None) -> None:
+        self.script = list(script or [])
+        self.requests = 0
+        self.active = 0
+        self.peak = 0
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, ConnectionResetError):
+                return
+            length = next(
+                int(line.split(b":")[1])
+                for line in head.split(b"\r\n")
+                if line.lower().startswith(b"content-length:")
+            )
+            await reader.readexactly(length)
+            self.requests += 1
+            status, delay = self.script.pop(0) if self.script else (200, 0.0)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self.active -= 1
+            if status == 200:
+                body = json.dumps({"choices": [{"message": {"content": f"reply {self.requests}"}}]}).encode()
+            else:
+                body = json.dumps({"error": {"message": "upstream trouble"}}).encode()
+            try:
+                writer.write(
+                    b"HTTP/1.1 %d X\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s"
+                    % (status, len(body), body)
+                )
+                await writer.drain()
+            except ConnectionError:
+                return
+
+
+class LLMGuardTests(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.server = FakeOpenAIServer()
+        base_url = await self.server.start()
+        self.patches = [
+            patch.object(settings, "NVIDIA_API_KEY", "test-key"),
+            patch.object(settings, "NVIDIA_API_BASE", base_url),
+            patch.object(settings, "HTTP_RETRY_BASE_SECONDS", 0.01),
+        ]
+        for p in self.patches:
+            p.start()
+
+    async def asyncTearDown(self) -> None:
+        await self.registry.aclose()
+        for p in self.patches:
+            p.stop()
+        await self.server.stop()
+
+    def _use(self, **upstream) -> resilience.UpstreamGuard:
+        self.registry = HTTPClientRegistry([Upstream("nvidia", timeout=5, **upstream)])
+        self.patches.append(patch.object(llm_service, "http_clients", self.registry))
+        self.patches[-1].start()
+        return self.registry.guard("nvidia")
+
+    async def _ask(self) -> str:
+        return await llm_service.invoke_llm_with_messages([{"role": "user", "content": "hi"}])
+
+    async def test_transient_errors_are_retried(self) -> None:
+        guard = self._use(retries=2)
+        self.server.script = [(503, 0), (502, 0)]
+
+        self.assertEqual(await self._ask(), "reply 3")
+        self.assertEqual(guard.retried, 2)
+        self.assertEqual(guard.breaker.failures, 0)
+
+    async def test_client_errors_are_not_retried(self) -> None:
+        self._use(retries=2)
+        self.server.script = [(400, 0)]
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            await self._ask()
+        self.assertEqual(self.server.requests, 1)
+
+    async def test_open_circuit_falls_back_without_calling_upstream(self) -> None:
+        guard = self._use(failure_threshold=2)
+        self.server.script = [(500, 0), (500, 0)]
+        for _ in range(2):
+            with self.assertRaises(httpx.HTTPStatusError):
+                await self._ask()
+
+        self.assertEqual(await self._ask(), llm_service._UNAVAILABLE_MESSAGE)
+        structured = await llm_service.invoke_llm("Plan it", response_json_schema={"type": "object"})
+        self.assertEqual(structured, {"unavailable": True})
+        self.assertEqual(self.server.requests, 2)
+        self.assertEqual(guard.snapshot()["state"], "open")
+        self.assertEqual(guard.snapshot()["short_circuited"], 2)
+
+    async def test_full_bulkhead_sheds_excess_callers(self) -> None:
+        guard = self._use(max_in_flight=1, max_queue=1)
+        self.server.script = [(200, 0.2), (200, 0.0)]
+
+        replies = await asyncio.gather(*(self._ask() for _ in range(3)))
+
+        self.assertEqual(sorted(replies), sorted(["reply 1", "reply 2", llm_service._UNAVAILABLE_MESSAGE]))
+        self.assertEqual(self.server.peak, 1)
+        self.assertEqual(guard.bulkhead.rejected, 1)
+
+    async def test_request_deadline_caps_the_upstream_timeout(self) -> None:
+        guard = self._use(retries=2)
+        self.server.script = [(200, 2.0)]
+
+        started = time.perf_counter()
+        with resilience.deadline(0.2):
+            reply = await self._ask()
+
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(reply, llm_service._UNAVAILABLE_MESSAGE)
+        self.assertEqual(guard.deadline_exceeded, 1)
+        # Our own deadline says nothing about the upstream's health.
+        self.assertEqual((guard.breaker.failures, guard.retried), (0, 0))
+
+
+class CircuitBreakerTests(TestCase):
+    def setUp(self) -> None:
+        self.now = 0.0
+        self.breaker = resilience.CircuitBreaker("test", failure_threshold=2, reset_seconds=10, clock=lambda: self.now)
+
+    def test_half_open_lets_one_probe_through(self) -> None:
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        with self.assertRaises(resilience.CircuitOpenError):
+            self.breaker.before_call()
+
+        self.now = 10
+        self.breaker.before_call()
+        with self.assertRaises(resilience.CircuitOpenError):
+            self.breaker.before_call()
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "open")
+        self.now = 20
+        self.breaker.before_call()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, "closed")
+
+
+class DeadlineMiddlewareTests(IsolatedAsyncioTestCase):
+    async def test_requests_run_under_the_smaller_budget(self) -> None:
+        async def remaining(_request):
+            return JSONResponse({"remaining": resilience.time_remaining()})
+
+        app = DeadlineMiddleware(Starlette(routes=[Route("/", remaining)]), default_seconds=30)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            default = (await client.get("/")).json()["remaining"]
+            asked = (await client.get("/", headers={"X-Request-Timeout": "2.5"})).json()["remaining"]
+            bogus = (await client.get("/", headers={"X-Request-Timeout": "soon"})).json()["remaining"]
+
+        self.assertTrue(29 < default <= 30)
+        self.assertTrue(2 < asked <= 2.5)
+        self.assertTrue(29 < bogus <= 30)
+        self.assertIsNone(resilience.time_remaining())
@@ -0,0 +1,204 @@
+"""Tests for the anonymous response cache: coalescing, staleness, headers, tags."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core import cache as app_cache
+from app.core.middleware.response_cache import CacheRule, ResponseCacheMiddleware, normalize_query
+from app.core.response_cache import CachedResponse, ResponseCache
+from app.db import cache_tags
+from app.models.availability_bitmap import AvailabilityBitmap
+from app.models.marketplace_listing import MarketplaceListing
+from app.models.review_stats import ReviewStats
+from app.models.template import Template
+from app.models.venue import Venue
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ResponseCacheStoreTests(TestCase):
+    def test_entries_go_stale_then_expire(self) -> None:
+        clock = _Clock()
+        cache = ResponseCache(clock=clock)
+        cache.set("k", CachedResponse(200, [], b"x"), ttl=10, stale=20)
+
+        clock.now = 15
+        entry = cache.get("k")
+        self.assertIsNotNone(entry)
+        self.assertLess(entry.fresh_until, clock.now)
+
+        clock.now = 31
+        self.assertIsNone(cache.get("k"))
+
+    def test_invalidation_drops_tagged_entries_only(self) -> None:
+        cache = ResponseCache()
+        cache.set("a", CachedResponse(200, [], b"", frozenset({"vendors"})), ttl=10, stale=0)
+        cache.set("b", CachedResponse(200, [], b"", frozenset({"templates"})), ttl=10, stale=0)
+
+        self.assertEqual(cache.invalidate_tags("vendors"), 1)
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("b"))
+
+    def test_render_started_before_invalidation_is_not_stored(self) -> None:
+        cache = ResponseCache()
+        versions = cache.tag_versions(["vendors"])
+        cache.invalidate_tags("vendors")
+
+        stored = cache.set("a", CachedResponse(200, [], b""), ttl=10, stale=0, tag_versions=versions)
+        self.assertFalse(stored)
+        self.assertIsNone(cache.get("a"))
+
+    def test_query_normalization(self) -> None:
+        self.assertEqual(
+            normalize_query(b"sort_by=rating&city=%20Austin&min_price="),
+            normalize_query(b"city=Austin&sort_by=rating"),
+        )
+
+
+def _app(calls: list[str], delay: float = 0.0) -> ResponseCacheMiddleware:
+    async def venues(request):
+        calls.append(request.url.query)
+        await asyncio.sleep(delay)
+        return JSONResponse({"data": len(calls)}, headers={"cache-control": "no-cache"})
+
+    async def missing(request):
+        calls.append("missing")
+        return JSONResponse({"detail": "nope"}, status_code=404)
+
+    app = Starlette(routes=[Route("/api/marketplace/venues", venues), Route("/api/other", missing)])
+    return ResponseCacheMiddleware(
+        app,
+        rules=[
+            CacheRule("marketplace", r"/api/marketplace/venues", ("vendors",), ttl_seconds=10, stale_seconds=60),
+            CacheRule("other", r"/api/other", ("vendors",)),
+        ],
+        cache=ResponseCache(clock=_Clock()),
+    )
+
+
+class ResponseCacheMiddlewareTests(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.calls: list[str] = []
+        self.middleware = _app(self.calls, delay=0.05)
+        self.clock = self.middleware.cache._clock
+        self.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=self.middleware), base_url="http://test"
+        )
+
+    async def asyncTearDown(self) -> None:
+        await self.client.aclose()
+
+    async def test_concurrent_misses_run_one_request(self) -> None:
+        responses = await asyncio.gather(
+            *(self.client.get("/api/marketplace/venues?city=Austin") for _ in range(10))
+        )
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual({r.json()["data"] for r in responses}, {1})
+        self.assertEqual({r.headers["x-cache"] for r in responses}, {"MISS"})
+
+    async def test_hits_carry_shared_cache_headers(self) -> None:
+        await self.client.get("/api/marketplace/venues?city=Austin&sort_by=")
+        response = await self.client.get("/api/marketplace/venues?city=%20Austin")
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(response.headers["x-cache"], "HIT")
+        self.assertEqual(response.headers["cache-control"], "public, max-age=10, stale-while-revalidate=60")
+        self.assertEqual(response.headers["vary"], "Authorization")
+        self.assertIn("age", response.headers)
+
+    async def test_stale_entry_is_served_while_one_refresh_runs(self) -> None:
+        await self.client.get("/api/marketplace/venues")
+        self.clock.now = 30
+
+        first, second = await asyncio.gather(
+            self.client.get("/api/marketplace/venues"), self.client.get("/api/marketplace/venues")
+        )
+        self.assertEqual((first.headers["x-cache"], second.headers["x-cache"]), ("STALE", "STALE"))
+        self.assertEqual(first.json()["data"], 1)
+
+        await asyncio.gather(*self.middleware._revalidations)
+        self.assertEqual(len(self.calls), 2)
+        refreshed = await self.client.get("/api/marketplace/venues")
+        self.assertEqual((refreshed.headers["x-cache"], refreshed.json()["data"]), ("HIT", 2))
+
+    async def test_authenticated_requests_bypass_the_cache(self) -> None:
+        for _ in range(2):
+            response = await self.client.get(
+                "/api/marketplace/venues", headers={"Authorization": "Bearer token"}
+            )
+
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(response.headers["cache-control"], "private, no-store")
+        self.assertNotIn("x-cache", response.headers)
+
+    async def test_errors_are_not_cached(self) -> None:
+        for _ in range(2):
+            response = await self.client.get("/api/other")
+
+        self.assertEqual(self.calls, ["missing", "missing"])
+        self.assertEqual(response.headers["cache-control"], "no-store")
+
+    async def test_tag_invalidation_forces_a_fresh_render(self) -> None:
+        await self.client.get("/api/marketplace/venues")
+        self.middleware.cache.invalidate_tags("vendors")
+        response = await self.client.get("/api/marketplace/venues")
+
+        self.assertEqual(response.headers["x-cache"], "MISS")
+        self.assertEqual(len(self.calls), 2)
+
+    async def test_other_workers_invalidations_arrive_through_the_shared_tier(self) -> None:
+        tier = Mock(tag_generations=AsyncMock(return_value={"vendors": 3}))
+        with patch.object(app_cache, "shared_tier", Mock(return_value=tier)):
+            await self.client.get("/api/marketplace/venues")
+            tier.tag_generations.return_value = {"vendors": 4}  # another worker committed a write
+
+            cached = await self.client.get("/api/marketplace/venues")
+            self.clock.now = 2
+            refreshed = await self.client.get("/api/marketplace/venues")
+
+        tier.tag_generations.assert_awaited_with(["vendors"])
+        self.assertEqual(tier.tag_generations.await_count, 2)  # once per sync interval
+        self.assertEqual(cached.headers["x-cache"], "HIT")
+        self.assertEqual((refreshed.headers["x-cache"], refreshed.json()["data"]), ("MISS", 2))
+
+
+class CommitInvalidationTests(TestCase):
+    def test_tags_are_collected_on_flush_and_fired_on_commit(self) -> None:
+        session = SimpleNamespace(new=[Venue()], dirty=[Template()], deleted=[], info={})
+        cache_tags._record_tags(session, None)
+        self.assertEqual(session.info["cache_tags"], {"vendors", "templates"})
+
+        cache_tags.response_cache.set(
+            "k", CachedResponse(200, [], b"", frozenset({"templates"})), ttl=10, stale=0
+        )
+        cache_tags._invalidate_tags(session)
+
+        self.assertIsNone(cache_tags.response_cache.get("k"))
+        self.assertNotIn("cache_tags", session.info)
+
+    def test_derived_vendor_tables_invalidate_vendor_pages(self) -> None:
+        instances = [AvailabilityBitmap(), MarketplaceListing(), ReviewStats()]
+
+        self.assertEqual(cache_tags.tags_for(instances), {"vendors"})
+        self.assertEqual(cache_tags.TABLE_TAGS["availability"], ("vendors",))
+
+    def test_rollback_discards_pending_tags(self) -> None:
+        session = SimpleNamespace(new=[Venue()], dirty=[], deleted=[], info={})
+        cache_tags._record_tags(session, None)
+        cache_tags._discard_tags(session)
+
+        self.assertEqual(session.info, {})
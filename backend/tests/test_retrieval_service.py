@@ -0,0 +1,78 @@
+"""Tests for semantic retrieval over listings and templates."""
+
+import uuid
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, Mock, patch
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.marketplace_listing import MarketplaceListing
+from app.services import marketplace_service, planner_service, retrieval_service
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def _sql_literal(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+class NearestTests(TestCase):
+    def test_ranking_keeps_the_structured_filters(self) -> None:
+        query = marketplace_service.build_venue_query(city="Austin", min_capacity=100, sort_by="rating")
+
+        ranked = retrieval_service.nearest(query, "venue", MarketplaceListing.entity_id, "barn wedding")
+
+        sql = _sql(retrieval_service._pgvector_query(ranked))
+        self.assertIn("JOIN vector_embeddings ON vector_embeddings.content_type", sql)
+        self.assertIn("marketplace_listings.capacity >=", sql)
+        self.assertIn("ORDER BY vector_embeddings.embedding <=>", sql)
+        self.assertNotIn("avg_rating DESC", sql)
+        self.assertIn("similarity", sql)
+
+    def test_nothing_to_search_with(self) -> None:
+        query = marketplace_service.build_venue_query()
+        self.assertIsNone(retrieval_service.nearest(query, "venue", MarketplaceListing.entity_id, "  the  "))
+
+    def test_listing_document_includes_card_text(self) -> None:
+        listing = SimpleNamespace(
+            name="Harbor Loft", venue_type="loft", city="Boston", amenities=["Parking"], categories=[],
+            card={"description": "Waterfront views", "services": []},
+        )
+        self.assertEqual(
+            retrieval_service.listing_document(listing), "Harbor Loft\nloft\nBoston\nParking\nWaterfront views"
+        )
+
+
+class BestMatchesTests(IsolatedAsyncioTestCase):
+    async def test_falls_back_to_the_browse_order_without_embeddings(self) -> None:
+        browse_row = SimpleNamespace(entity_id=uuid.uuid4(), name="Harbor Loft")
+        ranked_result, browse_result = Mock(), Mock()
+        ranked_result.all.return_value = []
+        browse_result.all.return_value = [browse_row]
+        db = Mock()
+        db.execute = AsyncMock(side_effect=[Mock(), ranked_result, browse_result])
+
+        rows = await planner_service._find_matching_venues(db, "Boston", 80, 5000, description="wedding")
+
+        self.assertEqual(rows, [browse_row])
+        statements = [_sql(call.args[0]) for call in db.execute.await_args_list]
+        self.assertIn("set_config", statements[0])
+        self.assertIn("<=>", statements[1])
+        self.assertNotIn("<=>", statements[2])
+
+    async def test_scores_the_candidate_pool_and_keeps_the_best(self) -> None:
+        oversized = SimpleNamespace(name="Hangar", capacity=2000, price_min=2000, similarity=0.9)
+        snug = SimpleNamespace(name="Harbor Loft", capacity=100, price_min=1500, similarity=0.8)
+        ranked_result = Mock()
+        ranked_result.all.return_value = [oversized, snug]
+        db = Mock()
+        db.execute = AsyncMock(side_effect=[Mock(), ranked_result])
+
+        with patch.object(planner_service.settings, "PLANNER_PROMPT_VENUES", 1):
+            rows = await planner_service._find_matching_venues(db, "Boston", 80, 5000, description="wedding")
+
+        self.assertEqual(rows, [snug])
+        self.assertIn(f"LIMIT {planner_service.settings.PLANNER_CANDIDATE_LIMIT}", _sql_literal(db.execute.await_args.args[0]))
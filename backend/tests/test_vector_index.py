@@ -0,0 +1,158 @@
+"""Tests for the in-process NumPy vector index."""
+
+import tempfile
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, Mock, patch
+
+import numpy as np
+
+from app.core.config import settings
+from app.services import vector_index
+
+DIM = 32
+EmbeddingRow = namedtuple("EmbeddingRow", "content_id updated_at packed_embedding")
+
+
+def _vectors(count: int, seed: int = 0, clusters: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    if clusters:
+        centers = rng.normal(size=(clusters, DIM))
+        vectors = centers[rng.integers(clusters, size=count)] + rng.normal(scale=0.1, size=(count, DIM))
+    else:
+        vectors = rng.normal(size=(count, DIM))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+class BackendTests(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        for patcher in (
+            patch.object(vector_index, "_database_has_pgvector", None),
+            patch.object(vector_index, "HAS_PGVECTOR", True),
+            patch.object(settings, "VECTOR_BACKEND", "auto"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_auto_follows_the_database_extension_not_the_package(self) -> None:
+        self.assertFalse(vector_index.enabled())  # not detected yet: assume pgvector
+
+        self.assertTrue(await vector_index.detect_backend(Mock(scalar=AsyncMock(return_value=False))))
+        self.assertTrue(vector_index.enabled())
+
+        self.assertFalse(await vector_index.detect_backend(Mock(scalar=AsyncMock(return_value=True))))
+
+    async def test_an_explicit_backend_wins(self) -> None:
+        await vector_index.detect_backend(Mock(scalar=AsyncMock(return_value=False)))
+
+        with patch.object(settings, "VECTOR_BACKEND", "pgvector"):
+            self.assertFalse(vector_index.enabled())
+        with patch.object(settings, "VECTOR_BACKEND", "numpy"):
+            self.assertTrue(vector_index.enabled())
+
+
+class IndexTestCase(TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.directory = Path(self.tmp.name) / "venue"
+        self.directory.mkdir()
+
+    def _index(self) -> vector_index.VectorIndex:
+        return vector_index.VectorIndex("venue", self.directory, dim=DIM)
+
+    def _build(self, vectors: np.ndarray) -> tuple[vector_index.VectorIndex, list[uuid.UUID]]:
+        index = self._index()
+        ids = [uuid.UUID(int=n + 1) for n in range(len(vectors))]
+        writer = vector_index._Writer(index)
+        for content_id, vector in zip(ids, vectors):
+            writer.put(content_id, vector.tobytes())
+        writer.save(watermark=None)
+        index.open()
+        return index, ids
+
+
+class SearchTests(IndexTestCase):
+    def test_exact_top_k_matches_brute_force_and_skips_deleted_rows(self) -> None:
+        vectors = _vectors(300)
+        index, ids = self._build(vectors)
+        query = vectors[7] + 0.05 * vectors[8]
+
+        expected = np.argsort(-(vectors @ (query / np.linalg.norm(query))))[:5]
+        self.assertEqual([content_id for content_id, _ in index.search(query.tolist(), 5)], [ids[i] for i in expected])
+
+        writer = vector_index._Writer(index)
+        writer.keep_only(set(ids) - {ids[expected[0]]})
+        writer.save(watermark=None)
+        reader = self._index()  # another process mapping the same files
+        reader.open()
+        found = [content_id for content_id, _ in reader.search(query.tolist(), 5)]
+        self.assertNotIn(ids[expected[0]], found)
+        self.assertEqual(found[:4], [ids[i] for i in expected[1:]])
+
+    def test_ivf_probes_the_nearest_partitions(self) -> None:
+        vectors = _vectors(2000, clusters=40)
+        with patch.object(settings, "VECTOR_INDEX_IVF_MIN_ROWS", 1000), patch.object(
+            settings, "VECTOR_INDEX_IVF_PROBES", 4
+        ):
+            index, ids = self._build(vectors)
+            self.assertGreater(index.manifest["ivf_lists"], 0)
+            recalled = 0
+            for row in range(0, 2000, 100):
+                exact = {ids[i] for i in np.argsort(-(vectors @ vectors[row]))[:10]}
+                recalled += len(exact & {content_id for content_id, _ in index.search(vectors[row].tolist(), 10)})
+        self.assertGreaterEqual(recalled / 200, 0.9)
+
+    def test_reload_swaps_in_a_new_snapshot(self) -> None:
+        vectors = _vectors(20)
+        index, _ = self._build(vectors[:10])
+        before = index.snapshot
+
+        writer = vector_index._Writer(index)
+        for n in range(10, 20):
+            writer.put(uuid.UUID(int=n + 1), vectors[n].tobytes())
+        writer.save(watermark=None)
+        index.open()
+
+        # A search still holding the old snapshot sees one consistent generation.
+        self.assertEqual((len(before.ids), len(before.vectors), before.size), (10, 10, 10))
+        self.assertEqual(index.size, 20)
+        self.assertEqual(index.search(vectors[15].tolist(), 1)[0][0], uuid.UUID(int=16))
+
+    def test_only_one_process_writes_at_a_time(self) -> None:
+        first, second = self._index(), self._index()
+        with first._writer_lock() as writing, second._writer_lock() as also_writing:
+            self.assertEqual((writing, also_writing), (True, False))
+
+
+class RefreshTests(IndexTestCase, IsolatedAsyncioTestCase):
+    async def test_refresh_applies_updates_and_deletions(self) -> None:
+        vectors = _vectors(3)
+        ids = [uuid.UUID(int=n + 1) for n in range(3)]
+        now = datetime(2026, 10, 1, tzinfo=timezone.utc)
+        rows = [EmbeddingRow(ids[n], now + timedelta(seconds=n), vectors[n].tobytes()) for n in range(3)]
+        db = Mock()
+        db.execute = AsyncMock(return_value=Mock(all=Mock(return_value=rows)))
+        db.scalar = AsyncMock(return_value=3)
+        index = self._index()
+
+        await index.refresh(db)
+        self.assertEqual(index.search(vectors[2].tolist(), 1)[0][0], ids[2])
+
+        # Row 2 deleted, row 0 re-embedded as row 2's old vector.
+        moved = EmbeddingRow(ids[0], now + timedelta(seconds=5), vectors[2].tobytes())
+        db.execute = AsyncMock(
+            side_effect=[
+                Mock(all=Mock(return_value=[moved])),
+                Mock(scalars=Mock(return_value=[ids[0], ids[1]])),
+            ]
+        )
+        db.scalar = AsyncMock(return_value=2)
+        await index.refresh(db)
+
+        self.assertEqual(index.size, 2)
+        self.assertEqual(index.search(vectors[2].tolist(), 1)[0][0], ids[0])
+        self.assertEqual(index.manifest["watermark"], moved.updated_at.isoformat())
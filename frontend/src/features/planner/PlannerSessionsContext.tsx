@@ -36,6 +36,7 @@ export const PlannerSessionsProvider: React.FC<PlannerSessionsProviderProps> = (
   const [sessions, setSessions] = React.useState<PlannerSession[]>([]);
   const [activeSessionId, setActiveSessionId] = React.useState<string | null>(null);
   const persistTimeoutRef = React.useRef<number | null>(null);
+  const loadingSessionIdsRef = React.useRef(new Set<string>());
 
   React.useEffect(() => {
     if (!enabled) {
@@ -61,6 +62,23 @@ export const PlannerSessionsProvider: React.FC<PlannerSessionsProviderProps> = (
     setIsReady(true);
   }, [enabled]);
 
+  React.useEffect(() => {
+    if (!enabled) return;
+
+    // Server sessions arrive a page at a time; local copies take precedence.
+    const handleSeeded = (event: Event) => {
+      const seeded = (event as CustomEvent<{ sessions: PlannerSession[] }>).detail?.sessions ?? [];
+      setSessions((prev) => {
+        const known = new Set(prev.map((session) => session.id));
+        const added = seeded.filter((session) => !known.has(session.id));
+        return added.length ? sortSessionsByUpdatedAt([...prev, ...added]) : prev;
+      });
+    };
+
+    window.addEventListener("planner:sessions-seeded", handleSeeded);
+    return () => window.removeEventListener("planner:sessions-seeded", handleSeeded);
+  }, [enabled]);
+
   React.useEffect(() => {
     if (!enabled || !isReady) {
       return;
@@ -99,6 +117,30 @@ export const PlannerSessionsProvider: React.FC<PlannerSessionsProviderProps> = (
     }
   }, [activeSessionId, enabled, isReady, sessions]);
 
+  React.useEffect(() => {
+    const summary = sessions.find((session) => session.id === activeSessionId);
+    const loadSession = plannerService.loadSession;
+    if (!summary?.isSummary || !loadSession || loadingSessionIdsRef.current.has(summary.id)) {
+      return;
+    }
+
+    loadingSessionIdsRef.current.add(summary.id);
+    loadSession(summary)
+      .then((loaded) => {
+        setSessions((prev) =>
+          prev.map((session) =>
+            session.id === loaded.id && session.isSummary ? loaded : session
+          )
+        );
+      })
+      .catch((error) => {
+        console.warn("[PlannerSessionsContext] Failed to load planner session:", error);
+      })
+      .finally(() => {
+        loadingSessionIdsRef.current.delete(summary.id);
+      });
+  }, [activeSessionId, sessions]);
+
   const setActiveSession = React.useCallback((sessionId: string) => {
     setActiveSessionId(sessionId);
   }, []);
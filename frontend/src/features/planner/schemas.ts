@@ -82,7 +82,8 @@ export const zPlannerSession = z.object({
   lastAskedField: z.enum(REQUIRED_BRIEF_FIELDS).optional(),
   plannerStateUpdatedAt: z.number().optional(),
   messages: z.array(zChatMessage),
-  plannerState: zPlannerState.optional()
+  plannerState: zPlannerState.optional(),
+  isSummary: z.boolean().optional()
 });
 
 export const zPlannerSessionsPayload = z.object({
@@ -3,6 +3,7 @@ import {
   PlannerService,
   PlannerServiceResponse,
   PlannerSession,
+  PlannerSessionSummary,
   ChatMessage
 } from "@/features/planner/types";
 
@@ -24,6 +25,40 @@ function retitleFromText(text: string): string {
   return title.length > 52 ? `${title.slice(0, 49)}...` : title;
 }
 
+function sessionFromSummary(summary: PlannerSessionSummary): PlannerSession {
+  return {
+    id: summary.id,
+    title: summary.title,
+    createdAt: summary.createdAt,
+    updatedAt: summary.updatedAt,
+    mode: summary.mode ?? "scratch",
+    viewMode: "chat_only",
+    briefStatus: summary.briefStatus ?? "collecting",
+    messages: [],
+    isSummary: true
+  };
+}
+
+async function fetchSessionPages(): Promise<void> {
+  let before: string | null = null;
+  do {
+    const query = before ? `?before=${encodeURIComponent(before)}` : "";
+    const page: SeedSessionsResponse = await request<SeedSessionsResponse>(
+      "GET",
+      `/api/planner/sessions${query}`,
+      { auth: true }
+    );
+    if (page.sessions?.length) {
+      window.dispatchEvent(
+        new CustomEvent("planner:sessions-seeded", {
+          detail: { sessions: page.sessions.map(sessionFromSummary) }
+        })
+      );
+    }
+    before = page.nextCursor;
+  } while (before);
+}
+
 // ---------------------------------------------------------------------------
 // API request / response shapes
 // ---------------------------------------------------------------------------
@@ -45,7 +80,14 @@ type SendMessageResponse = {
 };
 
 type SeedSessionsResponse = {
-  sessions: PlannerSession[];
+  sessions: PlannerSessionSummary[];
+  nextCursor: string | null;
+};
+
+type LoadSessionResponse = {
+  session: Partial<Omit<PlannerSession, "id" | "title" | "createdAt" | "updatedAt">> & {
+    messages: ChatMessage[];
+  };
 };
 
 // ---------------------------------------------------------------------------
@@ -95,25 +137,34 @@ export const plannerServiceApi: PlannerService = {
   },
 
   seedSessions(): PlannerSession[] {
-    // Fire-and-forget fetch from backend; return empty array synchronously.
-    // PlannerSessionsContext will merge results when the promise resolves.
-    request<SeedSessionsResponse>("GET", "/api/planner/sessions", { auth: true })
-      .then((response) => {
-        if (response.sessions?.length) {
-          window.dispatchEvent(
-            new CustomEvent("planner:sessions-seeded", {
-              detail: { sessions: response.sessions }
-            })
-          );
-        }
-      })
-      .catch((error) => {
-        console.warn("[plannerService.api] Failed to fetch seed sessions:", error);
-      });
+    // Fire-and-forget fetch of the session summaries, page by page; return an
+    // empty array synchronously. PlannerSessionsContext merges each page as it
+    // arrives and loads a session's transcript through loadSession on open.
+    fetchSessionPages().catch((error) => {
+      console.warn("[plannerService.api] Failed to fetch seed sessions:", error);
+    });
 
     return [];
   },
 
+  async loadSession(session: PlannerSession): Promise<PlannerSession> {
+    const { session: loaded } = await request<LoadSessionResponse>(
+      "GET",
+      `/api/planner/sessions/${encodeURIComponent(session.id)}`,
+      { auth: true }
+    );
+
+    return {
+      ...session,
+      mode: loaded.mode ?? session.mode,
+      briefStatus: loaded.briefStatus ?? session.briefStatus,
+      draftBrief: loaded.draftBrief ?? undefined,
+      plannerState: loaded.plannerState ?? undefined,
+      messages: loaded.messages ?? [],
+      isSummary: false
+    };
+  },
+
   retitleSessionFromFirstMessage(
     session: PlannerSession,
     firstUserText: string
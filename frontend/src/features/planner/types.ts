@@ -84,12 +84,25 @@ export type PlannerSession = {
   plannerStateUpdatedAt?: number;
   messages: ChatMessage[];
   plannerState?: PlannerState;
+  // Listed from a server summary; messages and brief load when it is opened.
+  isSummary?: boolean;
 };
 
 export type PlannerSessionUpdate = Partial<
   Omit<PlannerSession, "id" | "createdAt" | "updatedAt" | "messages">
 >;
 
+export type PlannerSessionSummary = {
+  id: string;
+  title: string;
+  status: string | null;
+  briefStatus: PlannerBriefStatus | null;
+  mode: PlannerMode | null;
+  messageCount: number;
+  createdAt: number;
+  updatedAt: number;
+};
+
 export type PlannerDeferredGeneration = {
   delayMs: number;
   plannerState: PlannerState;
@@ -111,6 +124,7 @@ export type PlannerService = {
   ) => Promise<PlannerServiceResponse>;
   createNewSession: () => PlannerSession;
   seedSessions: () => PlannerSession[];
+  loadSession?: (session: PlannerSession) => Promise<PlannerSession>;
   retitleSessionFromFirstMessage: (
     session: PlannerSession,
     firstUserText: string